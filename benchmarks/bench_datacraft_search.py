@@ -0,0 +1,111 @@
+"""Benchmark datacraft vector and hybrid search.
+
+Two parts:
+
+* ``VectorIndex`` on N synthetic clustered embeddings (default 1,000,000 x
+  256): build time, query latency (p50/p95) and recall@10 against an exact
+  scan.
+* ``DocumentStore.search`` end to end on a generated corpus embedded with
+  ``HashEmbedder``: keyword, semantic and hybrid latency, cold and cached.
+
+Usage:
+    python benchmarks/bench_datacraft_search.py [--vectors 1000000] [--chunks 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from mother.plugins.builtin.datacraft.storage import Document, DocumentStore
+from mother.plugins.builtin.datacraft.vectors import HashEmbedder, VectorIndex, to_blob
+
+
+def synthetic_vectors(count: int, dim: int, topics: int = 2000, seed: int = 1):
+    """Yield ``(id, blob)`` rows scattered around random topic centres."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((topics, dim)).astype(np.float32)
+    for start in range(0, count, 10_000):
+        n = min(10_000, count - start)
+        block = centres[rng.integers(0, topics, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+        for i in range(n):
+            yield start + i + 1, to_blob(block[i])
+
+
+def percentiles(samples: list[float]) -> str:
+    ms = np.array(samples) * 1000
+    return f"p50 {np.percentile(ms, 50):7.2f} ms  p95 {np.percentile(ms, 95):7.2f} ms"
+
+
+def bench_index(root: Path, count: int, dim: int, queries: int) -> None:
+    print(f"VectorIndex: {count} vectors x {dim}")
+    index = VectorIndex(root / "index")
+    started = time.perf_counter()
+    index.build(synthetic_vectors(count, dim), count, version=1)
+    print(f"  build                 {time.perf_counter() - started:8.2f}s")
+
+    vectors = np.load(root / "index" / "vectors.npy", mmap_mode="r")
+    ids = np.load(root / "index" / "ids.npy")
+    rng = np.random.default_rng(2)
+    sample = [vectors[i] + 0.1 * rng.standard_normal(dim).astype(np.float32) for i in rng.integers(0, count, queries)]
+
+    index.search(sample[0], 10)  # fault the mapping in
+    latencies, recall = [], []
+    for q in sample:
+        started = time.perf_counter()
+        hits = index.search(q, 10)
+        latencies.append(time.perf_counter() - started)
+        exact = set(ids[np.argpartition(-(vectors @ (q / np.linalg.norm(q))), 9)[:10]])
+        recall.append(len(exact & {chunk_id for chunk_id, _ in hits}) / 10)
+    print(f"  query                 {percentiles(latencies)}  recall@10 {np.mean(recall):.3f}")
+
+
+def bench_store(root: Path, chunks: int, queries: int) -> None:
+    words = [f"w{i}" for i in range(3000)] + ["invoice", "receipt", "contract", "payment", "shipment", "warranty"]
+    rng = random.Random(3)
+    store = DocumentStore(root / "search.db", embedder=HashEmbedder())
+    docs = []
+    for i in range(chunks // 10):
+        texts = [" ".join(rng.choices(words, k=80)) for _ in range(10)]
+        docs.append(Document(doc_id=f"d{i}", filename=f"d{i}.txt", doc_type="other", content="", chunks=texts))
+    store.store_documents(docs)
+    started = time.perf_counter()
+    store.embed_pending(batch_size=256)
+    print(f"DocumentStore: {chunks} chunks, embedded in {time.perf_counter() - started:.1f}s")
+
+    terms = ["invoices payment", "contract warranty", "receipts", "shipment", "payments due"][:queries]
+    store.search(terms[0], mode="semantic")  # build the vector index
+    for mode in ("keyword", "semantic", "hybrid"):
+        cold, warm = [], []
+        for term in terms:
+            store._cache.clear()
+            store._query_vectors.clear()
+            started = time.perf_counter()
+            store.search(term, mode=mode)
+            cold.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            store.search(term, mode=mode)
+            warm.append(time.perf_counter() - started)
+        print(f"  {mode:<8} cold {percentiles(cold)}   cached {percentiles(warm)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=1_000_000, help="vectors in the index benchmark")
+    parser.add_argument("--dim", type=int, default=256, help="embedding dimensions")
+    parser.add_argument("--chunks", type=int, default=20_000, help="chunks in the store benchmark")
+    parser.add_argument("--queries", type=int, default=50, help="queries per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mother-bench-") as root:
+        bench_index(Path(root), args.vectors, args.dim, args.queries)
+        bench_store(Path(root), args.chunks, args.queries)
+
+
+if __name__ == "__main__":
+    main()
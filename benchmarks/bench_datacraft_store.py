@@ -0,0 +1,133 @@
+"""Benchmark DocumentStore ingestion throughput in chunks/sec.
+
+Generates N synthetic documents (default 2,000 x 30 chunks) and times:
+
+* the old write path (one ``execute`` per chunk and entity row, FTS updated
+  by trigger, one transaction per document),
+* ``store_documents`` in ingestion-sized batches and in one large batch,
+* re-ingesting the same files (skipped by file hash), and
+* an incremental update that changes one chunk per document.
+
+Usage:
+    python benchmarks/bench_datacraft_store.py [--docs 2000] [--chunks 30]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from mother.plugins.builtin.datacraft.storage import Document, DocumentStore
+
+WORDS = [f"term{i}" for i in range(5000)]
+
+
+def make_docs(count: int, chunks: int, seed: int = 7) -> list[Document]:
+    rng = random.Random(seed)
+    docs = []
+    for i in range(count):
+        texts = [" ".join(rng.choices(WORDS, k=150)) for _ in range(chunks)]
+        docs.append(
+            Document(
+                doc_id=f"doc{i:06d}",
+                filename=f"file{i}.txt",
+                doc_type="other",
+                content="\n".join(texts),
+                chunks=texts,
+                entities=[{"type": "EMAIL", "value": f"user{i}@example.com"}],
+                file_hash=f"{i:064x}",
+            )
+        )
+    return docs
+
+
+def legacy_store(store: DocumentStore, doc: Document) -> None:
+    """The row-by-row write path DocumentStore used before batching."""
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO documents (doc_id, filename, doc_type, content, file_hash, pages, metadata, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                doc.doc_id,
+                doc.filename,
+                doc.doc_type,
+                doc.content,
+                doc.file_hash,
+                doc.pages,
+                json.dumps(doc.metadata),
+                doc.created_at.isoformat(),
+            ),
+        )
+        for i, chunk in enumerate(doc.chunks):
+            conn.execute(
+                "INSERT INTO chunks (doc_id, chunk_index, content) VALUES (?, ?, ?)",
+                (doc.doc_id, i, chunk),
+            )
+        for entity in doc.entities:
+            conn.execute(
+                "INSERT INTO entities (doc_id, entity_type, value) VALUES (?, ?, ?)",
+                (doc.doc_id, entity["type"], entity["value"]),
+            )
+        conn.commit()
+
+
+def report(label: str, started: float, chunks: int) -> None:
+    elapsed = time.perf_counter() - started
+    print(f"{label:<32} {elapsed:8.3f}s  {chunks / elapsed:12,.0f} chunks/sec")
+
+
+def run(root: Path, docs: list[Document]) -> None:
+    total_chunks = sum(len(d.chunks) for d in docs)
+    print(f"{len(docs)} documents, {total_chunks} chunks")
+
+    store = DocumentStore(root / "legacy.db")
+    started = time.perf_counter()
+    for doc in docs:
+        legacy_store(store, doc)
+    report("legacy (row by row)", started, total_chunks)
+
+    store = DocumentStore(root / "batched.db")
+    started = time.perf_counter()
+    for i in range(0, len(docs), 32):
+        store.store_documents(docs[i : i + 32])
+    report("store_documents (batches of 32)", started, total_chunks)
+
+    store = DocumentStore(root / "bulk.db")
+    started = time.perf_counter()
+    store.store_documents(docs)
+    report("store_documents (one batch)", started, total_chunks)
+
+    started = time.perf_counter()
+    store.optimize_index()
+    print(f"{'optimize_index':<32} {time.perf_counter() - started:8.3f}s")
+
+    started = time.perf_counter()
+    store.store_documents(docs)
+    report("re-ingest unchanged (skipped)", started, total_chunks)
+
+    edited = [replace(d, chunks=[d.chunks[0] + " edited", *d.chunks[1:]], file_hash=d.file_hash[::-1]) for d in docs]
+    started = time.perf_counter()
+    store.store_documents(edited)
+    report("incremental update (1 chunk/doc)", started, total_chunks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000, help="number of documents")
+    parser.add_argument("--chunks", type=int, default=30, help="chunks per document")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mother-bench-") as root:
+        run(Path(root), make_docs(args.docs, args.chunks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark recursive directory listing on a generated tree.
+
+Builds a tree of N files (default 200,000) and times:
+
+* the old listing strategy (``Path.rglob("*")`` plus ``stat``/``is_dir``/
+  ``is_file`` per entry, then a full sort), and
+* ``filesystem_list_directory`` first pages, full pagination and summary mode.
+
+Usage:
+    python benchmarks/bench_list_directory.py [--files 200000] [--keep DIR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from mother.plugins.builtin.filesystem import FilesystemPlugin
+
+
+def build_tree(root: Path, files: int, per_dir: int = 100, fanout: int = 20) -> None:
+    """Create ``files`` small files spread over nested directories."""
+    for i in range(files):
+        d = i // per_dir
+        directory = root / f"d{d // (fanout * fanout)}" / f"d{(d // fanout) % fanout}" / f"d{d % fanout}"
+        if i % per_dir == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file{i}.txt").write_bytes(b"x" * (i % 512))
+    # Something for the pruning to skip
+    hidden = root / ".cache"
+    hidden.mkdir()
+    for i in range(files // 10):
+        (hidden / f"blob{i}").write_bytes(b"")
+
+
+def legacy_listing(root: Path) -> int:
+    """The rglob-based listing this plugin used before scandir."""
+    entries = []
+    for item in root.rglob("*"):
+        if item.name.startswith("."):
+            continue
+        stat_info = item.stat()
+        entries.append(
+            {
+                "name": item.name,
+                "path": str(item),
+                "type": "directory" if item.is_dir() else "file",
+                "size": stat_info.st_size if item.is_file() else None,
+                "modified": datetime.fromtimestamp(stat_info.st_mtime).isoformat(),
+            }
+        )
+    entries.sort(key=lambda x: (x["type"] != "directory", x["name"].lower()))
+    return len(entries)
+
+
+async def run(root: Path) -> None:
+    plugin = FilesystemPlugin()
+
+    def report(label: str, started: float, detail: str) -> None:
+        print(f"{label:<34} {time.perf_counter() - started:8.3f}s  {detail}")
+
+    started = time.perf_counter()
+    count = legacy_listing(root)
+    report("legacy rglob (everything)", started, f"{count} entries")
+
+    started = time.perf_counter()
+    result = await plugin.execute("list_directory", {"path": str(root), "recursive": True})
+    report("scandir first page (1000)", started, f"{result.data['count']} entries")
+
+    started = time.perf_counter()
+    total, pages, cursor = 0, 0, None
+    while True:
+        params = {"path": str(root), "recursive": True, "max_entries": 10_000}
+        if cursor:
+            params["cursor"] = cursor
+        result = await plugin.execute("list_directory", params)
+        total += result.data["count"]
+        pages += 1
+        cursor = result.data.get("next_cursor")
+        if not cursor:
+            break
+    report("scandir all pages (10k each)", started, f"{total} entries in {pages} pages")
+
+    started = time.perf_counter()
+    result = await plugin.execute("list_directory", {"path": str(root), "recursive": True, "summary": True})
+    report("scandir summary", started, f"{result.data['total_files']} files, {result.data['total_size']} bytes")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200_000, help="number of files to generate")
+    parser.add_argument("--keep", type=Path, help="build (or reuse) the tree here instead of a temp dir")
+    args = parser.parse_args()
+
+    root = args.keep or Path(tempfile.mkdtemp(prefix="mother-bench-"))
+    root.mkdir(parents=True, exist_ok=True)
+    try:
+        if not any(root.iterdir()):
+            started = time.perf_counter()
+            build_tree(root, args.files)
+            print(f"built {args.files} files in {time.perf_counter() - started:.1f}s at {root}")
+        asyncio.run(run(root))
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
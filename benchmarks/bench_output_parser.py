@@ -0,0 +1,131 @@
+"""Benchmark the Rich table parser against the old implementation.
+
+Builds a colored Rich-style table of ``--rows`` rows with a border line
+between rows, then times:
+
+* the old ``parse_table`` (separator check and ANSI strip per line),
+* the new ``parse_table`` on the whole output,
+* ``TableParser.feed`` on the output in 64 KiB chunks, as it would arrive
+  from a subprocess pipe.
+
+The table uses light bars throughout; the old parser cannot read Rich's
+default heavy header.
+
+Usage:
+    python benchmarks/bench_output_parser.py [--rows 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+
+from mother.parsers.output import OutputParser, TableParser
+
+ANSI_PATTERN = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+
+def legacy_strip_ansi(text: str) -> str:
+    return ANSI_PATTERN.sub("", text)
+
+
+def legacy_is_separator_line(line: str) -> bool:
+    clean = legacy_strip_ansi(line).strip()
+    horiz_chars = set("─━═┌┐└┘├┤┬┴┼╔╗╚╝╠╣╦╩╬┏┓┗┛┡┩┢┪┯┷╭╮╯╰")
+    non_space = [c for c in clean if not c.isspace()]
+    if not non_space:
+        return False
+    return all(c in horiz_chars for c in non_space)
+
+
+def legacy_parse_table(output: str) -> list[dict[str, str]]:
+    headers: list[str] = []
+    rows = []
+    current: list[str] = []
+    header_found = False
+    sep_char = None
+    for line in output.split("\n"):
+        clean = legacy_strip_ansi(line).strip()
+        if not clean:
+            continue
+        if legacy_is_separator_line(line):
+            if current and header_found:
+                if len(current) == len(headers):
+                    rows.append({h: current[j].strip() for j, h in enumerate(headers)})
+                current = []
+            continue
+        if not sep_char:
+            sep_char = next((s for s in ["┃", "│", "║"] if s in clean), None)
+        if not sep_char:
+            continue
+        if sep_char in clean:
+            cells = [c.strip() for c in clean.split(sep_char)]
+            cells = [c for c in cells if c or cells.index(c) not in [0, len(cells) - 1]]
+            if not header_found:
+                headers = [c for c in cells if c]
+                header_found = True
+            elif not current:
+                current = cells
+            else:
+                for j, cell in enumerate(cells):
+                    if j < len(current) and cell:
+                        current[j] = f"{current[j]} {cell}" if current[j] else cell
+    if current and header_found and len(current) == len(headers):
+        rows.append({h: current[j].strip() for j, h in enumerate(headers)})
+    return rows
+
+
+def make_table(rows: int) -> str:
+    bold, dim, reset = "\x1b[1m", "\x1b[2m", "\x1b[0m"
+    lines = [
+        "Messages",
+        "┌───────┬──────────────────────┬──────────────────────────────┐",
+        f"│ {bold}ID{reset}    │ {bold}From{reset}                 │ {bold}Subject{reset}                      │",
+        "├───────┼──────────────────────┼──────────────────────────────┤",
+    ]
+    separator = f"{dim}├───────┼──────────────────────┼──────────────────────────────┤{reset}"
+    for i in range(rows):
+        if i:
+            lines.append(separator)
+        sender = f"user{i % 97}@example.com"
+        lines.append(f"│ {i:<5} │ {sender:<20} │ \x1b[36mRe: report {i:<17}\x1b[0m │")
+    lines.append("└───────┴──────────────────────┴──────────────────────────────┘")
+    lines.append(f"Found {rows} results")
+    return "\n".join(lines)
+
+
+def timed(fn, *args) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - started) * 1000, result
+
+
+def streamed(output: str, chunk_size: int = 64 * 1024):
+    parser = TableParser()
+    for start in range(0, len(output), chunk_size):
+        parser.feed(output[start : start + chunk_size])
+    return parser.result()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="table rows")
+    args = parser.parse_args()
+
+    output = make_table(args.rows)
+    print(f"{args.rows} rows, {len(output) / 1e6:.1f} MB")
+
+    elapsed, old_rows = timed(legacy_parse_table, output)
+    print(f"  parse_table, old        {elapsed:8.2f} ms")
+    elapsed, result = timed(OutputParser().parse_table, output)
+    print(f"  parse_table, new        {elapsed:8.2f} ms")
+    elapsed, streamed_result = timed(streamed, output)
+    print(f"  TableParser.feed        {elapsed:8.2f} ms")
+
+    assert result.rows == old_rows == streamed_result.rows
+    assert len(result.rows) == args.rows
+
+
+if __name__ == "__main__":
+    main()
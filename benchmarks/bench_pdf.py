@@ -0,0 +1,141 @@
+"""Benchmark the PDF plugin against the old in-loop implementation.
+
+Generates ``--files`` PDFs of ``--pages`` pages with text content, then times:
+
+* ``info`` on every file, cold and repeated (old: full re-parse each call),
+* a merge of all files, with the worst event loop stall while it runs, and
+* rotating every file (old: one after another; new: ``batch``).
+
+Usage:
+    python benchmarks/bench_pdf.py [--files 20] [--pages 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import NameObject, StreamObject
+
+from mother.plugins.builtin.pdf import PDFPlugin
+
+
+def make_pdf(path: Path, pages: int) -> None:
+    writer = PdfWriter()
+    for i in range(pages):
+        page = writer.add_blank_page(width=612, height=792)
+        content = StreamObject()
+        lines = " ".join(f"72 {700 - 12 * n} Td (Line {n} of page {i}) Tj" for n in range(50))
+        content.set_data(f"BT /F1 10 Tf {lines} ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    writer.add_metadata({"/Title": path.stem})
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def legacy_info(path: Path) -> int:
+    reader = PdfReader(str(path))
+    _ = reader.metadata
+    return len(reader.pages)
+
+
+def legacy_merge(paths: list[Path], output: Path) -> None:
+    writer = PdfWriter()
+    for path in paths:
+        for page in PdfReader(str(path)).pages:
+            writer.add_page(page)
+    with open(output, "wb") as f:
+        writer.write(f)
+
+
+def legacy_rotate(path: Path, output: Path) -> None:
+    writer = PdfWriter()
+    for page in PdfReader(str(path)).pages:
+        page.rotate(90)
+        writer.add_page(page)
+    with open(output, "wb") as f:
+        writer.write(f)
+
+
+async def max_stall(coro) -> tuple[float, float]:
+    """Run ``coro`` and return (elapsed seconds, longest event loop stall in ms)."""
+    stalls = [0.0]
+    done = False
+
+    async def ticker():
+        while not done:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append((time.perf_counter() - started - 0.001) * 1000)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - started
+    done = True
+    await tick
+    return elapsed, max(stalls)
+
+
+async def legacy(fn, *args):
+    await asyncio.sleep(0.01)  # let the ticker start
+    fn(*args)
+
+
+async def run(root: Path, files: int, pages: int) -> None:
+    paths = [root / f"doc_{i:03d}.pdf" for i in range(files)]
+    for path in paths:
+        make_pdf(path, pages)
+    print(f"{files} files x {pages} pages, {sum(p.stat().st_size for p in paths) / 1e6:.1f} MB")
+
+    plugin = PDFPlugin()
+    await plugin.execute("count_pages", {"input": str(paths[0])})  # start the worker pool
+
+    started = time.perf_counter()
+    for path in paths:
+        legacy_info(path)
+    print(f"  info, old               {(time.perf_counter() - started) / files * 1000:8.2f} ms/file")
+    started = time.perf_counter()
+    for path in paths:
+        await plugin.execute("info", {"input": str(path)})
+    print(f"  info, cold              {(time.perf_counter() - started) / files * 1000:8.2f} ms/file")
+    started = time.perf_counter()
+    for path in paths:
+        await plugin.execute("info", {"input": str(path)})
+    print(f"  info, cached            {(time.perf_counter() - started) / files * 1000:8.2f} ms/file")
+
+    elapsed, stall = await max_stall(legacy(legacy_merge, paths, root / "old.pdf"))
+    print(f"  merge, old              {elapsed:8.2f} s   loop stall {stall:8.1f} ms")
+    params = {"files": [str(p) for p in paths], "output": str(root / "new.pdf")}
+    elapsed, stall = await max_stall(plugin.execute("merge", params))
+    print(f"  merge, new              {elapsed:8.2f} s   loop stall {stall:8.1f} ms")
+
+    started = time.perf_counter()
+    for path in paths:
+        legacy_rotate(path, root / f"{path.stem}_old.pdf")
+    print(f"  rotate all, old         {time.perf_counter() - started:8.2f} s")
+    out = root / "rotated"
+    params = {"operation": "rotate", "files": [str(p) for p in paths], "output_dir": str(out)}
+    started = time.perf_counter()
+    await plugin.execute("batch", params)
+    print(f"  rotate all, batch       {time.perf_counter() - started:8.2f} s   ({plugin._workers} workers)")
+
+    await plugin.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=20, help="number of PDFs")
+    parser.add_argument("--pages", type=int, default=200, help="pages per PDF")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mother-bench-") as root:
+        asyncio.run(run(Path(root), args.files, args.pages))
+
+
+if __name__ == "__main__":
+    main()
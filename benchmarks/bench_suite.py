@@ -0,0 +1,19 @@
+"""Run the offline benchmark suite from a source checkout.
+
+Same as ``mother bench``: times the agent loop, ``/command`` throughput,
+tool routing (input tokens and time to first response), policy
+evaluation, semantic memory search, session storage, audit writes and
+plugin cold start against a scripted mock LLM and local stub services.
+
+Usage:
+    python benchmarks/bench_suite.py [--quick] [-o results.json] [--compare baseline.json] [scenario ...]
+"""
+
+from __future__ import annotations
+
+import sys
+
+from mother.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main(["bench", *sys.argv[1:]]))
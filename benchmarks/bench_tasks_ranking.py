@@ -0,0 +1,109 @@
+"""Benchmark task ranking and stats at growing task counts.
+
+For each size (default 1,000 / 10,000 / 100,000 active tasks) this times:
+
+* the old ranking (newest 100 active tasks, scored and sorted in Python),
+* ``TaskStore.get_top_tasks`` / ``get_focus_task`` (exact, SQL side), and
+* ``TaskStore.get_stats``,
+
+and checks the top 10 against a brute-force ranking of every task.
+
+Usage:
+    python benchmarks/bench_tasks_ranking.py [--sizes 1000,10000,100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from mother.plugins.builtin.tasks.storage import Task, TaskPriority, TaskStatus, TaskStore
+
+
+def populate(store: TaskStore, count: int, seed: int = 5) -> None:
+    rng = random.Random(seed)
+    now = datetime.now()
+    statuses = [TaskStatus.INBOX, TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED]
+    rows = []
+    for i in range(count):
+        due = None if rng.random() < 0.3 else now + timedelta(hours=rng.randint(-24 * 60, 24 * 120))
+        created = now - timedelta(minutes=count - i)
+        rows.append(
+            (
+                f"t{i:07d}",
+                f"Task {i}",
+                rng.choice(statuses).value,
+                rng.choice(list(TaskPriority)).value,
+                rng.choice(["work", "home", "health", ""]),
+                "",
+                due.isoformat() if due else None,
+                "",
+                json.dumps([]),
+                created.isoformat(),
+                created.isoformat(),
+                None,
+            )
+        )
+    with sqlite3.connect(store.db_path) as conn:
+        conn.executemany("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.commit()
+
+
+def legacy_top(store: TaskStore, limit: int) -> list[Task]:
+    """The ranking get_top_tasks used before it moved into SQL."""
+    tasks = store.list_tasks(include_completed=False, limit=100)
+    tasks.sort(key=lambda t: t.total_score, reverse=True)
+    return tasks[:limit]
+
+
+def brute_force_top(store: TaskStore, limit: int) -> list[Task]:
+    tasks = store.list_tasks(include_completed=False, limit=10**9)
+    tasks.sort(key=lambda t: -t.created_at.timestamp())
+    tasks.sort(key=lambda t: t.due_date or datetime.max)
+    tasks.sort(key=lambda t: t.total_score, reverse=True)
+    return tasks[:limit]
+
+
+def timed(fn, repeat: int = 20) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated task counts")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'legacy top':>12} {'top 10':>9} {'focus':>9} {'stats':>9}  exact  legacy exact")
+    with tempfile.TemporaryDirectory(prefix="mother-bench-") as root:
+        for size in (int(s) for s in args.sizes.split(",")):
+            store = TaskStore(Path(root) / f"tasks{size}.db")
+            populate(store, size)
+
+            expected = [t.task_id for t in brute_force_top(store, 10)]
+            exact = [t.task_id for t in store.get_top_tasks(10)] == expected
+            legacy_exact = [t.total_score for t in legacy_top(store, 10)] == [
+                t.total_score for t in brute_force_top(store, 10)
+            ]
+
+            print(
+                f"{size:>8} "
+                f"{timed(lambda: legacy_top(store, 10)):>9.2f} ms "
+                f"{timed(lambda: store.get_top_tasks(10)):>6.2f} ms "
+                f"{timed(store.get_focus_task):>6.2f} ms "
+                f"{timed(store.get_stats, repeat=5):>6.2f} ms  "
+                f"{str(exact):<6} {legacy_exact}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,10 @@ Provides the Mother AI agent with:
 from .cognitive import CognitiveEngine, Confidence, ThinkingMode
 from .core import MotherAgent
 from .errors import AgentError, ErrorCategory, ErrorHandler
+from .results import ResultStore
+from .router import ToolRouter
 from .session import Session, SessionStore
+from .usage import TokenUsage, UsageStore
 
 __all__ = [
     "MotherAgent",
@@ -20,6 +23,10 @@ __all__ = [
     "CognitiveEngine",
     "Confidence",
     "ThinkingMode",
+    "ResultStore",
+    "ToolRouter",
     "Session",
     "SessionStore",
+    "TokenUsage",
+    "UsageStore",
 ]
@@ -11,12 +11,13 @@ Features:
 import json
 import logging
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
 
+from .. import metrics, tracing
 from ..llm import LLMProvider
 from ..llm import ToolCall as LLMToolCall
 from ..llm.factory import get_provider_for_settings
@@ -25,8 +26,19 @@ from ..memory import MemoryManager
 from ..tools.base import ToolResult
 from ..tools.registry import ToolRegistry
 from .cognitive import CognitiveEngine
-from .errors import AgentError, ErrorHandler
+from .errors import AgentError, ErrorCategory, ErrorHandler
+from .results import (
+    DEFAULT_MAX_RESULT_CHARS,
+    DEFAULT_PAGE_LIMIT,
+    RESULTS_PAGE_NAME,
+    RESULTS_PAGE_SCHEMA,
+    ResultStore,
+    read_page,
+    shape_result,
+)
+from .router import EXPAND_TOOLS_NAME, EXPAND_TOOLS_SCHEMA, ToolRouter
 from .session import Session, SessionStore
+from .usage import ANONYMOUS_KEY, TokenUsage, UsageStore, usage_tokens
 
 # Import plugin types for type checking
 try:
@@ -40,6 +52,10 @@ except ImportError:
 
 logger = logging.getLogger("mother.agent")
 
+# Serialized sizes of the meta-tools, for the input token estimate
+_EXPAND_TOOLS_CHARS = len(json.dumps(EXPAND_TOOLS_SCHEMA, separators=(",", ":")))
+_RESULTS_PAGE_CHARS = len(json.dumps(RESULTS_PAGE_SCHEMA, separators=(",", ":")))
+
 
 # Optional per-tool action describers used to render confirmation prompts.
 # Core ships none: plugins that want a friendlier description than the generic
@@ -148,6 +164,10 @@ class AgentState:
     tool_call_count: int = 0
     last_reflection: str | None = None
     cognitive_summary: str | None = None
+    # Tools attached for the current turn when routing is enabled (None = all)
+    active_tools: list[str] | None = None
+    # Large tool results, previewed in the history and paged via results_page
+    results: ResultStore = field(default_factory=ResultStore)
 
 
 @dataclass
@@ -160,6 +180,10 @@ class AgentResponse:
     pending_confirmation: PendingConfirmation | None = None
     pending_plan: ExecutionPlan | None = None
     errors: list[AgentError] = field(default_factory=list)
+    # Latency breakdown when the request was traced (see mother.tracing)
+    timings: dict[str, Any] | None = None
+    # Tokens used by this request (see TokenUsage.to_dict)
+    usage: dict[str, int] | None = None
 
 
 class MotherAgent:
@@ -245,6 +269,11 @@ Respond ONLY with the JSON plan, no other text."""
         enable_session_persistence: bool = True,
         provider: LLMProvider | None = None,
         settings: Any | None = None,
+        tool_router: ToolRouter | None = None,
+        max_result_chars: int = DEFAULT_MAX_RESULT_CHARS,
+        usage_store: UsageStore | None = None,
+        max_request_input_tokens: int = 0,
+        daily_key_token_budget: int = 0,
     ):
         """Initialize the Mother agent.
 
@@ -259,6 +288,17 @@ Respond ONLY with the JSON plan, no other text."""
             enable_session_persistence: Enable session persistence to database
             provider: Pre-configured LLM provider instance
             settings: Application settings for provider configuration
+            tool_router: Optional router that attaches only the relevant
+                subset of tools per turn (all tools are sent when None)
+            max_result_chars: Tool results larger than this are stored and
+                sent to the model as a preview it can page through
+            usage_store: Optional store that accounts token usage per day,
+                API key and session
+            max_request_input_tokens: Stop a request before an LLM call
+                would take its input tokens over this (0 for no limit)
+            daily_key_token_budget: Refuse LLM calls for an API key once
+                it has used this many tokens today; needs usage_store (0
+                for no limit)
         """
         # Initialize LLM provider
         if provider:
@@ -275,9 +315,16 @@ Respond ONLY with the JSON plan, no other text."""
             )
 
         self.tool_registry = tool_registry
+        self.tool_router = tool_router
         self.max_iterations = max_iterations
+        self.max_result_chars = max_result_chars
+        self.usage_store = usage_store
+        self.max_request_input_tokens = max_request_input_tokens
+        self.daily_key_token_budget = daily_key_token_budget
         self.error_handler = ErrorHandler()
         self.state = AgentState()
+        # (history list, messages measured, their JSON length) for _check_budget
+        self._history_size: tuple[list[dict], int, int] | None = None
 
         # Initialize persistent memory
         self.memory: MemoryManager | None = None
@@ -303,20 +350,124 @@ Respond ONLY with the JSON plan, no other text."""
             except Exception as e:
                 logger.warning(f"Failed to initialize session store: {e}")
 
-    def get_tools(self) -> list[dict]:
-        """Generate tool definitions for Claude."""
-        return self.tool_registry.get_all_anthropic_schemas()
+    def get_tools(self) -> Sequence[Mapping[str, Any]]:
+        """Generate tool definitions for Claude.
 
-    def _generate_tool_descriptions(self) -> str:
+        With a tool router, only the tools routed for the current turn are
+        returned, followed by the expand_tools meta-tool. Otherwise this is
+        the registry's shared, cached schema tuple. The results_page
+        meta-tool is appended once the session has stored a large result.
+        """
+        if self.tool_router is not None and self.state.active_tools is not None:
+            tools = self.tool_router.schemas(self.state.active_tools)
+        else:
+            tools = self.tool_registry.get_all_anthropic_schemas()
+        if len(self.state.results):
+            return [*tools, RESULTS_PAGE_SCHEMA]
+        return tools
+
+    def _recent_tool_names(self) -> list[str]:
+        """Tool names called in this session, most recent first."""
+        names: dict[str, None] = {}
+        for message in reversed(self.state.messages):
+            if message.get("role") != "assistant" or not isinstance(message.get("content"), list):
+                continue
+            for block in message["content"]:
+                if isinstance(block, dict) and block.get("type") == "tool_use" and block.get("name"):
+                    names.setdefault(block["name"], None)
+        names.pop(EXPAND_TOOLS_NAME, None)
+        names.pop(RESULTS_PAGE_NAME, None)
+        return list(names)
+
+    def _route_tools(self, user_input: str) -> None:
+        """Select the tools attached for this turn."""
+        if self.tool_router is None:
+            return
+        try:
+            self.state.active_tools = self.tool_router.select(
+                user_input,
+                thinking_mode=self.cognitive.state.thinking_mode if self.cognitive else None,
+                recent_tools=self._recent_tool_names(),
+            )
+        except Exception as e:
+            logger.warning(f"Tool routing failed, sending all tools: {e}")
+            self.state.active_tools = None
+
+    def _expand_tools(self, tool_call: LLMToolCall) -> dict[str, Any]:
+        """Handle an expand_tools call by attaching more tools."""
+        query = str(tool_call.arguments.get("query", ""))
+        added: list[str] = []
+        if self.tool_router is not None and self.state.active_tools is not None:
+            added = self.tool_router.expand(query, self.state.active_tools)
+            self.state.active_tools.extend(added)
+
+        if added:
+            content = "Attached tools: " + ", ".join(added)
+        else:
+            content = f"No additional tools matched '{query}'. Use one of the attached tools."
+        return {
+            "type": "tool_result",
+            "tool_use_id": tool_call.id,
+            "content": content,
+        }
+
+    def _shape_result(self, value: Any) -> str:
+        """Tool result content for the model; large results become a preview."""
+        return shape_result(value, self.state.results, self.max_result_chars)
+
+    def _results_page(self, tool_call: LLMToolCall) -> dict[str, Any]:
+        """Handle a results_page call by reading part of a stored result."""
+        args = tool_call.arguments
+        try:
+            content = read_page(
+                self.state.results,
+                str(args.get("handle", "")),
+                path=str(args.get("path") or ""),
+                offset=int(args.get("offset") or 0),
+                limit=int(args.get("limit") or DEFAULT_PAGE_LIMIT),
+                max_chars=self.max_result_chars,
+            )
+        except (KeyError, ValueError, TypeError) as e:
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_call.id,
+                "content": e.args[0] if e.args else str(e),
+                "is_error": True,
+            }
+        return {
+            "type": "tool_result",
+            "tool_use_id": tool_call.id,
+            "content": content,
+        }
+
+    def _routed_commands(self, routed: list[str]) -> dict[str, list[str]]:
+        """Group routed capability names by plugin: {plugin: [commands]}."""
+        commands: dict[str, list[str]] = {}
+        for full_name in routed:
+            plugin, command = self.tool_registry.parse_tool_name(full_name)
+            if plugin and command:
+                commands.setdefault(plugin, []).append(command)
+        return commands
+
+    def _generate_tool_descriptions(self, routed: list[str] | None = None) -> str:
         """Generate dynamic tool descriptions from registry and plugins.
 
+        Args:
+            routed: Capabilities attached for this turn; when given, only
+                their plugins and commands are described
+
         Returns:
-            Formatted string with all available tools and their capabilities
+            Formatted string with the available tools and their capabilities
         """
         lines = ["Available tools:"]
 
         # Get all tools from registry (includes both legacy and plugins)
         all_tools = self.tool_registry.list_tools()
+        if routed is not None:
+            commands = self._routed_commands(routed)
+            all_tools = {
+                name: {**info, "commands": commands[name]} for name, info in all_tools.items() if name in commands
+            }
 
         # Group by source for better organization
         legacy_tools = {}
@@ -363,11 +514,22 @@ Respond ONLY with the JSON plan, no other text."""
     def get_system_prompt(self) -> str:
         """Get the system prompt with dynamic tool descriptions.
 
+        With a tool router, only the capabilities attached for the turn are
+        described; other plugins are named so the model knows to expand.
+
         Returns:
             Complete system prompt with current tools/plugins
         """
-        tool_descriptions = self._generate_tool_descriptions()
-        return self.SYSTEM_PROMPT_BASE.format(tool_descriptions=tool_descriptions)
+        routed = self.state.active_tools if self.tool_router is not None else None
+        tool_descriptions = self._generate_tool_descriptions(routed)
+        prompt = self.SYSTEM_PROMPT_BASE.format(tool_descriptions=tool_descriptions)
+        if routed is not None:
+            others = sorted(set(self.tool_registry.list_tools()) - set(self._routed_commands(routed)))
+            prompt += "\n\nOnly the tools most relevant to this request are attached and described above."
+            if others:
+                prompt += f" Other plugins: {', '.join(others)}."
+            prompt += f" If you need a capability that is not attached, call {EXPAND_TOOLS_NAME} first."
+        return prompt
 
     def get_planning_prompt(self) -> str:
         """Get the planning prompt with dynamic tool descriptions.
@@ -378,11 +540,137 @@ Respond ONLY with the JSON plan, no other text."""
         tool_descriptions = self._generate_tool_descriptions()
         return self.PLANNING_PROMPT_BASE.format(tool_descriptions=tool_descriptions)
 
+    async def _create_message(self, usage: TokenUsage, key_id: str | None = None, **kwargs: Any) -> Any:
+        """Call the LLM provider, recording latency, errors and token usage.
+
+        The response's tokens are added to ``usage`` and, with a usage
+        store, to the rollup of ``key_id`` and the current session.
+        """
+        labels = {
+            "provider": getattr(self.provider.provider_type, "value", "unknown"),
+            "model": getattr(self.provider, "model", "unknown"),
+        }
+        try:
+            with metrics.LLM_REQUEST_DURATION.time(**labels):
+                response = await self.provider.create_message(**kwargs)
+        except Exception:
+            metrics.LLM_ERRORS.inc(**labels)
+            raise
+
+        input_tokens, output_tokens = usage_tokens(response.usage)
+        if input_tokens:
+            metrics.LLM_TOKENS.inc(input_tokens, type="input", **labels)
+        if output_tokens:
+            metrics.LLM_TOKENS.inc(output_tokens, type="output", **labels)
+
+        key = key_id or ANONYMOUS_KEY
+        if input_tokens:
+            metrics.KEY_TOKENS.inc(input_tokens, key_id=key, type="input")
+        if output_tokens:
+            metrics.KEY_TOKENS.inc(output_tokens, key_id=key, type="output")
+
+        usage.add(input_tokens, output_tokens)
+        if self.usage_store:
+            try:
+                self.usage_store.add(key, self.state.session_id, input_tokens, output_tokens)
+            except Exception as e:
+                logger.warning(f"Failed to record token usage: {e}")
+        return response
+
+    def _tool_schema_chars(self) -> int:
+        """JSON length of the tools :meth:`get_tools` attaches this turn.
+
+        Read from the registry's pre-serialized schemas, so nothing is
+        re-encoded per iteration.
+        """
+        if self.tool_router is not None and self.state.active_tools is not None:
+            chars = len(self.tool_registry.get_schemas_json(self.state.active_tools)) + _EXPAND_TOOLS_CHARS
+        else:
+            chars = len(self.tool_registry.get_all_anthropic_schemas_json())
+        if len(self.state.results):
+            chars += _RESULTS_PAGE_CHARS
+        return chars
+
+    def _history_chars(self, messages: list[dict[str, Any]]) -> int:
+        """JSON length of the message history, kept as a running count.
+
+        The history only grows during a request, so just the messages added
+        since the last call are serialized. A different or shorter list
+        (a restored session) is measured from scratch.
+        """
+        measured, count, chars = self._history_size or (None, 0, 0)
+        if measured is not messages or len(messages) < count:
+            count, chars = 0, 0
+        for message in messages[count:]:
+            chars += len(json.dumps(message, default=str))
+        self._history_size = (messages, len(messages), chars)
+        return chars
+
+    def _check_budget(
+        self,
+        usage: TokenUsage,
+        key_id: str | None,
+        messages: list[dict[str, Any]],
+        system_prompt: str,
+        tool_chars: int,
+    ) -> AgentError | None:
+        """Check the token budgets before an LLM call.
+
+        The call's input tokens are estimated at four characters per token,
+        so a request is stopped before a call that would exceed
+        ``max_request_input_tokens`` is paid for.
+
+        Args:
+            usage: Token usage of the request so far
+            key_id: ID of the API key making the request
+            messages: Messages the call will send
+            system_prompt: System prompt the call will send
+            tool_chars: JSON length of the attached tool schemas
+
+        Returns:
+            An error describing the exceeded budget, or None
+        """
+        if self.max_request_input_tokens:
+            chars = len(system_prompt) + self._history_chars(messages) + tool_chars
+            estimate = usage.input_tokens + chars // 4
+            if estimate > self.max_request_input_tokens:
+                metrics.TOKEN_BUDGET_EXCEEDED.inc(budget="request_input")
+                return AgentError(
+                    category=ErrorCategory.BUDGET_EXCEEDED,
+                    message=(
+                        f"The next step would take this request to about {estimate:,} input tokens, "
+                        f"over its budget of {self.max_request_input_tokens:,}"
+                    ),
+                    recoverable=False,
+                    suggestion="Try a narrower request or start a new session",
+                )
+
+        if self.daily_key_token_budget and self.usage_store:
+            try:
+                used = self.usage_store.key_usage(key_id).total_tokens
+            except Exception as e:
+                logger.warning(f"Failed to read token usage: {e}")
+                return None
+            if used >= self.daily_key_token_budget:
+                metrics.TOKEN_BUDGET_EXCEEDED.inc(budget="key_daily")
+                return AgentError(
+                    category=ErrorCategory.BUDGET_EXCEEDED,
+                    message=(
+                        f"API key '{key_id or ANONYMOUS_KEY}' has used {used:,} tokens today, "
+                        f"its daily budget is {self.daily_key_token_budget:,}"
+                    ),
+                    recoverable=False,
+                    suggestion="Wait until the budget resets at midnight UTC",
+                )
+        return None
+
     async def process_command(
         self,
         user_input: str,
         session_id: str | None = None,
         pre_confirmed: bool = False,
+        trace: bool = False,
+        key_id: str | None = None,
     ) -> AgentResponse:
         """
         Process a natural language command through the agent loop.
@@ -397,10 +685,31 @@ Respond ONLY with the JSON plan, no other text."""
             user_input: The user's natural language command
             session_id: Optional session ID for context continuity
             pre_confirmed: If True, skip confirmation for destructive actions
+            trace: Trace this request even if it is not sampled (only
+                while tracing is enabled)
+            key_id: ID of the API key making the request, for token
+                accounting and the daily budget
 
         Returns:
-            AgentResponse with the result
+            AgentResponse with the result and its token ``usage``;
+            ``timings`` is set when the request was traced
         """
+        usage = TokenUsage()
+        with tracing.start_trace("agent.process_command", force=trace) as current:
+            response = await self._process_command(user_input, session_id, pre_confirmed, usage, key_id)
+        if current is not None:
+            response.timings = current.timings()
+        response.usage = usage.to_dict()
+        return response
+
+    async def _process_command(
+        self,
+        user_input: str,
+        session_id: str | None,
+        pre_confirmed: bool,
+        usage: TokenUsage,
+        key_id: str | None,
+    ) -> AgentResponse:
         # Initialize or restore session
         if session_id and session_id == self.state.session_id:
             # Continue existing session
@@ -462,6 +771,7 @@ Respond ONLY with the JSON plan, no other text."""
             context_parts.append(f"\n---\n## Cognitive Context\n{self.cognitive.get_cognitive_summary()}")
 
         user_content = "".join(context_parts)
+        self._route_tools(user_input)
         self.state.messages.append({"role": "user", "content": user_content})
 
         tool_calls_made = []
@@ -471,13 +781,30 @@ Respond ONLY with the JSON plan, no other text."""
         while iteration < self.max_iterations:
             iteration += 1
 
+            system_prompt = self.get_system_prompt()
+            tools = self.get_tools()
+            budget_error = self._check_budget(
+                usage, key_id, self.state.messages, system_prompt, self._tool_schema_chars()
+            )
+            if budget_error:
+                self._save_session()
+                return AgentResponse(
+                    text=f"I stopped because the token budget was reached: {budget_error.message}.",
+                    success=False,
+                    tool_calls=tool_calls_made,
+                    errors=[*errors, budget_error],
+                )
+
             # Call LLM provider
             try:
-                response = await self.provider.create_message(
-                    messages=self.state.messages,
-                    system_prompt=self.get_system_prompt(),
-                    tools=self.get_tools(),
-                )
+                with tracing.span("llm.create_message", iteration=iteration):
+                    response = await self._create_message(
+                        usage,
+                        key_id,
+                        messages=self.state.messages,
+                        system_prompt=system_prompt,
+                        tools=tools,
+                    )
             except Exception as e:
                 return AgentResponse(
                     text=f"API error: {e}",
@@ -542,12 +869,29 @@ Respond ONLY with the JSON plan, no other text."""
             # Execute tools
             tool_results = []
             for tool_call in tool_uses:
+                if tool_call.name == EXPAND_TOOLS_NAME:
+                    tool_results.append(self._expand_tools(tool_call))
+                    continue
+                if tool_call.name == RESULTS_PAGE_NAME:
+                    tool_results.append(self._results_page(tool_call))
+                    continue
+
+                # A known capability the router did not attach stays attached
+                # for the rest of the turn
+                if (
+                    self.state.active_tools is not None
+                    and tool_call.name not in self.state.active_tools
+                    and self.tool_registry.is_plugin_capability(tool_call.name)
+                ):
+                    self.state.active_tools.append(tool_call.name)
+
                 # Check if this is a plugin capability first
                 is_plugin = self.tool_registry.is_plugin_capability(tool_call.name)
 
                 if is_plugin:
                     # Plugin execution path
-                    tool_result = await self._execute_plugin_tool_unified(tool_call, tool_calls_made, pre_confirmed)
+                    with tracing.span("agent.tool", tool=tool_call.name):
+                        tool_result = await self._execute_plugin_tool_unified(tool_call, tool_calls_made, pre_confirmed)
                     if tool_result is None:
                         # Pending confirmation
                         return AgentResponse(
@@ -616,7 +960,8 @@ Respond ONLY with the JSON plan, no other text."""
                         )
 
                 # Execute tool
-                result = wrapper.execute(command, tool_call.arguments)
+                with tracing.span("agent.tool", tool=tool_call.name):
+                    result = wrapper.execute(command, tool_call.arguments)
 
                 tool_call_info = {
                     "tool": f"{wrapper_name}_{command}",
@@ -645,9 +990,9 @@ Respond ONLY with the JSON plan, no other text."""
                 # Format result for Claude
                 if result.success:
                     if result.parsed_data:
-                        result_content = json.dumps(result.parsed_data, indent=2, default=str)
+                        result_content = self._shape_result(result.parsed_data)
                     else:
-                        result_content = result.stdout
+                        result_content = self._shape_result(result.stdout)
                 else:
                     error = self.error_handler.classify_error(
                         result.error_message or result.stderr,
@@ -911,9 +1256,9 @@ Respond ONLY with the JSON plan, no other text."""
             # Format result for Claude
             if result.success:
                 if result.data:
-                    result_content = json.dumps(result.data, indent=2, default=str)
+                    result_content = self._shape_result(result.data)
                 elif result.raw_output:
-                    result_content = result.raw_output
+                    result_content = self._shape_result(result.raw_output)
                 else:
                     result_content = "Success (no output)"
             else:
@@ -1040,6 +1385,12 @@ Respond ONLY with the JSON plan, no other text."""
             return self.memory.recall(query, limit=limit)
         return []
 
+    def get_token_usage(self) -> dict[str, Any] | None:
+        """Get today's token usage, in total and per API key ID."""
+        if self.usage_store:
+            return self.usage_store.get_stats()
+        return None
+
     def get_session_stats(self) -> dict[str, Any] | None:
         """Get session store statistics."""
         if self.session_store:
@@ -1099,6 +1450,7 @@ Respond ONLY with the JSON plan, no other text."""
         self,
         user_input: str,
         session_id: str | None = None,
+        key_id: str | None = None,
     ) -> AgentResponse:
         """
         Create an execution plan for a multi-step task without executing it.
@@ -1106,6 +1458,8 @@ Respond ONLY with the JSON plan, no other text."""
         Args:
             user_input: The user's natural language command
             session_id: Optional session ID for context continuity
+            key_id: ID of the API key making the request, for token
+                accounting
 
         Returns:
             AgentResponse with the plan for approval
@@ -1116,11 +1470,24 @@ Respond ONLY with the JSON plan, no other text."""
         else:
             self.state = AgentState(session_id=session_id or str(uuid.uuid4()))
 
+        usage = TokenUsage()
+        messages = [{"role": "user", "content": user_input}]
+        system_prompt = self.get_planning_prompt()
+        budget_error = self._check_budget(usage, key_id, messages, system_prompt, 0)
+        if budget_error:
+            return AgentResponse(
+                text=f"I stopped because the token budget was reached: {budget_error.message}.",
+                success=False,
+                errors=[budget_error],
+            )
+
         # Call LLM provider with planning prompt
         try:
-            response = await self.provider.create_message(
-                messages=[{"role": "user", "content": user_input}],
-                system_prompt=self.get_planning_prompt(),
+            response = await self._create_message(
+                usage,
+                key_id,
+                messages=messages,
+                system_prompt=system_prompt,
                 tools=None,  # No tools in planning mode
             )
         except Exception as e:
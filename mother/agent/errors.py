@@ -18,6 +18,7 @@ class ErrorCategory(Enum):
     PARSE_ERROR = "parse_error"
     VALIDATION = "validation"
     RATE_LIMIT = "rate_limit"
+    BUDGET_EXCEEDED = "budget_exceeded"
     MISSING_PARAMETER = "missing_parameter"
     INTERNAL = "internal"
 
@@ -0,0 +1,271 @@
+"""Shaping of large tool results before they enter the message history.
+
+A tool result goes into the conversation verbatim and is re-sent with every
+following LLM call of the turn, so a 500-entry directory listing or a whole
+file costs its full size on every iteration. Results whose serialized form
+exceeds a character budget are kept in a per-session :class:`ResultStore`
+instead, and the model receives a compact preview:
+
+- the same structure with lists cut to their first few items and long
+  strings cut to a short head,
+- for everything that was cut, its size and (for lists of objects) the
+  item fields,
+- a handle the model can pass to the ``results_page`` meta-tool to read any
+  list or string of the stored result a page at a time.
+
+Stored results live only in memory; after a session is restored from disk
+old handles are unknown and the tool has to be run again.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from typing import Any
+
+RESULTS_PAGE_NAME = "results_page"
+
+RESULTS_PAGE_SCHEMA: dict[str, Any] = {
+    "name": RESULTS_PAGE_NAME,
+    "description": (
+        "Read part of a large tool result that was replaced by a preview. Pass the "
+        "result_handle from the preview and the path of a truncated list or text "
+        "(as listed under 'truncated'). Lists are paged by item, text by line; lines "
+        "longer than a page are split into page-sized pieces that count as lines."
+    ),
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "handle": {"type": "string", "description": "result_handle from the preview"},
+            "path": {
+                "type": "string",
+                "description": "Dotted path of the list or text to read, e.g. 'entries' or 'messages.3.body'; "
+                "empty for the result itself",
+            },
+            "offset": {"type": "integer", "description": "First item or line to return (default 0)"},
+            "limit": {"type": "integer", "description": "Maximum items or lines to return (default 50)"},
+        },
+        "required": ["handle"],
+    },
+}
+
+# Results serialized to more characters than this are stored and previewed
+DEFAULT_MAX_RESULT_CHARS = 20_000
+
+# Stored results kept per session; the oldest are dropped first
+DEFAULT_MAX_STORED_RESULTS = 32
+
+PREVIEW_ITEMS = 5
+PREVIEW_KEYS = 50
+PREVIEW_TEXT_CHARS = 1_000
+# Strings inside previewed list items are cut harder
+PREVIEW_ITEM_TEXT_CHARS = 200
+PREVIEW_DEPTH = 4
+
+DEFAULT_PAGE_LIMIT = 50
+
+
+def serialize(value: Any) -> str:
+    """Serialize a tool result the way it is sent to the model."""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, indent=2, default=str)
+
+
+class ResultStore:
+    """Large tool results of one session, addressable by handle."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_STORED_RESULTS):
+        self.max_entries = max_entries
+        self._results: OrderedDict[str, Any] = OrderedDict()
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def put(self, value: Any) -> str:
+        """Store a result and return its handle."""
+        self._counter += 1
+        handle = f"r{self._counter}"
+        self._results[handle] = value
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+        return handle
+
+    def get(self, handle: str) -> Any:
+        """Return a stored result.
+
+        Raises:
+            KeyError: If the handle is unknown or was evicted
+        """
+        return self._results[handle]
+
+
+def _join(path: str, key: Any) -> str:
+    return f"{path}.{key}" if path else str(key)
+
+
+def _item_fields(items: list[Any]) -> list[str] | None:
+    fields: dict[str, None] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            return None
+        fields.update(dict.fromkeys(map(str, item)))
+    return list(fields)
+
+
+def _preview(value: Any, path: str, truncated: dict[str, Any] | None, depth: int) -> Any:
+    """Cut ``value`` down, recording what was cut under ``truncated``.
+
+    ``truncated`` is None inside list items: those are not listed
+    individually but can still be paged by index.
+    """
+    text_chars = PREVIEW_TEXT_CHARS if truncated is not None else PREVIEW_ITEM_TEXT_CHARS
+    if isinstance(value, str):
+        if len(value) <= text_chars:
+            return value
+        if truncated is not None:
+            truncated[path or "."] = {"chars": len(value), "lines": value.count("\n") + 1}
+        return value[:text_chars] + "…"
+    if depth >= PREVIEW_DEPTH and isinstance(value, dict | list):
+        if truncated is not None:
+            truncated[path or "."] = {"items": len(value)}
+        return f"<{type(value).__name__} of {len(value)}>"
+    if isinstance(value, dict):
+        if len(value) > PREVIEW_KEYS and truncated is not None:
+            truncated[path or "."] = {"keys": len(value), "shown": PREVIEW_KEYS}
+        return {
+            key: _preview(item, _join(path, key), truncated, depth + 1)
+            for key, item in list(value.items())[:PREVIEW_KEYS]
+        }
+    if isinstance(value, list | tuple):
+        items = list(value)
+        if len(items) > PREVIEW_ITEMS and truncated is not None:
+            info: dict[str, Any] = {"items": len(items), "shown": PREVIEW_ITEMS}
+            fields = _item_fields(items)
+            if fields:
+                info["fields"] = fields
+            truncated[path or "."] = info
+        return [_preview(item, _join(path, i), None, depth + 1) for i, item in enumerate(items[:PREVIEW_ITEMS])]
+    return value
+
+
+def shape_result(value: Any, store: ResultStore, max_chars: int = DEFAULT_MAX_RESULT_CHARS) -> str:
+    """Return the tool_result content for ``value``.
+
+    Results within ``max_chars`` are serialized as they are. Larger ones
+    are stored and replaced by a preview with a handle for ``results_page``.
+    """
+    content = serialize(value)
+    if len(content) <= max_chars:
+        return content
+
+    handle = store.put(value)
+    truncated: dict[str, Any] = {}
+    preview = _preview(value, "", truncated, 0)
+    return serialize(
+        {
+            "result_handle": handle,
+            "size_chars": len(content),
+            "truncated": truncated,
+            "preview": preview,
+            "note": f"Large result shortened. Call {RESULTS_PAGE_NAME} with this handle and a path "
+            "from 'truncated' to read more.",
+        }
+    )
+
+
+def _resolve(value: Any, path: str) -> Any:
+    for key in path.split(".") if path and path != "." else ():
+        if isinstance(value, dict):
+            if key not in value:
+                raise KeyError(f"No key '{key}' in path '{path}'")
+            value = value[key]
+        elif isinstance(value, list | tuple):
+            try:
+                value = value[int(key)]
+            except (ValueError, IndexError):
+                raise KeyError(f"No item '{key}' in path '{path}'") from None
+        else:
+            raise KeyError(f"Path '{path}' goes past a {type(value).__name__}")
+    return value
+
+
+def _text_units(text: str, max_chars: int) -> list[str]:
+    """Lines of ``text``, with lines over ``max_chars`` split into pieces."""
+    units: list[str] = []
+    for line in text.splitlines(keepends=True):
+        if len(line) <= max_chars:
+            units.append(line)
+        else:
+            units.extend(line[i : i + max_chars] for i in range(0, len(line), max_chars))
+    return units
+
+
+def read_page(
+    store: ResultStore,
+    handle: str,
+    path: str = "",
+    offset: int = 0,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    max_chars: int = DEFAULT_MAX_RESULT_CHARS,
+) -> str:
+    """Return one page of a stored result as tool_result content.
+
+    A page holds at most ``limit`` items (or lines) and stops early at
+    ``max_chars``, always returning at least one. Text lines longer than
+    ``max_chars`` are split into ``max_chars`` pieces, each counted as a
+    line, so every character can be reached. ``next_offset`` is where the
+    following page starts, or None at the end.
+
+    Raises:
+        KeyError: If the handle or path does not exist
+        ValueError: If the path names something that cannot be paged
+    """
+    try:
+        stored = store.get(handle)
+    except KeyError:
+        raise KeyError(f"Unknown result handle '{handle}'; run the tool again") from None
+    value = _resolve(stored, path)
+
+    if isinstance(value, str):
+        units: list[Any] = _text_units(value, max(max_chars, 1))
+        kind = "lines"
+    elif isinstance(value, list | tuple):
+        units = list(value)
+        kind = "items"
+    elif isinstance(value, dict):
+        units = [{key: item} for key, item in value.items()]
+        kind = "items"
+    else:
+        raise ValueError(f"'{path or '.'}' is a {type(value).__name__}, not a list or text")
+
+    offset = max(offset, 0)
+    limit = max(limit, 1)
+    page: list[Any] = []
+    used = 0
+    for unit in units[offset : offset + limit]:
+        size = len(unit) if kind == "lines" else len(serialize(unit))
+        if page and used + size > max_chars:
+            break
+        page.append(unit)
+        used += size
+
+    end = offset + len(page)
+    result: dict[str, Any] = {
+        "handle": handle,
+        "path": path,
+        "offset": offset,
+        "total": len(units),
+        "next_offset": end if end < len(units) else None,
+    }
+    if kind == "lines":
+        result["text"] = "".join(page)
+    elif len(page) == 1 and used > max_chars:
+        # One item larger than a page: preview it and point at its own path
+        item_path = _join(path, next(iter(page[0])) if isinstance(value, dict) else offset)
+        result["items"] = [_preview(page[0], item_path, None, 1)]
+        result["note"] = f"Item {offset} is too large for one page; page into it with path '{item_path}'."
+    else:
+        result["items"] = page
+    return serialize(result)
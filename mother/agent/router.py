@@ -0,0 +1,139 @@
+"""Per-turn tool subset selection.
+
+Sending every registered capability schema on every LLM call costs thousands
+of input tokens once a handful of plugins are loaded. The ToolRouter picks
+the capabilities relevant to the current user turn and the agent only
+attaches those, plus a small ``expand_tools`` meta-tool the model can call
+when something it needs is missing.
+
+Selection combines:
+- the registry's capability search index (names and descriptions),
+- tools used recently in the session (follow-up turns usually reuse them),
+- the cognitive ThinkingMode (deliberate tasks get a wider subset).
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any
+
+from .cognitive import ThinkingMode
+
+if TYPE_CHECKING:
+    from ..tools.registry import ToolRegistry
+
+logger = logging.getLogger("mother.agent.router")
+
+EXPAND_TOOLS_NAME = "expand_tools"
+
+EXPAND_TOOLS_SCHEMA: dict[str, Any] = {
+    "name": EXPAND_TOOLS_NAME,
+    "description": (
+        "Attach additional tools to this conversation. Only the tools most relevant "
+        "to the request are attached up front; call this with a short description of "
+        "the capability you need (e.g. 'merge pdf files') or an exact tool name."
+    ),
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "What the missing tool should do, or its exact name",
+            },
+        },
+        "required": ["query"],
+    },
+}
+
+
+class ToolRouter:
+    """Selects the top-K capabilities to attach for a user turn."""
+
+    def __init__(
+        self,
+        tool_registry: ToolRegistry,
+        top_k: int = 16,
+        recent_k: int = 6,
+        deliberate_multiplier: int = 2,
+        expand_k: int = 8,
+    ):
+        """Initialize the router.
+
+        Args:
+            tool_registry: Registry providing capability search and schemas
+            top_k: Tools to attach per turn in reactive mode
+            recent_k: How many recently used tools to keep attached
+            deliberate_multiplier: Widening factor for ThinkingMode.DELIBERATE
+            expand_k: Tools added per expand_tools call
+        """
+        self.tool_registry = tool_registry
+        self.top_k = top_k
+        self.recent_k = recent_k
+        self.deliberate_multiplier = deliberate_multiplier
+        self.expand_k = expand_k
+
+    def budget(self, thinking_mode: ThinkingMode | None = None) -> int:
+        """Number of tools to attach for a thinking mode."""
+        if thinking_mode == ThinkingMode.DELIBERATE:
+            return self.top_k * self.deliberate_multiplier
+        return self.top_k
+
+    def select(
+        self,
+        query: str,
+        thinking_mode: ThinkingMode | None = None,
+        recent_tools: Iterable[str] = (),
+    ) -> list[str] | None:
+        """Pick the capabilities to attach for a turn.
+
+        Args:
+            query: The user's input for this turn
+            thinking_mode: Current cognitive mode, if any
+            recent_tools: Tool names used recently, most recent first
+
+        Returns:
+            Ordered list of tool names, or None when every tool fits in the
+            budget and routing would only add overhead
+        """
+        available = set(self.tool_registry.list_capability_names())
+        budget = self.budget(thinking_mode)
+        if len(available) <= budget:
+            return None
+
+        selected: dict[str, None] = {}
+        for name in recent_tools:
+            if len(selected) >= min(self.recent_k, budget):
+                break
+            if name in available:
+                selected[name] = None
+
+        for name in self.tool_registry.search_capabilities(query, limit=budget):
+            if len(selected) >= budget:
+                break
+            selected[name] = None
+
+        logger.debug(f"Routed {len(selected)}/{len(available)} tools (mode: {thinking_mode})")
+        return list(selected)
+
+    def expand(self, query: str, active: Iterable[str]) -> list[str]:
+        """Find tools to add in response to an expand_tools call.
+
+        Args:
+            query: Description or exact name of the wanted capability
+            active: Tools already attached
+
+        Returns:
+            Newly selected tool names (may be empty)
+        """
+        active_set = set(active)
+        query = query.strip()
+        if query in set(self.tool_registry.list_capability_names()):
+            return [] if query in active_set else [query]
+
+        hits = self.tool_registry.search_capabilities(query, limit=self.expand_k + len(active_set))
+        return [name for name in hits if name not in active_set][: self.expand_k]
+
+    def schemas(self, names: Iterable[str]) -> list[Mapping[str, Any]]:
+        """Tool schemas for the given names plus the expand_tools meta-tool."""
+        return [*self.tool_registry.get_schemas(names), EXPAND_TOOLS_SCHEMA]
@@ -11,6 +11,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from ..metrics import SQLITE_OP_DURATION
+from ..tracing import traced
+
 logger = logging.getLogger("mother.session")
 
 
@@ -91,6 +94,8 @@ class SessionStore:
             conn.commit()
         logger.info(f"Session store initialized: {self.db_path}")
 
+    @SQLITE_OP_DURATION.timed(store="session", op="save")
+    @traced("session.save")
     def save(self, session: Session) -> None:
         """Save or update a session."""
         session.updated_at = datetime.now()
@@ -114,6 +119,8 @@ class SessionStore:
             conn.commit()
         logger.debug(f"Saved session {session.id} with {len(session.messages)} messages")
 
+    @SQLITE_OP_DURATION.timed(store="session", op="get")
+    @traced("session.load")
     def get(self, session_id: str) -> Session | None:
         """Get a session by ID."""
         with sqlite3.connect(self.db_path) as conn:
@@ -136,6 +143,7 @@ class SessionStore:
                 )
         return None
 
+    @SQLITE_OP_DURATION.timed(store="session", op="get_recent")
     def get_recent(self, limit: int = 10, status: str | None = None) -> list[Session]:
         """Get recent sessions."""
         with sqlite3.connect(self.db_path) as conn:
@@ -174,6 +182,7 @@ class SessionStore:
                 for row in cursor.fetchall()
             ]
 
+    @SQLITE_OP_DURATION.timed(store="session", op="delete")
     def delete(self, session_id: str) -> bool:
         """Delete a session."""
         with sqlite3.connect(self.db_path) as conn:
@@ -0,0 +1,164 @@
+"""Token usage accounting.
+
+The tokens of every LLM call are added to a SQLite rollup with one row
+per day, API key and session, so usage can be reported per key, per
+session and per day, and a daily budget per key enforced, without keeping
+a row per call.
+"""
+
+import logging
+import sqlite3
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from ..llm.response import Usage
+from ..metrics import SQLITE_OP_DURATION
+
+logger = logging.getLogger("mother.usage")
+
+# Accounting key of requests made without an API key identity
+ANONYMOUS_KEY = "anonymous"
+
+
+def usage_tokens(usage: dict[str, int] | Usage | Any) -> tuple[int, int]:
+    """Input and output tokens of an LLM response's ``usage``."""
+    if isinstance(usage, Usage):
+        return usage.input_tokens, usage.output_tokens
+    if isinstance(usage, dict):
+        return usage.get("input_tokens", 0) or 0, usage.get("output_tokens", 0) or 0
+    return 0, 0
+
+
+def today() -> str:
+    """The accounting day (UTC) as YYYY-MM-DD."""
+    return datetime.now(UTC).date().isoformat()
+
+
+@dataclass
+class TokenUsage:
+    """Tokens used by a request, session or key."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    llm_calls: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def add(self, input_tokens: int, output_tokens: int) -> None:
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.llm_calls += 1
+
+    def to_dict(self) -> dict[str, int]:
+        return {**asdict(self), "total_tokens": self.total_tokens}
+
+
+class UsageStore:
+    """SQLite rollup of token usage by day, API key and session."""
+
+    def __init__(self, db_path: Path | None = None):
+        if db_path is None:
+            db_path = Path.home() / ".local" / "share" / "mother" / "usage.db"
+
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Initialize database schema."""
+        with sqlite3.connect(self.db_path) as conn:
+            # The primary key doubles as the index for per-day and per-key sums
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS token_usage (
+                    day TEXT NOT NULL,
+                    key_id TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    input_tokens INTEGER NOT NULL DEFAULT 0,
+                    output_tokens INTEGER NOT NULL DEFAULT 0,
+                    llm_calls INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, key_id, session_id)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_token_usage_session
+                ON token_usage(session_id)
+            """)
+            conn.commit()
+        logger.info(f"Usage store initialized: {self.db_path}")
+
+    @SQLITE_OP_DURATION.timed(store="usage", op="add")
+    def add(
+        self,
+        key_id: str | None,
+        session_id: str,
+        input_tokens: int,
+        output_tokens: int,
+        day: str | None = None,
+    ) -> None:
+        """Add one LLM call's tokens to the rollup."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT INTO token_usage (day, key_id, session_id, input_tokens, output_tokens, llm_calls)
+                VALUES (?, ?, ?, ?, ?, 1)
+                ON CONFLICT (day, key_id, session_id) DO UPDATE SET
+                    input_tokens = input_tokens + excluded.input_tokens,
+                    output_tokens = output_tokens + excluded.output_tokens,
+                    llm_calls = llm_calls + 1
+                """,
+                (day or today(), key_id or ANONYMOUS_KEY, session_id, input_tokens, output_tokens),
+            )
+            conn.commit()
+
+    @SQLITE_OP_DURATION.timed(store="usage", op="key_usage")
+    def key_usage(self, key_id: str | None, day: str | None = None) -> TokenUsage:
+        """Tokens used by an API key on a day (today by default)."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                """
+                SELECT COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0), COALESCE(SUM(llm_calls), 0)
+                FROM token_usage WHERE day = ? AND key_id = ?
+                """,
+                (day or today(), key_id or ANONYMOUS_KEY),
+            ).fetchone()
+        return TokenUsage(*row)
+
+    def session_usage(self, session_id: str) -> TokenUsage:
+        """Tokens used by a session over all days."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                """
+                SELECT COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0), COALESCE(SUM(llm_calls), 0)
+                FROM token_usage WHERE session_id = ?
+                """,
+                (session_id,),
+            ).fetchone()
+        return TokenUsage(*row)
+
+    def get_stats(self, day: str | None = None) -> dict[str, Any]:
+        """Usage of a day (today by default), in total and per API key."""
+        day = day or today()
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT key_id, SUM(input_tokens), SUM(output_tokens), SUM(llm_calls), COUNT(*)
+                FROM token_usage WHERE day = ? GROUP BY key_id ORDER BY key_id
+                """,
+                (day,),
+            ).fetchall()
+
+        total = TokenUsage()
+        by_key = {}
+        sessions = 0
+        for key_id, input_tokens, output_tokens, llm_calls, key_sessions in rows:
+            usage = TokenUsage(input_tokens, output_tokens, llm_calls)
+            by_key[key_id] = usage.to_dict()
+            total.input_tokens += input_tokens
+            total.output_tokens += output_tokens
+            total.llm_calls += llm_calls
+            sessions += key_sessions
+        return {"day": day, "sessions": sessions, **total.to_dict(), "by_key": by_key}
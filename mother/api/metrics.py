@@ -0,0 +1,47 @@
+"""Request metrics middleware for the Mother API.
+
+Records the latency of every HTTP request in
+``mother_http_request_duration_seconds``, labelled with the method, the
+status code and the route template (``/tools/{tool_name}`` rather than the
+requested path, so the number of series stays bounded). Requests that
+match no route are labelled ``unmatched``.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .. import metrics
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            metrics.HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status,
+            )
@@ -23,6 +23,8 @@ from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from .. import metrics
+
 logger = logging.getLogger("mother.api.ratelimit")
 
 
@@ -50,6 +52,7 @@ class RateLimitConfig:
         default_factory=lambda: [
             "/health",
             "/status",
+            "/metrics",
             "/docs",
             "/openapi.json",
         ]
@@ -198,6 +201,7 @@ class RateLimiter:
 
         retry_after = bucket.get_retry_after()
         headers["Retry-After"] = str(int(retry_after) + 1)
+        metrics.RATE_LIMIT_REJECTIONS.inc(role=role or "none")
         return False, headers
 
     def reset(self, key: str) -> None:
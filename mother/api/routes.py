@@ -1,12 +1,17 @@
 """FastAPI routes for the Mother Agent API."""
 
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+from collections.abc import Callable
+from typing import Annotated
 
-from .. import __version__
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from .. import __version__, metrics, tracing
 from ..agent.core import MotherAgent
+from ..auth.models import IdentityContext
 from ..config.settings import get_settings
 from ..tools.registry import ToolRegistry
-from .auth import verify_api_key
+from .auth import get_identity_context, verify_api_key
 from .schemas import (
     CommandRequest,
     CommandResponse,
@@ -23,12 +28,14 @@ from .schemas import (
     PlanResponse,
     PlanStepResponse,
     StatusResponse,
+    TimingsResponse,
     ToolCall,
     ToolDetailResponse,
     ToolExecuteRequest,
     ToolExecuteResponse,
     ToolInfo,
     ToolListResponse,
+    UsageResponse,
 )
 
 router = APIRouter()
@@ -37,12 +44,42 @@ router = APIRouter()
 _registry: ToolRegistry | None = None
 _agent: MotherAgent | None = None
 
+# Pre-serialized tool listings: key -> (registry, registry version, body, etag)
+_tool_responses: dict[str, tuple[object, object, bytes, str]] = {}
+
 
 def init_dependencies(registry: ToolRegistry, agent: MotherAgent) -> None:
     """Initialize global dependencies."""
     global _registry, _agent
     _registry = registry
     _agent = agent
+    _tool_responses.clear()
+
+
+def _cached_json_response(
+    key: str,
+    registry: ToolRegistry,
+    build: Callable[[], bytes],
+    if_none_match: str | None,
+) -> Response:
+    """Serve a JSON body that only changes when the registry version does.
+
+    The body and its ETag are computed once per registry version; clients
+    sending a matching If-None-Match get a 304 without a body.
+    """
+    version = registry.version
+    cached = _tool_responses.get(key)
+    if cached is None or cached[0] is not registry or cached[1] != version:
+        body = build()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        cached = (registry, version, body, etag)
+        _tool_responses[key] = cached
+
+    _, _, body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match is not None and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 def get_registry() -> ToolRegistry:
@@ -62,7 +99,7 @@ def get_agent() -> MotherAgent:
 @router.post("/command", response_model=CommandResponse)
 async def execute_command(
     request: CommandRequest,
-    _: str = Depends(verify_api_key),
+    identity: IdentityContext | None = Depends(get_identity_context),
     agent: MotherAgent = Depends(get_agent),
 ) -> CommandResponse:
     """
@@ -85,6 +122,8 @@ async def execute_command(
             user_input=request.command,
             session_id=request.session_id,
             pre_confirmed=request.pre_confirmed,
+            trace=request.trace,
+            key_id=identity.key_id if identity else None,
         )
 
         # Convert to response model
@@ -128,6 +167,8 @@ async def execute_command(
             tool_calls=tool_calls,
             pending_confirmation=pending,
             errors=errors,
+            timings=result.timings,
+            usage=result.usage,
         )
 
     except Exception as e:
@@ -184,20 +225,39 @@ async def confirm_action(
 async def list_tools(
     _: str = Depends(verify_api_key),
     registry: ToolRegistry = Depends(get_registry),
-) -> ToolListResponse:
-    """List all available tools and their commands."""
-    tools_info = registry.list_tools()
-
-    tools = [
-        ToolInfo(
-            name=name,
-            description=info["description"],
-            commands=info["commands"],
-        )
-        for name, info in tools_info.items()
-    ]
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """List all available tools and their commands.
+
+    The response is serialized once per registry version and carries an
+    ETag, so polling clients can revalidate with If-None-Match.
+    """
+
+    def build() -> bytes:
+        tools = [
+            ToolInfo(
+                name=name,
+                description=info["description"],
+                commands=info["commands"],
+            )
+            for name, info in registry.list_tools().items()
+        ]
+        return ToolListResponse(tools=tools).model_dump_json().encode()
+
+    return _cached_json_response("tools", registry, build, if_none_match)
 
-    return ToolListResponse(tools=tools)
+
+@router.get("/tools/schemas")
+async def list_tool_schemas(
+    _: str = Depends(verify_api_key),
+    registry: ToolRegistry = Depends(get_registry),
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Get the Anthropic tool_use schemas for every capability.
+
+    Served from the registry's pre-serialized JSON with an ETag.
+    """
+    return _cached_json_response("schemas", registry, registry.get_all_anthropic_schemas_json, if_none_match)
 
 
 @router.get("/tools/{tool_name}", response_model=ToolDetailResponse)
@@ -270,6 +330,9 @@ async def get_status(
     """Get agent status and health check."""
     settings = get_settings()
     memory_stats = agent.get_memory_stats()
+    token_usage = agent.get_token_usage()
+    if token_usage:
+        token_usage = {k: v for k, v in token_usage.items() if k != "by_key"}
 
     return StatusResponse(
         status="healthy",
@@ -277,9 +340,36 @@ async def get_status(
         available_tools=len(registry.wrappers),
         model=settings.claude_model,
         memory_stats=memory_stats,
+        token_usage=token_usage,
     )
 
 
+@router.get("/metrics")
+async def get_metrics(_: str = Depends(verify_api_key)) -> Response:
+    """Metrics in the Prometheus text exposition format.
+
+    Authenticated like the other endpoints because the series carry API key
+    IDs, capability names and error codes; scrapers send the X-API-Key header.
+    """
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@router.get("/timings", response_model=TimingsResponse)
+async def get_timings(_: str = Depends(verify_api_key)) -> TimingsResponse:
+    """Latency histograms of the requests traced since startup."""
+    return TimingsResponse(enabled=tracing.is_enabled(), spans=tracing.histograms())
+
+
+@router.get("/usage", response_model=UsageResponse)
+async def get_usage(
+    _: str = Depends(verify_api_key),
+    agent: MotherAgent = Depends(get_agent),
+) -> UsageResponse:
+    """Today's token usage, in total and per API key ID."""
+    usage = agent.get_token_usage()
+    return UsageResponse(enabled=usage is not None, usage=usage)
+
+
 @router.get("/memory/stats", response_model=MemoryStatsResponse)
 async def get_memory_stats(
     _: str = Depends(verify_api_key),
@@ -329,7 +419,7 @@ async def search_memory(
 @router.post("/plan", response_model=PlanCommandResponse)
 async def create_plan(
     request: PlanCommandRequest,
-    _: str = Depends(verify_api_key),
+    identity: IdentityContext | None = Depends(get_identity_context),
     agent: MotherAgent = Depends(get_agent),
 ) -> PlanCommandResponse:
     """
@@ -347,6 +437,7 @@ async def create_plan(
         result = await agent.create_plan(
             user_input=request.command,
             session_id=request.session_id,
+            key_id=identity.key_id if identity else None,
         )
 
         # Convert plan to response model
@@ -11,6 +11,7 @@ class CommandRequest(BaseModel):
     command: str = Field(..., description="Natural language command to execute")
     session_id: str | None = Field(None, description="Session ID for context continuity")
     pre_confirmed: bool = Field(False, description="Pre-confirm destructive actions (use with caution)")
+    trace: bool = Field(False, description="Trace this request (if tracing is on) and return its latency breakdown")
 
 
 class ConfirmRequest(BaseModel):
@@ -58,6 +59,22 @@ class CommandResponse(BaseModel):
     tool_calls: list[ToolCall] = Field(default_factory=list)
     pending_confirmation: PendingConfirmationResponse | None = None
     errors: list[ErrorResponse] = Field(default_factory=list)
+    timings: dict[str, Any] | None = Field(None, description="Latency breakdown, when the request was traced")
+    usage: dict[str, int] | None = Field(None, description="Tokens used by this request")
+
+
+class UsageResponse(BaseModel):
+    """Today's token usage, in total and per API key ID."""
+
+    enabled: bool
+    usage: dict[str, Any] | None = None
+
+
+class TimingsResponse(BaseModel):
+    """Latency histograms of traced requests, per span name."""
+
+    enabled: bool
+    spans: dict[str, Any] = Field(default_factory=dict)
 
 
 class ToolInfo(BaseModel):
@@ -106,6 +123,8 @@ class StatusResponse(BaseModel):
     available_tools: int
     model: str
     memory_stats: dict | None = None
+    # Today's totals only; the per-key breakdown is under GET /usage
+    token_usage: dict | None = None
 
 
 class MemorySearchRequest(BaseModel):
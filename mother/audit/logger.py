@@ -22,6 +22,8 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from ..metrics import AUDIT_DROPPED, AUDIT_QUEUE_DEPTH
+from ..tracing import traced
 from .redaction import get_redactor
 
 logger = logging.getLogger("mother.audit")
@@ -256,6 +258,7 @@ class AuditLogger:
             max_size_bytes = self.config.max_file_size_mb * 1024 * 1024
         return self._current_file_size >= max_size_bytes
 
+    @traced("audit.write")
     def _write_entry(self, entry: AuditEntry) -> None:
         """Write an audit entry to the log file.
 
@@ -284,6 +287,7 @@ class AuditLogger:
                     self._write_direct(json_line)
 
         except Exception as e:
+            AUDIT_DROPPED.inc()
             logger.error(f"Failed to write audit entry: {e}")
 
     def _write_direct(self, json_line: str) -> None:
@@ -715,6 +719,13 @@ class AuditLogger:
 _audit_logger: AuditLogger | None = None
 
 
+def _queue_depth() -> int:
+    return len(_audit_logger._buffer) if _audit_logger is not None else 0
+
+
+AUDIT_QUEUE_DEPTH.set_function(_queue_depth)
+
+
 def get_audit_logger(config: AuditLogConfig | None = None) -> AuditLogger:
     """Get the global audit logger instance.
 
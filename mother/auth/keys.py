@@ -9,6 +9,7 @@ from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from ..metrics import SQLITE_OP_DURATION
 from .models import APIKey, IdentityContext, Role
 
 logger = logging.getLogger("mother.auth.keys")
@@ -246,6 +247,7 @@ class APIKeyStore:
         finally:
             conn.close()
 
+    @SQLITE_OP_DURATION.timed(store="keys", op="validate_key")
     def validate_key(self, api_key: str) -> IdentityContext | None:
         """Validate an API key and return identity context.
 
@@ -0,0 +1,19 @@
+"""Offline benchmark suite.
+
+Times the agent loop, the API, tool routing, the policy engine, memory
+search, session storage, audit logging and plugin loading against a
+deterministic mock LLM and local stub services, and reports the results
+as JSON so runs can be compared. Run it with ``mother bench``.
+"""
+
+from .scenarios import SCENARIOS, BenchConfig, summarize
+from .suite import compare, flatten, run_suite
+
+__all__ = [
+    "BenchConfig",
+    "SCENARIOS",
+    "compare",
+    "flatten",
+    "run_suite",
+    "summarize",
+]
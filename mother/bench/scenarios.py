@@ -0,0 +1,507 @@
+"""Benchmark scenarios.
+
+Each scenario is an async function taking a :class:`BenchConfig` and
+returning a JSON-serializable dict. Latencies are in milliseconds, rates
+per second. Everything runs offline: the LLM is a scripted
+:class:`MockProvider` with artificial latency, web tools fetch from a
+local stub server, and databases and logs live in temporary directories.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import sqlite3
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..agent.core import MotherAgent
+from ..agent.router import ToolRouter
+from ..agent.session import Session, SessionStore
+from ..audit.logger import AuditLogConfig, AuditLogger
+from ..llm.base import plain_schema
+from ..llm.providers.mock import MockProvider
+from ..llm.response import LLMResponse, ToolCall
+from ..memory.store import MemoryStore
+from ..plugins import PluginConfig, resolve_enabled_plugins
+from ..policy import PolicyEngine, reload_policy_engine
+from ..policy.loader import get_default_policy
+from ..policy.models import NetworkCondition, PolicyAction, PolicyConfig
+from ..tools.registry import ToolRegistry
+from .stubs import StubHTTPServer
+
+# Plugins loaded for the agent loop scenarios
+BENCH_PLUGINS = ["web"]
+
+# Tools attached per turn by the tool_routing scenario's router
+ROUTING_TOP_K = 16
+
+COMMAND = "Fetch the benchmark page"
+
+
+@dataclass
+class BenchConfig:
+    """Sizes and timings of a benchmark run."""
+
+    # Seconds each mock LLM call and stub HTTP response takes
+    llm_latency: float = 0.05
+    http_latency: float = 0.0
+    # Sequential agent turns timed by turn_latency
+    turns: int = 100
+    # /command requests and concurrent clients for command_throughput
+    requests: int = 500
+    concurrency: int = 32
+    policy_evals: int = 50_000
+    # Stored vectors searched at, their dimension and searches per size
+    vector_counts: tuple[int, ...] = (10_000, 100_000, 1_000_000)
+    vector_dim: int = 256
+    searches: int = 20
+    # Session history lengths (messages) and save/restore repeats per length
+    history_sizes: tuple[int, ...] = (10, 100, 1_000, 10_000)
+    session_repeats: int = 5
+    audit_entries: int = 20_000
+    cold_starts: int = 3
+    seed: int = 42
+
+    @classmethod
+    def quick(cls) -> BenchConfig:
+        """A configuration finishing in seconds, for smoke runs."""
+        return cls(
+            llm_latency=0.005,
+            turns=10,
+            requests=40,
+            concurrency=8,
+            policy_evals=2_000,
+            vector_counts=(1_000, 5_000),
+            vector_dim=64,
+            searches=5,
+            history_sizes=(10, 100),
+            session_repeats=2,
+            audit_entries=1_000,
+            cold_starts=1,
+        )
+
+
+def summarize(seconds: list[float]) -> dict[str, float]:
+    """Count, mean and percentiles (ms) of latency samples in seconds."""
+    ordered = sorted(seconds)
+    if not ordered:
+        return {"count": 0}
+
+    def percentile(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": percentile(50),
+        "p90_ms": percentile(90),
+        "p99_ms": percentile(99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+# --- Agent loop ---
+
+
+def _script(url: str) -> list[LLMResponse]:
+    """One turn calling web_fetch, then the final answer."""
+    return [
+        LLMResponse(
+            tool_calls=[ToolCall(id="bench_fetch", name="web_fetch", arguments={"url": url})],
+            stop_reason="tool_use",
+            usage={"input_tokens": 1200, "output_tokens": 40},
+        ),
+        LLMResponse(
+            text="Fetched the benchmark page.",
+            stop_reason="end_turn",
+            usage={"input_tokens": 1800, "output_tokens": 60},
+        ),
+    ]
+
+
+@contextmanager
+def _stub_policy(port: int) -> Iterator[None]:
+    """Let web tools reach the stub server, restoring the policy afterwards."""
+    reload_policy_engine(
+        PolicyConfig(
+            safe_mode=False,
+            default_action=PolicyAction.ALLOW,
+            network=NetworkCondition(denied_domains=[], block_private_ranges=False, allowed_ports=[port]),
+        )
+    )
+    try:
+        yield
+    finally:
+        reload_policy_engine()
+
+
+async def _agent(config: BenchConfig, url: str) -> MotherAgent:
+    registry = ToolRegistry(
+        plugin_config=PluginConfig(enabled_plugins=BENCH_PLUGINS, explicitly_enabled_plugins=BENCH_PLUGINS)
+    )
+    await registry.initialize_plugins()
+    provider = MockProvider(api_key="bench", model="mock-v1", latency=config.llm_latency, script=_script(url))
+    return MotherAgent(
+        tool_registry=registry,
+        provider=provider,
+        enable_memory=False,
+        enable_cognitive=False,
+        enable_session_persistence=False,
+    )
+
+
+def _succeeded(response: Any) -> bool:
+    return bool(response.success and response.tool_calls and all(tc["success"] for tc in response.tool_calls))
+
+
+async def turn_latency(config: BenchConfig) -> dict[str, Any]:
+    """Latency of single agent turns: LLM call, web_fetch, LLM call."""
+    with StubHTTPServer(config.http_latency) as http, _stub_policy(http.port):
+        agent = await _agent(config, http.url("/page"))
+        samples = []
+        failures = 0
+        for _ in range(config.turns):
+            started = time.perf_counter()
+            response = await agent.process_command(COMMAND)
+            samples.append(time.perf_counter() - started)
+            failures += not _succeeded(response)
+
+    return {**summarize(samples), "failures": failures, "llm_calls_per_turn": 2}
+
+
+async def command_throughput(config: BenchConfig) -> dict[str, Any]:
+    """Throughput of concurrent POST /command requests through the API."""
+    import httpx
+    from fastapi import FastAPI
+
+    from ..api.auth import get_identity_context
+    from ..api.metrics import MetricsMiddleware
+    from ..api.routes import init_dependencies, router
+
+    with StubHTTPServer(config.http_latency) as http, _stub_policy(http.port):
+        agent = await _agent(config, http.url("/page"))
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(router)
+        app.dependency_overrides[get_identity_context] = lambda: None
+        init_dependencies(agent.tool_registry, agent)
+
+        samples: list[float] = []
+        failures = 0
+
+        async def client_loop(client: httpx.AsyncClient, count: int) -> None:
+            nonlocal failures
+            for _ in range(count):
+                started = time.perf_counter()
+                response = await client.post("/command", json={"command": COMMAND})
+                samples.append(time.perf_counter() - started)
+                failures += response.status_code != 200 or not response.json()["success"]
+
+        counts = [
+            config.requests // config.concurrency + (i < config.requests % config.concurrency)
+            for i in range(config.concurrency)
+        ]
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(client_loop(client, count) for count in counts if count))
+            elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": config.concurrency,
+        "requests_per_s": round(len(samples) / elapsed, 1),
+        **summarize(samples),
+        "failures": failures,
+    }
+
+
+async def tool_routing(config: BenchConfig) -> dict[str, Any]:
+    """Prompt size and time to first response with and without tool routing.
+
+    Every plugin the server would load is registered, plus web for the
+    scripted web_fetch call, so the full tool list is realistic. Input tokens are estimated at four characters per
+    token over each call's system prompt, messages and tool schemas. Time
+    to first response runs from the command to the end of its first LLM
+    call; the mock answers after a fixed latency, so it shows the agent's
+    own overhead rather than prefill time.
+    """
+    enabled = [*resolve_enabled_plugins(), *BENCH_PLUGINS]
+    registry = ToolRegistry(plugin_config=PluginConfig(explicitly_enabled_plugins=enabled))
+    await registry.initialize_plugins()
+    results: dict[str, Any] = {"capabilities": len(registry.list_capability_names())}
+
+    with StubHTTPServer(config.http_latency) as http, _stub_policy(http.port):
+        for label, router in (("all_tools", None), ("routed", ToolRouter(registry, top_k=ROUTING_TOP_K))):
+            provider = MockProvider(
+                api_key="bench", model="mock-v1", latency=config.llm_latency, script=_script(http.url("/page"))
+            )
+            calls: list[tuple[float, int]] = []
+            create_message = provider.create_message
+
+            async def recording(messages, system_prompt=None, tools=None, _create=create_message, _calls=calls, **kw):
+                chars = len(system_prompt or "") + len(json.dumps(messages, default=str))
+                chars += len(json.dumps(plain_schema(tools or [])))
+                response = await _create(messages, system_prompt=system_prompt, tools=tools, **kw)
+                _calls.append((time.perf_counter(), chars // 4))
+                return response
+
+            provider.create_message = recording
+            agent = MotherAgent(
+                tool_registry=registry,
+                provider=provider,
+                enable_memory=False,
+                enable_cognitive=False,
+                enable_session_persistence=False,
+                tool_router=router,
+            )
+
+            first, tokens = [], []
+            failures = 0
+            for _ in range(config.turns):
+                calls.clear()
+                started = time.perf_counter()
+                response = await agent.process_command(COMMAND)
+                failures += not _succeeded(response)
+                if calls:
+                    first.append(calls[0][0] - started)
+                    tokens.append(sum(count for _, count in calls))
+
+            results[label] = {
+                "input_tokens_per_turn": round(sum(tokens) / len(tokens)) if tokens else 0,
+                "time_to_first_response": summarize(first),
+                "failures": failures,
+            }
+
+    return results
+
+
+# --- Policy ---
+
+POLICY_CALLS: list[tuple[str, dict[str, Any]]] = [
+    ("filesystem_read_file", {"path": "./workspace/notes.txt"}),
+    ("filesystem_write_file", {"path": "/etc/passwd", "content": "x"}),
+    ("shell_run_command", {"command": "ls -la ./workspace"}),
+    ("shell_run_command", {"command": "rm -rf /"}),
+    ("web_fetch", {"url": "https://example.com/page"}),
+    ("web_fetch", {"url": "http://192.168.1.10:22/"}),
+    ("tasks_list", {}),
+]
+
+
+async def policy_eval(config: BenchConfig) -> dict[str, Any]:
+    """Policy evaluations per second under the built-in default policy."""
+    engine = PolicyEngine(get_default_policy())
+    allowed = 0
+    started = time.perf_counter()
+    for i in range(config.policy_evals):
+        name, params = POLICY_CALLS[i % len(POLICY_CALLS)]
+        allowed += engine.evaluate(name, params).allowed
+    elapsed = time.perf_counter() - started
+
+    return {
+        "evaluations": config.policy_evals,
+        "evals_per_s": round(config.policy_evals / elapsed),
+        "mean_us": round(elapsed / config.policy_evals * 1e6, 2),
+        "allowed": allowed,
+    }
+
+
+# --- Storage ---
+
+
+def _fill_memories(store: MemoryStore, rng: np.random.Generator, start: int, stop: int, dim: int) -> None:
+    epoch = datetime(2026, 1, 1)
+    with sqlite3.connect(store.db_path) as conn:
+        for chunk in range(start, stop, 10_000):
+            end = min(chunk + 10_000, stop)
+            vectors = rng.standard_normal((end - chunk, dim)).astype(np.float32)
+            conn.executemany(
+                "INSERT INTO memories (timestamp, session_id, role, content, embedding) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        (epoch + timedelta(seconds=i)).isoformat(),
+                        f"session-{i // 100}",
+                        "user",
+                        f"Benchmark memory {i}",
+                        vectors[i - chunk].tobytes(),
+                    )
+                    for i in range(chunk, end)
+                ),
+            )
+        conn.commit()
+
+
+async def memory_search(config: BenchConfig) -> dict[str, Any]:
+    """search_semantic latency as the number of stored vectors grows."""
+    rng = np.random.default_rng(config.seed)
+    sizes: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(Path(tmp) / "memory.db")
+        stored = 0
+        for count in sorted(config.vector_counts):
+            started = time.perf_counter()
+            _fill_memories(store, rng, stored, count, config.vector_dim)
+            fill_s = time.perf_counter() - started
+            stored = count
+
+            queries = rng.standard_normal((config.searches, config.vector_dim)).astype(np.float32)
+            samples = []
+            for query in queries:
+                started = time.perf_counter()
+                store.search_semantic(query.tolist(), limit=10, min_similarity=0.0)
+                samples.append(time.perf_counter() - started)
+            sizes[str(count)] = {**summarize(samples), "fill_s": round(fill_s, 2)}
+
+    return {"dim": config.vector_dim, "vectors": sizes}
+
+
+def _history(size: int) -> list[dict[str, Any]]:
+    """An agent message history: command, tool call, tool result, answer."""
+    messages: list[dict[str, Any]] = []
+    for i in range(size):
+        step = i % 4
+        if step == 0:
+            messages.append({"role": "user", "content": f"Command {i}: fetch the page and summarize it"})
+        elif step == 1:
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": [
+                        {"type": "tool_use", "id": f"call_{i}", "name": "web_fetch", "input": {"url": "https://x"}}
+                    ],
+                }
+            )
+        elif step == 2:
+            messages.append(
+                {
+                    "role": "user",
+                    "content": [{"type": "tool_result", "tool_use_id": f"call_{i - 1}", "content": "text " * 100}],
+                }
+            )
+        else:
+            messages.append({"role": "assistant", "content": [{"type": "text", "text": "Summary " * 40}]})
+    return messages
+
+
+async def session_roundtrip(config: BenchConfig) -> dict[str, Any]:
+    """Session save and restore latency as the message history grows."""
+    sizes: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(Path(tmp) / "sessions.db")
+        for size in config.history_sizes:
+            now = datetime.now()
+            session = Session(id=f"bench-{size}", created_at=now, updated_at=now, messages=_history(size))
+            saves, loads = [], []
+            for _ in range(config.session_repeats):
+                started = time.perf_counter()
+                store.save(session)
+                saves.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                store.get(session.id)
+                loads.append(time.perf_counter() - started)
+            sizes[str(size)] = {
+                "bytes": len(json.dumps(session.messages)),
+                "save": summarize(saves),
+                "load": summarize(loads),
+            }
+
+    return {"messages": sizes}
+
+
+async def audit_write(config: BenchConfig) -> dict[str, Any]:
+    """Audit entries written per second, including redaction and flushing."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "audit.jsonl"
+        audit = AuditLogger(AuditLogConfig(log_path=path))
+        started = time.perf_counter()
+        for i in range(config.audit_entries):
+            audit.log_capability_request(
+                capability="web_fetch",
+                plugin="web",
+                params={"url": f"https://example.com/{i}", "api_key": "sk-bench-0123456789abcdef"},
+                session_id="bench",
+            )
+        audit.flush()
+        elapsed = time.perf_counter() - started
+        size = path.stat().st_size
+        audit.close()
+
+    return {
+        "entries": config.audit_entries,
+        "entries_per_s": round(config.audit_entries / elapsed),
+        "mean_us": round(elapsed / config.audit_entries * 1e6, 2),
+        "bytes": size,
+    }
+
+
+# --- Plugins ---
+
+# Run in a fresh interpreter so module imports are part of the measurement
+COLD_START = """
+import asyncio, json, time
+started = time.perf_counter()
+from mother.plugins import PluginConfig, resolve_enabled_plugins
+from mother.tools.registry import ToolRegistry
+imported = time.perf_counter()
+registry = ToolRegistry(plugin_config=PluginConfig(explicitly_enabled_plugins=resolve_enabled_plugins()))
+asyncio.run(registry.initialize_plugins())
+loaded = time.perf_counter()
+manager = registry.plugin_manager
+print(json.dumps({
+    "import_s": imported - started,
+    "load_s": loaded - imported,
+    "plugins": len(manager.list_plugins()),
+    "capabilities": len(manager.list_capabilities()),
+}))
+"""
+
+
+async def plugin_cold_start(config: BenchConfig) -> dict[str, Any]:
+    """Time for a new process to import Mother and load its plugins."""
+    runs = []
+    for _ in range(config.cold_starts):
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            COLD_START,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+        elapsed = time.perf_counter() - started
+        if process.returncode != 0:
+            raise RuntimeError(f"Plugin cold start exited with {process.returncode}")
+        runs.append({**json.loads(stdout.decode().strip().splitlines()[-1]), "process_s": elapsed})
+
+    return {
+        "process": summarize([r["process_s"] for r in runs]),
+        "import": summarize([r["import_s"] for r in runs]),
+        "load": summarize([r["load_s"] for r in runs]),
+        "plugins": runs[-1]["plugins"],
+        "capabilities": runs[-1]["capabilities"],
+    }
+
+
+SCENARIOS: dict[str, Callable[[BenchConfig], Awaitable[dict[str, Any]]]] = {
+    "turn_latency": turn_latency,
+    "command_throughput": command_throughput,
+    "tool_routing": tool_routing,
+    "policy_eval": policy_eval,
+    "memory_search": memory_search,
+    "session_roundtrip": session_roundtrip,
+    "audit_write": audit_write,
+    "plugin_cold_start": plugin_cold_start,
+}
@@ -0,0 +1,62 @@
+"""Local stand-ins for the services benchmarked tools talk to."""
+
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE = (
+    b"<html><head><title>Benchmark page</title></head><body>"
+    + b"".join(b"<p>Paragraph %d of the benchmark page.</p>" % i for i in range(50))
+    + b"</body></html>"
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubHTTPServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):  # noqa: N802
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        # Every fetch goes over the wire instead of hitting the web cache
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server on localhost answering every GET with one page.
+
+    Args:
+        delay: Seconds to wait before each response
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.delay = delay
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def url(self, path: str = "/") -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def __enter__(self) -> StubHTTPServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+        self.server_close()
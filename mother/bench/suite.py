@@ -0,0 +1,87 @@
+"""Run benchmark scenarios and compare runs."""
+
+from __future__ import annotations
+
+import platform
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict
+from datetime import UTC, datetime
+from typing import Any
+
+from .. import __version__
+from .scenarios import SCENARIOS, BenchConfig
+
+
+async def run_suite(
+    names: Iterable[str] | None = None,
+    config: BenchConfig | None = None,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """Run benchmark scenarios in order.
+
+    Args:
+        names: Scenarios to run (all when None)
+        config: Sizes and timings (the full defaults when None)
+        progress: Called with each scenario name before it runs
+
+    Returns:
+        The run as a JSON-serializable dict: environment, config and the
+        results of each scenario
+
+    Raises:
+        ValueError: If a scenario name is unknown
+    """
+    config = config or BenchConfig()
+    names = list(names or SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}. Available: {', '.join(SCENARIOS)}")
+
+    results: dict[str, Any] = {}
+    for name in names:
+        if progress:
+            progress(name)
+        started = time.perf_counter()
+        results[name] = await SCENARIOS[name](config)
+        results[name]["duration_s"] = round(time.perf_counter() - started, 2)
+
+    return {
+        "mother_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(UTC).isoformat(),
+        "config": asdict(config),
+        "scenarios": results,
+    }
+
+
+def flatten(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Numeric values of nested results keyed by dotted path."""
+    flat: dict[str, float] = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{path}."))
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[tuple[str, float, float, float | None]]:
+    """Metrics present in both runs.
+
+    Returns:
+        (dotted path, baseline value, current value, percent change) per
+        metric; the change is None when the baseline is zero
+    """
+    before = flatten(baseline.get("scenarios", {}))
+    after = flatten(current.get("scenarios", {}))
+    rows = []
+    for path, old in before.items():
+        if path not in after:
+            continue
+        new = after[path]
+        change = round((new - old) / old * 100, 1) if old else None
+        rows.append((path, old, new, change))
+    return rows
@@ -6,6 +6,7 @@ Provides command-line interface for managing Mother, including:
 - Managing email accounts
 - Checking system status
 - Initial setup wizard
+- Running the benchmark suite
 """
 
 import argparse
@@ -452,6 +453,58 @@ def create_parser() -> argparse.ArgumentParser:
         help="Output as JSON",
     )
 
+    # bench command
+    bench_parser = subparsers.add_parser(
+        "bench",
+        help="Run the benchmark suite",
+        description="Benchmark the agent loop, API, policy, memory, storage and plugins offline",
+    )
+    bench_parser.add_argument(
+        "scenarios",
+        nargs="*",
+        help="Scenarios to run (default: all)",
+    )
+    bench_parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Use small sizes that finish in seconds",
+    )
+    bench_parser.add_argument(
+        "--output",
+        "-o",
+        help="Write the JSON results to this file",
+    )
+    bench_parser.add_argument(
+        "--compare",
+        dest="baseline",
+        help="Compare with the JSON results of an earlier run",
+    )
+    bench_parser.add_argument(
+        "--llm-latency",
+        type=float,
+        help="Seconds per mock LLM call",
+    )
+    bench_parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Concurrent clients for command_throughput",
+    )
+    bench_parser.add_argument(
+        "--requests",
+        type=int,
+        help="Requests sent by command_throughput",
+    )
+    bench_parser.add_argument(
+        "--vectors",
+        help="Comma-separated vector counts for memory_search (e.g. 10000,100000)",
+    )
+    bench_parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output as JSON",
+    )
+
     # init command
     init_parser = subparsers.add_parser(
         "init",
@@ -894,6 +947,23 @@ def run_doctor(args: argparse.Namespace) -> int:
     )
 
 
+def run_bench(args: argparse.Namespace) -> int:
+    """Run bench command."""
+    from .bench import cmd_bench
+
+    return cmd_bench(
+        scenarios=args.scenarios,
+        quick=args.quick,
+        output=args.output,
+        baseline=args.baseline,
+        json_output=args.json_output,
+        llm_latency=args.llm_latency,
+        concurrency=args.concurrency,
+        requests=args.requests,
+        vectors=args.vectors,
+    )
+
+
 def run_init(args: argparse.Namespace) -> int:
     """Run init command."""
     from .init_cmd import cmd_init
@@ -1021,6 +1091,8 @@ def main(argv: list[str] | None = None) -> int:
             return run_keys(args)
         elif args.command == "doctor":
             return run_doctor(args)
+        elif args.command == "bench":
+            return run_bench(args)
         elif args.command == "init":
             return run_init(args)
         elif args.command == "export":
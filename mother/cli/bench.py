@@ -0,0 +1,83 @@
+"""Bench CLI command."""
+
+import asyncio
+import json
+import logging
+from dataclasses import replace
+from pathlib import Path
+
+from ..bench import BenchConfig, compare, flatten, run_suite
+
+
+def _parse_sizes(value: str) -> tuple[int, ...]:
+    return tuple(int(part.replace("_", "")) for part in value.split(",") if part.strip())
+
+
+def cmd_bench(
+    scenarios: list[str] | None = None,
+    quick: bool = False,
+    output: str | None = None,
+    baseline: str | None = None,
+    json_output: bool = False,
+    llm_latency: float | None = None,
+    concurrency: int | None = None,
+    requests: int | None = None,
+    vectors: str | None = None,
+) -> int:
+    """Run the benchmark suite.
+
+    Args:
+        scenarios: Scenarios to run (all when empty)
+        quick: Use small sizes that finish in seconds
+        output: File to write the JSON results to
+        baseline: JSON results of an earlier run to compare against (shown
+            with the summary, not with json_output)
+        json_output: Print the JSON results instead of a summary
+        llm_latency: Seconds per mock LLM call
+        concurrency: Concurrent clients for command_throughput
+        requests: Requests sent by command_throughput
+        vectors: Comma-separated vector counts for memory_search
+
+    Returns:
+        Exit code (0 for success)
+    """
+    config = BenchConfig.quick() if quick else BenchConfig()
+    overrides = {
+        "llm_latency": llm_latency,
+        "concurrency": concurrency,
+        "requests": requests,
+        "vector_counts": _parse_sizes(vectors) if vectors else None,
+    }
+    config = replace(config, **{k: v for k, v in overrides.items() if v is not None})
+
+    # Plugin loading warnings would interleave with the report
+    logging.getLogger("mother").setLevel(logging.ERROR)
+
+    def progress(name: str) -> None:
+        if not json_output:
+            print(f"Running {name}...", flush=True)
+
+    results = asyncio.run(run_suite(scenarios or None, config, progress))
+    text = json.dumps(results, indent=2)
+
+    if output:
+        Path(output).write_text(text + "\n")
+    if json_output:
+        print(text)
+    else:
+        print()
+        for name, metrics in results["scenarios"].items():
+            print(name)
+            for path, value in flatten(metrics).items():
+                print(f"  {path:<32} {value:>14,}")
+        if output:
+            print(f"\nResults written to {output}")
+
+        if baseline:
+            rows = compare(json.loads(Path(baseline).read_text()), results)
+            print(f"\nCompared with {baseline}")
+            for path, old, new, change in rows:
+                delta = "n/a" if change is None else f"{change:+.1f}%"
+                print(f"  {path:<48} {old:>14,} {new:>14,} {delta:>9}")
+
+    return 0
@@ -37,6 +37,33 @@ class Settings(BaseSettings):
     )
     max_tokens: int = Field(default=4096, alias="MAX_TOKENS")
     max_iterations: int = Field(default=10, alias="MAX_ITERATIONS")
+    tool_routing_top_k: int = Field(
+        default=0,
+        alias="MOTHER_TOOL_ROUTING_TOP_K",
+        description="Attach only the K most relevant tools per turn (0 sends all tools)",
+    )
+    max_tool_result_chars: int = Field(
+        default=20_000,
+        alias="MOTHER_MAX_TOOL_RESULT_CHARS",
+        description="Tool results larger than this are sent to the model as a pageable preview",
+    )
+
+    # Token accounting and budgets
+    token_accounting_enabled: bool = Field(
+        default=True,
+        alias="MOTHER_TOKEN_ACCOUNTING",
+        description="Record token usage per day, API key and session in SQLite",
+    )
+    max_request_input_tokens: int = Field(
+        default=0,
+        alias="MOTHER_MAX_REQUEST_INPUT_TOKENS",
+        description="Stop a command before its input tokens exceed this (0 for no limit)",
+    )
+    daily_key_token_budget: int = Field(
+        default=0,
+        alias="MOTHER_DAILY_KEY_TOKEN_BUDGET",
+        description="Refuse commands of an API key that used this many tokens today (0 for no limit)",
+    )
 
     # Provider API Keys
     anthropic_api_key: str | None = Field(None, alias="ANTHROPIC_API_KEY")
@@ -102,6 +129,23 @@ class Settings(BaseSettings):
         description="Safe working directory for file operations",
     )
 
+    # Tracing
+    tracing_enabled: bool = Field(
+        default=False,
+        alias="MOTHER_TRACING",
+        description="Trace requests and return a latency breakdown with each command response",
+    )
+    tracing_sample_rate: float = Field(
+        default=1.0,
+        alias="MOTHER_TRACING_SAMPLE_RATE",
+        description="Fraction of requests traced when tracing is enabled",
+    )
+    tracing_export_path: Path | None = Field(
+        default=None,
+        alias="MOTHER_TRACING_EXPORT_PATH",
+        description="Append finished traces to this file as OpenTelemetry JSON lines",
+    )
+
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
 
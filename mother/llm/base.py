@@ -1,12 +1,27 @@
 """Abstract base class for LLM providers."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
 from enum import Enum
 from typing import Any
 
 from .response import LLMResponse, ToolResult
 
 
+def plain_schema(value: Any) -> Any:
+    """Copy a tool schema into plain dicts and lists.
+
+    The registry hands out shared, read-only schemas (mapping proxies and
+    tuples); provider SDKs serialize or adjust their payloads and need
+    ordinary containers.
+    """
+    if isinstance(value, Mapping):
+        return {key: plain_schema(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [plain_schema(item) for item in value]
+    return value
+
+
 class ProviderType(Enum):
     """Supported LLM provider types."""
 
@@ -62,14 +77,15 @@ class LLMProvider(ABC):
         self,
         messages: list[dict[str, Any]],
         system_prompt: str,
-        tools: list[dict[str, Any]] | None = None,
+        tools: Sequence[Mapping[str, Any]] | None = None,
     ) -> LLMResponse:
         """Send a message to the LLM and get a response.
 
         Args:
             messages: List of conversation messages in Anthropic format
             system_prompt: System prompt
-            tools: List of tool definitions in Anthropic format
+            tools: Tool definitions in Anthropic format; may be the
+                registry's shared read-only schemas
 
         Returns:
             Unified LLMResponse object
@@ -100,15 +116,18 @@ class LLMProvider(ABC):
         """
         ...
 
-    def convert_tools(self, tools: list[dict[str, Any]] | None) -> list[dict[str, Any]] | None:
+    def convert_tools(self, tools: Sequence[Mapping[str, Any]] | None) -> list[dict[str, Any]] | None:
         """Convert a list of tools to provider-specific format.
 
+        Each schema is copied into plain containers first (see
+        :func:`plain_schema`), so providers never touch the shared ones.
+
         Args:
-            tools: List of tools in Anthropic format
+            tools: Tools in Anthropic format
 
         Returns:
             List of tools in provider-specific format, or None
         """
         if tools is None:
             return None
-        return [self.convert_tool_schema(tool) for tool in tools]
+        return [self.convert_tool_schema(plain_schema(tool)) for tool in tools]
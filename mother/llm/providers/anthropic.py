@@ -1,5 +1,6 @@
 """Anthropic Claude LLM provider."""
 
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 import anthropic
@@ -26,7 +27,7 @@ class AnthropicProvider(LLMProvider):
         self,
         messages: list[dict[str, Any]],
         system_prompt: str,
-        tools: list[dict[str, Any]] | None = None,
+        tools: Sequence[Mapping[str, Any]] | None = None,
     ) -> LLMResponse:
         if self._client is None:
             self._initialize_client()
@@ -39,7 +40,7 @@ class AnthropicProvider(LLMProvider):
         }
 
         if tools:
-            kwargs["tools"] = tools  # Already in Anthropic format
+            kwargs["tools"] = self.convert_tools(tools)  # Plain copies; already in Anthropic format
 
         response = self._client.messages.create(**kwargs)
 
@@ -1,11 +1,12 @@
 """Google Gemini LLM provider using the new google.genai SDK."""
 
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from google import genai
 from google.genai import types
 
-from ..base import LLMProvider, ProviderType
+from ..base import LLMProvider, ProviderType, plain_schema
 from ..response import LLMResponse, ToolCall, ToolResult
 
 
@@ -27,7 +28,7 @@ class GeminiProvider(LLMProvider):
         self,
         messages: list[dict[str, Any]],
         system_prompt: str,
-        tools: list[dict[str, Any]] | None = None,
+        tools: Sequence[Mapping[str, Any]] | None = None,
     ) -> LLMResponse:
         if self._client is None:
             self._initialize_client()
@@ -38,7 +39,7 @@ class GeminiProvider(LLMProvider):
         # Prepare tools
         gemini_tools = None
         if tools:
-            function_declarations = [self._create_function_declaration(t) for t in tools]
+            function_declarations = [self._create_function_declaration(plain_schema(t)) for t in tools]
             gemini_tools = [types.Tool(function_declarations=function_declarations)]
 
         # Prepare generation config
@@ -10,10 +10,16 @@ Usage:
     export AI_PROVIDER=mock
     export MOCK_API_KEY=test-key  # Any non-empty value works
     mother serve
+
+For benchmarks the provider takes an artificial ``latency`` (seconds per
+call) and a ``script``: a list of responses returned in order within each
+conversation, e.g. a turn calling several tools followed by a final answer.
 """
 
+import asyncio
 import re
 import uuid
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from ..base import LLMProvider, ProviderType
@@ -62,11 +68,22 @@ DEFAULT_RESPONSE = LLMResponse(
 )
 
 
+def _turns_since_command(messages: list[dict[str, Any]]) -> int:
+    """Assistant turns after the last user message that is not a tool result."""
+    turns = 0
+    for msg in reversed(messages):
+        if msg.get("role") == "assistant":
+            turns += 1
+        elif isinstance(msg.get("content"), str):
+            break
+    return turns
+
+
 class MockProvider(LLMProvider):
     """Mock LLM provider for deterministic offline testing.
 
-    Returns pre-configured tool calls based on prompt pattern matching.
-    No actual API calls are made.
+    Returns pre-configured tool calls based on prompt pattern matching,
+    or the responses of a script. No actual API calls are made.
     """
 
     @property
@@ -74,9 +91,28 @@ class MockProvider(LLMProvider):
         """Return provider type (uses Anthropic format for compatibility)."""
         return ProviderType.ANTHROPIC
 
-    def __init__(self, api_key: str, model: str, **kwargs):
-        """Initialize mock provider."""
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        latency: float = 0.0,
+        script: list[LLMResponse] | None = None,
+        **kwargs,
+    ):
+        """Initialize mock provider.
+
+        Args:
+            api_key: API key (any value)
+            model: Model name (any value)
+            latency: Seconds each call sleeps before answering
+            script: Responses returned in order within a conversation,
+                instead of matching prompt patterns. The response for a
+                call is the one at the number of assistant turns since the
+                last user command; the last response repeats.
+        """
         super().__init__(api_key=api_key, model=model, **kwargs)
+        self.latency = latency
+        self.script = script
         self._call_count = 0
 
     def _initialize_client(self) -> None:
@@ -87,7 +123,7 @@ class MockProvider(LLMProvider):
         self,
         messages: list[dict[str, Any]],
         system_prompt: str | None = None,
-        tools: list[dict[str, Any]] | None = None,
+        tools: Sequence[Mapping[str, Any]] | None = None,
         max_tokens: int = 4096,
         **kwargs,
     ) -> LLMResponse:
@@ -104,6 +140,10 @@ class MockProvider(LLMProvider):
             LLMResponse with deterministic tool calls or text
         """
         self._call_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.script:
+            return self.script[min(_turns_since_command(messages), len(self.script) - 1)]
 
         # Extract the last user message
         user_message = ""
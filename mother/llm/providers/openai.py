@@ -1,6 +1,7 @@
 """OpenAI GPT LLM provider."""
 
 import json
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from openai import OpenAI
@@ -44,7 +45,7 @@ class OpenAIProvider(LLMProvider):
         self,
         messages: list[dict[str, Any]],
         system_prompt: str,
-        tools: list[dict[str, Any]] | None = None,
+        tools: Sequence[Mapping[str, Any]] | None = None,
     ) -> LLMResponse:
         if self._client is None:
             self._initialize_client()
@@ -1,6 +1,7 @@
 """Zhipu AI GLM-4 LLM provider."""
 
 import json
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from zhipuai import ZhipuAI
@@ -40,7 +41,7 @@ class ZhipuProvider(LLMProvider):
         self,
         messages: list[dict[str, Any]],
         system_prompt: str,
-        tools: list[dict[str, Any]] | None = None,
+        tools: Sequence[Mapping[str, Any]] | None = None,
     ) -> LLMResponse:
         if self._client is None:
             self._initialize_client()
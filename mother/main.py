@@ -7,8 +7,11 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from . import __version__
+from . import __version__, tracing
 from .agent.core import MotherAgent
+from .agent.router import ToolRouter
+from .agent.usage import UsageStore
+from .api.metrics import MetricsMiddleware
 from .api.routes import init_dependencies, router
 from .config.settings import get_settings
 from .plugins import PluginConfig, resolve_enabled_plugins
@@ -28,6 +31,11 @@ async def lifespan(app: FastAPI):
     # Startup
     settings = get_settings()
     logger.info(f"Starting Mother Agent v{__version__}")
+    tracing.configure(
+        enabled=settings.tracing_enabled,
+        sample_rate=settings.tracing_sample_rate,
+        export_path=settings.tracing_export_path,
+    )
 
     # Initialize tool registry with high-risk plugins explicitly enabled.
     # Resolution lives in mother.plugins so the CLI reports the same set.
@@ -50,6 +58,13 @@ async def lifespan(app: FastAPI):
         openai_api_key=settings.openai_api_key,
         enable_memory=True,
         settings=settings,  # Uses AI_PROVIDER from settings
+        tool_router=ToolRouter(registry, top_k=settings.tool_routing_top_k)
+        if settings.tool_routing_top_k > 0
+        else None,
+        max_result_chars=settings.max_tool_result_chars,
+        usage_store=UsageStore() if settings.token_accounting_enabled else None,
+        max_request_input_tokens=settings.max_request_input_tokens,
+        daily_key_token_budget=settings.daily_key_token_budget,
     )
     logger.info(f"Agent initialized with provider: {settings.ai_provider}")
     if agent.memory:
@@ -90,6 +105,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 # Include routes
 app.include_router(router)
 
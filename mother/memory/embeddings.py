@@ -5,6 +5,8 @@ import json
 import logging
 from pathlib import Path
 
+from ..tracing import traced
+
 logger = logging.getLogger("mother.memory")
 
 
@@ -73,6 +75,7 @@ class EmbeddingGenerator:
                 raise ImportError("openai package required: pip install openai")
         return self._client
 
+    @traced("memory.embed")
     def generate(self, text: str) -> list[float] | None:
         """Generate embedding for text."""
         if not text or not text.strip():
@@ -106,6 +109,7 @@ class EmbeddingGenerator:
             logger.error(f"Failed to generate embedding: {e}")
             return None
 
+    @traced("memory.embed")
     def generate_batch(self, texts: list[str]) -> list[list[float] | None]:
         """Generate embeddings for multiple texts."""
         results = []
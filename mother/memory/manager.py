@@ -3,6 +3,8 @@
 import logging
 from datetime import datetime
 
+from ..metrics import MEMORY_SEARCH_DURATION
+from ..tracing import traced
 from .embeddings import EmbeddingGenerator
 from .store import Memory, MemoryStore
 
@@ -31,6 +33,7 @@ class MemoryManager:
         )
         logger.info("Memory manager initialized")
 
+    @traced("memory.remember")
     def remember(
         self,
         session_id: str,
@@ -111,6 +114,7 @@ class MemoryManager:
             generate_embedding=True,
         )
 
+    @MEMORY_SEARCH_DURATION.timed()
     def recall(
         self,
         query: str,
@@ -156,6 +160,7 @@ class MemoryManager:
             for memory, similarity in results
         ]
 
+    @traced("memory.recall")
     def get_context_for_query(
         self,
         query: str,
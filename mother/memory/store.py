@@ -8,6 +8,8 @@ from pathlib import Path
 
 import numpy as np
 
+from ..metrics import SQLITE_OP_DURATION
+
 
 @dataclass
 class Memory:
@@ -82,6 +84,7 @@ class MemoryStore:
 
             conn.commit()
 
+    @SQLITE_OP_DURATION.timed(store="memory", op="add")
     def add(self, memory: Memory) -> int:
         """Add a memory to the store. Returns the memory ID."""
         with sqlite3.connect(self.db_path) as conn:
@@ -105,6 +108,7 @@ class MemoryStore:
             conn.commit()
             return cursor.lastrowid
 
+    @SQLITE_OP_DURATION.timed(store="memory", op="get")
     def get(self, memory_id: int) -> Memory | None:
         """Get a specific memory by ID."""
         with sqlite3.connect(self.db_path) as conn:
@@ -116,6 +120,7 @@ class MemoryStore:
                 return self._row_to_memory(row)
         return None
 
+    @SQLITE_OP_DURATION.timed(store="memory", op="get_recent")
     def get_recent(self, limit: int = 20, session_id: str | None = None) -> list[Memory]:
         """Get recent memories, optionally filtered by session."""
         with sqlite3.connect(self.db_path) as conn:
@@ -143,6 +148,7 @@ class MemoryStore:
 
             return [self._row_to_memory(row) for row in cursor.fetchall()]
 
+    @SQLITE_OP_DURATION.timed(store="memory", op="search_semantic")
     def search_semantic(
         self,
         query_embedding: list[float],
@@ -200,6 +206,7 @@ class MemoryStore:
 
             return results[:limit]
 
+    @SQLITE_OP_DURATION.timed(store="memory", op="search_text")
     def search_text(self, query: str, limit: int = 20) -> list[Memory]:
         """Simple text search in content."""
         with sqlite3.connect(self.db_path) as conn:
@@ -216,6 +223,7 @@ class MemoryStore:
 
             return [self._row_to_memory(row) for row in cursor.fetchall()]
 
+    @SQLITE_OP_DURATION.timed(store="memory", op="get_session_history")
     def get_session_history(self, session_id: str) -> list[Memory]:
         """Get all memories for a session in chronological order."""
         with sqlite3.connect(self.db_path) as conn:
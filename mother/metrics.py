@@ -0,0 +1,353 @@
+"""Prometheus-style metrics served at ``/metrics``.
+
+Counters and histograms are recorded into per-thread accumulators: each
+thread owns a shard that only it writes, so recording takes no lock and
+threads never contend. A scrape sums the shards. Gauges are read from
+callbacks at scrape time.
+
+All metrics live in one process-wide :data:`REGISTRY` and are rendered in
+the Prometheus text exposition format (version 0.0.4). The metrics the
+agent records are defined at the bottom of this module; callers import
+them and record with label values as keyword arguments::
+
+    from mother import metrics
+
+    metrics.LLM_TOKENS.inc(120, provider="anthropic", model="...", type="input")
+    with metrics.CAPABILITY_DURATION.time(capability="pdf_merge"):
+        ...
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the text exposition format."""
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        registry: MetricsRegistry | None = REGISTRY,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        # One dict per recording thread: label values -> accumulator
+        self._shards: list[dict[tuple[str, ...], Any]] = []
+        self._shards_lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _shard(self) -> dict[tuple[str, ...], Any]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: dict[tuple[str, ...], Any] = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _snapshot(self) -> list[dict[tuple[str, ...], Any]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        # dict.copy() is atomic under the GIL, so a shard being written to
+        # by its thread is read consistently
+        return [shard.copy() for shard in shards]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        key = self._key(labels)
+        return sum(shard.get(key, 0.0) for shard in self._snapshot())
+
+    def samples(self) -> list[str]:
+        totals: dict[tuple[str, ...], float] = {}
+        for shard in self._snapshot():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return [
+            f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(totals.items())
+        ]
+
+
+class Histogram(_Metric):
+    """A distribution of observed values over fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        registry: MetricsRegistry | None = REGISTRY,
+    ):
+        super().__init__(name, help, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        # Per-bucket (not cumulative) counts, then the sum
+        counts = shard.get(key)
+        if counts is None:
+            counts = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the duration of a block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def timed(self, **labels: Any) -> Callable[[F], F]:
+        """Decorator observing each call's duration (sync or async)."""
+
+        def decorate(func: F) -> F:
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    with self.time(**labels):
+                        return await func(*args, **kwargs)
+
+                return async_wrapper  # type: ignore[return-value]
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.time(**labels):
+                    return func(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate
+
+    def _totals(self) -> dict[tuple[str, ...], list[float]]:
+        totals: dict[tuple[str, ...], list[float]] = {}
+        for shard in self._snapshot():
+            for key, counts in shard.items():
+                counts = list(counts)
+                total = totals.get(key)
+                if total is None:
+                    totals[key] = counts
+                else:
+                    for i, n in enumerate(counts):
+                        total[i] += n
+        return totals
+
+    def count(self, **labels: Any) -> int:
+        counts = self._totals().get(self._key(labels))
+        return int(sum(counts[:-1])) if counts else 0
+
+    def samples(self) -> list[str]:
+        lines = []
+        bounds = (*self.buckets, math.inf)
+        for key, counts in sorted(self._totals().items()):
+            cumulative = 0
+            for bound, n in zip(bounds, counts, strict=False):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {int(cumulative)}")
+            labels = _labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(counts[-1])}")
+            # Derived from the buckets so it always matches the +Inf bucket
+            lines.append(f"{self.name}_count{labels} {int(cumulative)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """A value read from a callback at scrape time.
+
+    The callback returns a number, or for labelled gauges a mapping of
+    label value tuples to numbers. A failing callback yields no samples.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        registry: MetricsRegistry | None = REGISTRY,
+    ):
+        super().__init__(name, help, labelnames, registry)
+        self._callback: Callable[[], float | dict[tuple[str, ...], float]] | None = None
+
+    def set_function(self, callback: Callable[[], float | dict[tuple[str, ...], float]]) -> None:
+        self._callback = callback
+
+    def samples(self) -> list[str]:
+        if self._callback is None:
+            return []
+        try:
+            value = self._callback()
+        except Exception:
+            return []
+        if isinstance(value, dict):
+            return [
+                f"{self.name}{_labels(self.labelnames, key)} {_format_value(v)}" for key, v in sorted(value.items())
+            ]
+        return [f"{self.name} {_format_value(value)}"]
+
+
+def render() -> str:
+    """The process-wide metrics in the text exposition format."""
+    return REGISTRY.render()
+
+
+# --- Metrics recorded by the agent ---
+
+HTTP_REQUEST_DURATION = Histogram(
+    "mother_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+CAPABILITY_DURATION = Histogram(
+    "mother_capability_duration_seconds",
+    "Plugin capability execution time",
+    ("capability",),
+)
+CAPABILITY_ERRORS = Counter(
+    "mother_capability_errors_total",
+    "Failed plugin capability executions by error code",
+    ("capability", "code"),
+)
+LLM_REQUEST_DURATION = Histogram(
+    "mother_llm_request_duration_seconds",
+    "LLM API call latency",
+    ("provider", "model"),
+)
+LLM_TOKENS = Counter(
+    "mother_llm_tokens_total",
+    "LLM tokens used, by direction (input or output)",
+    ("provider", "model", "type"),
+)
+LLM_ERRORS = Counter(
+    "mother_llm_errors_total",
+    "Failed LLM API calls",
+    ("provider", "model"),
+)
+KEY_TOKENS = Counter(
+    "mother_key_tokens_total",
+    "LLM tokens used per API key ID, by direction (input or output)",
+    ("key_id", "type"),
+)
+TOKEN_BUDGET_EXCEEDED = Counter(
+    "mother_token_budget_exceeded_total",
+    "Requests stopped by a token budget (request_input or key_daily)",
+    ("budget",),
+)
+MEMORY_SEARCH_DURATION = Histogram(
+    "mother_memory_search_duration_seconds",
+    "Semantic memory search latency, including the query embedding",
+)
+SQLITE_OP_DURATION = Histogram(
+    "mother_sqlite_op_duration_seconds",
+    "SQLite operation latency by store and operation",
+    ("store", "op"),
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "mother_rate_limit_rejections_total",
+    "Requests rejected by the rate limiter, by role",
+    ("role",),
+)
+AUDIT_QUEUE_DEPTH = Gauge(
+    "mother_audit_queue_depth",
+    "Audit entries buffered and not yet written to disk",
+)
+AUDIT_DROPPED = Counter(
+    "mother_audit_dropped_total",
+    "Audit entries that could not be written",
+)
@@ -1,8 +1,20 @@
-"""Output parsers for CLI tool output."""
+"""Output parsers for CLI tool output.
+
+Output is tokenized once: ANSI codes are stripped in a single pass over the
+whole text, then each line is stripped and classified as blank, a table
+border or text. :class:`OutputParser` keeps the tokens of the last output
+it saw, so calling several extractors on the same output (a table, its
+key-value lines and a summary) reads it only once. :class:`TableParser`
+consumes lines one at a time and can be fed straight from a streaming
+subprocess reader.
+"""
+
+from __future__ import annotations
 
 import re
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, NamedTuple
 
 # ANSI escape code pattern
 ANSI_PATTERN = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
@@ -10,10 +22,58 @@ ANSI_PATTERN = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
 # Box drawing characters used by Rich (comprehensive set)
 BOX_CHARS = "─│┌┐└┘├┤┬┴┼═║╔╗╚╝╠╣╦╩╬┃┏┓┗┛┡┩┢┪━┯┷┠┨╭╮╯╰"
 
+# Vertical bars between cells, in order of preference
+CELL_SEPARATORS = ("┃", "│", "║")
+
+_VERTICALS = "│┃║┆┇┊┋╎╏"
+
+# A line made only of these is a table border: every box drawing character
+# (U+2500-U+257F) except the vertical bars, plus whitespace
+_BORDER_CHARS = "".join(c for c in map(chr, range(0x2500, 0x2580)) if c not in _VERTICALS) + " \t\r\f\v\xa0"
+
+_KEY_VALUE_PATTERNS = (
+    re.compile(r"^([A-Za-z][A-Za-z0-9\s\-_]+?):\s*(.+)$"),
+    re.compile(r"^([A-Za-z][A-Za-z0-9\s\-_]+?)\s{2,}(.+)$"),
+)
+
+_SUMMARY_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), key)
+    for pattern, key in (
+        (r"(\d+)\s+messages?", "messages"),
+        (r"(\d+)\s+new", "new"),
+        (r"(\d+)\s+accounts?", "accounts"),
+        (r"(\d+)\s+leads?", "leads"),
+        (r"(\d+)\s+documents?", "documents"),
+        (r"(\d+)\s+results?", "results"),
+        (r"Found\s+(\d+)", "found"),
+        (r"Total:\s*(\d+)", "total"),
+    )
+)
+
 
 def strip_ansi(text: str) -> str:
     """Remove ANSI escape codes from text."""
-    return ANSI_PATTERN.sub("", text)
+    return ANSI_PATTERN.sub("", text) if "\x1b" in text else text
+
+
+class Line(NamedTuple):
+    """One line of output, tokenized."""
+
+    # Without ANSI codes and surrounding whitespace
+    text: str
+    # True for a table border (horizontal rules, corners, joints)
+    border: bool
+
+
+def _line(clean: str) -> Line:
+    text = clean.strip()
+    return Line(text, bool(text) and not text.strip(_BORDER_CHARS))
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Line]:
+    """Tokenize output given as lines (e.g. from a streaming reader)."""
+    for raw in lines:
+        yield _line(strip_ansi(raw))
 
 
 @dataclass
@@ -25,135 +85,186 @@ class TableParseResult:
     title: str | None = None
 
 
+class TableParser:
+    """Incremental parser for Rich tables.
+
+    Feed it tokenized lines with :meth:`add`, or raw output in chunks of any
+    size with :meth:`feed`, then call :meth:`result`. Each line is looked
+    at once, so the cost is linear in the size of the output.
+
+    Rows are separated by border lines when the table has them. Without
+    them (Rich's default), a line whose first cell is empty continues the
+    previous row, as Rich does when it wraps a long cell. Which of the two
+    applies is only known once a border is followed by another data line,
+    so until then the data lines are held back and grouped later.
+    """
+
+    def __init__(self) -> None:
+        self.title: str | None = None
+        self.headers: list[str] = []
+        self.rows: list[dict[str, Any]] = []
+        self._in_table = False
+        self._row: list[str] | None = None
+        # Whether border lines separate the data rows; None until known
+        self._row_lines: bool | None = None
+        # Data lines seen while _row_lines is unknown
+        self._held: list[list[str]] = []
+        self._border_after_data = False
+        self._pending = ""
+
+    def feed(self, chunk: str) -> None:
+        """Add raw output; a trailing partial line waits for the next chunk."""
+        lines = (self._pending + chunk).split("\n")
+        self._pending = lines.pop()
+        for raw in lines:
+            self.add(_line(strip_ansi(raw)))
+
+    def add(self, line: Line) -> None:
+        """Add one tokenized line."""
+        text = line.text
+        if not text:
+            return
+        if line.border:
+            if self._row_lines:
+                self._end_row()
+            elif self._held:
+                self._border_after_data = True
+            return
+
+        # Rich draws the header row with heavy bars and the body with light ones
+        bars = text.replace("┃", "│").replace("║", "│")
+        if "│" not in bars:
+            if not self._in_table:
+                # Text before the table is its title
+                self.title = text
+            return
+        self._in_table = True
+
+        cells = bars.split("│")
+        start = 1 if not cells[0].strip() else 0
+        stop = len(cells) - 1 if len(cells) > 1 and not cells[-1].strip() else len(cells)
+        cells = [cell.strip() for cell in cells[start:stop]]
+
+        if not self.headers:
+            # First content row is headers
+            self.headers = [c for c in cells if c]
+        elif self._row_lines is None:
+            if not self._border_after_data:
+                self._held.append(cells)
+                return
+            # A border between data lines: every held line is one row
+            self._row_lines = True
+            for held in self._held:
+                self._extend_row(held)
+            self._held = []
+            self._end_row()
+            self._row = cells
+        elif self._row is None:
+            self._row = cells
+        else:
+            self._extend_row(cells)
+
+    def _extend_row(self, cells: list[str]) -> None:
+        """Append a continuation line's cells to the current row."""
+        row = self._row
+        if row is None:
+            self._row = cells
+            return
+        for j, cell in enumerate(cells[: len(row)]):
+            if cell:
+                row[j] = f"{row[j]} {cell}" if row[j] else cell
+
+    def _end_row(self) -> None:
+        row, self._row = self._row, None
+        if row is not None and len(row) == len(self.headers):
+            self.rows.append(dict(zip(self.headers, row, strict=True)))
+
+    def result(self) -> TableParseResult | None:
+        """Finish parsing; None if no table was found."""
+        if self._pending:
+            pending, self._pending = self._pending, ""
+            self.add(_line(strip_ansi(pending)))
+        # No border between data lines: rows start at a non-empty first cell
+        for cells in self._held:
+            if cells[0]:
+                self._end_row()
+            self._extend_row(cells)
+        self._held = []
+        self._end_row()
+        if not self.headers:
+            return None
+        return TableParseResult(headers=self.headers, rows=self.rows, title=self.title)
+
+
+class _Tokens(NamedTuple):
+    output: str
+    clean: str
+    lines: list[Line]
+
+
 class OutputParser:
     """Parser for CLI output formats."""
 
+    def __init__(self) -> None:
+        self._last: _Tokens | None = None
+
+    def _tokens(self, output: str) -> _Tokens:
+        """Tokenize ``output``, reusing the result for the same output."""
+        last = self._last
+        if last is not None and last.output == output:
+            return last
+        clean = strip_ansi(output)
+        tokens = _Tokens(output, clean, [_line(line) for line in clean.split("\n")])
+        self._last = tokens
+        return tokens
+
+    def _lines(self, output: str | Iterable[str]) -> Iterable[Line]:
+        if isinstance(output, str):
+            return self._tokens(output).lines
+        return tokenize(output)
+
     def is_separator_line(self, line: str) -> bool:
         """Check if line is a table separator (horizontal line only)."""
-        clean = strip_ansi(line).strip()
-        # Check if mostly horizontal separators (─, ━, ═) and corners/connectors
-        horiz_chars = set("─━═┌┐└┘├┤┬┴┼╔╗╚╝╠╣╦╩╬┏┓┗┛┡┩┢┪┯┷╭╮╯╰")
-        non_space = [c for c in clean if not c.isspace()]
-        if not non_space:
-            return False
-        return all(c in horiz_chars for c in non_space)
+        return _line(strip_ansi(line)).border
 
     def get_cell_separator(self, line: str) -> str | None:
         """Find the cell separator character in a line."""
-        for sep in ["┃", "│", "║"]:
+        for sep in CELL_SEPARATORS:
             if sep in line:
                 return sep
         return None
 
-    def parse_table(self, output: str) -> TableParseResult | None:
-        """Parse Rich table output into structured data."""
-        lines = output.split("\n")
-
-        title = None
-        headers = []
-        rows = []
-        current_row_cells = []
-        header_found = False
-        sep_char = None
-
-        for i, line in enumerate(lines):
-            clean = strip_ansi(line).strip()
-
-            # Skip empty lines
-            if not clean:
-                continue
-
-            # Skip separator lines
-            if self.is_separator_line(line):
-                # If we have accumulated cells and headers, save the row
-                if current_row_cells and header_found:
-                    if len(current_row_cells) == len(headers):
-                        # Merge multi-line cells
-                        row = {}
-                        for j, h in enumerate(headers):
-                            row[h] = current_row_cells[j].strip()
-                        rows.append(row)
-                    current_row_cells = []
-                continue
-
-            # Find separator character
-            if not sep_char:
-                sep_char = self.get_cell_separator(clean)
-
-            # Detect title (centered text before table)
-            if not sep_char and clean:
-                title = clean
-                continue
-
-            # Parse table content
-            if sep_char and sep_char in clean:
-                # Split by separator and clean up
-                cells = [c.strip() for c in clean.split(sep_char)]
-                # Remove empty edge cells
-                cells = [c for c in cells if c or cells.index(c) not in [0, len(cells) - 1]]
-                cells = [c.strip() for c in cells]
-
-                if not header_found:
-                    # First content row is headers
-                    headers = [c for c in cells if c]
-                    header_found = True
-                elif cells:
-                    # Data row - handle multi-line cells
-                    if not current_row_cells:
-                        current_row_cells = cells
-                    else:
-                        # Continuation of previous row (multi-line cell)
-                        for j, cell in enumerate(cells):
-                            if j < len(current_row_cells) and cell:
-                                if current_row_cells[j]:
-                                    current_row_cells[j] += " " + cell
-                                else:
-                                    current_row_cells[j] = cell
-
-        # Don't forget last row
-        if current_row_cells and header_found and len(current_row_cells) == len(headers):
-            row = {}
-            for j, h in enumerate(headers):
-                row[h] = current_row_cells[j].strip()
-            rows.append(row)
-
-        if headers:
-            return TableParseResult(
-                headers=headers,
-                rows=rows,
-                title=title,
-            )
+    def parse_table(self, output: str | Iterable[str]) -> TableParseResult | None:
+        """Parse Rich table output into structured data.
 
-        return None
+        Args:
+            output: The whole output, or an iterable of lines
+        """
+        parser = TableParser()
+        for line in self._lines(output):
+            parser.add(line)
+        return parser.result()
 
-    def parse_email_list(self, output: str) -> list[dict[str, Any]]:
+    def parse_email_list(self, output: str | Iterable[str]) -> list[dict[str, Any]]:
         """Parse an email-listing table into structured records."""
         emails = []
-        clean = strip_ansi(output)
-        lines = clean.split("\n")
-
-        # Find account/folder header
-        for line in lines:
-            line = line.strip()
-            if "@" in line and ("INBOX" in line or "Sent" in line or "Drafts" in line):
-                break
 
         # Look for table rows - box-drawing separators ┃ or │
         current_email = {}
-        for line in lines:
-            line = line.strip()
+        for line in self._lines(output):
+            text = line.text
 
             # Skip separators
-            if not line or self.is_separator_line(line):
+            if not text or line.border:
                 if current_email:
                     emails.append(current_email)
                     current_email = {}
                 continue
 
             # Parse data rows (contain │ or ┃)
-            sep = self.get_cell_separator(line)
-            if sep and line.count(sep) >= 2:
-                parts = [p.strip() for p in line.split(sep)]
+            sep = self.get_cell_separator(text)
+            if sep and text.count(sep) >= 2:
+                parts = [p.strip() for p in text.split(sep)]
                 parts = [p for p in parts if p]  # Remove empty
 
                 if len(parts) >= 3:
@@ -185,49 +296,30 @@ class OutputParser:
 
         return emails
 
-    def extract_key_values(self, output: str) -> dict[str, str]:
+    def extract_key_values(self, output: str | Iterable[str]) -> dict[str, str]:
         """Extract key-value pairs from formatted output."""
         result = {}
-        clean = strip_ansi(output)
 
         # Pattern: "Key: Value" or "Key   Value"
-        patterns = [
-            r"^([A-Za-z][A-Za-z0-9\s\-_]+?):\s*(.+)$",
-            r"^([A-Za-z][A-Za-z0-9\s\-_]+?)\s{2,}(.+)$",
-        ]
-
-        for line in clean.split("\n"):
-            line = line.strip()
-
-            for pattern in patterns:
-                match = re.match(pattern, line)
+        for line in self._lines(output):
+            if line.border:
+                continue
+            for pattern in _KEY_VALUE_PATTERNS:
+                match = pattern.match(line.text)
                 if match:
-                    key = match.group(1).strip()
-                    value = match.group(2).strip()
-                    result[key] = value
+                    result[match.group(1).strip()] = match.group(2).strip()
                     break
 
         return result
 
     def extract_summary(self, output: str) -> dict[str, Any]:
         """Extract summary statistics from output."""
-        clean = strip_ansi(output)
+        clean = self._tokens(output).clean
         result = {}
 
         # Common patterns for counts
-        patterns = [
-            (r"(\d+)\s+messages?", "messages"),
-            (r"(\d+)\s+new", "new"),
-            (r"(\d+)\s+accounts?", "accounts"),
-            (r"(\d+)\s+leads?", "leads"),
-            (r"(\d+)\s+documents?", "documents"),
-            (r"(\d+)\s+results?", "results"),
-            (r"Found\s+(\d+)", "found"),
-            (r"Total:\s*(\d+)", "total"),
-        ]
-
-        for pattern, key in patterns:
-            match = re.search(pattern, clean, re.IGNORECASE)
+        for pattern, key in _SUMMARY_PATTERNS:
+            match = pattern.search(clean)
             if match:
                 result[key] = int(match.group(1))
 
@@ -235,7 +327,7 @@ class OutputParser:
 
     def extract_email_header(self, output: str) -> dict[str, str]:
         """Extract email header fields from read output."""
-        clean = strip_ansi(output)
+        clean = self._tokens(output).clean
         result = {}
 
         header_patterns = {
@@ -255,7 +347,7 @@ class OutputParser:
 
     def extract_body(self, output: str, after_marker: str = "Message") -> str:
         """Extract body text after a marker."""
-        clean = strip_ansi(output)
+        clean = self._tokens(output).clean
 
         # Look for marker line
         marker_pattern = rf"{after_marker}\s*[\─═]+\s*\n"
@@ -280,7 +372,7 @@ class OutputParser:
 
     def is_success_message(self, output: str) -> bool:
         """Check if output indicates success."""
-        clean = strip_ansi(output).lower()
+        clean = self._tokens(output).clean.lower()
         success_patterns = [
             "success",
             "completed",
@@ -295,7 +387,7 @@ class OutputParser:
 
     def is_error_message(self, output: str) -> bool:
         """Check if output indicates an error."""
-        clean = strip_ansi(output).lower()
+        clean = self._tokens(output).clean.lower()
         error_patterns = [
             "error",
             "failed",
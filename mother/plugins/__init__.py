@@ -27,10 +27,13 @@ from __future__ import annotations
 
 import logging
 import os
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from ..metrics import CAPABILITY_DURATION, CAPABILITY_ERRORS
+from ..tracing import span
 from .base import PluginBase, PluginInfo, PluginResult, ResultStatus
 from .exceptions import (
     CapabilityNotFoundError,
@@ -74,6 +77,7 @@ from .schema import (
     parse_semver,
     validate_params,
 )
+from .search import SearchIndex
 
 logger = logging.getLogger("mother.plugins")
 
@@ -102,6 +106,7 @@ __all__ = [
     # Registry
     "PluginRegistry",
     "CapabilityEntry",
+    "SearchIndex",
     # Loader
     "PluginLoader",
     # Executor
@@ -448,26 +453,32 @@ class PluginManager:
 
         # Execute
         try:
-            result = await entry.executor.execute(
-                entry.capability_name,
-                params,
-            )
+            with span("plugin.execute", capability=capability_name):
+                with CAPABILITY_DURATION.time(capability=capability_name):
+                    result = await entry.executor.execute(
+                        entry.capability_name,
+                        params,
+                    )
+            if not result.success:
+                CAPABILITY_ERRORS.inc(capability=capability_name, code=result.error_code or "UNKNOWN")
             return result
 
         except PluginTimeoutError:
+            CAPABILITY_ERRORS.inc(capability=capability_name, code="TIMEOUT")
             raise
         except Exception as e:
+            CAPABILITY_ERRORS.inc(capability=capability_name, code="EXECUTION_ERROR")
             raise ExecutionError(
                 entry.plugin_name,
                 entry.capability_name,
                 str(e),
             )
 
-    def get_all_schemas(self) -> list[dict[str, Any]]:
+    def get_all_schemas(self) -> tuple[Mapping[str, Any], ...]:
         """Get all capability schemas for Claude tool_use.
 
         Returns:
-            List of tool schemas
+            Shared tuple of read-only tool schemas
         """
         return self._registry.get_all_anthropic_schemas()
 
@@ -531,17 +542,23 @@ class PluginManager:
         """
         return self._registry.requires_confirmation(capability_name)
 
-    def search_capabilities(self, query: str, limit: int = 10) -> list[CapabilityEntry]:
+    def search_capabilities(
+        self,
+        query: str,
+        limit: int = 10,
+        semantic: bool = False,
+    ) -> list[CapabilityEntry]:
         """Search capabilities by name or description.
 
         Args:
             query: Search query
             limit: Maximum results
+            semantic: Re-rank results with the registry's embedder, if set
 
         Returns:
             List of matching capabilities
         """
-        return self._registry.search_capabilities(query, limit)
+        return self._registry.search_capabilities(query, limit, semantic=semantic)
 
     def get_plugin_info(self, plugin_name: str) -> PluginInfo | None:
         """Get detailed info about a plugin.
@@ -5,6 +5,8 @@ Provides document processing capabilities: parse, store, search, extract tables.
 
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -19,13 +21,13 @@ from ...manifest import (
     PluginMetadata,
     PythonExecutionSpec,
 )
+from .ingest import DEFAULT_BATCH_SIZE, IngestJob, IngestPipeline, default_workers, pool_context
 from .parsers import (
-    chunk_text,
-    detect_document_type,
     is_supported,
     parse_document,
 )
-from .storage import Document, DocumentStore
+from .storage import SEARCH_MODES, DocumentStore
+from .vectors import BatchEmbedder, HashEmbedder
 
 
 def _create_manifest() -> PluginManifest:
@@ -43,7 +45,11 @@ def _create_manifest() -> PluginManifest:
             # Process documents
             CapabilitySpec(
                 name="process",
-                description="Process a document: parse content, chunk text, extract entities, and store for search.",
+                description=(
+                    "Process a document or directory: parse content, chunk text, extract entities, and store for "
+                    "search. Directories are parsed in parallel and files already stored are skipped. Use "
+                    "background=true for large directories and poll job_status."
+                ),
                 parameters=[
                     ParameterSpec(
                         name="path",
@@ -71,12 +77,61 @@ def _create_manifest() -> PluginManifest:
                         required=False,
                         default=False,
                     ),
+                    ParameterSpec(
+                        name="background",
+                        type=ParameterType.BOOLEAN,
+                        description="Return a job ID immediately and keep processing in the background",
+                        required=False,
+                        default=False,
+                    ),
+                    ParameterSpec(
+                        name="job_id",
+                        type=ParameterType.STRING,
+                        description="Resume a cancelled or interrupted job (path and options come from the job)",
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="batch_size",
+                        type=ParameterType.INTEGER,
+                        description=f"Documents written per database transaction (default: {DEFAULT_BATCH_SIZE})",
+                        required=False,
+                        default=DEFAULT_BATCH_SIZE,
+                    ),
+                ],
+            ),
+            # Ingestion job status
+            CapabilitySpec(
+                name="job_status",
+                description="Get progress and results of a background processing job.",
+                parameters=[
+                    ParameterSpec(
+                        name="job_id",
+                        type=ParameterType.STRING,
+                        description="Job ID returned by process",
+                        required=True,
+                    ),
+                ],
+            ),
+            # Cancel ingestion job
+            CapabilitySpec(
+                name="cancel_job",
+                description="Cancel a running processing job. Documents stored so far are kept; resume with process.",
+                parameters=[
+                    ParameterSpec(
+                        name="job_id",
+                        type=ParameterType.STRING,
+                        description="Job ID returned by process",
+                        required=True,
+                    ),
                 ],
             ),
             # Search documents
             CapabilitySpec(
                 name="search",
-                description="Search processed documents using full-text search.",
+                description=(
+                    "Search processed documents. Keyword mode uses full-text search; semantic and hybrid modes "
+                    "also match paraphrases when embeddings are configured. Results include highlighted snippets."
+                ),
                 parameters=[
                     ParameterSpec(
                         name="query",
@@ -84,6 +139,13 @@ def _create_manifest() -> PluginManifest:
                         description="Search query",
                         required=True,
                     ),
+                    ParameterSpec(
+                        name="mode",
+                        type=ParameterType.STRING,
+                        description="keyword, semantic or hybrid (default: hybrid with embeddings, else keyword)",
+                        required=False,
+                        choices=list(SEARCH_MODES),
+                    ),
                     ParameterSpec(
                         name="doc_type",
                         type=ParameterType.STRING,
@@ -193,6 +255,28 @@ def _create_manifest() -> PluginManifest:
     )
 
 
+def _make_embedder(config: dict[str, Any]) -> BatchEmbedder | None:
+    """Build the chunk embedder named by the ``embeddings`` config key.
+
+    ``hash`` is a local, deterministic embedder (``embedding_dim``, default
+    256); ``openai`` uses the OpenAI embeddings API like the memory system.
+    """
+    kind = config.get("embeddings")
+    if not kind:
+        return None
+    if kind == "hash":
+        return HashEmbedder(int(config.get("embedding_dim", 256)))
+    if kind == "openai":
+        from ....memory.embeddings import EmbeddingGenerator
+
+        generator = EmbeddingGenerator(
+            api_key=config.get("openai_api_key"),
+            model=config.get("embedding_model", "text-embedding-3-small"),
+        )
+        return generator.generate_batch
+    raise ValueError(f"Unknown embeddings backend: {kind} (use hash or openai)")
+
+
 class DatacraftPlugin(PluginBase):
     """Built-in plugin for document processing."""
 
@@ -204,7 +288,12 @@ class DatacraftPlugin(PluginBase):
         db_path = None
         if config and "db_path" in config:
             db_path = Path(config["db_path"])
-        self._store = DocumentStore(db_path)
+        self._store = DocumentStore(db_path, embedder=_make_embedder(self.config))
+
+        # Parser processes are started on first use
+        self._workers = int(self.config.get("ingest_workers") or default_workers())
+        self._executor: ProcessPoolExecutor | None = None
+        self._jobs: dict[str, IngestJob] = {}
 
     def _resolve_path(self, path_str: str) -> Path:
         """Resolve and expand a path string."""
@@ -217,6 +306,8 @@ class DatacraftPlugin(PluginBase):
         """Execute a datacraft capability."""
         handlers = {
             "process": self._process,
+            "job_status": self._job_status,
+            "cancel_job": self._cancel_job,
             "search": self._search,
             "tables": self._tables,
             "get": self._get,
@@ -256,14 +347,46 @@ class DatacraftPlugin(PluginBase):
                 code="PROCESSING_ERROR",
             )
 
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers, mp_context=pool_context())
+        return self._executor
+
+    def _replace_pool(self, broken: Executor) -> ProcessPoolExecutor:
+        """Drop a pool broken by a dying worker and start a new one."""
+        if self._executor is broken:
+            self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+        return self._pool()
+
+    def _pipeline(self) -> IngestPipeline:
+        return IngestPipeline(self._store, self._pool(), self._workers, replace_executor=self._replace_pool)
+
     async def _process(
         self,
-        path: str,
+        path: str | None = None,
         doc_type: str | None = None,
         recursive: bool = False,
         no_store: bool = False,
+        background: bool = False,
+        job_id: str | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ) -> PluginResult:
         """Process document(s) and optionally store them."""
+        if job_id:
+            running = self._jobs.get(job_id)
+            if running and running.status == "running":
+                return PluginResult.error_result(f"Job is still running: {job_id}", code="JOB_RUNNING")
+            record = self._store.get_job(job_id)
+            if not record:
+                return PluginResult.error_result(f"Job not found: {job_id}", code="NOT_FOUND")
+            path = record["path"]
+            doc_type = record["params"].get("doc_type")
+            recursive = record["params"].get("recursive", False)
+            batch_size = record["params"].get("batch_size", batch_size)
+        elif not path:
+            raise ValueError("Either path or job_id is required")
+
         input_path = self._resolve_path(path)
 
         if not input_path.exists():
@@ -272,16 +395,11 @@ class DatacraftPlugin(PluginBase):
                 code="FILE_NOT_FOUND",
             )
 
-        results = []
-
         if input_path.is_file():
-            # Process single file
-            result = await self._process_file(input_path, doc_type, no_store)
-            results.append(result)
+            files = [input_path]
         else:
-            # Process directory
             pattern = "**/*" if recursive else "*"
-            files = [f for f in input_path.glob(pattern) if f.is_file() and is_supported(f)]
+            files = sorted(f for f in input_path.glob(pattern) if f.is_file() and is_supported(f))
 
             if not files:
                 return PluginResult.error_result(
@@ -289,99 +407,99 @@ class DatacraftPlugin(PluginBase):
                     code="NO_DOCUMENTS",
                 )
 
-            for file_path in files:
-                result = await self._process_file(file_path, doc_type, no_store)
-                results.append(result)
+        job = IngestJob.create(
+            input_path,
+            files,
+            job_id=job_id,
+            doc_type=doc_type,
+            recursive=recursive,
+            no_store=no_store,
+            batch_size=max(1, batch_size),
+        )
+        self._jobs[job.job_id] = job
+        # A single file gains nothing from a process pool
+        pipeline = self._pipeline() if len(files) > 1 else IngestPipeline(self._store, None, 1)
 
-        successful = [r for r in results if r.get("success")]
-        failed = [r for r in results if not r.get("success")]
+        if background:
+            job.status = "running"
+            job.task = asyncio.create_task(pipeline.run(job))
+            return PluginResult.success_result(
+                data={"job_id": job.job_id, "status": "running", "total": job.total},
+                message=f"Processing {job.total} document(s) in the background (job {job.job_id})",
+            )
 
+        await pipeline.run(job)
         return PluginResult.success_result(
             data={
-                "processed": len(successful),
-                "failed": len(failed),
-                "documents": results,
+                "job_id": job.job_id,
+                "status": job.status,
+                "processed": job.processed,
+                "skipped": job.skipped,
+                "failed": job.failed,
+                "documents": job.documents,
             },
-            message=f"Processed {len(successful)} document(s), {len(failed)} failed",
+            message=f"Processed {job.processed} document(s), {job.skipped} already stored, {job.failed} failed",
         )
 
-    async def _process_file(
-        self,
-        file_path: Path,
-        doc_type: str | None,
-        no_store: bool,
-    ) -> dict[str, Any]:
-        """Process a single file."""
-        try:
-            if not is_supported(file_path):
-                return {
-                    "success": False,
-                    "filename": file_path.name,
-                    "error": f"Unsupported file type: {file_path.suffix}",
-                }
-
-            # Parse document
-            parsed = parse_document(file_path)
-
-            # Detect type if not specified
-            if doc_type:
-                detected_type = doc_type
-            else:
-                detected_type = detect_document_type(file_path.name, parsed.content)
-
-            # Create chunks
-            chunks = chunk_text(parsed.content)
-
-            # Generate document ID
-            doc_id = self._store.generate_doc_id(parsed.content, file_path.name)
-
-            # Create document object
-            doc = Document(
-                doc_id=doc_id,
-                filename=file_path.name,
-                doc_type=detected_type,
-                content=parsed.content,
-                chunks=chunks,
-                metadata=parsed.metadata,
-                entities=parsed.entities,
-                file_hash=parsed.file_hash,
-                pages=parsed.pages,
+    async def _job_status(self, job_id: str) -> PluginResult:
+        """Get the state of an ingestion job."""
+        job = self._jobs.get(job_id)
+        data = job.summary() if job else self._store.get_job(job_id)
+
+        if not data:
+            return PluginResult.error_result(
+                f"Job not found: {job_id}",
+                code="NOT_FOUND",
             )
 
-            # Store if requested
-            if not no_store:
-                self._store.store_document(doc)
-
-            return {
-                "success": True,
-                "doc_id": doc_id,
-                "filename": file_path.name,
-                "doc_type": detected_type,
-                "pages": parsed.pages,
-                "chunks": len(chunks),
-                "entities": len(parsed.entities),
-                "tables": len(parsed.tables),
-            }
+        return PluginResult.success_result(
+            data=data,
+            message=(
+                f"Job {job_id} {data['status']}: {data['processed']} processed, "
+                f"{data['skipped']} skipped, {data['failed']} failed of {data['total']}"
+            ),
+        )
 
-        except Exception as e:
-            return {
-                "success": False,
-                "filename": file_path.name,
-                "error": str(e),
-            }
+    async def _cancel_job(self, job_id: str) -> PluginResult:
+        """Stop an ingestion job after the files in flight."""
+        job = self._jobs.get(job_id)
+
+        if not job:
+            return PluginResult.error_result(
+                f"Job not found: {job_id}",
+                code="NOT_FOUND",
+            )
+        if job.status != "running":
+            return PluginResult.error_result(
+                f"Job is not running: {job_id} ({job.status})",
+                code="JOB_NOT_RUNNING",
+            )
+
+        job.cancelled.set()
+        if job.task:
+            await job.task
+
+        return PluginResult.success_result(
+            data=job.to_record(),
+            message=f"Cancelled job {job_id} after {job.done} of {job.total} file(s)",
+        )
 
     async def _search(
         self,
         query: str,
         doc_type: str | None = None,
         limit: int = 10,
+        mode: str | None = None,
     ) -> PluginResult:
         """Search documents."""
-        results = self._store.search(query, doc_type, limit)
+        if mode is None:
+            mode = "keyword" if self._store.embedder is None else "hybrid"
+        results = await asyncio.to_thread(self._store.search, query, doc_type, limit, mode)
 
         return PluginResult.success_result(
             data={
                 "query": query,
+                "mode": mode,
                 "count": len(results),
                 "results": [r.to_dict() for r in results],
             },
@@ -533,5 +651,17 @@ class DatacraftPlugin(PluginBase):
                 code="DELETE_FAILED",
             )
 
+    async def shutdown(self) -> None:
+        """Cancel running jobs and stop parser processes."""
+        for job in self._jobs.values():
+            job.cancelled.set()
+        tasks = [job.task for job in self._jobs.values() if job.task]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        await super().shutdown()
+
 
 __all__ = ["DatacraftPlugin"]
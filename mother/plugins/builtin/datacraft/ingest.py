@@ -0,0 +1,344 @@
+"""Batched document ingestion for the datacraft plugin.
+
+Parsing runs in a process pool sized to the machine's cores, so CPU-bound
+backends do not serialise on the GIL or block the event loop. The workers
+start from a fork server rather than a fork of the threaded server, and a
+pool broken by a dying worker is replaced mid-job. Parsed
+documents are written in batched transactions (and embedded, if the store
+has an embedder), files whose hash is already stored are skipped, and
+progress is streamed through the live output callback. Jobs are recorded
+in the document store so an interrupted or cancelled job can be resumed:
+the files it already stored are skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ...process import live_output_callback
+from .parsers import (
+    chunk_text,
+    compute_file_hash,
+    detect_document_type,
+    is_supported,
+    parse_document,
+)
+from .storage import Document, DocumentStore
+
+logger = logging.getLogger("mother.plugins.datacraft.ingest")
+
+DEFAULT_BATCH_SIZE = 32
+
+# Merge the full-text index once a job has stored this many chunks
+OPTIMIZE_AFTER_CHUNKS = 10_000
+
+
+def default_workers() -> int:
+    """Number of parser processes to use by default."""
+    return os.cpu_count() or 1
+
+
+def pool_context() -> multiprocessing.context.BaseContext:
+    """Start method for parser processes that does not fork the threaded server."""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Workers fork from a server that has already imported this module
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def parse_file(path: str, doc_type: str | None) -> dict[str, Any]:
+    """Parse, classify and chunk one file.
+
+    Runs in a worker process, so it takes and returns plain picklable values.
+    """
+    file_path = Path(path)
+    parsed = parse_document(file_path)
+    return {
+        "content": parsed.content,
+        "pages": parsed.pages,
+        "tables": len(parsed.tables),
+        "metadata": parsed.metadata,
+        "entities": parsed.entities,
+        "file_hash": parsed.file_hash,
+        "doc_type": doc_type or detect_document_type(file_path.name, parsed.content),
+        "chunks": chunk_text(parsed.content),
+    }
+
+
+@dataclass
+class IngestJob:
+    """State of one ingestion run."""
+
+    job_id: str
+    path: str
+    files: list[Path]
+    doc_type: str | None = None
+    recursive: bool = False
+    no_store: bool = False
+    batch_size: int = DEFAULT_BATCH_SIZE
+    status: str = "pending"
+    processed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    chunks: int = 0
+    error: str | None = None
+    documents: list[dict[str, Any]] = field(default_factory=list)
+    cancelled: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task | None = None
+
+    @classmethod
+    def create(cls, path: Path, files: list[Path], job_id: str | None = None, **params: Any) -> IngestJob:
+        return cls(job_id=job_id or uuid.uuid4().hex[:12], path=str(path), files=files, **params)
+
+    @property
+    def total(self) -> int:
+        return len(self.files)
+
+    @property
+    def done(self) -> int:
+        return self.processed + self.skipped + self.failed
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return {
+            "doc_type": self.doc_type,
+            "recursive": self.recursive,
+            "no_store": self.no_store,
+            "batch_size": self.batch_size,
+        }
+
+    def to_record(self) -> dict[str, Any]:
+        """Fields persisted in the ``ingest_jobs`` table."""
+        return {
+            "job_id": self.job_id,
+            "path": self.path,
+            "params": self.params,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "error": self.error,
+        }
+
+    def summary(self) -> dict[str, Any]:
+        return {**self.to_record(), "documents": self.documents}
+
+
+class IngestPipeline:
+    """Runs ingestion jobs against a document store."""
+
+    def __init__(
+        self,
+        store: DocumentStore,
+        executor: Executor | None,
+        max_workers: int,
+        replace_executor: Callable[[Executor], Executor] | None = None,
+    ):
+        """
+        Args:
+            store: Where parsed documents are written
+            executor: Pool that runs :func:`parse_file`; ``None`` parses in threads
+            max_workers: Files in flight at once
+            replace_executor: Called with a process pool broken by a dying
+                worker; returns the pool to use instead
+        """
+        self.store = store
+        self.executor = executor
+        self.max_workers = max(1, max_workers)
+        self.replace_executor = replace_executor
+
+    async def run(self, job: IngestJob) -> IngestJob:
+        """Process every file of ``job``, honouring cancellation."""
+        job.status = "running"
+        await self._save(job)
+
+        known = {} if job.no_store else await asyncio.to_thread(self.store.known_file_hashes)
+        pending: list[Document] = []
+        write_lock = asyncio.Lock()
+        files = iter(job.files)
+        progress = live_output_callback()
+
+        async def report(result: dict[str, Any]) -> None:
+            nonlocal progress
+            if progress is None:
+                return
+            try:
+                sent = progress("progress", self._progress_line(job, result))
+                if inspect.isawaitable(sent):
+                    await sent
+            except Exception as e:
+                logger.warning(f"Progress callback failed, disabling it: {e}")
+                progress = None
+
+        async def flush() -> None:
+            async with write_lock:
+                if not pending:
+                    return
+                batch = pending[:]
+                pending.clear()
+                await asyncio.to_thread(self.store.store_documents, batch)
+                if self.store.embedder is not None:
+                    await asyncio.to_thread(self.store.embed_pending)
+                await self._save(job)
+
+        async def worker() -> None:
+            for file_path in files:
+                if job.cancelled.is_set():
+                    return
+                result = await self._ingest_file(file_path, job, known, pending)
+                job.documents.append(result)
+                if not result["success"]:
+                    job.failed += 1
+                elif result.get("skipped"):
+                    job.skipped += 1
+                else:
+                    job.processed += 1
+                    job.chunks += result["chunks"]
+                await report(result)
+                if len(pending) >= job.batch_size:
+                    await flush()
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.max_workers, job.total or 1))))
+            await flush()
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            await self._save(job)
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            await self._save(job)
+            raise
+
+        if job.chunks >= OPTIMIZE_AFTER_CHUNKS and not job.no_store:
+            await asyncio.to_thread(self.store.optimize_index)
+
+        job.status = "cancelled" if job.cancelled.is_set() and job.done < job.total else "completed"
+        await self._save(job)
+        return job
+
+    async def _ingest_file(
+        self,
+        file_path: Path,
+        job: IngestJob,
+        known: dict[str, str],
+        pending: list[Document],
+    ) -> dict[str, Any]:
+        """Parse one file and queue it for storage."""
+        try:
+            if not is_supported(file_path):
+                return {
+                    "success": False,
+                    "filename": file_path.name,
+                    "error": f"Unsupported file type: {file_path.suffix}",
+                }
+
+            if not job.no_store:
+                file_hash = await asyncio.to_thread(compute_file_hash, file_path)
+                if file_hash in known:
+                    return {
+                        "success": True,
+                        "skipped": True,
+                        "doc_id": known[file_hash],
+                        "filename": file_path.name,
+                    }
+
+            parsed = await self._parse(file_path, job.doc_type)
+            doc_id = self.store.generate_doc_id(parsed["content"], file_path.name)
+            if not job.no_store:
+                known.setdefault(parsed["file_hash"], doc_id)
+                pending.append(
+                    Document(
+                        doc_id=doc_id,
+                        filename=file_path.name,
+                        doc_type=parsed["doc_type"],
+                        content=parsed["content"],
+                        chunks=parsed["chunks"],
+                        metadata=parsed["metadata"],
+                        entities=parsed["entities"],
+                        file_hash=parsed["file_hash"],
+                        pages=parsed["pages"],
+                    )
+                )
+
+            return {
+                "success": True,
+                "doc_id": doc_id,
+                "filename": file_path.name,
+                "doc_type": parsed["doc_type"],
+                "pages": parsed["pages"],
+                "chunks": len(parsed["chunks"]),
+                "entities": len(parsed["entities"]),
+                "tables": parsed["tables"],
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "filename": file_path.name,
+                "error": str(e),
+            }
+
+    async def _parse(self, file_path: Path, doc_type: str | None) -> dict[str, Any]:
+        if self.executor is None:
+            return await asyncio.to_thread(parse_file, str(file_path), doc_type)
+        return await self._submit(parse_file, str(file_path), doc_type)
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn`` in the process pool, replacing the pool if it broke.
+
+        A submission rejected by a pool an earlier file broke is retried on
+        the replacement; the file whose worker died fails on its own.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            future = loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            executor = self._replace(executor)
+            future = loop.run_in_executor(executor, fn, *args)
+        try:
+            return await future
+        except BrokenProcessPool:
+            self._replace(executor)
+            raise
+
+    def _replace(self, broken: Executor) -> Executor:
+        if self.replace_executor is None:
+            raise BrokenProcessPool("Parser pool is broken")
+        if self.executor is broken:
+            logger.warning("A parser process died, starting a new pool")
+            self.executor = self.replace_executor(broken)
+        return self.executor
+
+    async def _save(self, job: IngestJob) -> None:
+        if not job.no_store:
+            await asyncio.to_thread(self.store.save_job, job.to_record())
+
+    @staticmethod
+    def _progress_line(job: IngestJob, result: dict[str, Any]) -> bytes:
+        """A JSON progress line for the live output callback."""
+        event = {
+            "job_id": job.job_id,
+            "done": job.done,
+            "total": job.total,
+            "filename": result["filename"],
+            "status": "skipped" if result.get("skipped") else "ok" if result["success"] else "failed",
+        }
+        return (json.dumps(event) + "\n").encode()
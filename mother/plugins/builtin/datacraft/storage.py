@@ -5,11 +5,31 @@ from __future__ import annotations
 import hashlib
 import json
 import sqlite3
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .vectors import BatchEmbedder, VectorIndex, to_blob
+
+# Batches with at least this many chunks index them for full-text search in
+# one statement after the inserts instead of through the per-row trigger
+FTS_DEFER_THRESHOLD = 500
+
+SEARCH_MODES = ("keyword", "semantic", "hybrid")
+# Reciprocal-rank fusion constant; larger values flatten the rank curve
+RRF_K = 60
+SEARCH_CACHE_SIZE = 256
+
+_CHUNKS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+        INSERT INTO chunks_fts(rowid, content, doc_id, chunk_index)
+        VALUES (new.id, new.content, new.doc_id, new.chunk_index);
+    END
+"""
+
 
 @dataclass
 class Document:
@@ -51,6 +71,7 @@ class SearchResult:
     score: float
     content_preview: str
     chunk_index: int = 0
+    snippet: str = ""
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -60,23 +81,33 @@ class SearchResult:
             "doc_type": self.doc_type,
             "score": self.score,
             "content_preview": self.content_preview,
+            "snippet": self.snippet,
         }
 
 
 class DocumentStore:
     """SQLite-based document storage with full-text search."""
 
-    def __init__(self, db_path: Path | None = None):
+    def __init__(self, db_path: Path | None = None, embedder: BatchEmbedder | None = None, nprobe: int = 16):
         """Initialize document store.
 
         Args:
             db_path: Path to SQLite database. Defaults to ~/.config/mother/datacraft.db
+            embedder: Optional batch embedding function; enables semantic and hybrid search
+            nprobe: Vector index clusters scanned per query
         """
         if db_path is None:
             db_path = Path.home() / ".config" / "mother" / "datacraft.db"
 
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.embedder = embedder
+        self._vectors = VectorIndex(db_path.with_name(db_path.name + ".vectors"), nprobe=nprobe)
+        self._vectors_lock = threading.Lock()
+        # Guards both LRU caches below; searches run in worker threads
+        self._cache_lock = threading.Lock()
+        self._cache: OrderedDict[tuple, list[SearchResult]] = OrderedDict()
+        self._query_vectors: OrderedDict[str, Any] = OrderedDict()
         self._init_db()
 
     def _init_db(self) -> None:
@@ -139,12 +170,7 @@ class DocumentStore:
             """)
 
             # Triggers to keep FTS in sync
-            conn.execute("""
-                CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
-                    INSERT INTO chunks_fts(rowid, content, doc_id, chunk_index)
-                    VALUES (new.id, new.content, new.doc_id, new.chunk_index);
-                END
-            """)
+            conn.execute(_CHUNKS_INSERT_TRIGGER)
 
             conn.execute("""
                 CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
@@ -153,8 +179,10 @@ class DocumentStore:
                 END
             """)
 
+            # Only content changes touch the index (not embedding writes)
+            conn.execute("DROP TRIGGER IF EXISTS chunks_au")
             conn.execute("""
-                CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE ON chunks BEGIN
+                CREATE TRIGGER chunks_au AFTER UPDATE OF content ON chunks BEGIN
                     INSERT INTO chunks_fts(chunks_fts, rowid, content, doc_id, chunk_index)
                     VALUES('delete', old.id, old.content, old.doc_id, old.chunk_index);
                     INSERT INTO chunks_fts(rowid, content, doc_id, chunk_index)
@@ -164,11 +192,62 @@ class DocumentStore:
 
             # Indexes
             conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_doc_id ON chunks(doc_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_unembedded ON chunks(id) WHERE embedding IS NULL")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_entities_doc_id ON entities(doc_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(doc_type)")
+            self._ensure_unique_file_hash(conn)
+
+            # Change counters: "data" for any write, "vectors" for writes that
+            # invalidate the vector index
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO store_meta VALUES ('data', 0), ('vectors', 0)")
+
+            # Directory ingestion jobs, so interrupted jobs can be resumed
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingest_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    processed INTEGER NOT NULL DEFAULT 0,
+                    skipped INTEGER NOT NULL DEFAULT 0,
+                    failed INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
 
             conn.commit()
 
+    @staticmethod
+    def _ensure_unique_file_hash(conn: sqlite3.Connection) -> None:
+        """Create the unique file hash index, migrating older databases.
+
+        Databases written before the index existed may hold the same file
+        under several IDs. The oldest copy keeps the hash; the others have it
+        cleared so the index can be built.
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_documents_file_hash_unique'"
+        ).fetchone()
+        if exists:
+            return
+        conn.execute("DROP INDEX IF EXISTS idx_documents_file_hash")
+        conn.execute("""
+            UPDATE documents SET file_hash = ''
+            WHERE file_hash != '' AND rowid NOT IN (
+                SELECT MIN(rowid) FROM documents WHERE file_hash != '' GROUP BY file_hash
+            )
+        """)
+        conn.execute("CREATE UNIQUE INDEX idx_documents_file_hash_unique ON documents(file_hash) WHERE file_hash != ''")
+
     def generate_doc_id(self, content: str, filename: str) -> str:
         """Generate a unique document ID based on content hash."""
         hash_input = f"{filename}:{content[:1000]}"
@@ -177,82 +256,258 @@ class DocumentStore:
     def store_document(self, doc: Document) -> str:
         """Store a document and its chunks.
 
+        A document whose file hash is already stored is left alone.
+
         Args:
             doc: Document to store
 
         Returns:
-            Document ID
+            Document ID (of the stored copy, if the file was already stored)
         """
+        return self.store_documents([doc])[0]
+
+    def store_documents(self, docs: list[Document]) -> list[str]:
+        """Store several documents in a single transaction.
+
+        Large batches defer full-text indexing of new chunks to a single
+        statement at the end of the transaction, which is several times
+        faster than indexing row by row.
+
+        Args:
+            docs: Documents to store
+
+        Returns:
+            Document IDs, in order (see :meth:`store_document`)
+        """
+        # The last copy of a repeated ID wins, as if stored one by one
+        unique = list({doc.doc_id: doc for doc in docs}.values())
+        deferred = sum(len(doc.chunks) for doc in unique) >= FTS_DEFER_THRESHOLD
+
         with sqlite3.connect(self.db_path) as conn:
-            # Check if document already exists
-            existing = conn.execute(
-                "SELECT doc_id FROM documents WHERE doc_id = ?",
-                (doc.doc_id,),
-            ).fetchone()
+            conn.execute("BEGIN IMMEDIATE")
+            if deferred:
+                last_chunk_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM chunks").fetchone()[0]
+                conn.execute("DROP TRIGGER chunks_ai")
 
-            if existing:
-                # Update existing document
-                conn.execute(
-                    """
-                    UPDATE documents SET
-                        filename = ?, doc_type = ?, content = ?,
-                        file_hash = ?, pages = ?, metadata = ?, created_at = ?
-                    WHERE doc_id = ?
-                    """,
-                    (
-                        doc.filename,
-                        doc.doc_type,
-                        doc.content,
-                        doc.file_hash,
-                        doc.pages,
-                        json.dumps(doc.metadata),
-                        doc.created_at.isoformat(),
-                        doc.doc_id,
-                    ),
-                )
-                # Delete old chunks and entities
-                conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc.doc_id,))
-                conn.execute("DELETE FROM entities WHERE doc_id = ?", (doc.doc_id,))
-                conn.execute("DELETE FROM relationships WHERE doc_id = ?", (doc.doc_id,))
-            else:
-                # Insert new document
+            stored = {doc.doc_id: self._store(conn, doc) for doc in unique}
+
+            if deferred:
                 conn.execute(
                     """
-                    INSERT INTO documents (doc_id, filename, doc_type, content, file_hash, pages, metadata, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO chunks_fts(rowid, content, doc_id, chunk_index)
+                    SELECT id, content, doc_id, chunk_index FROM chunks WHERE id > ?
                     """,
-                    (
-                        doc.doc_id,
-                        doc.filename,
-                        doc.doc_type,
-                        doc.content,
-                        doc.file_hash,
-                        doc.pages,
-                        json.dumps(doc.metadata),
-                        doc.created_at.isoformat(),
-                    ),
+                    (last_chunk_id,),
                 )
+                conn.execute(_CHUNKS_INSERT_TRIGGER)
+            self._bump(conn, "data")
+            conn.commit()
 
-            # Insert chunks
-            for i, chunk in enumerate(doc.chunks):
-                conn.execute(
-                    "INSERT INTO chunks (doc_id, chunk_index, content) VALUES (?, ?, ?)",
-                    (doc.doc_id, i, chunk),
-                )
+        return [stored[doc.doc_id] for doc in docs]
 
-            # Insert entities
-            entity_ids = {}
-            for i, entity in enumerate(doc.entities):
-                cursor = conn.execute(
-                    "INSERT INTO entities (doc_id, entity_type, value) VALUES (?, ?, ?)",
-                    (doc.doc_id, entity.get("type", "unknown"), entity.get("value", "")),
-                )
-                entity_ids[i] = cursor.lastrowid
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, *keys: str) -> None:
+        conn.executemany("UPDATE store_meta SET value = value + 1 WHERE key = ?", [(key,) for key in keys])
 
-            conn.commit()
+    def _versions(self, conn: sqlite3.Connection) -> dict[str, int]:
+        return dict(conn.execute("SELECT key, value FROM store_meta").fetchall())
 
+    def _store(self, conn: sqlite3.Connection, doc: Document) -> str:
+        """Insert or update one document without committing."""
+        if doc.file_hash:
+            unchanged = conn.execute(
+                # The != '' lets SQLite use the partial unique index
+                "SELECT doc_id FROM documents WHERE file_hash = ? AND file_hash != ''",
+                (doc.file_hash,),
+            ).fetchone()
+            if unchanged:
+                return unchanged[0]
+
+        # Check if document already exists
+        existing = conn.execute(
+            "SELECT doc_id FROM documents WHERE doc_id = ?",
+            (doc.doc_id,),
+        ).fetchone()
+
+        if existing:
+            # Update existing document
+            conn.execute(
+                """
+                UPDATE documents SET
+                    filename = ?, doc_type = ?, content = ?,
+                    file_hash = ?, pages = ?, metadata = ?, created_at = ?
+                WHERE doc_id = ?
+                """,
+                (
+                    doc.filename,
+                    doc.doc_type,
+                    doc.content,
+                    doc.file_hash,
+                    doc.pages,
+                    json.dumps(doc.metadata),
+                    doc.created_at.isoformat(),
+                    doc.doc_id,
+                ),
+            )
+            self._update_chunks(conn, doc)
+            conn.execute("DELETE FROM entities WHERE doc_id = ?", (doc.doc_id,))
+            conn.execute("DELETE FROM relationships WHERE doc_id = ?", (doc.doc_id,))
+        else:
+            # Insert new document
+            conn.execute(
+                """
+                INSERT INTO documents (doc_id, filename, doc_type, content, file_hash, pages, metadata, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    doc.doc_id,
+                    doc.filename,
+                    doc.doc_type,
+                    doc.content,
+                    doc.file_hash,
+                    doc.pages,
+                    json.dumps(doc.metadata),
+                    doc.created_at.isoformat(),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO chunks (doc_id, chunk_index, content) VALUES (?, ?, ?)",
+                [(doc.doc_id, i, chunk) for i, chunk in enumerate(doc.chunks)],
+            )
+
+        conn.executemany(
+            "INSERT INTO entities (doc_id, entity_type, value) VALUES (?, ?, ?)",
+            [(doc.doc_id, e.get("type", "unknown"), e.get("value", "")) for e in doc.entities],
+        )
         return doc.doc_id
 
+    @staticmethod
+    def _update_chunks(conn: sqlite3.Connection, doc: Document) -> None:
+        """Rewrite only the chunks of ``doc`` that changed."""
+        rows = conn.execute(
+            "SELECT chunk_index, id, content FROM chunks WHERE doc_id = ?",
+            (doc.doc_id,),
+        ).fetchall()
+        old = {index: (chunk_id, content) for index, chunk_id, content in rows}
+
+        changed = []
+        added = []
+        for i, chunk in enumerate(doc.chunks):
+            if i not in old:
+                added.append((doc.doc_id, i, chunk))
+                continue
+            chunk_id, content = old.pop(i)
+            if content != chunk:
+                changed.append((chunk, chunk_id))
+
+        conn.executemany("UPDATE chunks SET content = ?, embedding = NULL WHERE id = ?", changed)
+        conn.executemany("INSERT INTO chunks (doc_id, chunk_index, content) VALUES (?, ?, ?)", added)
+        conn.executemany("DELETE FROM chunks WHERE id = ?", [(chunk_id,) for chunk_id, _ in old.values()])
+        if changed or old:
+            DocumentStore._bump(conn, "vectors")
+
+    def embed_pending(self, batch_size: int = 64) -> int:
+        """Embed chunks that have no embedding yet.
+
+        Args:
+            batch_size: Chunks sent to the embedder per call
+
+        Returns:
+            Number of chunks embedded
+        """
+        if self.embedder is None:
+            return 0
+
+        embedded = 0
+        last_id = 0
+        while True:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT id, content FROM chunks WHERE embedding IS NULL AND id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            vectors = self.embedder([content for _, content in rows])
+            updates = [(to_blob(v), chunk_id) for (chunk_id, _), v in zip(rows, vectors) if v is not None]
+            if updates:
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.executemany("UPDATE chunks SET embedding = ? WHERE id = ?", updates)
+                    self._bump(conn, "vectors")
+                    conn.commit()
+                embedded += len(updates)
+
+        return embedded
+
+    def _vector_index(self, conn: sqlite3.Connection, version: int) -> VectorIndex:
+        """The vector index, rebuilt first if embeddings changed since it was built."""
+        with self._vectors_lock:
+            if self._vectors.version != version:
+                count = conn.execute("SELECT COUNT(*) FROM chunks WHERE embedding IS NOT NULL").fetchone()[0]
+                rows = conn.execute("SELECT id, embedding FROM chunks WHERE embedding IS NOT NULL ORDER BY id")
+                self._vectors.build(rows, count, version)
+        return self._vectors
+
+    def optimize_index(self, rebuild: bool = False) -> None:
+        """Merge the full-text index after large loads.
+
+        Args:
+            rebuild: Rebuild the index from the chunks table instead
+        """
+        command = "rebuild" if rebuild else "optimize"
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(f"INSERT INTO chunks_fts(chunks_fts) VALUES('{command}')")
+            conn.commit()
+
+    def known_file_hashes(self) -> dict[str, str]:
+        """Map the file hash of every stored document to its ID."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT file_hash, doc_id FROM documents WHERE file_hash != ''").fetchall()
+        return dict(rows)
+
+    def save_job(self, job: dict[str, Any]) -> None:
+        """Insert or update an ingestion job record."""
+        now = datetime.now().isoformat()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT INTO ingest_jobs (
+                    job_id, path, params, status, total, processed, skipped, failed, error, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (job_id) DO UPDATE SET
+                    status = excluded.status, total = excluded.total, processed = excluded.processed,
+                    skipped = excluded.skipped, failed = excluded.failed, error = excluded.error,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    job["job_id"],
+                    job["path"],
+                    json.dumps(job.get("params", {})),
+                    job["status"],
+                    job.get("total", 0),
+                    job.get("processed", 0),
+                    job.get("skipped", 0),
+                    job.get("failed", 0),
+                    job.get("error"),
+                    now,
+                    now,
+                ),
+            )
+            conn.commit()
+
+    def get_job(self, job_id: str) -> dict[str, Any] | None:
+        """Get an ingestion job record."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM ingest_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if not row:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        return job
+
     def get_document(self, doc_id: str) -> Document | None:
         """Retrieve a document by ID."""
         with sqlite3.connect(self.db_path) as conn:
@@ -294,7 +549,10 @@ class DocumentStore:
         """Delete a document by ID."""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
-            # Cascading deletes handle chunks, entities, relationships
+            # Foreign keys are not enforced, so remove dependent rows explicitly
+            for table in ("chunks", "entities", "relationships"):
+                conn.execute(f"DELETE FROM {table} WHERE doc_id = ?", (doc_id,))
+            self._bump(conn, "data", "vectors")
             conn.commit()
             return cursor.rowcount > 0
 
@@ -343,85 +601,192 @@ class DocumentStore:
         query: str,
         doc_type: str | None = None,
         limit: int = 10,
+        mode: str = "keyword",
     ) -> list[SearchResult]:
-        """Search documents using FTS5.
+        """Search documents.
+
+        ``keyword`` ranks chunks with FTS5 BM25, ``semantic`` by cosine
+        similarity of embeddings, and ``hybrid`` fuses both rankings with
+        reciprocal-rank fusion. Results are cached per query until the
+        store changes.
 
         Args:
             query: Search query
             doc_type: Optional document type filter
             limit: Maximum results
+            mode: keyword, semantic or hybrid
 
         Returns:
-            List of search results with scores
+            List of search results with scores and highlighted snippets
         """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode} (use {', '.join(SEARCH_MODES)})")
+        if mode != "keyword" and self.embedder is None:
+            raise ValueError(f"{mode.capitalize()} search needs embeddings, which are not configured")
+
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
-
-            # Format query for FTS5 - use OR between words for broader matching
-            # Escape special characters and join with OR
-            words = query.strip().split()
-            if len(words) > 1:
-                # Multiple words: search with OR to match any word
-                fts_query = " OR ".join(f'"{w}"' for w in words if w)
+            versions = self._versions(conn)
+            key = (mode, query, doc_type, limit, versions["data"], versions["vectors"])
+            with self._cache_lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    return list(cached)
+
+            if mode == "keyword":
+                results = [self._keyword_result(row) for row in self._keyword_rows(conn, query, doc_type, limit)]
             else:
-                fts_query = f'"{query}"' if query else "*"
+                results = self._fused_search(conn, query, doc_type, limit, versions["vectors"], mode == "hybrid")
 
-            # Use FTS5 for search with BM25 ranking
-            if doc_type:
-                rows = conn.execute(
-                    """
-                    SELECT
-                        f.doc_id,
-                        f.chunk_index,
-                        f.content,
-                        d.filename,
-                        d.doc_type,
-                        bm25(chunks_fts) as score
-                    FROM chunks_fts f
-                    JOIN documents d ON f.doc_id = d.doc_id
-                    WHERE chunks_fts MATCH ? AND d.doc_type = ?
-                    ORDER BY score
-                    LIMIT ?
-                    """,
-                    (fts_query, doc_type, limit),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    """
-                    SELECT
-                        f.doc_id,
-                        f.chunk_index,
-                        f.content,
-                        d.filename,
-                        d.doc_type,
-                        bm25(chunks_fts) as score
-                    FROM chunks_fts f
-                    JOIN documents d ON f.doc_id = d.doc_id
-                    WHERE chunks_fts MATCH ?
-                    ORDER BY score
-                    LIMIT ?
-                    """,
-                    (fts_query, limit),
-                ).fetchall()
+        with self._cache_lock:
+            self._cache[key] = results
+            if len(self._cache) > SEARCH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return list(results)
 
-            results = []
-            for row in rows:
-                # BM25 returns negative scores (more negative = better match)
-                # Convert to 0-1 scale where 1 is best
-                normalized_score = min(1.0, max(0.0, 1.0 + row["score"] / 10))
-
-                results.append(
-                    SearchResult(
-                        doc_id=row["doc_id"],
-                        filename=row["filename"],
-                        doc_type=row["doc_type"],
-                        score=normalized_score,
-                        content_preview=row["content"][:300],
-                        chunk_index=row["chunk_index"],
-                    )
+    def _keyword_rows(
+        self,
+        conn: sqlite3.Connection,
+        query: str,
+        doc_type: str | None,
+        limit: int,
+    ) -> list[sqlite3.Row]:
+        """Best chunks for ``query`` by BM25."""
+        # Format query for FTS5 - use OR between words for broader matching
+        # Escape special characters and join with OR
+        words = query.strip().split()
+        if len(words) > 1:
+            # Multiple words: search with OR to match any word
+            fts_query = " OR ".join(f'"{w}"' for w in words if w)
+        else:
+            fts_query = f'"{query}"' if query else "*"
+
+        type_filter = "AND d.doc_type = ?" if doc_type else ""
+        params = (fts_query, doc_type, limit) if doc_type else (fts_query, limit)
+        return conn.execute(
+            f"""
+            SELECT
+                f.rowid AS chunk_id,
+                f.doc_id,
+                f.chunk_index,
+                f.content,
+                d.filename,
+                d.doc_type,
+                bm25(chunks_fts) as score,
+                snippet(chunks_fts, 0, '**', '**', '...', 16) AS snippet
+            FROM chunks_fts f
+            JOIN documents d ON f.doc_id = d.doc_id
+            WHERE chunks_fts MATCH ? {type_filter}
+            ORDER BY score
+            LIMIT ?
+            """,
+            params,
+        ).fetchall()
+
+    @staticmethod
+    def _keyword_result(row: sqlite3.Row) -> SearchResult:
+        # BM25 returns negative scores (more negative = better match)
+        # Convert to 0-1 scale where 1 is best
+        normalized_score = min(1.0, max(0.0, 1.0 + row["score"] / 10))
+
+        return SearchResult(
+            doc_id=row["doc_id"],
+            filename=row["filename"],
+            doc_type=row["doc_type"],
+            score=normalized_score,
+            content_preview=row["content"][:300],
+            chunk_index=row["chunk_index"],
+            snippet=row["snippet"],
+        )
+
+    def _embed_query(self, query: str) -> Any:
+        """Embed a query, remembering recent ones."""
+        with self._cache_lock:
+            if query in self._query_vectors:
+                self._query_vectors.move_to_end(query)
+                return self._query_vectors[query]
+        # Embedded outside the lock; two threads may embed the same query once each
+        vector = self.embedder([query])[0]
+        with self._cache_lock:
+            self._query_vectors[query] = vector
+            if len(self._query_vectors) > SEARCH_CACHE_SIZE:
+                self._query_vectors.popitem(last=False)
+        return vector
+
+    def _fused_search(
+        self,
+        conn: sqlite3.Connection,
+        query: str,
+        doc_type: str | None,
+        limit: int,
+        vectors_version: int,
+        keyword: bool,
+    ) -> list[SearchResult]:
+        """Semantic search, fused with BM25 by reciprocal rank if ``keyword``."""
+        depth = max(limit * 4, 50)
+        fused: dict[int, float] = {}
+        keyword_rows = {}
+        if keyword:
+            keyword_rows = {row["chunk_id"]: row for row in self._keyword_rows(conn, query, doc_type, depth)}
+        for rank, chunk_id in enumerate(keyword_rows):
+            fused[chunk_id] = 1.0 / (RRF_K + rank + 1)
+
+        query_vector = self._embed_query(query)
+        hits = []
+        if query_vector is not None:
+            # Over-fetch when filtering, since the index does not know types
+            hits = self._vector_index(conn, vectors_version).search(query_vector, depth * (4 if doc_type else 1))
+        placeholders = ",".join("?" * len(hits))
+        type_filter = "AND d.doc_type = ?" if doc_type else ""
+        chunk_rows = {
+            row["chunk_id"]: row
+            for row in conn.execute(
+                f"""
+                SELECT c.id AS chunk_id, c.doc_id, c.chunk_index, c.content, d.filename, d.doc_type
+                FROM chunks c
+                JOIN documents d ON c.doc_id = d.doc_id
+                WHERE c.id IN ({placeholders}) {type_filter}
+                """,
+                [chunk_id for chunk_id, _ in hits] + ([doc_type] if doc_type else []),
+            )
+        }
+        similarity = {}
+        for chunk_id, cosine in hits:
+            if chunk_id not in chunk_rows or cosine <= 0:
+                continue
+            similarity[chunk_id] = cosine
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (RRF_K + len(similarity))
+            if len(similarity) >= depth:
+                break
+
+        if keyword:
+            best = 2.0 / (RRF_K + 1)
+            ranked = sorted(fused.items(), key=lambda item: -item[1])[:limit]
+            scores = {chunk_id: score / best for chunk_id, score in ranked}
+        else:
+            scores = dict(list(similarity.items())[:limit])
+
+        results = []
+        for chunk_id, score in scores.items():
+            row = keyword_rows.get(chunk_id) or chunk_rows[chunk_id]
+            content = row["content"]
+            if chunk_id in keyword_rows:
+                snippet = row["snippet"]
+            else:
+                snippet = content[:200] + ("..." if len(content) > 200 else "")
+            results.append(
+                SearchResult(
+                    doc_id=row["doc_id"],
+                    filename=row["filename"],
+                    doc_type=row["doc_type"],
+                    score=round(score, 4),
+                    content_preview=content[:300],
+                    chunk_index=row["chunk_index"],
+                    snippet=snippet,
                 )
-
-            return results
+            )
+        return results
 
     def get_stats(self) -> dict[str, Any]:
         """Get storage statistics."""
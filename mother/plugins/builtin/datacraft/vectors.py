@@ -0,0 +1,267 @@
+"""Chunk embeddings and the memory-mapped vector index for datacraft.
+
+Embeddings are stored per chunk as float32 blobs in SQLite (the source of
+truth). For search they are copied into an index directory next to the
+database: L2-normalised vectors in a ``.npy`` matrix that is memory-mapped,
+so cosine similarity is a single matrix-vector product over pages the OS
+caches.
+
+Small collections are scanned exhaustively. Larger ones are clustered
+(spherical k-means, an IVF index): vectors are stored grouped by nearest
+centroid and a query only scans the ``nprobe`` closest clusters, which keeps
+latency flat as the collection grows at a small cost in recall.
+
+Any batch embedding callable works (``EmbeddingGenerator.generate_batch``
+from mother.memory fits); :class:`HashEmbedder` is a deterministic local
+stand-in that needs no model or network.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+BatchEmbedder = Callable[[list[str]], list[Sequence[float] | None]]
+
+# Below this many vectors a full scan is fast enough and exact
+IVF_MIN_VECTORS = 50_000
+# Vectors used to train the cluster centroids
+_TRAIN_SAMPLE = 100_000
+_KMEANS_ITERATIONS = 8
+# Rows processed at a time when assigning vectors to clusters
+_BLOCK = 65_536
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class HashEmbedder:
+    """Deterministic feature-hashing embedder.
+
+    Words and their character trigrams are hashed into a fixed number of
+    signed buckets. Texts that share words or word fragments ("invoice",
+    "invoices") end up close, which is enough to exercise semantic search
+    without a model.
+    """
+
+    def __init__(self, dim: int = 256):
+        """
+        Args:
+            dim: Number of dimensions
+        """
+        self.dim = dim
+
+    def __call__(self, texts: list[str]) -> list[np.ndarray | None]:
+        return [self.embed(text) for text in texts]
+
+    def embed(self, text: str) -> np.ndarray | None:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in _TOKEN_RE.findall(text.lower()):
+            self._add(vector, word, 1.0)
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                self._add(vector, padded[i : i + 3], 0.5)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _add(self, vector: np.ndarray, token: str, weight: float) -> None:
+        h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+        vector[h % self.dim] += weight if h >> 63 else -weight
+
+
+def to_blob(vector: Sequence[float]) -> bytes:
+    """Serialise an embedding for the ``chunks.embedding`` column."""
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorIndex:
+    """Memory-mapped cosine similarity index over chunk embeddings."""
+
+    def __init__(self, directory: Path, nprobe: int = 16):
+        """
+        Args:
+            directory: Where the index files live
+            nprobe: Clusters scanned per query once the index is clustered
+        """
+        self.directory = directory
+        self.nprobe = nprobe
+        self._lock = threading.Lock()
+        self._meta: dict | None = None
+        self._vectors: np.ndarray | None = None
+        self._ids: np.ndarray | None = None
+        self._centroids: np.ndarray | None = None
+        self._offsets: np.ndarray | None = None
+
+    @property
+    def version(self) -> int | None:
+        """Store version the index was built from, if it exists."""
+        meta = self._meta or self._read_meta()
+        return meta["version"] if meta else None
+
+    def _read_meta(self) -> dict | None:
+        try:
+            return json.loads((self.directory / "meta.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _file(self, name: str) -> Path:
+        return self.directory / name
+
+    def build(self, rows: Iterable[tuple[int, bytes]], count: int, version: int) -> None:
+        """Rebuild the index from ``(chunk_id, embedding blob)`` rows.
+
+        Args:
+            rows: Embeddings, streamed
+            count: Number of rows
+            version: Store version the rows come from
+        """
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._close()
+            dim = 0
+            vectors = ids = None
+            n = 0
+            for chunk_id, blob in rows:
+                vector = np.frombuffer(blob, dtype=np.float32)
+                if vectors is None:
+                    dim = len(vector)
+                    vectors = np.lib.format.open_memmap(
+                        self._file("vectors.tmp.npy"), mode="w+", dtype=np.float32, shape=(count, dim)
+                    )
+                    ids = np.empty(count, dtype=np.int64)
+                if len(vector) != dim:
+                    continue
+                vectors[n] = vector
+                ids[n] = chunk_id
+                n += 1
+
+            if vectors is None:
+                self._write({"version": version, "dim": 0, "count": 0})
+                return
+
+            for start in range(0, n, _BLOCK):
+                end = min(start + _BLOCK, n)
+                vectors[start:end] = _normalize(vectors[start:end])
+            vectors.flush()
+            ids = ids[:n]
+
+            meta = {"version": version, "dim": dim, "count": n}
+            if n >= IVF_MIN_VECTORS:
+                self._cluster(vectors[:n], ids, meta)
+            else:
+                if n < count:
+                    np.save(self._file("vectors.npy"), np.asarray(vectors[:n]))
+                    del vectors
+                    self._file("vectors.tmp.npy").unlink()
+                else:
+                    del vectors
+                    os.replace(self._file("vectors.tmp.npy"), self._file("vectors.npy"))
+                np.save(self._file("ids.tmp.npy"), ids)
+                os.replace(self._file("ids.tmp.npy"), self._file("ids.npy"))
+            self._write(meta)
+
+    def _cluster(self, vectors: np.ndarray, ids: np.ndarray, meta: dict) -> None:
+        """Group vectors by nearest centroid and write the IVF layout."""
+        n = len(vectors)
+        nlist = int(np.sqrt(n))
+        rng = np.random.default_rng(0)
+        sample = np.asarray(vectors[np.sort(rng.choice(n, size=min(n, _TRAIN_SAMPLE), replace=False))])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+        for _ in range(_KMEANS_ITERATIONS):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        assign = np.empty(n, dtype=np.int32)
+        for start in range(0, n, _BLOCK):
+            assign[start : start + _BLOCK] = np.argmax(vectors[start : start + _BLOCK] @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+
+        grouped = np.lib.format.open_memmap(
+            self._file("vectors.grouped.npy"), mode="w+", dtype=np.float32, shape=(n, meta["dim"])
+        )
+        for start in range(0, n, _BLOCK):
+            grouped[start : start + _BLOCK] = vectors[order[start : start + _BLOCK]]
+        grouped.flush()
+        del grouped, vectors
+
+        np.save(self._file("ids.tmp.npy"), ids[order])
+        np.save(self._file("centroids.tmp.npy"), centroids)
+        np.save(self._file("offsets.tmp.npy"), np.searchsorted(assign[order], np.arange(nlist + 1)))
+        os.replace(self._file("vectors.grouped.npy"), self._file("vectors.npy"))
+        self._file("vectors.tmp.npy").unlink()
+        for name in ("ids", "centroids", "offsets"):
+            os.replace(self._file(f"{name}.tmp.npy"), self._file(f"{name}.npy"))
+        meta["nlist"] = nlist
+
+    def _write(self, meta: dict) -> None:
+        if "nlist" not in meta:
+            for name in ("centroids.npy", "offsets.npy"):
+                self._file(name).unlink(missing_ok=True)
+        tmp = self._file("meta.json.tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self._file("meta.json"))
+        self._meta = None
+
+    def _close(self) -> None:
+        self._meta = self._vectors = self._ids = self._centroids = self._offsets = None
+
+    def _load(self) -> bool:
+        if self._meta is not None:
+            return True
+        meta = self._read_meta()
+        if not meta:
+            return False
+        if meta["count"]:
+            self._vectors = np.load(self._file("vectors.npy"), mmap_mode="r")
+            self._ids = np.load(self._file("ids.npy"))
+            if "nlist" in meta:
+                self._centroids = np.load(self._file("centroids.npy"))
+                self._offsets = np.load(self._file("offsets.npy"))
+        self._meta = meta
+        return True
+
+    def search(self, query: Sequence[float], k: int) -> list[tuple[int, float]]:
+        """Find the ``k`` chunks most similar to ``query``.
+
+        Returns:
+            ``(chunk_id, cosine similarity)`` pairs, best first
+        """
+        with self._lock:
+            if not self._load() or not self._meta["count"]:
+                return []
+            q = np.asarray(query, dtype=np.float32)
+            if len(q) != self._meta["dim"]:
+                return []
+            q = q / (np.linalg.norm(q) or 1.0)
+
+            if self._centroids is None:
+                scores = self._vectors @ q
+                ids = self._ids
+            else:
+                probe = np.argsort(self._centroids @ q)[::-1][: self.nprobe]
+                ranges = [(self._offsets[c], self._offsets[c + 1]) for c in probe]
+                scores = np.concatenate([self._vectors[a:b] @ q for a, b in ranges])
+                ids = np.concatenate([self._ids[a:b] for a, b in ranges])
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top]
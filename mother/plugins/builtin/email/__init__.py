@@ -5,6 +5,8 @@ Provides email reading and sending capabilities via IMAP/SMTP.
 
 from __future__ import annotations
 
+import asyncio
+from pathlib import Path
 from typing import Any
 
 from ....config.email_accounts import (
@@ -23,7 +25,9 @@ from ...manifest import (
     PluginMetadata,
     PythonExecutionSpec,
 )
+from .cache import EmailHeaderCache
 from .imap_client import IMAPClient
+from .pool import IMAPPool
 from .smtp_client import EmailDraft, SMTPClient
 
 
@@ -90,6 +94,13 @@ def _create_manifest() -> PluginManifest:
                         required=False,
                         default=False,
                     ),
+                    ParameterSpec(
+                        name="refresh",
+                        type=ParameterType.BOOLEAN,
+                        description="Sync with the server even if the local cache is fresh",
+                        required=False,
+                        default=False,
+                    ),
                 ],
             ),
             # Search messages
@@ -106,7 +117,10 @@ def _create_manifest() -> PluginManifest:
                     ParameterSpec(
                         name="query",
                         type=ParameterType.STRING,
-                        description="Search query (e.g., 'FROM sender@example.com', 'SUBJECT invoice')",
+                        description=(
+                            "IMAP criteria (e.g., 'FROM sender@example.com', 'SUBJECT invoice') "
+                            "or plain words to search subject, sender and snippet"
+                        ),
                         required=True,
                     ),
                     ParameterSpec(
@@ -123,6 +137,13 @@ def _create_manifest() -> PluginManifest:
                         required=False,
                         default=20,
                     ),
+                    ParameterSpec(
+                        name="refresh",
+                        type=ParameterType.BOOLEAN,
+                        description="Sync with the server even if the local cache is fresh",
+                        required=False,
+                        default=False,
+                    ),
                 ],
             ),
             # Read message
@@ -227,6 +248,13 @@ def _create_manifest() -> PluginManifest:
                         required=False,
                         default="INBOX",
                     ),
+                    ParameterSpec(
+                        name="refresh",
+                        type=ParameterType.BOOLEAN,
+                        description="Sync with the server even if the local cache is fresh",
+                        required=False,
+                        default=False,
+                    ),
                 ],
             ),
             # Mark as read/unread
@@ -342,6 +370,23 @@ class EmailPlugin(PluginBase):
     def __init__(self, config: dict[str, Any] | None = None):
         """Initialize the email plugin."""
         super().__init__(_create_manifest(), config)
+        config = config or {}
+        self._imap_pool = IMAPPool(
+            max_per_account=config.get("imap_pool_size", 2),
+            keepalive_interval=config.get("imap_keepalive_interval", 120.0),
+            max_idle=config.get("imap_max_idle", 600.0),
+            client_factory=IMAPClient,
+        )
+        self._cache_enabled = config.get("header_cache", True)
+        self._cache_max_age = config.get("cache_max_age", 60.0)
+        self._cache_db_path = Path(config["cache_db_path"]) if "cache_db_path" in config else None
+        self._cache: EmailHeaderCache | None = None
+        self._sync_locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    async def shutdown(self) -> None:
+        """Log out of pooled IMAP connections."""
+        await self._imap_pool.close()
+        await super().shutdown()
 
     def _get_account(self, account_name: str | None) -> Any:
         """Get the specified account or default."""
@@ -356,6 +401,37 @@ class EmailPlugin(PluginBase):
             raise ValueError("No email accounts configured. Run: mother email add")
         return account
 
+    async def _header_cache(self) -> EmailHeaderCache | None:
+        """Get the header cache, creating it on first use.
+
+        Opening the cache creates its SQLite schema, so it runs in a worker
+        thread.
+        """
+        if not self._cache_enabled:
+            return None
+        if self._cache is None:
+            cache = await asyncio.to_thread(EmailHeaderCache, self._cache_db_path)
+            if self._cache is None:
+                self._cache = cache
+        return self._cache
+
+    async def _synced_cache(self, acc: Any, folder: str, refresh: bool = False) -> EmailHeaderCache | None:
+        """Get the header cache with the folder synced within the freshness bound.
+
+        Concurrent callers for the same folder share a single sync.
+        """
+        cache = await self._header_cache()
+        if cache is None:
+            return None
+        if not refresh and await asyncio.to_thread(cache.is_fresh, acc.name, folder, self._cache_max_age):
+            return cache
+
+        lock = self._sync_locks.setdefault((acc.name, folder), asyncio.Lock())
+        async with lock:
+            if refresh or not await asyncio.to_thread(cache.is_fresh, acc.name, folder, self._cache_max_age):
+                await self._imap_pool.run(acc, lambda client: cache.sync(client, acc.name, folder))
+        return cache
+
     async def execute(self, capability: str, params: dict[str, Any]) -> PluginResult:
         """Execute an email capability."""
         handlers = {
@@ -427,8 +503,7 @@ class EmailPlugin(PluginBase):
         """List folders in an email account."""
         acc = self._get_account(account)
 
-        with IMAPClient(acc) as client:
-            folders = client.list_folders()
+        folders = await self._imap_pool.run(acc, lambda client: client.list_folders())
 
         return PluginResult.success_result(
             data={"folders": folders, "account": acc.name},
@@ -441,13 +516,17 @@ class EmailPlugin(PluginBase):
         folder: str = "INBOX",
         limit: int = 20,
         unread_only: bool = False,
+        refresh: bool = False,
     ) -> PluginResult:
         """List messages in a folder."""
         acc = self._get_account(account)
-        criteria = "UNSEEN" if unread_only else "ALL"
 
-        with IMAPClient(acc) as client:
-            messages = client.fetch_messages(folder, criteria, limit)
+        cache = await self._synced_cache(acc, folder, refresh)
+        if cache:
+            messages = await asyncio.to_thread(cache.list_messages, acc.name, folder, limit, unread_only)
+        else:
+            criteria = "UNSEEN" if unread_only else "ALL"
+            messages = await self._imap_pool.run(acc, lambda client: client.fetch_summaries(folder, criteria, limit))
 
         summaries = [msg.summary() for msg in messages]
 
@@ -457,6 +536,7 @@ class EmailPlugin(PluginBase):
                 "count": len(summaries),
                 "folder": folder,
                 "account": acc.name,
+                "cached": cache is not None,
             },
             message=f"Found {len(summaries)} message(s) in {folder}",
         )
@@ -467,12 +547,18 @@ class EmailPlugin(PluginBase):
         account: str | None = None,
         folder: str = "INBOX",
         limit: int = 20,
+        refresh: bool = False,
     ) -> PluginResult:
         """Search for messages matching a query."""
         acc = self._get_account(account)
 
-        with IMAPClient(acc) as client:
-            messages = client.fetch_messages(folder, query, limit)
+        messages = None
+        cache = await self._synced_cache(acc, folder, refresh)
+        if cache:
+            messages = await asyncio.to_thread(cache.search, acc.name, folder, query, limit)
+        cached = messages is not None
+        if messages is None:
+            messages = await self._imap_pool.run(acc, lambda client: client.fetch_summaries(folder, query, limit))
 
         summaries = [msg.summary() for msg in messages]
 
@@ -483,6 +569,7 @@ class EmailPlugin(PluginBase):
                 "query": query,
                 "folder": folder,
                 "account": acc.name,
+                "cached": cached,
             },
             message=f"Found {len(summaries)} message(s) matching '{query}'",
         )
@@ -497,10 +584,19 @@ class EmailPlugin(PluginBase):
         """Read a specific message."""
         acc = self._get_account(account)
 
-        with IMAPClient(acc) as client:
+        def read(client: IMAPClient) -> Any:
             message = client.fetch_message(uid, folder)
             if mark_read:
                 client.mark_read(uid, folder)
+            return message
+
+        message = await self._imap_pool.run(acc, read)
+
+        cache = await self._header_cache()
+        if cache:
+            await asyncio.to_thread(cache.set_snippet, acc.name, folder, uid, message.body_text)
+            if mark_read:
+                await asyncio.to_thread(cache.update_flags, acc.name, folder, uid, add="\\Seen")
 
         return PluginResult.success_result(
             data={"message": message.to_dict()},
@@ -534,8 +630,11 @@ class EmailPlugin(PluginBase):
             bcc=bcc_list,
         )
 
-        with SMTPClient(acc) as client:
-            result = client.send(draft)
+        def send() -> dict[str, Any]:
+            with SMTPClient(acc) as client:
+                return client.send(draft)
+
+        result = await asyncio.to_thread(send)
 
         return PluginResult.success_result(
             data=result,
@@ -546,15 +645,19 @@ class EmailPlugin(PluginBase):
         self,
         account: str | None = None,
         folder: str = "INBOX",
+        refresh: bool = False,
     ) -> PluginResult:
         """Get unread message count."""
         acc = self._get_account(account)
 
-        with IMAPClient(acc) as client:
-            count = client.get_unread_count(folder)
+        cache = await self._synced_cache(acc, folder, refresh)
+        if cache:
+            count = await asyncio.to_thread(cache.unread_count, acc.name, folder)
+        else:
+            count = await self._imap_pool.run(acc, lambda client: client.get_unread_count(folder))
 
         return PluginResult.success_result(
-            data={"unread": count, "folder": folder, "account": acc.name},
+            data={"unread": count, "folder": folder, "account": acc.name, "cached": cache is not None},
             message=f"{count} unread message(s) in {folder}",
         )
 
@@ -568,11 +671,17 @@ class EmailPlugin(PluginBase):
         """Mark a message as read or unread."""
         acc = self._get_account(account)
 
-        with IMAPClient(acc) as client:
+        if read:
+            success = await self._imap_pool.run(acc, lambda client: client.mark_read(uid, folder))
+        else:
+            success = await self._imap_pool.run(acc, lambda client: client.mark_unread(uid, folder))
+
+        cache = await self._header_cache()
+        if success and cache:
             if read:
-                success = client.mark_read(uid, folder)
+                await asyncio.to_thread(cache.update_flags, acc.name, folder, uid, add="\\Seen")
             else:
-                success = client.mark_unread(uid, folder)
+                await asyncio.to_thread(cache.update_flags, acc.name, folder, uid, remove="\\Seen")
 
         if success:
             status = "read" if read else "unread"
@@ -595,8 +704,11 @@ class EmailPlugin(PluginBase):
         """Delete a message."""
         acc = self._get_account(account)
 
-        with IMAPClient(acc) as client:
-            success = client.delete_message(uid, folder)
+        success = await self._imap_pool.run(acc, lambda client: client.delete_message(uid, folder), retry=False)
+
+        cache = await self._header_cache()
+        if success and cache:
+            await asyncio.to_thread(cache.remove, acc.name, folder, uid)
 
         if success:
             return PluginResult.success_result(
@@ -619,8 +731,14 @@ class EmailPlugin(PluginBase):
         """Move a message to another folder."""
         acc = self._get_account(account)
 
-        with IMAPClient(acc) as client:
-            success = client.move_message(uid, from_folder, to_folder)
+        success = await self._imap_pool.run(
+            acc, lambda client: client.move_message(uid, from_folder, to_folder), retry=False
+        )
+
+        cache = await self._header_cache()
+        if success and cache:
+            await asyncio.to_thread(cache.remove, acc.name, from_folder, uid)
+            await asyncio.to_thread(cache.invalidate, acc.name, to_folder)
 
         if success:
             return PluginResult.success_result(
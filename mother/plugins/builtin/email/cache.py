@@ -0,0 +1,505 @@
+"""Local SQLite cache of email headers and flags.
+
+Keeps envelopes, flags and attachment metadata per account and folder so
+listings, unread counts and simple searches can be answered without a
+server round trip. Folders are synchronized incrementally:
+
+* UIDVALIDITY changes invalidate the folder and trigger a full resync.
+* Messages at or above the cached UIDNEXT are fetched as new.
+* With CONDSTORE, only flags changed since the cached HIGHESTMODSEQ are
+  fetched; without it, all flags are refreshed in one FETCH.
+* Expunged messages are detected from the EXISTS count (CONDSTORE) or from
+  the flag refresh, and removed.
+
+New messages also get a snippet, the start of their first text/plain part,
+so free-text search covers body text and not only subject and sender.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import shlex
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .imap_client import (
+    SUMMARY_ITEMS,
+    EmailMessage,
+    IMAPClient,
+    bodystructure_text_part,
+    compress_uid_set,
+    decode_partial_body,
+    summary_from_fetch,
+)
+
+logger = logging.getLogger("mother.plugins.email.cache")
+
+# UIDs per FETCH during a full resync
+SYNC_BATCH_SIZE = 500
+
+SNIPPET_LENGTH = 200
+
+# Bytes of the text part fetched per message for its snippet; more than
+# SNIPPET_LENGTH to leave room for transfer encoding and multibyte text
+SNIPPET_FETCH_BYTES = 2 * SNIPPET_LENGTH
+
+# Keys that mark a query as IMAP search criteria rather than free text
+IMAP_SEARCH_KEYS = frozenset(
+    {
+        "ALL", "ANSWERED", "BCC", "BEFORE", "BODY", "CC", "DELETED", "DRAFT", "FLAGGED", "FROM",
+        "HEADER", "KEYWORD", "LARGER", "NEW", "NOT", "OLD", "ON", "OR", "RECENT", "SEEN",
+        "SENTBEFORE", "SENTON", "SENTSINCE", "SINCE", "SMALLER", "SUBJECT", "TEXT", "TO", "UID",
+        "UNANSWERED", "UNDELETED", "UNDRAFT", "UNFLAGGED", "UNKEYWORD", "UNSEEN",
+    }
+)  # fmt: skip
+
+# Criteria the cache can evaluate itself (substring matches like IMAP)
+_LIKE_COLUMNS = {"FROM": "sender", "SUBJECT": "subject", "TO": "recipients"}
+
+
+def _snippet(text: str) -> str:
+    """Collapse whitespace and cut text to the stored snippet length."""
+    return " ".join(text.split())[:SNIPPET_LENGTH]
+
+
+@dataclass
+class FolderState:
+    """Cached synchronization state of one folder."""
+
+    uidvalidity: int
+    uidnext: int
+    highestmodseq: int | None
+    synced_at: float
+
+
+@dataclass
+class SyncResult:
+    """What a folder synchronization changed."""
+
+    full: bool = False
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+
+
+class EmailHeaderCache:
+    """SQLite-backed header cache with FTS5 search."""
+
+    def __init__(self, db_path: Path | None = None):
+        """Initialize the cache.
+
+        Args:
+            db_path: Path to SQLite database. Defaults to ~/.config/mother/email_cache.db
+        """
+        if db_path is None:
+            db_path = Path.home() / ".config" / "mother" / "email_cache.db"
+
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        """Initialize database schema."""
+        with self._connect() as conn:
+            # WAL lets listings read while a sync writes from a worker thread
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS folders (
+                    account TEXT NOT NULL,
+                    folder TEXT NOT NULL,
+                    uidvalidity INTEGER NOT NULL,
+                    uidnext INTEGER NOT NULL,
+                    highestmodseq INTEGER,
+                    synced_at REAL NOT NULL,
+                    PRIMARY KEY (account, folder)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY,
+                    account TEXT NOT NULL,
+                    folder TEXT NOT NULL,
+                    uid INTEGER NOT NULL,
+                    subject TEXT NOT NULL DEFAULT '',
+                    sender TEXT NOT NULL DEFAULT '',
+                    recipients TEXT NOT NULL DEFAULT '[]',
+                    date TEXT,
+                    flags TEXT NOT NULL DEFAULT '[]',
+                    seen INTEGER NOT NULL DEFAULT 0,
+                    attachments TEXT NOT NULL DEFAULT '[]',
+                    size INTEGER,
+                    snippet TEXT NOT NULL DEFAULT '',
+                    UNIQUE (account, folder, uid)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_unseen ON messages(account, folder, seen)")
+
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                    subject,
+                    sender,
+                    snippet,
+                    content='messages',
+                    content_rowid='id'
+                )
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+                    INSERT INTO messages_fts(rowid, subject, sender, snippet)
+                    VALUES (new.id, new.subject, new.sender, new.snippet);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+                    INSERT INTO messages_fts(messages_fts, rowid, subject, sender, snippet)
+                    VALUES('delete', old.id, old.subject, old.sender, old.snippet);
+                END
+            """)
+            # Flag updates are frequent and must not touch the index
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE OF subject, sender, snippet ON messages BEGIN
+                    INSERT INTO messages_fts(messages_fts, rowid, subject, sender, snippet)
+                    VALUES('delete', old.id, old.subject, old.sender, old.snippet);
+                    INSERT INTO messages_fts(rowid, subject, sender, snippet)
+                    VALUES (new.id, new.subject, new.sender, new.snippet);
+                END
+            """)
+            conn.commit()
+
+    # -- folder state -------------------------------------------------------
+
+    def folder_state(self, account: str, folder: str) -> FolderState | None:
+        """Get the cached sync state of a folder."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT uidvalidity, uidnext, highestmodseq, synced_at FROM folders WHERE account = ? AND folder = ?",
+                (account, folder),
+            ).fetchone()
+        if not row:
+            return None
+        return FolderState(row["uidvalidity"], row["uidnext"], row["highestmodseq"], row["synced_at"])
+
+    def is_fresh(self, account: str, folder: str, max_age: float) -> bool:
+        """Whether the folder was synchronized within max_age seconds."""
+        state = self.folder_state(account, folder)
+        return state is not None and time.time() - state.synced_at <= max_age
+
+    def invalidate(self, account: str, folder: str) -> None:
+        """Force the next access to synchronize the folder."""
+        with self._connect() as conn:
+            conn.execute("UPDATE folders SET synced_at = 0 WHERE account = ? AND folder = ?", (account, folder))
+            conn.commit()
+
+    # -- synchronization ----------------------------------------------------
+
+    def sync(self, client: IMAPClient, account: str, folder: str) -> SyncResult:
+        """Bring the cached folder up to date with the server.
+
+        Blocking; run it in a worker thread with a connected client.
+
+        Args:
+            client: Connected IMAP client
+            account: Account name the rows are stored under
+            folder: Folder to synchronize
+
+        Returns:
+            Counts of added, updated and removed messages
+        """
+        server = client.mailbox_state(folder)
+        cached = self.folder_state(account, folder)
+        result = SyncResult()
+
+        with self._connect() as conn:
+            if cached is None or cached.uidvalidity != server.uidvalidity:
+                result.full = True
+                conn.execute("DELETE FROM messages WHERE account = ? AND folder = ?", (account, folder))
+                uids = client.search_uids(folder, "ALL")
+                for start in range(0, len(uids), SYNC_BATCH_SIZE):
+                    batch = uids[start : start + SYNC_BATCH_SIZE]
+                    fetched = client.fetch_items(compress_uid_set(batch), SUMMARY_ITEMS, folder)
+                    result.added += self._store_summaries(conn, account, folder, fetched)
+                    self._store_snippets(conn, client, account, folder, fetched)
+            else:
+                known = {
+                    row["uid"]
+                    for row in conn.execute(
+                        "SELECT uid FROM messages WHERE account = ? AND folder = ?", (account, folder)
+                    )
+                }
+
+                if server.uidnext > cached.uidnext:
+                    # n:* always includes the highest UID, even if it is below n
+                    fetched = client.fetch_items(f"{cached.uidnext}:*", SUMMARY_ITEMS, folder)
+                    fetched = {uid: items for uid, items in fetched.items() if int(uid) >= cached.uidnext}
+                    result.added = self._store_summaries(conn, account, folder, fetched)
+                    self._store_snippets(conn, client, account, folder, fetched)
+
+                if known:
+                    known_range = f"1:{cached.uidnext - 1}"
+                    if cached.highestmodseq is not None and server.highestmodseq is not None:
+                        if server.highestmodseq > cached.highestmodseq:
+                            changed = client.fetch_items(
+                                known_range, "(UID FLAGS)", folder, changed_since=cached.highestmodseq
+                            )
+                            result.updated = self._store_flags(conn, account, folder, changed)
+                        if len(known) + result.added != server.exists:
+                            present = {int(uid) for uid in client.search_uids(folder, f"UID {known_range}")}
+                            result.removed = self._remove_missing(conn, account, folder, known - present)
+                    else:
+                        flags = client.fetch_items(known_range, "(UID FLAGS)", folder)
+                        result.updated = self._store_flags(conn, account, folder, flags)
+                        present = {int(uid) for uid in flags}
+                        result.removed = self._remove_missing(conn, account, folder, known - present)
+
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO folders (account, folder, uidvalidity, uidnext, highestmodseq, synced_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (account, folder, server.uidvalidity, server.uidnext, server.highestmodseq, time.time()),
+            )
+            conn.commit()
+
+        logger.debug(
+            f"Synced {account}/{folder}: full={result.full} added={result.added} "
+            f"updated={result.updated} removed={result.removed}"
+        )
+        return result
+
+    def _store_summaries(
+        self, conn: sqlite3.Connection, account: str, folder: str, fetched: dict[str, dict[bytes, Any]]
+    ) -> int:
+        rows = []
+        for uid, items in fetched.items():
+            msg = summary_from_fetch(uid, items, folder)
+            rows.append(
+                (
+                    account,
+                    folder,
+                    int(uid),
+                    msg.subject,
+                    msg.sender,
+                    json.dumps(msg.recipients),
+                    msg.date.isoformat() if msg.date else None,
+                    json.dumps(msg.flags),
+                    int("\\Seen" in msg.flags),
+                    json.dumps(msg.attachments),
+                    msg.size,
+                )
+            )
+        conn.executemany(
+            """
+            INSERT INTO messages (
+                account, folder, uid, subject, sender, recipients, date, flags, seen, attachments, size
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (account, folder, uid) DO UPDATE SET flags = excluded.flags, seen = excluded.seen
+            """,
+            rows,
+        )
+        return len(rows)
+
+    def _store_snippets(
+        self,
+        conn: sqlite3.Connection,
+        client: IMAPClient,
+        account: str,
+        folder: str,
+        fetched: dict[str, dict[bytes, Any]],
+    ) -> None:
+        """Fill snippets for freshly fetched summaries.
+
+        The text part is located from the BODYSTRUCTURE already fetched, and
+        messages are grouped by part section so each group is a single
+        partial FETCH. A failed FETCH leaves the snippets empty; reading the
+        message fills them in later.
+        """
+        parts: dict[str, dict[str, tuple[str, str]]] = {}
+        for uid, items in fetched.items():
+            found = bodystructure_text_part(items.get(b"BODYSTRUCTURE"))
+            if found:
+                section, encoding, charset = found
+                parts.setdefault(section, {})[uid] = (encoding, charset)
+
+        rows = []
+        for section, uids in parts.items():
+            try:
+                bodies = client.fetch_items(
+                    compress_uid_set(uids), f"(UID BODY.PEEK[{section}]<0.{SNIPPET_FETCH_BYTES}>)", folder
+                )
+            except ValueError as e:
+                logger.debug(f"Snippet fetch failed for {account}/{folder}: {e}")
+                continue
+            key = f"BODY[{section}]<0>".encode()
+            for uid, items in bodies.items():
+                if uid in uids and isinstance(items.get(key), bytes):
+                    text = decode_partial_body(items[key], *uids[uid])
+                    rows.append((_snippet(text), account, folder, int(uid)))
+        conn.executemany(
+            "UPDATE messages SET snippet = ? WHERE account = ? AND folder = ? AND uid = ?",
+            rows,
+        )
+
+    def _store_flags(
+        self, conn: sqlite3.Connection, account: str, folder: str, fetched: dict[str, dict[bytes, Any]]
+    ) -> int:
+        rows = []
+        for uid, items in fetched.items():
+            flags = [f.decode() if isinstance(f, bytes) else str(f) for f in items.get(b"FLAGS") or []]
+            rows.append((json.dumps(flags), int("\\Seen" in flags), account, folder, int(uid)))
+        conn.executemany(
+            "UPDATE messages SET flags = ?, seen = ? WHERE account = ? AND folder = ? AND uid = ?",
+            rows,
+        )
+        return len(rows)
+
+    def _remove_missing(self, conn: sqlite3.Connection, account: str, folder: str, uids: set[int]) -> int:
+        conn.executemany(
+            "DELETE FROM messages WHERE account = ? AND folder = ? AND uid = ?",
+            [(account, folder, uid) for uid in uids],
+        )
+        return len(uids)
+
+    # -- queries ------------------------------------------------------------
+
+    def list_messages(
+        self, account: str, folder: str, limit: int = 20, unread_only: bool = False
+    ) -> list[EmailMessage]:
+        """List cached message summaries, most recent first."""
+        sql = "SELECT * FROM messages WHERE account = ? AND folder = ?"
+        if unread_only:
+            sql += " AND seen = 0"
+        sql += " ORDER BY uid DESC LIMIT ?"
+        with self._connect() as conn:
+            rows = conn.execute(sql, (account, folder, limit)).fetchall()
+        return [self._row_to_message(row) for row in rows]
+
+    def search(self, account: str, folder: str, query: str, limit: int = 20) -> list[EmailMessage] | None:
+        """Search cached messages.
+
+        Free-text queries go through the FTS5 index over subject, sender
+        and snippet. IMAP criteria are evaluated locally when they only use
+        ALL, SEEN, UNSEEN, FROM, SUBJECT and TO.
+
+        Returns:
+            Matching messages, or None if the query needs the server
+        """
+        try:
+            tokens = shlex.split(query)
+        except ValueError:
+            return None
+        if not tokens:
+            return None
+
+        if tokens[0].upper() not in IMAP_SEARCH_KEYS:
+            return self._search_text(account, folder, tokens, limit)
+
+        clauses = ["m.account = ?", "m.folder = ?"]
+        params: list[Any] = [account, folder]
+        i = 0
+        while i < len(tokens):
+            key = tokens[i].upper()
+            if key == "ALL":
+                pass
+            elif key in ("SEEN", "UNSEEN"):
+                clauses.append("m.seen = ?")
+                params.append(int(key == "SEEN"))
+            elif key in _LIKE_COLUMNS and i + 1 < len(tokens):
+                i += 1
+                clauses.append(f"m.{_LIKE_COLUMNS[key]} LIKE ? ESCAPE '\\'")
+                params.append(f"%{_escape_like(tokens[i])}%")
+            else:
+                return None
+            i += 1
+
+        sql = f"SELECT m.* FROM messages m WHERE {' AND '.join(clauses)} ORDER BY m.uid DESC LIMIT ?"
+        with self._connect() as conn:
+            rows = conn.execute(sql, (*params, limit)).fetchall()
+        return [self._row_to_message(row) for row in rows]
+
+    def _search_text(self, account: str, folder: str, words: list[str], limit: int) -> list[EmailMessage]:
+        # Quote each word and allow prefix matches; words are ANDed
+        match = " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT m.* FROM messages_fts
+                JOIN messages m ON m.id = messages_fts.rowid
+                WHERE messages_fts MATCH ? AND m.account = ? AND m.folder = ?
+                ORDER BY m.uid DESC LIMIT ?
+                """,
+                (match, account, folder, limit),
+            ).fetchall()
+        return [self._row_to_message(row) for row in rows]
+
+    def unread_count(self, account: str, folder: str) -> int:
+        """Count cached unread messages."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE account = ? AND folder = ? AND seen = 0",
+                (account, folder),
+            ).fetchone()
+        return row[0]
+
+    # -- write-through ------------------------------------------------------
+
+    def update_flags(self, account: str, folder: str, uid: str, add: str = "", remove: str = "") -> None:
+        """Apply a local flag change made through the plugin."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT flags FROM messages WHERE account = ? AND folder = ? AND uid = ?",
+                (account, folder, int(uid)),
+            ).fetchone()
+            if not row:
+                return
+            flags = [f for f in json.loads(row["flags"]) if f != remove]
+            if add and add not in flags:
+                flags.append(add)
+            conn.execute(
+                "UPDATE messages SET flags = ?, seen = ? WHERE account = ? AND folder = ? AND uid = ?",
+                (json.dumps(flags), int("\\Seen" in flags), account, folder, int(uid)),
+            )
+            conn.commit()
+
+    def set_snippet(self, account: str, folder: str, uid: str, text: str) -> None:
+        """Store the start of a message body for full-text search."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE messages SET snippet = ? WHERE account = ? AND folder = ? AND uid = ?",
+                (_snippet(text), account, folder, int(uid)),
+            )
+            conn.commit()
+
+    def remove(self, account: str, folder: str, uid: str) -> None:
+        """Drop a message that was deleted or moved through the plugin."""
+        with self._connect() as conn:
+            self._remove_missing(conn, account, folder, {int(uid)})
+            conn.commit()
+
+    def _row_to_message(self, row: sqlite3.Row) -> EmailMessage:
+        return EmailMessage(
+            uid=str(row["uid"]),
+            subject=row["subject"],
+            sender=row["sender"],
+            recipients=json.loads(row["recipients"]),
+            date=datetime.fromisoformat(row["date"]) if row["date"] else None,
+            body_text="",
+            body_html="",
+            attachments=json.loads(row["attachments"]),
+            flags=json.loads(row["flags"]),
+            folder=row["folder"],
+            size=row["size"],
+        )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
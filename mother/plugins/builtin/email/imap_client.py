@@ -5,10 +5,15 @@ Provides email reading capabilities via IMAP.
 
 from __future__ import annotations
 
+import base64
+import binascii
 import email
 import email.header
 import email.utils
 import imaplib
+import quopri
+import re
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime
 from email.message import Message
@@ -31,6 +36,7 @@ class EmailMessage:
     attachments: list[dict[str, Any]]
     flags: list[str]
     folder: str
+    size: int | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -56,6 +62,7 @@ class EmailMessage:
             "date": self.date.isoformat() if self.date else None,
             "has_attachments": len(self.attachments) > 0,
             "flags": self.flags,
+            "size": self.size,
         }
 
 
@@ -169,6 +176,302 @@ def parse_message(uid: str, raw_email: bytes, folder: str) -> EmailMessage:
     )
 
 
+# Summary fetch: everything a listing needs, without message bodies
+SUMMARY_ITEMS = "(UID FLAGS ENVELOPE BODYSTRUCTURE RFC822.SIZE)"
+
+_ATOM_DELIMITERS = frozenset(b' ()"{\r\n')
+
+
+def parse_imap_data(data: bytes) -> list[Any]:
+    """Parse IMAP response data into nested lists.
+
+    Handles parenthesized lists, quoted strings, ``{n}`` literals and atoms.
+    Strings and atoms come back as bytes, ``NIL`` as None.
+
+    Args:
+        data: Response text with literals inlined after their ``{n}`` marker
+
+    Returns:
+        Top-level sequence of parsed values
+    """
+    stack: list[list[Any]] = [[]]
+    i, n = 0, len(data)
+    while i < n:
+        c = data[i]
+        if c in b" \r\n":
+            i += 1
+        elif c == 0x28:  # (
+            stack.append([])
+            i += 1
+        elif c == 0x29:  # )
+            if len(stack) > 1:
+                done = stack.pop()
+                stack[-1].append(done)
+            i += 1
+        elif c == 0x22:  # "
+            buf = bytearray()
+            i += 1
+            while i < n and data[i] != 0x22:
+                if data[i] == 0x5C:  # backslash escape
+                    i += 1
+                buf.append(data[i])
+                i += 1
+            stack[-1].append(bytes(buf))
+            i += 1
+        elif c == 0x7B:  # {n} literal
+            end = data.index(b"}", i)
+            size = int(data[i + 1 : end])
+            i = end + 1
+            if data[i : i + 2] == b"\r\n":
+                i += 2
+            stack[-1].append(data[i : i + size])
+            i += size
+        else:
+            start = i
+            while i < n and data[i] not in _ATOM_DELIMITERS:
+                # Keep bracketed section specs like BODY[HEADER] together
+                if data[i] == 0x5B:  # [
+                    i = data.index(b"]", i)
+                i += 1
+            atom = data[start:i]
+            stack[-1].append(None if atom.upper() == b"NIL" else atom)
+    while len(stack) > 1:
+        done = stack.pop()
+        stack[-1].append(done)
+    return stack[0]
+
+
+def join_fetch_response(data: Iterable[Any]) -> bytes:
+    """Flatten imaplib's fetch data (bytes and (header, literal) tuples)."""
+    parts: list[bytes] = []
+    for item in data:
+        if isinstance(item, tuple):
+            parts.append(item[0] + b"\r\n" + item[1])
+        elif isinstance(item, bytes):
+            parts.append(item)
+    return b" ".join(parts)
+
+
+def parse_fetch_response(data: Iterable[Any]) -> dict[str, dict[bytes, Any]]:
+    """Parse a UID FETCH response into {uid: {ITEM: value}}.
+
+    Unsolicited FETCH responses without a UID are ignored.
+    """
+    parsed = parse_imap_data(join_fetch_response(data))
+    result: dict[str, dict[bytes, Any]] = {}
+    for entry in parsed:
+        if not isinstance(entry, list):
+            continue  # sequence number
+        items = {}
+        for key, value in zip(entry[::2], entry[1::2], strict=False):
+            if isinstance(key, bytes):
+                items[key.upper()] = value
+        uid = items.get(b"UID")
+        if uid is not None:
+            result[uid.decode()] = items
+    return result
+
+
+def compress_uid_set(uids: Iterable[str]) -> str:
+    """Build a compact UID set, e.g. ``1:5,9,12:13``."""
+    numbers = sorted({int(u) for u in uids})
+    ranges: list[str] = []
+    i = 0
+    while i < len(numbers):
+        j = i
+        while j + 1 < len(numbers) and numbers[j + 1] == numbers[j] + 1:
+            j += 1
+        ranges.append(str(numbers[i]) if i == j else f"{numbers[i]}:{numbers[j]}")
+        i = j + 1
+    return ",".join(ranges)
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="replace")
+    return decode_header_value(str(value))
+
+
+def _format_addresses(addresses: Any) -> list[str]:
+    """Format ENVELOPE address structures (name adl mailbox host)."""
+    if not isinstance(addresses, list):
+        return []
+    result = []
+    for addr in addresses:
+        if not isinstance(addr, list) or len(addr) < 4:
+            continue
+        name, _, mailbox, host = addr[:4]
+        if mailbox is None or host is None:
+            continue  # group syntax markers
+        address = f"{_text(mailbox)}@{_text(host)}"
+        result.append(email.utils.formataddr((_text(name), address)) if name else address)
+    return result
+
+
+def _flags(value: Any) -> list[str]:
+    if not isinstance(value, list):
+        return []
+    return [f.decode() if isinstance(f, bytes) else str(f) for f in value]
+
+
+def _attachment_disposition(structure: list[Any]) -> list[Any] | None:
+    """Get the attachment disposition of a single-part BODYSTRUCTURE, if any."""
+    return next(
+        (
+            item
+            for item in structure[7:]
+            if isinstance(item, list) and item and isinstance(item[0], bytes) and item[0].lower() == b"attachment"
+        ),
+        None,
+    )
+
+
+def bodystructure_attachments(structure: Any) -> list[dict[str, Any]]:
+    """List attachments described by a BODYSTRUCTURE.
+
+    Args:
+        structure: Parsed BODYSTRUCTURE value
+
+    Returns:
+        Attachment dicts with filename, content_type and size
+    """
+    attachments: list[dict[str, Any]] = []
+    if not isinstance(structure, list) or not structure:
+        return attachments
+
+    if isinstance(structure[0], list):
+        # Multipart: child parts come first, then the subtype
+        for child in structure:
+            if isinstance(child, list):
+                attachments.extend(bodystructure_attachments(child))
+        return attachments
+
+    disposition = _attachment_disposition(structure)
+    if disposition is None:
+        return attachments
+
+    filename = None
+    for params in (disposition[1] if len(disposition) > 1 else None, structure[2]):
+        if isinstance(params, list):
+            pairs = dict(zip(params[::2], params[1::2], strict=False))
+            raw = pairs.get(b"filename") or pairs.get(b"FILENAME") or pairs.get(b"name") or pairs.get(b"NAME")
+            if raw:
+                filename = _text(raw)
+                break
+
+    try:
+        size = int(structure[6])
+    except (IndexError, TypeError, ValueError):
+        size = 0
+
+    attachments.append(
+        {
+            "filename": filename or "unknown",
+            "content_type": f"{_text(structure[0])}/{_text(structure[1])}".lower(),
+            "size": size,
+        }
+    )
+    return attachments
+
+
+def bodystructure_text_part(structure: Any, section: str = "") -> tuple[str, str, str] | None:
+    """Find the first inline text/plain part described by a BODYSTRUCTURE.
+
+    Args:
+        structure: Parsed BODYSTRUCTURE value
+        section: Section number of ``structure`` itself (empty for the message)
+
+    Returns:
+        (section, transfer encoding, charset) for a ``BODY[section]`` fetch,
+        or None if the message has no such part
+    """
+    if not isinstance(structure, list) or not structure:
+        return None
+
+    if isinstance(structure[0], list):
+        children = [child for child in structure if isinstance(child, list)]
+        for index, child in enumerate(children, start=1):
+            found = bodystructure_text_part(child, f"{section}.{index}" if section else str(index))
+            if found:
+                return found
+        return None
+
+    if len(structure) < 7 or _text(structure[0]).lower() != "text" or _text(structure[1]).lower() != "plain":
+        return None
+    if _attachment_disposition(structure) is not None:
+        return None
+
+    charset = "utf-8"
+    if isinstance(structure[2], list):
+        pairs = {_text(k).lower(): v for k, v in zip(structure[2][::2], structure[2][1::2], strict=False)}
+        charset = _text(pairs.get("charset")) or charset
+    # A single-part message is section 1 of itself
+    return section or "1", _text(structure[5]).lower(), charset
+
+
+def decode_partial_body(data: bytes, encoding: str, charset: str) -> str:
+    """Decode the first bytes of a body part fetched with ``BODY[section]<0.n>``.
+
+    A truncated base64 tail or multibyte character is dropped rather than
+    failing the whole part.
+    """
+    if encoding == "base64":
+        data = b"".join(data.split())
+        try:
+            data = base64.b64decode(data[: len(data) // 4 * 4])
+        except binascii.Error:
+            return ""
+    elif encoding == "quoted-printable":
+        data = quopri.decodestring(data)
+    try:
+        return data.decode(charset, errors="ignore")
+    except LookupError:
+        return data.decode("utf-8", errors="ignore")
+
+
+def summary_from_fetch(uid: str, items: dict[bytes, Any], folder: str) -> EmailMessage:
+    """Build a body-less EmailMessage from summary FETCH items."""
+    envelope = items.get(b"ENVELOPE") or []
+    envelope = envelope + [None] * (10 - len(envelope))
+    senders = _format_addresses(envelope[2])
+    size = items.get(b"RFC822.SIZE")
+
+    return EmailMessage(
+        uid=uid,
+        subject=_text(envelope[1]),
+        sender=senders[0] if senders else "",
+        recipients=_format_addresses(envelope[5]),
+        date=parse_date(_text(envelope[0])),
+        body_text="",
+        body_html="",
+        attachments=bodystructure_attachments(items.get(b"BODYSTRUCTURE")),
+        flags=_flags(items.get(b"FLAGS")),
+        folder=folder,
+        size=int(size) if size is not None else None,
+    )
+
+
+@dataclass
+class MailboxState:
+    """Synchronization state reported when a folder is selected."""
+
+    uidvalidity: int
+    uidnext: int
+    exists: int
+    highestmodseq: int | None = None
+
+
+def _response_int(connection: imaplib.IMAP4, code: str) -> int | None:
+    """Pop an untagged response code such as UIDNEXT and return it as int."""
+    _, data = connection.response(code)
+    try:
+        return int(data[-1])
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
 class IMAPClient:
     """IMAP client for reading emails."""
 
@@ -180,6 +483,8 @@ class IMAPClient:
         """
         self.account = account
         self._connection: imaplib.IMAP4 | imaplib.IMAP4_SSL | None = None
+        self._selected: str | None = None
+        self.condstore = False
 
     def connect(self) -> None:
         """Connect to the IMAP server."""
@@ -199,6 +504,56 @@ class IMAPClient:
                 self._connection.starttls()
 
         self._connection.login(self.account.email, password)
+        self._selected = None
+        self.condstore = self._enable_condstore()
+
+    def _enable_condstore(self) -> bool:
+        """Enable CONDSTORE (RFC 7162) if the server supports it."""
+        capabilities = set(self._connection.capabilities)
+        # Servers often announce extra capabilities in the LOGIN response
+        _, data = self._connection.response("CAPABILITY")
+        for line in data or []:
+            if isinstance(line, bytes):
+                capabilities.update(line.decode().upper().split())
+        self._connection.capabilities = tuple(sorted(capabilities))
+        if "CONDSTORE" not in capabilities:
+            return False
+        if "ENABLE" in capabilities:
+            try:
+                self._connection.enable("CONDSTORE")
+            except imaplib.IMAP4.error:
+                return False
+        return True
+
+    @property
+    def connected(self) -> bool:
+        """Whether a connection is open."""
+        return self._connection is not None
+
+    def noop(self) -> bool:
+        """Send NOOP to keep the connection alive.
+
+        Returns:
+            True if the server answered OK
+        """
+        if not self._connection:
+            return False
+        status, _ = self._connection.noop()
+        return status == "OK"
+
+    def abort(self) -> None:
+        """Close the socket without logging out.
+
+        Safe while another thread is inside a command on this client: the
+        command fails instead of interleaving with a LOGOUT.
+        """
+        connection, self._connection = self._connection, None
+        self._selected = None
+        if connection is not None:
+            try:
+                connection.shutdown()
+            except Exception:
+                pass
 
     def disconnect(self) -> None:
         """Disconnect from the server."""
@@ -212,6 +567,7 @@ class IMAPClient:
             except Exception:
                 pass
             self._connection = None
+            self._selected = None
 
     def __enter__(self) -> IMAPClient:
         """Context manager entry."""
@@ -245,10 +601,31 @@ class IMAPClient:
 
         status, data = self._connection.select(folder)
         if status != "OK":
+            self._selected = None
             raise ValueError(f"Failed to select folder: {folder}")
 
+        self._selected = folder
         return int(data[0])
 
+    def ensure_folder(self, folder: str) -> None:
+        """Select a folder unless it is already selected."""
+        if self._selected != folder:
+            self.select_folder(folder)
+
+    def mailbox_state(self, folder: str = "INBOX") -> MailboxState:
+        """Re-select a folder and return its UIDVALIDITY, UIDNEXT and counts.
+
+        Always issues SELECT so the values are current even if the folder
+        was already selected on this connection.
+        """
+        exists = self.select_folder(folder)
+        uidvalidity = _response_int(self._connection, "UIDVALIDITY")
+        uidnext = _response_int(self._connection, "UIDNEXT")
+        if uidvalidity is None or uidnext is None:
+            raise ValueError(f"Server did not report UIDVALIDITY/UIDNEXT for {folder}")
+        highestmodseq = _response_int(self._connection, "HIGHESTMODSEQ") if self.condstore else None
+        return MailboxState(uidvalidity, uidnext, exists, highestmodseq)
+
     def search(
         self,
         folder: str = "INBOX",
@@ -265,18 +642,21 @@ class IMAPClient:
         Returns:
             List of message UIDs
         """
+        uids = self.search_uids(folder, criteria)
+        # Return most recent first, limited
+        return uids[-limit:][::-1]
+
+    def search_uids(self, folder: str = "INBOX", criteria: str = "ALL") -> list[str]:
+        """Return every UID matching criteria, in ascending order."""
         if not self._connection:
             raise ValueError("Not connected")
 
-        self.select_folder(folder)
+        self.ensure_folder(folder)
         status, data = self._connection.uid("search", None, criteria)
         if status != "OK":
             raise ValueError(f"Search failed: {criteria}")
 
-        uids = data[0].split()
-        # Return most recent first, limited
-        uids = uids[-limit:][::-1]
-        return [uid.decode() for uid in uids]
+        return [uid.decode() for uid in data[0].split()]
 
     def fetch_message(self, uid: str, folder: str = "INBOX") -> EmailMessage:
         """Fetch a single message by UID.
@@ -291,7 +671,7 @@ class IMAPClient:
         if not self._connection:
             raise ValueError("Not connected")
 
-        self.select_folder(folder)
+        self.ensure_folder(folder)
         status, data = self._connection.uid("fetch", uid, "(RFC822 FLAGS)")
         if status != "OK" or not data[0]:
             raise ValueError(f"Failed to fetch message: {uid}")
@@ -301,19 +681,90 @@ class IMAPClient:
         flags_data = data[0][0]
 
         message = parse_message(uid, raw_email, folder)
+        message.size = len(raw_email)
 
         # Extract flags
         if isinstance(flags_data, bytes):
-            flags_str = flags_data.decode()
-            if "FLAGS" in flags_str:
-                import re
-
-                match = re.search(r"FLAGS \(([^)]*)\)", flags_str)
-                if match:
-                    message.flags = match.group(1).split()
+            match = re.search(r"FLAGS \(([^)]*)\)", flags_data.decode())
+            if match:
+                message.flags = match.group(1).split()
 
         return message
 
+    def fetch_summaries(
+        self,
+        folder: str = "INBOX",
+        criteria: str = "ALL",
+        limit: int = 20,
+    ) -> list[EmailMessage]:
+        """Fetch message summaries without downloading bodies.
+
+        One UID SEARCH plus one batched UID FETCH of ENVELOPE, FLAGS,
+        BODYSTRUCTURE and RFC822.SIZE, regardless of the message count.
+
+        Args:
+            folder: Folder to search
+            criteria: IMAP search criteria
+            limit: Maximum messages to return
+
+        Returns:
+            Body-less messages, most recent first
+        """
+        uids = self.search(folder, criteria, limit)
+        return self.fetch_summaries_by_uid(uids, folder)
+
+    def fetch_summaries_by_uid(self, uids: list[str], folder: str = "INBOX") -> list[EmailMessage]:
+        """Fetch summaries for known UIDs in a single round trip.
+
+        Args:
+            uids: Message UIDs, in the order results should be returned
+            folder: Folder containing the messages
+
+        Returns:
+            Body-less messages for the UIDs that still exist
+        """
+        if not self._connection:
+            raise ValueError("Not connected")
+        if not uids:
+            return []
+
+        self.ensure_folder(folder)
+        status, data = self._connection.uid("fetch", compress_uid_set(uids), SUMMARY_ITEMS)
+        if status != "OK":
+            raise ValueError(f"Failed to fetch summaries in {folder}")
+
+        fetched = parse_fetch_response(data)
+        return [summary_from_fetch(uid, fetched[uid], folder) for uid in uids if uid in fetched]
+
+    def fetch_items(
+        self,
+        uid_set: str,
+        items: str,
+        folder: str = "INBOX",
+        changed_since: int | None = None,
+    ) -> dict[str, dict[bytes, Any]]:
+        """Run one UID FETCH and return the parsed items per UID.
+
+        Args:
+            uid_set: UID set such as ``1:*`` or ``4,7:9``
+            items: Parenthesized FETCH items
+            folder: Folder containing the messages
+            changed_since: Only messages with a higher MODSEQ (CONDSTORE)
+
+        Returns:
+            Mapping of UID to {ITEM: value}
+        """
+        if not self._connection:
+            raise ValueError("Not connected")
+
+        self.ensure_folder(folder)
+        if changed_since is not None:
+            items = f"{items} (CHANGEDSINCE {changed_since})"
+        status, data = self._connection.uid("fetch", uid_set, items)
+        if status != "OK":
+            raise ValueError(f"Failed to fetch {items} in {folder}")
+        return parse_fetch_response(data)
+
     def fetch_messages(
         self,
         folder: str = "INBOX",
@@ -331,13 +782,23 @@ class IMAPClient:
             List of parsed messages
         """
         uids = self.search(folder, criteria, limit)
+        if not uids:
+            return []
+
+        status, data = self._connection.uid("fetch", compress_uid_set(uids), "(UID FLAGS RFC822)")
+        if status != "OK":
+            raise ValueError(f"Failed to fetch messages in {folder}")
+
+        fetched = parse_fetch_response(data)
         messages = []
         for uid in uids:
-            try:
-                msg = self.fetch_message(uid, folder)
-                messages.append(msg)
-            except Exception:
+            items = fetched.get(uid)
+            if not items or not isinstance(items.get(b"RFC822"), bytes):
                 continue  # Skip failed messages
+            message = parse_message(uid, items[b"RFC822"], folder)
+            message.flags = _flags(items.get(b"FLAGS"))
+            message.size = len(items[b"RFC822"])
+            messages.append(message)
         return messages
 
     def mark_read(self, uid: str, folder: str = "INBOX") -> bool:
@@ -345,7 +806,7 @@ class IMAPClient:
         if not self._connection:
             raise ValueError("Not connected")
 
-        self.select_folder(folder)
+        self.ensure_folder(folder)
         status, _ = self._connection.uid("store", uid, "+FLAGS", "\\Seen")
         return status == "OK"
 
@@ -354,7 +815,7 @@ class IMAPClient:
         if not self._connection:
             raise ValueError("Not connected")
 
-        self.select_folder(folder)
+        self.ensure_folder(folder)
         status, _ = self._connection.uid("store", uid, "-FLAGS", "\\Seen")
         return status == "OK"
 
@@ -363,7 +824,7 @@ class IMAPClient:
         if not self._connection:
             raise ValueError("Not connected")
 
-        self.select_folder(folder)
+        self.ensure_folder(folder)
         status, _ = self._connection.uid("store", uid, "+FLAGS", "\\Deleted")
         if status == "OK":
             self._connection.expunge()
@@ -375,7 +836,7 @@ class IMAPClient:
         if not self._connection:
             raise ValueError("Not connected")
 
-        self.select_folder(from_folder)
+        self.ensure_folder(from_folder)
         # Copy then delete
         status, _ = self._connection.uid("copy", uid, to_folder)
         if status == "OK":
@@ -387,7 +848,7 @@ class IMAPClient:
         if not self._connection:
             raise ValueError("Not connected")
 
-        self.select_folder(folder)
+        self.ensure_folder(folder)
         status, data = self._connection.uid("search", None, "UNSEEN")
         if status != "OK":
             return 0
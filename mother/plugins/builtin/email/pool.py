@@ -0,0 +1,222 @@
+"""Connection pool for IMAP accounts.
+
+Opening an IMAP session costs a TCP connect, a TLS handshake and a LOGIN.
+The pool keeps a few authenticated IMAPClient connections per account,
+checks idle ones with NOOP before reuse (and periodically in the
+background), reconnects on dropped connections, and runs every blocking
+imaplib call in a worker thread so the event loop never stalls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import imaplib
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from ....config.email_accounts import EmailAccount
+from .imap_client import IMAPClient
+
+logger = logging.getLogger("mother.plugins.email.pool")
+
+T = TypeVar("T")
+
+# Errors after which a connection cannot be trusted any more
+CONNECTION_ERRORS: tuple[type[BaseException], ...] = (imaplib.IMAP4.abort, OSError, EOFError)
+
+
+@dataclass
+class _AccountSlot:
+    """Idle connections and concurrency limit for one account."""
+
+    semaphore: asyncio.Semaphore
+    idle: list[tuple[IMAPClient, float]] = field(default_factory=list)
+
+
+class IMAPPool:
+    """Per-account pool of authenticated IMAP connections."""
+
+    def __init__(
+        self,
+        max_per_account: int = 2,
+        keepalive_interval: float = 120.0,
+        max_idle: float = 600.0,
+        client_factory: Callable[[EmailAccount], IMAPClient] = IMAPClient,
+    ):
+        """Initialize the pool.
+
+        Args:
+            max_per_account: Concurrent connections allowed per account
+            keepalive_interval: Idle seconds after which a connection is
+                NOOP-checked before reuse and by the background keepalive
+                (0 disables the background task)
+            max_idle: Idle seconds after which a connection is closed
+            client_factory: Creates an unconnected client for an account
+        """
+        self.max_per_account = max_per_account
+        self.keepalive_interval = keepalive_interval
+        self.max_idle = max_idle
+        self._client_factory = client_factory
+        self._slots: dict[tuple[str, str, int], _AccountSlot] = {}
+        self._keepalive_task: asyncio.Task | None = None
+        self._stats = {"connects": 0, "reuses": 0, "reconnects": 0, "noops": 0}
+
+    @staticmethod
+    def _key(account: EmailAccount) -> tuple[str, str, int]:
+        imap = account.imap
+        return (account.name, imap.host if imap else "", imap.port if imap else 0)
+
+    def _slot(self, account: EmailAccount) -> _AccountSlot:
+        key = self._key(account)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _AccountSlot(asyncio.Semaphore(self.max_per_account))
+        return slot
+
+    async def run(
+        self,
+        account: EmailAccount,
+        operation: Callable[[IMAPClient], T],
+        retry: bool = True,
+    ) -> T:
+        """Run a blocking operation on a pooled connection in a worker thread.
+
+        Args:
+            account: Account to connect to
+            operation: Called with a connected IMAPClient
+            retry: Retry once on a fresh connection if the pooled one turns
+                out to be dead (only for operations safe to repeat)
+
+        Returns:
+            The operation's return value
+        """
+        self._ensure_keepalive()
+        slot = self._slot(account)
+        async with slot.semaphore:
+            client = await self._checkout(account, slot)
+            try:
+                return await self._attempt(slot, client, operation)
+            except CONNECTION_ERRORS as e:
+                if not retry:
+                    raise
+                logger.info(f"IMAP connection for '{account.name}' dropped ({e}), reconnecting")
+                self._stats["reconnects"] += 1
+                client = await self._connect(account)
+                return await self._attempt(slot, client, operation)
+
+    async def _attempt(self, slot: _AccountSlot, client: IMAPClient, operation: Callable[[IMAPClient], T]) -> T:
+        """Run the operation once, then pool or discard the client."""
+        try:
+            result = await asyncio.to_thread(operation, client)
+        except CONNECTION_ERRORS:
+            await self._discard(client)
+            raise
+        except Exception:
+            # Command-level errors leave the session usable
+            slot.idle.append((client, time.monotonic()))
+            raise
+        except asyncio.CancelledError:
+            # The worker thread may still be using the client, so it is
+            # closed rather than returned to the pool
+            client.abort()
+            raise
+        slot.idle.append((client, time.monotonic()))
+        return result
+
+    async def _checkout(self, account: EmailAccount, slot: _AccountSlot) -> IMAPClient:
+        """Take an idle connection (validated if stale) or open a new one."""
+        while slot.idle:
+            client, last_used = slot.idle.pop()
+            idle_for = time.monotonic() - last_used
+            if idle_for > self.max_idle:
+                await self._discard(client)
+                continue
+            if idle_for > self.keepalive_interval and not await self._ping(client):
+                await self._discard(client)
+                continue
+            self._stats["reuses"] += 1
+            return client
+        return await self._connect(account)
+
+    async def _connect(self, account: EmailAccount) -> IMAPClient:
+        client = self._client_factory(account)
+        try:
+            await asyncio.to_thread(client.connect)
+        except asyncio.CancelledError:
+            client.abort()
+            raise
+        self._stats["connects"] += 1
+        return client
+
+    async def _ping(self, client: IMAPClient) -> bool:
+        self._stats["noops"] += 1
+        try:
+            return await asyncio.to_thread(client.noop)
+        except Exception:
+            return False
+        except asyncio.CancelledError:
+            client.abort()
+            raise
+
+    async def _discard(self, client: IMAPClient) -> None:
+        with contextlib.suppress(Exception):
+            await asyncio.to_thread(client.disconnect)
+
+    def _ensure_keepalive(self) -> None:
+        if self.keepalive_interval <= 0:
+            return
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.get_running_loop().create_task(self._keepalive_loop())
+
+    async def _keepalive_loop(self) -> None:
+        """Periodically NOOP idle connections and close expired ones."""
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            await self.keepalive()
+
+    async def keepalive(self) -> None:
+        """Check every idle connection once.
+
+        Each connection is taken out of the pool and checked while holding
+        one of its account's permits, like a run() would, so a concurrent
+        run() that finds no idle connection cannot push the account past
+        max_per_account. Accounts with no free permit are skipped; their
+        connections are checked on checkout instead.
+        """
+        for slot in list(self._slots.values()):
+            for entry in list(slot.idle):
+                if slot.semaphore.locked():
+                    break
+                async with slot.semaphore:
+                    if entry not in slot.idle:
+                        continue  # checked out meanwhile
+                    slot.idle.remove(entry)
+                    client, last_used = entry
+                    if time.monotonic() - last_used > self.max_idle or not await self._ping(client):
+                        await self._discard(client)
+                    else:
+                        slot.idle.append(entry)
+
+    def stats(self) -> dict[str, Any]:
+        """Pool counters and current idle connections."""
+        return {
+            **self._stats,
+            "idle": sum(len(slot.idle) for slot in self._slots.values()),
+        }
+
+    async def close(self) -> None:
+        """Stop the keepalive task and log out of every idle connection."""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._keepalive_task
+            self._keepalive_task = None
+        for slot in self._slots.values():
+            idle, slot.idle = slot.idle, []
+            for client, _ in idle:
+                await self._discard(client)
+        self._slots.clear()
@@ -1,15 +1,29 @@
 """Built-in filesystem plugin for Mother AI OS.
 
 Provides file and directory operations with security controls.
+
+Handlers are synchronous and run in a worker thread, so slow disks and
+large files never stall the event loop. Partial reads seek and read only the
+bytes they need, and copies use copy_file_range/sendfile where the kernel supports them.
 """
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import codecs
+import errno
+import fnmatch
+import json
+import os
+import re
 import shutil
 import stat
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from ..base import PluginBase, PluginResult
 from ..manifest import (
@@ -23,6 +37,37 @@ from ..manifest import (
     PythonExecutionSpec,
 )
 
+# Bytes per copy_file_range/sendfile call
+_COPY_CHUNK = 8 * 1024 * 1024
+
+# Errors meaning the kernel copy syscall cannot be used for this pair of files
+_KERNEL_COPY_UNSUPPORTED = frozenset(
+    {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.EPERM}
+)
+
+# Longest line returned by grep; longer lines are cut
+_GREP_LINE_LIMIT = 500
+
+# Characters grep reads at a time, so a file without newlines is still
+# streamed; a match spanning two reads of one line can be missed
+_GREP_READ_CHUNK = 64 * 1024
+
+# Block size for scanning for line breaks in head/tail reads
+_LINE_SCAN_CHUNK = 64 * 1024
+
+# Bytes inspected for a NUL when deciding whether a file is binary
+_BINARY_SNIFF = 8192
+
+# Unreadable directories listed in a list_directory result
+_MAX_REPORTED_ERRORS = 20
+
+# Entry cap of a recursive list_directory when max_entries is not given;
+# plain listings of one directory are not capped unless asked
+_RECURSIVE_MAX_ENTRIES = 1000
+
+# Sort key of one path component: directories first, then case-insensitive name
+_SortKey = tuple[bool, str, str]
+
 
 def _create_manifest() -> PluginManifest:
     """Create the filesystem plugin manifest programmatically."""
@@ -39,7 +84,10 @@ def _create_manifest() -> PluginManifest:
             # Read file
             CapabilitySpec(
                 name="read_file",
-                description="Read the contents of a file. Returns text content for text files.",
+                description=(
+                    "Read the contents of a file. Returns text content for text files. "
+                    "Use offset/length or head/tail to read part of a large file."
+                ),
                 parameters=[
                     ParameterSpec(
                         name="path",
@@ -47,6 +95,30 @@ def _create_manifest() -> PluginManifest:
                         description="Path to the file to read",
                         required=True,
                     ),
+                    ParameterSpec(
+                        name="offset",
+                        type=ParameterType.INTEGER,
+                        description="Byte offset to start reading at",
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="length",
+                        type=ParameterType.INTEGER,
+                        description="Number of bytes to read from offset (capped at max_size)",
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="head",
+                        type=ParameterType.INTEGER,
+                        description="Read only the first N lines",
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="tail",
+                        type=ParameterType.INTEGER,
+                        description="Read only the last N lines",
+                        required=False,
+                    ),
                     ParameterSpec(
                         name="encoding",
                         type=ParameterType.STRING,
@@ -57,7 +129,10 @@ def _create_manifest() -> PluginManifest:
                     ParameterSpec(
                         name="max_size",
                         type=ParameterType.INTEGER,
-                        description="Maximum file size in bytes (default: 10MB)",
+                        description=(
+                            "Maximum file size in bytes (default: 10MB); for partial reads, "
+                            "the maximum number of bytes returned"
+                        ),
                         required=False,
                         default=10 * 1024 * 1024,
                     ),
@@ -154,6 +229,40 @@ def _create_manifest() -> PluginManifest:
                         required=False,
                         default=False,
                     ),
+                    ParameterSpec(
+                        name="max_depth",
+                        type=ParameterType.INTEGER,
+                        description="Maximum depth for recursive listings (1 = direct children only)",
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="max_entries",
+                        type=ParameterType.INTEGER,
+                        description=(
+                            "Maximum entries to return (default: 1000 when recursive, no limit otherwise); "
+                            "pass next_cursor back as cursor for more"
+                        ),
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="cursor",
+                        type=ParameterType.STRING,
+                        description="Resume a listing from the next_cursor of a previous call",
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="respect_ignore",
+                        type=ParameterType.BOOLEAN,
+                        description="Skip paths matched by .gitignore files (default: only when recursive)",
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="summary",
+                        type=ParameterType.BOOLEAN,
+                        description="Return total size and file counts per directory instead of entries",
+                        required=False,
+                        default=False,
+                    ),
                 ],
             ),
             # File info
@@ -256,6 +365,76 @@ def _create_manifest() -> PluginManifest:
                     ),
                 ],
             ),
+            # Search file contents
+            CapabilitySpec(
+                name="grep",
+                description=(
+                    "Search a file, or the files under a directory, for lines matching a pattern. "
+                    "Returns matching lines with line numbers instead of whole files."
+                ),
+                parameters=[
+                    ParameterSpec(
+                        name="path",
+                        type=ParameterType.STRING,
+                        description="File or directory to search",
+                        required=True,
+                    ),
+                    ParameterSpec(
+                        name="pattern",
+                        type=ParameterType.STRING,
+                        description="Regular expression (or plain text with fixed_string) to search for",
+                        required=True,
+                    ),
+                    ParameterSpec(
+                        name="fixed_string",
+                        type=ParameterType.BOOLEAN,
+                        description="Treat pattern as plain text rather than a regular expression",
+                        required=False,
+                        default=False,
+                    ),
+                    ParameterSpec(
+                        name="ignore_case",
+                        type=ParameterType.BOOLEAN,
+                        description="Case-insensitive matching",
+                        required=False,
+                        default=False,
+                    ),
+                    ParameterSpec(
+                        name="file_pattern",
+                        type=ParameterType.STRING,
+                        description="Glob for file names when searching a directory (e.g., '*.log')",
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="max_matches",
+                        type=ParameterType.INTEGER,
+                        description="Stop after this many matching lines (default: 100)",
+                        required=False,
+                        default=100,
+                    ),
+                    ParameterSpec(
+                        name="max_files",
+                        type=ParameterType.INTEGER,
+                        description="Stop after searching this many files (default: 10000)",
+                        required=False,
+                        default=10_000,
+                    ),
+                    ParameterSpec(
+                        name="max_bytes",
+                        type=ParameterType.INTEGER,
+                        description="Stop after reading about this many bytes in total (default: 100 MB)",
+                        required=False,
+                        default=100 * 1024 * 1024,
+                    ),
+                    ParameterSpec(
+                        name="encoding",
+                        type=ParameterType.STRING,
+                        description="Text encoding (default: utf-8)",
+                        required=False,
+                        default="utf-8",
+                    ),
+                ],
+            ),
             # File exists
             CapabilitySpec(
                 name="exists",
@@ -324,6 +503,7 @@ class FilesystemPlugin(PluginBase):
             "move_file": self._move_file,
             "create_directory": self._create_directory,
             "exists": self._exists,
+            "grep": self._grep,
         }
 
         handler = handlers.get(capability)
@@ -334,7 +514,8 @@ class FilesystemPlugin(PluginBase):
             )
 
         try:
-            return await handler(**params)
+            # Handlers make blocking syscalls, so they run in a worker thread
+            return await asyncio.to_thread(handler, **params)
         except PermissionError as e:
             return PluginResult.error_result(
                 f"Permission denied: {e}",
@@ -351,13 +532,17 @@ class FilesystemPlugin(PluginBase):
                 code="FILESYSTEM_ERROR",
             )
 
-    async def _read_file(
+    def _read_file(
         self,
         path: str,
         encoding: str = "utf-8",
         max_size: int = 10 * 1024 * 1024,
+        offset: int | None = None,
+        length: int | None = None,
+        head: int | None = None,
+        tail: int | None = None,
     ) -> PluginResult:
-        """Read file contents."""
+        """Read file contents, or a byte or line range of them."""
         file_path = self._resolve_path(path)
 
         if not file_path.exists():
@@ -378,11 +563,14 @@ class FilesystemPlugin(PluginBase):
                 code="ACCESS_DENIED",
             )
 
+        if offset is not None or length is not None or head is not None or tail is not None:
+            return self._read_range(file_path, encoding, max_size, offset, length, head, tail)
+
         # Check file size
         size = file_path.stat().st_size
         if size > max_size:
             return PluginResult.error_result(
-                f"File too large ({size} bytes, max {max_size})",
+                f"File too large ({size} bytes, max {max_size}); use offset/length, head, tail or grep",
                 code="FILE_TOO_LARGE",
             )
 
@@ -402,7 +590,78 @@ class FilesystemPlugin(PluginBase):
                 code="DECODE_ERROR",
             )
 
-    async def _write_file(
+    def _read_range(
+        self,
+        file_path: Path,
+        encoding: str,
+        max_size: int,
+        offset: int | None,
+        length: int | None,
+        head: int | None,
+        tail: int | None,
+    ) -> PluginResult:
+        """Read part of a file without loading the rest.
+
+        Uses plain reads rather than mmap: a log that is rotated or
+        truncated mid-read just comes back short instead of faulting.
+        """
+        if sum(x is not None for x in (head, tail)) + (offset is not None or length is not None) > 1:
+            return PluginResult.error_result(
+                "Use only one of offset/length, head or tail",
+                code="INVALID_RANGE",
+            )
+        if any(x is not None and x < 0 for x in (offset, length, head, tail)):
+            return PluginResult.error_result(
+                "Range values must not be negative",
+                code="INVALID_RANGE",
+            )
+
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                start = end = 0
+                data = b""
+            else:
+                if head is not None:
+                    start, end = 0, _line_end(f, size, head)
+                elif tail is not None:
+                    start, end = _line_start(f, size, tail), size
+                else:
+                    start = min(offset or 0, size)
+                    end = size if length is None else min(start + length, size)
+                if end - start > max_size:
+                    # Keep the requested end for tail, the start otherwise
+                    if tail is not None:
+                        start = end - max_size
+                    else:
+                        end = start + max_size
+                f.seek(start)
+                data = f.read(end - start)
+                # The file may have shrunk since it was sized
+                end = start + len(data)
+
+        try:
+            content, start, end = _decode_range(data, encoding, start, end, size)
+        except UnicodeDecodeError:
+            return PluginResult.error_result(
+                f"Cannot decode file as {encoding} (may be binary)",
+                code="DECODE_ERROR",
+            )
+
+        result = {
+            "path": str(file_path),
+            "content": content,
+            "size": size,
+            "encoding": encoding,
+            "start": start,
+            "end": end,
+            "truncated": start > 0 or end < size,
+        }
+        if end < size:
+            result["next_offset"] = end
+        return PluginResult.success_result(data=result)
+
+    def _write_file(
         self,
         path: str,
         content: str,
@@ -437,7 +696,7 @@ class FilesystemPlugin(PluginBase):
             }
         )
 
-    async def _append_file(
+    def _append_file(
         self,
         path: str,
         content: str,
@@ -463,14 +722,28 @@ class FilesystemPlugin(PluginBase):
             }
         )
 
-    async def _list_directory(
+    def _list_directory(
         self,
         path: str,
         pattern: str | None = None,
         include_hidden: bool = False,
         recursive: bool = False,
+        max_depth: int | None = None,
+        max_entries: int | None = None,
+        cursor: str | None = None,
+        respect_ignore: bool | None = None,
+        summary: bool = False,
     ) -> PluginResult:
-        """List directory contents."""
+        """List directory contents.
+
+        Entries come in a stable order (directories first, then by name,
+        depth-first), so a listing cut off at max_entries can be resumed
+        from its cursor without rescanning what was already returned.
+
+        Recursive walks are capped at 1000 entries and skip .gitignore'd
+        paths unless told otherwise. A plain listing of one directory
+        returns every entry, ignored or not, as it always has.
+        """
         dir_path = self._resolve_path(path)
 
         if not dir_path.exists():
@@ -491,55 +764,53 @@ class FilesystemPlugin(PluginBase):
                 code="ACCESS_DENIED",
             )
 
-        entries = []
+        if not recursive:
+            max_depth = 1
+        if respect_ignore is None:
+            respect_ignore = recursive
+        if max_entries is None and recursive:
+            max_entries = _RECURSIVE_MAX_ENTRIES
 
-        if pattern:
-            if recursive:
-                items = dir_path.rglob(pattern)
-            else:
-                items = dir_path.glob(pattern)
-        else:
-            if recursive:
-                items = dir_path.rglob("*")
-            else:
-                items = dir_path.iterdir()
+        walker = _DirectoryWalker(dir_path, max_depth, include_hidden, respect_ignore)
 
-        for item in items:
-            # Skip hidden files unless requested
-            if not include_hidden and item.name.startswith("."):
-                continue
+        if summary:
+            return PluginResult.success_result(data=walker.summarize(pattern, max_entries))
 
-            try:
-                stat_info = item.stat()
-                entries.append(
-                    {
-                        "name": item.name,
-                        "path": str(item),
-                        "type": "directory" if item.is_dir() else "file",
-                        "size": stat_info.st_size if item.is_file() else None,
-                        "modified": datetime.fromtimestamp(stat_info.st_mtime).isoformat(),
-                    }
-                )
-            except (PermissionError, OSError):
-                # Skip files we can't access
-                entries.append(
-                    {
-                        "name": item.name,
-                        "path": str(item),
-                        "type": "unknown",
-                        "error": "permission denied",
-                    }
-                )
+        try:
+            after = _decode_cursor(cursor) if cursor else None
+        except ValueError:
+            return PluginResult.error_result(
+                "Invalid cursor",
+                code="INVALID_CURSOR",
+            )
 
-        return PluginResult.success_result(
-            data={
-                "path": str(dir_path),
-                "count": len(entries),
-                "entries": sorted(entries, key=lambda x: (x["type"] != "directory", x["name"].lower())),
-            }
-        )
+        entries = []
+        next_cursor = None
+        last_key: tuple[_SortKey, ...] | None = None
+        if max_entries is not None:
+            max_entries = max(1, max_entries)
+        for entry, key in walker.walk(after):
+            if pattern and not walker.matches(entry, pattern):
+                continue
+            if max_entries is not None and len(entries) >= max_entries:
+                next_cursor = _encode_cursor(last_key)
+                break
+            entries.append(_entry_info(entry))
+            last_key = key
+
+        result = {
+            "path": str(dir_path),
+            "count": len(entries),
+            "entries": entries,
+            "truncated": next_cursor is not None,
+        }
+        if next_cursor:
+            result["next_cursor"] = next_cursor
+        if walker.errors:
+            result["unreadable_directories"] = walker.errors[:_MAX_REPORTED_ERRORS]
+        return PluginResult.success_result(data=result)
 
-    async def _file_info(self, path: str) -> PluginResult:
+    def _file_info(self, path: str) -> PluginResult:
         """Get file information."""
         file_path = self._resolve_path(path)
 
@@ -579,7 +850,7 @@ class FilesystemPlugin(PluginBase):
 
         return PluginResult.success_result(data=info)
 
-    async def _delete_file(self, path: str) -> PluginResult:
+    def _delete_file(self, path: str) -> PluginResult:
         """Delete a file or empty directory."""
         file_path = self._resolve_path(path)
 
@@ -613,7 +884,7 @@ class FilesystemPlugin(PluginBase):
             }
         )
 
-    async def _copy_file(
+    def _copy_file(
         self,
         source: str,
         destination: str,
@@ -647,17 +918,21 @@ class FilesystemPlugin(PluginBase):
                 code="DESTINATION_EXISTS",
             )
 
-        shutil.copy2(src_path, dst_path)
+        if dst_path.is_dir():
+            dst_path = dst_path / src_path.name
+
+        method = _fast_copy(src_path, dst_path)
 
         return PluginResult.success_result(
             data={
                 "source": str(src_path),
                 "destination": str(dst_path),
                 "action": "copied",
+                "method": method,
             }
         )
 
-    async def _move_file(
+    def _move_file(
         self,
         source: str,
         destination: str,
@@ -685,7 +960,8 @@ class FilesystemPlugin(PluginBase):
                 code="DESTINATION_EXISTS",
             )
 
-        shutil.move(str(src_path), str(dst_path))
+        # rename() when possible; across filesystems the data is copied in-kernel
+        shutil.move(str(src_path), str(dst_path), copy_function=_fast_copy)
 
         return PluginResult.success_result(
             data={
@@ -695,7 +971,7 @@ class FilesystemPlugin(PluginBase):
             }
         )
 
-    async def _create_directory(
+    def _create_directory(
         self,
         path: str,
         parents: bool = True,
@@ -732,7 +1008,104 @@ class FilesystemPlugin(PluginBase):
             }
         )
 
-    async def _exists(self, path: str) -> PluginResult:
+    def _grep(
+        self,
+        path: str,
+        pattern: str,
+        fixed_string: bool = False,
+        ignore_case: bool = False,
+        file_pattern: str | None = None,
+        max_matches: int = 100,
+        max_files: int = 10_000,
+        max_bytes: int = 100 * 1024 * 1024,
+        encoding: str = "utf-8",
+    ) -> PluginResult:
+        """Search file contents line by line.
+
+        The search stops at the first of max_matches, max_files or max_bytes
+        (counted in decoded characters); ``truncated_by`` names the budget
+        that ended it.
+        """
+        root = self._resolve_path(path)
+
+        if not root.exists():
+            return PluginResult.error_result(
+                f"Path not found: {path}",
+                code="NOT_FOUND",
+            )
+
+        if not self._check_path_allowed(root):
+            return PluginResult.error_result(
+                f"Access denied to path: {path}",
+                code="ACCESS_DENIED",
+            )
+
+        try:
+            regex = re.compile(re.escape(pattern) if fixed_string else pattern, re.IGNORECASE if ignore_case else 0)
+        except re.error as e:
+            return PluginResult.error_result(
+                f"Invalid pattern: {e}",
+                code="INVALID_PATTERN",
+            )
+
+        matches: list[dict[str, Any]] = []
+        files_searched = 0
+        bytes_read = 0
+        truncated_by = None
+        files = [root] if root.is_file() else _iter_text_files(root, file_pattern)
+
+        for file_path in files:
+            if not self._check_path_allowed(file_path):
+                continue
+            if files_searched >= max_files:
+                truncated_by = "max_files"
+                break
+            try:
+                with open(file_path, encoding=encoding, errors="replace") as f:
+                    files_searched += 1
+                    line_number = 1
+                    matched_line = 0
+                    while True:
+                        if bytes_read >= max_bytes:
+                            truncated_by = "max_bytes"
+                            break
+                        segment = f.readline(_GREP_READ_CHUNK)
+                        if not segment:
+                            break
+                        bytes_read += len(segment)
+                        if matched_line != line_number and regex.search(segment):
+                            if len(matches) >= max_matches:
+                                truncated_by = "max_matches"
+                                break
+                            matched_line = line_number
+                            matches.append(
+                                {
+                                    "path": str(file_path),
+                                    "line_number": line_number,
+                                    "line": segment.rstrip("\r\n")[:_GREP_LINE_LIMIT],
+                                }
+                            )
+                        if segment.endswith("\n"):
+                            line_number += 1
+            except OSError:
+                # Skip files we can't read
+                continue
+            if truncated_by:
+                break
+
+        data = {
+            "path": str(root),
+            "pattern": pattern,
+            "matches": matches,
+            "count": len(matches),
+            "files_searched": files_searched,
+            "truncated": truncated_by is not None,
+        }
+        if truncated_by:
+            data["truncated_by"] = truncated_by
+        return PluginResult.success_result(data=data)
+
+    def _exists(self, path: str) -> PluginResult:
         """Check if a path exists."""
         file_path = self._resolve_path(path)
 
@@ -750,5 +1123,350 @@ class FilesystemPlugin(PluginBase):
         )
 
 
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _sort_key(name: str, is_dir: bool) -> _SortKey:
+    return (not is_dir, name.lower(), name)
+
+
+def _entry_info(entry: os.DirEntry) -> dict[str, Any]:
+    """Describe a directory entry using its cached type and a single stat."""
+    try:
+        is_dir = entry.is_dir()
+        stat_info = entry.stat()
+        return {
+            "name": entry.name,
+            "path": entry.path,
+            "type": "directory" if is_dir else "file",
+            "size": None if is_dir else stat_info.st_size,
+            "modified": datetime.fromtimestamp(stat_info.st_mtime).isoformat(),
+        }
+    except OSError as e:
+        # Dangling symlinks, races with deletion, permission problems
+        return {
+            "name": entry.name,
+            "path": entry.path,
+            "type": "unknown",
+            "error": e.strerror or str(e),
+        }
+
+
+def _encode_cursor(key: tuple[_SortKey, ...]) -> str:
+    """Encode a listing position as an opaque string."""
+    names = [component[2] for component in key]
+    raw = json.dumps({"p": names, "d": not key[-1][0]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[_SortKey, ...]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        names, last_is_dir = data["p"], data["d"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not names or not all(isinstance(name, str) for name in names):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    # Every component but the last is a directory
+    return tuple(_sort_key(name, True) for name in names[:-1]) + (_sort_key(names[-1], bool(last_is_dir)),)
+
+
+@dataclass
+class _IgnoreRule:
+    """One pattern from a .gitignore, relative to the directory holding it."""
+
+    base: tuple[str, ...]
+    pattern: str
+    dir_only: bool
+    anchored: bool
+
+    def matches(self, parts: tuple[str, ...], is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if parts[: len(self.base)] != self.base:
+            return False
+        if self.anchored:
+            return fnmatch.fnmatchcase("/".join(parts[len(self.base) :]), self.pattern)
+        return fnmatch.fnmatchcase(parts[-1], self.pattern)
+
+
+def _read_ignore_file(directory: str, base: tuple[str, ...]) -> list[_IgnoreRule]:
+    """Parse the simple subset of .gitignore (no negation) in a directory."""
+    try:
+        with open(os.path.join(directory, ".gitignore"), encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    rules = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(("#", "!")):
+            continue
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        rules.append(_IgnoreRule(base, line.lstrip("/"), dir_only, anchored))
+    return rules
+
+
+class _DirectoryWalker:
+    """Depth-first os.scandir walk in listing order.
+
+    Hidden and ignored directories are pruned before they are opened, and
+    symlinked directories are listed but not followed.
+    """
+
+    def __init__(self, root: Path, max_depth: int | None, include_hidden: bool, respect_ignore: bool):
+        self.root = root
+        self.max_depth = max_depth
+        self.include_hidden = include_hidden
+        self.respect_ignore = respect_ignore
+        self.errors: list[str] = []
+
+    def _scan(
+        self, path: str, parts: tuple[str, ...], rules: list[_IgnoreRule]
+    ) -> tuple[list[tuple[_SortKey, os.DirEntry]], list[_IgnoreRule]]:
+        """Read one directory, dropping hidden and ignored entries, sorted."""
+        if self.respect_ignore:
+            rules = rules + _read_ignore_file(path, parts)
+        try:
+            with os.scandir(path) as it:
+                scanned = list(it)
+        except OSError:
+            self.errors.append(path)
+            return [], rules
+
+        entries = []
+        for entry in scanned:
+            if not self.include_hidden and entry.name.startswith("."):
+                continue
+            is_dir = _is_dir(entry)
+            entry_parts = parts + (entry.name,)
+            if any(rule.matches(entry_parts, is_dir) for rule in rules):
+                continue
+            entries.append((_sort_key(entry.name, is_dir), entry))
+        entries.sort(key=lambda item: item[0])
+        return entries, rules
+
+    def walk(self, after: tuple[_SortKey, ...] | None = None) -> Iterator[tuple[os.DirEntry, tuple[_SortKey, ...]]]:
+        """Yield (entry, position key) for every entry past ``after``.
+
+        Position keys order like the walk itself, so whole subtrees that lie
+        before ``after`` are skipped without being opened.
+        """
+        entries, rules = self._scan(str(self.root), (), [])
+        stack = [((), (), iter(entries), rules)]
+        while stack:
+            parts, key, remaining, rules = stack[-1]
+            item = next(remaining, None)
+            if item is None:
+                stack.pop()
+                continue
+            component, entry = item
+            entry_key = key + (component,)
+            entry_parts = parts + (entry.name,)
+
+            if after is not None:
+                if after[: len(entry_key)] == entry_key:
+                    # The cursor entry or one of its ancestors: already returned
+                    yield_entry = False
+                elif entry_key < after:
+                    continue
+                else:
+                    after = None
+                    yield_entry = True
+            else:
+                yield_entry = True
+
+            if yield_entry:
+                yield entry, entry_key
+
+            depth = len(entry_parts)
+            if not component[0] and not entry.is_symlink() and (self.max_depth is None or depth < self.max_depth):
+                children, child_rules = self._scan(entry.path, entry_parts, rules)
+                stack.append((entry_parts, entry_key, iter(children), child_rules))
+
+    def matches(self, entry: os.DirEntry, pattern: str) -> bool:
+        """Match a glob against the name, or the relative path if it has a slash."""
+        if "/" in pattern:
+            relative = os.path.relpath(entry.path, self.root).replace(os.sep, "/")
+            return fnmatch.fnmatch(relative, pattern)
+        return fnmatch.fnmatch(entry.name, pattern)
+
+    def summarize(self, pattern: str | None, max_entries: int | None) -> dict[str, Any]:
+        """Total files and bytes under each directory, largest first.
+
+        Only files matching ``pattern`` (if given) are counted, and at most
+        ``max_entries`` directories (None for all) are listed.
+        """
+        root = str(self.root)
+        totals: dict[str, list[int]] = {root: [0, 0, 0]}  # files, dirs, bytes
+        for entry, _ in self.walk():
+            parent = os.path.dirname(entry.path)
+            if _is_dir(entry):
+                totals.setdefault(entry.path, [0, 0, 0])
+                totals[parent][1] += 1
+                continue
+            if pattern and not self.matches(entry, pattern):
+                continue
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            # Credit the file to every directory between it and the root
+            directory = parent
+            while True:
+                counts = totals[directory]
+                counts[0] += 1
+                counts[2] += size
+                if directory == root:
+                    break
+                directory = os.path.dirname(directory)
+
+        directories = sorted(totals.items(), key=lambda item: item[1][2], reverse=True)
+        files, dirs, size = totals[root]
+        result = {
+            "path": root,
+            "summary": True,
+            "total_files": files,
+            "total_size": size,
+            "directories": [
+                {"path": path, "files": counts[0], "subdirectories": counts[1], "size": counts[2]}
+                for path, counts in directories[:max_entries]
+            ],
+            "directory_count": len(directories),
+            "truncated": max_entries is not None and len(directories) > max_entries,
+        }
+        if self.errors:
+            result["unreadable_directories"] = self.errors[:_MAX_REPORTED_ERRORS]
+        return result
+
+
+def _line_end(f: BinaryIO, size: int, lines: int) -> int:
+    """Offset just past the first ``lines`` lines of the first ``size`` bytes."""
+    end = pos = 0
+    f.seek(0)
+    while lines and pos < size:
+        block = f.read(min(_LINE_SCAN_CHUNK, size - pos))
+        if not block:
+            break
+        newline = block.find(b"\n")
+        while newline >= 0 and lines:
+            end = pos + newline + 1
+            lines -= 1
+            newline = block.find(b"\n", newline + 1)
+        pos += len(block)
+    return end if not lines else pos
+
+
+def _line_start(f: BinaryIO, size: int, lines: int) -> int:
+    """Offset of the first of the last ``lines`` lines of the first ``size`` bytes."""
+    if lines == 0:
+        return size
+    # A trailing newline ends the last line rather than starting a new one
+    f.seek(size - 1)
+    pos = size - 1 if f.read(1) == b"\n" else size
+    while pos > 0:
+        block_start = max(0, pos - _LINE_SCAN_CHUNK)
+        f.seek(block_start)
+        block = f.read(pos - block_start)
+        if not block:
+            # Truncated below this point
+            return 0
+        newline = block.rfind(b"\n")
+        while newline >= 0:
+            lines -= 1
+            if not lines:
+                return block_start + newline + 1
+            newline = block.rfind(b"\n", 0, newline)
+        pos = block_start
+    return 0
+
+
+def _decode_range(data: bytes, encoding: str, start: int, end: int, size: int) -> tuple[str, int, int]:
+    """Decode a byte range, dropping characters cut in half at its edges.
+
+    Returns the text and the adjusted start and end offsets.
+    """
+    if start > 0 and codecs.lookup(encoding).name == "utf-8":
+        # Skip continuation bytes of a character that began before the range
+        skip = 0
+        while skip < min(3, len(data)) and data[skip] & 0xC0 == 0x80:
+            skip += 1
+        data, start = data[skip:], start + skip
+    decoder = codecs.getincrementaldecoder(encoding)()
+    # final=False keeps an incomplete trailing character out of the text
+    text = decoder.decode(data, final=end >= size)
+    pending, _ = decoder.getstate()
+    return text, start, end - len(pending)
+
+
+def _kernel_copy(step: Callable[[], int]) -> bool:
+    """Run a kernel copy syscall until EOF.
+
+    Returns False, having copied nothing, if the syscall cannot be used for
+    these files or reports nothing to copy (e.g. procfs files with size 0).
+    """
+    try:
+        copied = step()
+    except OSError as e:
+        if e.errno in _KERNEL_COPY_UNSUPPORTED:
+            return False
+        raise
+    if copied == 0:
+        return False
+    while copied:
+        copied = step()
+    return True
+
+
+def _fast_copy(src: Path | str, dst: Path | str) -> str:
+    """Copy a file with its metadata, keeping the data in the kernel if possible.
+
+    Tries copy_file_range (which lets filesystems share extents), then
+    sendfile, then a buffered read/write loop.
+
+    Returns:
+        The method that copied the data
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src} and {dst} are the same file")
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        if hasattr(os, "copy_file_range") and _kernel_copy(lambda: os.copy_file_range(infd, outfd, _COPY_CHUNK)):
+            method = "copy_file_range"
+        elif hasattr(os, "sendfile") and _kernel_copy(lambda: os.sendfile(outfd, infd, None, _COPY_CHUNK)):
+            method = "sendfile"
+        else:
+            shutil.copyfileobj(fsrc, fdst, _COPY_CHUNK)
+            method = "read_write"
+    shutil.copystat(src, dst)
+    return method
+
+
+def _is_binary(path: Path) -> bool:
+    with open(path, "rb") as f:
+        return b"\0" in f.read(_BINARY_SNIFF)
+
+
+def _iter_text_files(root: Path, file_pattern: str | None) -> Iterator[Path]:
+    """Yield text files under root, skipping hidden files and directories."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if name.startswith(".") or (file_pattern and not fnmatch.fnmatch(name, file_pattern)):
+                continue
+            file_path = Path(dirpath) / name
+            try:
+                if file_path.is_file() and not _is_binary(file_path):
+                    yield file_path
+            except OSError:
+                continue
+
+
 # Export the plugin class and manifest
 __all__ = ["FilesystemPlugin", "_create_manifest"]
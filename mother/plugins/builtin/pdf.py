@@ -1,10 +1,28 @@
 """Built-in PDF plugin for Mother AI OS.
 
 Provides PDF manipulation capabilities: merge, split, extract pages, get info.
+
+Rewriting PDFs is CPU-bound, so merge, split, extract, rotate and delete run
+in a process pool instead of on the event loop. Workers are started from a
+fork server (or spawned) rather than forked from the threaded server, and a
+pool broken by a dying worker is replaced. Readers are opened on a file
+handle rather than a path, so pypdf only parses the xref and the objects a
+page actually needs instead of loading the whole file into memory. Merges
+take one input at a time and close it once its pages are copied, and all
+outputs are written to a temporary file that replaces the target when done.
+Metadata for info and count_pages is cached by (path, mtime, size).
 """
 
 from __future__ import annotations
 
+import asyncio
+import multiprocessing
+import os
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
@@ -22,6 +40,15 @@ from ..manifest import (
     PythonExecutionSpec,
 )
 
+# Cached info/count_pages results, keyed by (path, mtime, size)
+METADATA_CACHE_SIZE = 256
+
+# Operations the batch capability can apply. delete_pages is left out so a
+# batch never bypasses its confirmation.
+BATCH_OPERATIONS = ("info", "count_pages", "rotate", "extract_pages", "split")
+
+_BATCH_SUFFIXES = {"rotate": "_rotated", "extract_pages": "_extracted"}
+
 
 def _create_manifest() -> PluginManifest:
     """Create the PDF plugin manifest programmatically."""
@@ -189,6 +216,50 @@ def _create_manifest() -> PluginManifest:
                     ),
                 ],
             ),
+            # Batch operations
+            CapabilitySpec(
+                name="batch",
+                description=(
+                    "Apply one operation to many PDF files concurrently. Writing operations save "
+                    "<name>_rotated.pdf / <name>_extracted.pdf (or a <name>/ folder for split) in output_dir."
+                ),
+                parameters=[
+                    ParameterSpec(
+                        name="operation",
+                        type=ParameterType.STRING,
+                        description="Operation to apply to every file",
+                        required=True,
+                        choices=list(BATCH_OPERATIONS),
+                    ),
+                    ParameterSpec(
+                        name="files",
+                        type=ParameterType.ARRAY,
+                        description="List of PDF file paths",
+                        required=True,
+                        items_type=ParameterType.STRING,
+                    ),
+                    ParameterSpec(
+                        name="output_dir",
+                        type=ParameterType.STRING,
+                        description="Output directory (required for rotate, extract_pages and split)",
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="pages",
+                        type=ParameterType.STRING,
+                        description="Pages for rotate/extract_pages. Format: '1,3,5' or '1-5' or 'all'",
+                        required=False,
+                        default="all",
+                    ),
+                    ParameterSpec(
+                        name="angle",
+                        type=ParameterType.INTEGER,
+                        description="Rotation angle for rotate (90, 180, or 270)",
+                        required=False,
+                        default=90,
+                    ),
+                ],
+            ),
         ],
         execution=ExecutionSpec(
             type=ExecutionType.PYTHON,
@@ -238,6 +309,113 @@ def parse_page_spec(spec: str, total_pages: int) -> list[int]:
     return sorted(pages)
 
 
+def default_workers() -> int:
+    """Number of worker processes to use by default."""
+    return os.cpu_count() or 1
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """Start method for workers that does not fork the threaded server."""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Workers fork from a server that has already imported this module
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+@contextmanager
+def _open_reader(path: str) -> Iterator[PdfReader]:
+    """Open a lazy reader that seeks in the file instead of loading all of it."""
+    with open(path, "rb") as f:
+        yield PdfReader(f)
+
+
+def _write(writer: PdfWriter, output: str) -> None:
+    """Write to a temporary file next to ``output`` and move it into place."""
+    tmp = f"{output}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            writer.write(f)
+        os.replace(tmp, output)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def read_metadata(path: str) -> dict[str, Any]:
+    """Read the page count and document info without touching page content."""
+    with _open_reader(path) as reader:
+        info: dict[str, Any] = {
+            "pages": len(reader.pages),
+            "encrypted": reader.is_encrypted,
+        }
+        metadata = reader.metadata
+        if metadata:
+            for key, value in (
+                ("title", metadata.title),
+                ("author", metadata.author),
+                ("subject", metadata.subject),
+                ("creator", metadata.creator),
+                ("producer", metadata.producer),
+                ("created", metadata.creation_date),
+                ("modified", metadata.modification_date),
+            ):
+                if value:
+                    info[key] = str(value)
+    return info
+
+
+def merge_files(paths: list[str], output: str) -> int:
+    """Merge PDFs into ``output``, reading one input at a time.
+
+    Pages are copied into the writer as each input is read, so an input is
+    closed before the next is opened.
+
+    Returns:
+        Number of pages written
+    """
+    writer = PdfWriter()
+    for path in paths:
+        with _open_reader(path) as reader:
+            for page in reader.pages:
+                writer.add_page(page)
+    _write(writer, output)
+    return len(writer.pages)
+
+
+def split_file(path: str, output_dir: str, prefix: str) -> list[str]:
+    """Write every page of ``path`` to its own file.
+
+    Returns:
+        Paths of the written files
+    """
+    outputs = []
+    with _open_reader(path) as reader:
+        for i, page in enumerate(reader.pages, 1):
+            writer = PdfWriter()
+            writer.add_page(page)
+            output = os.path.join(output_dir, f"{prefix}_{i:03d}.pdf")
+            _write(writer, output)
+            outputs.append(output)
+    return outputs
+
+
+def copy_pages(path: str, output: str, pages: list[int], rotate: list[int] | None = None, angle: int = 0) -> None:
+    """Copy the given 0-indexed pages to ``output``, rotating some of them.
+
+    Only the listed pages are loaded from the source.
+    """
+    to_rotate = set(rotate or ())
+    writer = PdfWriter()
+    with _open_reader(path) as reader:
+        for idx in pages:
+            page = writer.add_page(reader.pages[idx])
+            if idx in to_rotate:
+                page.rotate(angle)
+    _write(writer, output)
+
+
 class PDFPlugin(PluginBase):
     """Built-in plugin for PDF manipulation."""
 
@@ -248,6 +426,10 @@ class PDFPlugin(PluginBase):
         # Default output directory
         self._default_output_dir = Path.home() / "Downloads"
 
+        self._workers = int(self.config.get("workers") or default_workers())
+        self._executor: ProcessPoolExecutor | None = None
+        self._metadata_cache: OrderedDict[tuple[str, int, int], dict[str, Any]] = OrderedDict()
+
     def _resolve_path(self, path_str: str) -> Path:
         """Resolve and expand a path string."""
         path = Path(path_str).expanduser()
@@ -255,6 +437,52 @@ class PDFPlugin(PluginBase):
             path = Path.cwd() / path
         return path.resolve()
 
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers, mp_context=_pool_context())
+        return self._executor
+
+    def _discard_pool(self, executor: ProcessPoolExecutor) -> None:
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn, *args) -> Any:
+        """Run a PDF rewrite in the worker process pool.
+
+        A worker that dies (OOM-killed on a huge file, a crash, an rlimit)
+        breaks its pool for good, so the pool is replaced. A call rejected
+        by a pool an earlier call broke is retried on the new one; the call
+        that was running when the worker died fails.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._pool()
+        try:
+            future = loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            self._discard_pool(executor)
+            executor = self._pool()
+            future = loop.run_in_executor(executor, fn, *args)
+        try:
+            return await future
+        except BrokenProcessPool:
+            self._discard_pool(executor)
+            raise
+
+    async def _metadata(self, path: Path) -> dict[str, Any]:
+        """Get the page count and document info, cached by (path, mtime, size)."""
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        info = self._metadata_cache.get(key)
+        if info is None:
+            info = await asyncio.to_thread(read_metadata, str(path))
+            self._metadata_cache[key] = info
+            if len(self._metadata_cache) > METADATA_CACHE_SIZE:
+                self._metadata_cache.popitem(last=False)
+        else:
+            self._metadata_cache.move_to_end(key)
+        return info
+
     async def execute(self, capability: str, params: dict[str, Any]) -> PluginResult:
         """Execute a PDF capability."""
         handlers = {
@@ -265,6 +493,7 @@ class PDFPlugin(PluginBase):
             "rotate": self._rotate,
             "delete_pages": self._delete_pages,
             "count_pages": self._count_pages,
+            "batch": self._batch,
         }
 
         handler = handlers.get(capability)
@@ -274,6 +503,10 @@ class PDFPlugin(PluginBase):
                 code="UNKNOWN_CAPABILITY",
             )
 
+        return await self._call(handler, params)
+
+    async def _call(self, handler, params: dict[str, Any]) -> PluginResult:
+        """Run a handler, turning exceptions into error results."""
         try:
             return await handler(**params)
         except FileNotFoundError as e:
@@ -321,18 +554,7 @@ class PDFPlugin(PluginBase):
         # Create output directory if needed
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Merge PDFs
-        writer = PdfWriter()
-        total_pages = 0
-
-        for path in input_paths:
-            reader = PdfReader(str(path))
-            for page in reader.pages:
-                writer.add_page(page)
-                total_pages += 1
-
-        with open(output_path, "wb") as f:
-            writer.write(f)
+        total_pages = await self._run(merge_files, [str(p) for p in input_paths], str(output_path))
 
         return PluginResult.success_result(
             data={
@@ -362,17 +584,7 @@ class PDFPlugin(PluginBase):
         # Create output directory
         output_dir_path.mkdir(parents=True, exist_ok=True)
 
-        reader = PdfReader(str(input_path))
-        output_files = []
-
-        for i, page in enumerate(reader.pages, 1):
-            writer = PdfWriter()
-            writer.add_page(page)
-
-            output_file = output_dir_path / f"{prefix}_{i:03d}.pdf"
-            with open(output_file, "wb") as f:
-                writer.write(f)
-            output_files.append(str(output_file))
+        output_files = await self._run(split_file, str(input_path), str(output_dir_path), prefix)
 
         return PluginResult.success_result(
             data={
@@ -399,8 +611,7 @@ class PDFPlugin(PluginBase):
                 code="FILE_NOT_FOUND",
             )
 
-        reader = PdfReader(str(input_path))
-        total_pages = len(reader.pages)
+        total_pages = (await self._metadata(input_path))["pages"]
 
         # Parse page specification
         try:
@@ -420,13 +631,7 @@ class PDFPlugin(PluginBase):
         # Create output directory if needed
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Extract pages
-        writer = PdfWriter()
-        for idx in page_indices:
-            writer.add_page(reader.pages[idx])
-
-        with open(output_path, "wb") as f:
-            writer.write(f)
+        await self._run(copy_pages, str(input_path), str(output_path), page_indices)
 
         # Convert back to 1-indexed for display
         extracted_pages = [i + 1 for i in page_indices]
@@ -450,32 +655,7 @@ class PDFPlugin(PluginBase):
                 code="FILE_NOT_FOUND",
             )
 
-        reader = PdfReader(str(input_path))
-        metadata = reader.metadata or {}
-
-        # Extract metadata fields
-        info = {
-            "file": str(input_path),
-            "pages": len(reader.pages),
-            "encrypted": reader.is_encrypted,
-        }
-
-        # Standard PDF metadata fields
-        if metadata:
-            if metadata.title:
-                info["title"] = metadata.title
-            if metadata.author:
-                info["author"] = metadata.author
-            if metadata.subject:
-                info["subject"] = metadata.subject
-            if metadata.creator:
-                info["creator"] = metadata.creator
-            if metadata.producer:
-                info["producer"] = metadata.producer
-            if metadata.creation_date:
-                info["created"] = str(metadata.creation_date)
-            if metadata.modification_date:
-                info["modified"] = str(metadata.modification_date)
+        info = {"file": str(input_path), **await self._metadata(input_path)}
 
         # File size
         info["size_bytes"] = input_path.stat().st_size
@@ -509,8 +689,7 @@ class PDFPlugin(PluginBase):
                 code="FILE_NOT_FOUND",
             )
 
-        reader = PdfReader(str(input_path))
-        total_pages = len(reader.pages)
+        total_pages = (await self._metadata(input_path))["pages"]
 
         # Parse page specification
         try:
@@ -525,14 +704,7 @@ class PDFPlugin(PluginBase):
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Rotate specified pages
-        writer = PdfWriter()
-        for i, page in enumerate(reader.pages):
-            if i in page_indices:
-                page.rotate(angle)
-            writer.add_page(page)
-
-        with open(output_path, "wb") as f:
-            writer.write(f)
+        await self._run(copy_pages, str(input_path), str(output_path), list(range(total_pages)), page_indices, angle)
 
         rotated_count = len(page_indices)
         return PluginResult.success_result(
@@ -560,8 +732,7 @@ class PDFPlugin(PluginBase):
                 code="FILE_NOT_FOUND",
             )
 
-        reader = PdfReader(str(input_path))
-        total_pages = len(reader.pages)
+        total_pages = (await self._metadata(input_path))["pages"]
 
         # Parse page specification
         try:
@@ -588,13 +759,8 @@ class PDFPlugin(PluginBase):
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Keep pages not in the delete list
-        writer = PdfWriter()
-        for i, page in enumerate(reader.pages):
-            if i not in pages_to_delete:
-                writer.add_page(page)
-
-        with open(output_path, "wb") as f:
-            writer.write(f)
+        keep = [i for i in range(total_pages) if i not in pages_to_delete]
+        await self._run(copy_pages, str(input_path), str(output_path), keep)
 
         remaining = total_pages - len(pages_to_delete)
         return PluginResult.success_result(
@@ -616,14 +782,100 @@ class PDFPlugin(PluginBase):
                 code="FILE_NOT_FOUND",
             )
 
-        reader = PdfReader(str(input_path))
-        count = len(reader.pages)
+        count = (await self._metadata(input_path))["pages"]
 
         return PluginResult.success_result(
             data={"file": str(input_path), "pages": count},
             message=f"{input_path.name}: {count} pages",
         )
 
+    async def _batch(
+        self,
+        operation: str,
+        files: list[str],
+        output_dir: str | None = None,
+        pages: str = "all",
+        angle: int = 90,
+    ) -> PluginResult:
+        """Apply one operation to many PDFs concurrently."""
+        if operation not in BATCH_OPERATIONS:
+            return PluginResult.error_result(
+                f"Unsupported batch operation: {operation}. Use one of: {', '.join(BATCH_OPERATIONS)}",
+                code="INVALID_INPUT",
+            )
+
+        if not files:
+            return PluginResult.error_result(
+                "No input files provided",
+                code="INVALID_INPUT",
+            )
+
+        input_paths = [self._resolve_path(f) for f in files]
+        calls: list[tuple[Any, dict[str, Any]]] = []
+
+        if operation in ("info", "count_pages"):
+            handler = self._info if operation == "info" else self._count_pages
+            calls = [(handler, {"input": str(path)}) for path in input_paths]
+        else:
+            if not output_dir:
+                return PluginResult.error_result(
+                    f"output_dir is required for batch {operation}",
+                    code="INVALID_INPUT",
+                )
+            stems = [path.stem for path in input_paths]
+            if len(set(stems)) != len(stems):
+                return PluginResult.error_result(
+                    "Input files must have distinct names when writing to one output_dir",
+                    code="INVALID_INPUT",
+                )
+            out = self._resolve_path(output_dir)
+            for path in input_paths:
+                if operation == "split":
+                    calls.append((self._split, {"input": str(path), "output_dir": str(out / path.stem)}))
+                    continue
+                output = out / f"{path.stem}{_BATCH_SUFFIXES[operation]}.pdf"
+                params = {"input": str(path), "output": str(output), "pages": pages}
+                if operation == "rotate":
+                    calls.append((self._rotate, {**params, "angle": angle}))
+                else:
+                    calls.append((self._extract_pages, params))
+
+        limit = asyncio.Semaphore(self._workers)
+
+        async def run_one(handler, params: dict[str, Any]) -> PluginResult:
+            async with limit:
+                return await self._call(handler, params)
+
+        results = await asyncio.gather(*(run_one(handler, params) for handler, params in calls))
+
+        items = []
+        for path, result in zip(input_paths, results, strict=True):
+            item: dict[str, Any] = {"file": str(path), "success": result.success}
+            if result.success:
+                item["data"] = result.data
+            else:
+                item["error"] = result.error_message
+                item["error_code"] = result.error_code
+            items.append(item)
+        succeeded = sum(1 for r in results if r.success)
+
+        return PluginResult.success_result(
+            data={
+                "operation": operation,
+                "results": items,
+                "succeeded": succeeded,
+                "failed": len(items) - succeeded,
+            },
+            message=f"Batch {operation}: {succeeded}/{len(items)} files succeeded",
+        )
+
+    async def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        await super().shutdown()
+
     def _human_size(self, size_bytes: int) -> str:
         """Convert bytes to human-readable size."""
         for unit in ["B", "KB", "MB", "GB"]:
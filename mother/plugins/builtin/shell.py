@@ -5,7 +5,6 @@ Provides shell command execution with security controls.
 
 from __future__ import annotations
 
-import asyncio
 import getpass
 import os
 import shutil
@@ -24,6 +23,7 @@ from ..manifest import (
     PluginMetadata,
     PythonExecutionSpec,
 )
+from ..process import limits_from_config, run_process
 
 
 def _create_manifest() -> PluginManifest:
@@ -226,6 +226,9 @@ class ShellPlugin(PluginBase):
         if config and "allowed_cwd" in config:
             self._allowed_cwd = [Path(p).resolve() for p in config["allowed_cwd"]]
 
+        # Resource caps enforced on every child process
+        self._limits = limits_from_config(config)
+
     def _check_command_allowed(self, command: str) -> tuple[bool, str | None]:
         """Check if a command is allowed to run.
 
@@ -318,36 +321,31 @@ class ShellPlugin(PluginBase):
 
         # Execute command
         try:
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            outcome = await run_process(
+                ["/bin/sh", "-c", command],
+                timeout=timeout,
                 cwd=cwd,
                 env=run_env,
+                limits=self._limits,
+                name=self.name,
             )
-
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=timeout,
-                )
-            except TimeoutError:
-                process.kill()
-                await process.wait()
+            if outcome.timed_out:
                 return PluginResult.timeout_result(timeout)
 
-            stdout_str = stdout.decode("utf-8", errors="replace")
-            stderr_str = stderr.decode("utf-8", errors="replace")
+            stdout_str = outcome.stdout.decode("utf-8", errors="replace")
+            stderr_str = outcome.stderr.decode("utf-8", errors="replace")
 
             return PluginResult.success_result(
                 data={
                     "command": command,
-                    "exit_code": process.returncode,
+                    "exit_code": outcome.returncode,
                     "stdout": stdout_str,
                     "stderr": stderr_str,
-                    "success": process.returncode == 0,
+                    "success": outcome.returncode == 0,
                 },
-                raw_output=stdout_str if process.returncode == 0 else stderr_str,
+                raw_output=stdout_str if outcome.returncode == 0 else stderr_str,
+                execution_time=outcome.wall_time,
+                **outcome.metadata(),
             )
 
         except Exception as e:
@@ -379,37 +377,30 @@ class ShellPlugin(PluginBase):
 
         # Execute script
         try:
-            process = await asyncio.create_subprocess_exec(
-                shell,
-                "-c",
-                script,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            outcome = await run_process(
+                [shell, "-c", script],
+                timeout=timeout,
                 cwd=cwd,
+                limits=self._limits,
+                name=self.name,
             )
-
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=timeout,
-                )
-            except TimeoutError:
-                process.kill()
-                await process.wait()
+            if outcome.timed_out:
                 return PluginResult.timeout_result(timeout)
 
-            stdout_str = stdout.decode("utf-8", errors="replace")
-            stderr_str = stderr.decode("utf-8", errors="replace")
+            stdout_str = outcome.stdout.decode("utf-8", errors="replace")
+            stderr_str = outcome.stderr.decode("utf-8", errors="replace")
 
             return PluginResult.success_result(
                 data={
                     "shell": shell,
-                    "exit_code": process.returncode,
+                    "exit_code": outcome.returncode,
                     "stdout": stdout_str,
                     "stderr": stderr_str,
-                    "success": process.returncode == 0,
+                    "success": outcome.returncode == 0,
                 },
-                raw_output=stdout_str if process.returncode == 0 else stderr_str,
+                raw_output=stdout_str if outcome.returncode == 0 else stderr_str,
+                execution_time=outcome.wall_time,
+                **outcome.metadata(),
             )
 
         except Exception as e:
@@ -1,11 +1,15 @@
 """Built-in SSH plugin for Mother AI OS.
 
 Provides SSH access to remote VMs for command execution and file operations.
+All paramiko calls run in the connection pool's worker threads.
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
+import time
 from pathlib import Path
 from typing import Any
 
@@ -22,6 +26,7 @@ from ...manifest import (
     PluginMetadata,
     PythonExecutionSpec,
 )
+from ...process import live_output_callback
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +83,44 @@ def _create_manifest() -> PluginManifest:
                     ),
                 ],
             ),
+            # Run command on several VMs
+            CapabilitySpec(
+                name="run_on_many",
+                description=(
+                    "Execute the same command on several VMs concurrently. "
+                    "Results are returned per VM in the order they finish."
+                ),
+                confirmation_required=True,
+                parameters=[
+                    ParameterSpec(
+                        name="command",
+                        type=ParameterType.STRING,
+                        description="Command to execute",
+                        required=True,
+                    ),
+                    ParameterSpec(
+                        name="vm_names",
+                        type=ParameterType.ARRAY,
+                        description="VM names to run on (default: all configured VMs)",
+                        required=False,
+                        items_type=ParameterType.STRING,
+                    ),
+                    ParameterSpec(
+                        name="timeout",
+                        type=ParameterType.INTEGER,
+                        description="Per-VM command timeout in seconds (default: 30)",
+                        required=False,
+                        default=30,
+                    ),
+                    ParameterSpec(
+                        name="max_parallel",
+                        type=ParameterType.INTEGER,
+                        description="Maximum VMs to run on at once (default: 10)",
+                        required=False,
+                        default=10,
+                    ),
+                ],
+            ),
             # Read file
             CapabilitySpec(
                 name="read_file",
@@ -214,10 +257,15 @@ class SSHPlugin(PluginBase):
         super().__init__(_create_manifest(), config)
 
         # Load VM registry
-        config_path = Path.home() / ".config/mother/vms.yaml"
+        config_path = Path(self.config.get("vms_config", "~/.config/mother/vms.yaml"))
         try:
             self.vm_registry = VMRegistry.load_from_yaml(config_path)
-            self.connection_pool = SSHConnectionPool(self.vm_registry)
+            self.connection_pool = SSHConnectionPool(
+                self.vm_registry,
+                max_workers=self.config.get("max_workers", 16),
+                max_channels=self.config.get("max_channels_per_vm", 8),
+                keepalive_interval=self.config.get("keepalive_interval", 30),
+            )
             logger.info(
                 f"SSH plugin initialized with {len(self.vm_registry.list_vm_names())} VMs"
             )
@@ -238,6 +286,7 @@ class SSHPlugin(PluginBase):
         handlers = {
             "connect": self._connect,
             "run_command": self._run_command,
+            "run_on_many": self._run_on_many,
             "read_file": self._read_file,
             "list_directory": self._list_directory,
             "download_file": self._download_file,
@@ -279,11 +328,10 @@ class SSHPlugin(PluginBase):
 
     async def _connect(self, vm_name: str) -> PluginResult:
         """Test connection to a VM."""
-        conn = self.connection_pool.get_connection(vm_name)
         config = self.vm_registry.get_vm(vm_name)
 
         # Get system info
-        result = conn.run_command("hostname && uptime", timeout=10)
+        result = await self.connection_pool.run(vm_name, lambda conn: conn.run_command("hostname && uptime", timeout=10))
 
         if not result.success:
             return PluginResult.error_result(
@@ -306,8 +354,10 @@ class SSHPlugin(PluginBase):
         self, vm_name: str, command: str, timeout: int = 30
     ) -> PluginResult:
         """Execute a command on a VM."""
-        conn = self.connection_pool.get_connection(vm_name)
-        result = conn.run_command(command, timeout=timeout)
+        # Not retried: the command may already have run before the drop
+        result = await self.connection_pool.run(
+            vm_name, lambda conn: conn.run_command(command, timeout=timeout), retry=False
+        )
 
         return PluginResult.success_result(
             message=f"Command executed on '{vm_name}' with exit code {result.exit_code}",
@@ -321,12 +371,88 @@ class SSHPlugin(PluginBase):
             },
         )
 
+    async def _run_on_many(
+        self,
+        command: str,
+        vm_names: list[str] | None = None,
+        timeout: int = 30,
+        max_parallel: int = 10,
+    ) -> PluginResult:
+        """Execute a command on several VMs concurrently.
+
+        If a live output callback is set (see ``stream_output``), each VM's
+        stdout and stderr are passed to it as soon as that VM finishes,
+        under the stream names ``<vm>/stdout`` and ``<vm>/stderr``.
+        """
+        names = list(dict.fromkeys(vm_names or self.vm_registry.list_vm_names()))
+        for name in names:
+            self.vm_registry.get_vm(name)  # Unknown names fail before anything runs
+
+        semaphore = asyncio.Semaphore(max(1, max_parallel))
+        on_output = live_output_callback()
+
+        async def run_one(name: str) -> dict[str, Any]:
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    result = await self.connection_pool.run(
+                        name, lambda conn: conn.run_command(command, timeout=timeout), retry=False
+                    )
+                except Exception as e:
+                    return {
+                        "vm_name": name,
+                        "success": False,
+                        "error": str(e),
+                        "elapsed": round(time.monotonic() - started, 3),
+                    }
+                return {
+                    "vm_name": name,
+                    "stdout": result.stdout,
+                    "stderr": result.stderr,
+                    "exit_code": result.exit_code,
+                    "success": result.success,
+                    "elapsed": round(time.monotonic() - started, 3),
+                }
+
+        results = []
+        for next_done in asyncio.as_completed([run_one(name) for name in names]):
+            host = await next_done
+            results.append(host)
+            if on_output is not None:
+                on_output = await self._emit_host(on_output, host)
+
+        succeeded = sum(1 for host in results if host["success"])
+        return PluginResult.success_result(
+            message=f"Command ran on {len(results)} VM(s): {succeeded} succeeded, {len(results) - succeeded} failed",
+            data={
+                "command": command,
+                "results": results,
+                "count": len(results),
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+            },
+        )
+
+    @staticmethod
+    async def _emit_host(on_output: Any, host: dict[str, Any]) -> Any:
+        """Stream one VM's output; returns None if the callback should be dropped."""
+        try:
+            streams = {"stdout": host.get("stdout"), "stderr": host.get("stderr") or host.get("error")}
+            for stream, text in streams.items():
+                if text:
+                    result = on_output(f"{host['vm_name']}/{stream}", text.encode())
+                    if inspect.isawaitable(result):
+                        await result
+            return on_output
+        except Exception as e:
+            logger.warning(f"Output callback failed, disabling it: {e}")
+            return None
+
     async def _read_file(
         self, vm_name: str, remote_path: str, max_size: int = 1024 * 1024
     ) -> PluginResult:
         """Read a file from a VM."""
-        conn = self.connection_pool.get_connection(vm_name)
-        content = conn.read_file(remote_path, max_size=max_size)
+        content = await self.connection_pool.run(vm_name, lambda conn: conn.read_file(remote_path, max_size=max_size))
 
         return PluginResult.success_result(
             message=f"Read {len(content)} bytes from {remote_path} on '{vm_name}'",
@@ -340,8 +466,7 @@ class SSHPlugin(PluginBase):
 
     async def _list_directory(self, vm_name: str, remote_path: str) -> PluginResult:
         """List directory contents on a VM."""
-        conn = self.connection_pool.get_connection(vm_name)
-        files = conn.list_directory(remote_path)
+        files = await self.connection_pool.run(vm_name, lambda conn: conn.list_directory(remote_path))
 
         files_data = [
             {
@@ -368,8 +493,7 @@ class SSHPlugin(PluginBase):
         self, vm_name: str, remote_path: str, local_path: str
     ) -> PluginResult:
         """Download a file from a VM."""
-        conn = self.connection_pool.get_connection(vm_name)
-        success = conn.download_file(remote_path, local_path)
+        success = await self.connection_pool.run(vm_name, lambda conn: conn.download_file(remote_path, local_path))
 
         if not success:
             return PluginResult.error_result(
@@ -390,8 +514,7 @@ class SSHPlugin(PluginBase):
         self, vm_name: str, local_path: str, remote_path: str
     ) -> PluginResult:
         """Upload a file to a VM."""
-        conn = self.connection_pool.get_connection(vm_name)
-        success = conn.upload_file(local_path, remote_path)
+        success = await self.connection_pool.run(vm_name, lambda conn: conn.upload_file(local_path, remote_path))
 
         if not success:
             return PluginResult.error_result(
@@ -410,17 +533,22 @@ class SSHPlugin(PluginBase):
 
     async def _list_vms(self) -> PluginResult:
         """List all configured VMs."""
-        vms_data = []
+        vms = self.vm_registry.get_all_vms()
 
-        for vm in self.vm_registry.get_all_vms():
-            # Try to connect and get status
-            try:
-                conn = self.connection_pool.get_connection(vm.name)
+        # Try to connect to every VM at once and get status
+        outcomes = await asyncio.gather(
+            *(self.connection_pool.run(vm.name, lambda conn: None) for vm in vms),
+            return_exceptions=True,
+        )
+
+        vms_data = []
+        for vm, outcome in zip(vms, outcomes):
+            if isinstance(outcome, BaseException):
+                connected = False
+                status = f"error: {str(outcome)[:50]}"
+            else:
                 connected = True
                 status = "connected"
-            except Exception as e:
-                connected = False
-                status = f"error: {str(e)[:50]}"
 
             vms_data.append(
                 {
@@ -458,6 +586,12 @@ class SSHPlugin(PluginBase):
             },
         )
 
+    async def shutdown(self) -> None:
+        """Close pooled SSH connections."""
+        if self.connection_pool:
+            await asyncio.to_thread(self.connection_pool.close_all)
+        await super().shutdown()
+
     def __del__(self):
         """Cleanup connections on plugin destruction."""
         if hasattr(self, "connection_pool") and self.connection_pool:
@@ -134,6 +134,32 @@ class Task:
         return priority_score * 0.6 + urgency * 0.4
 
 
+def _urgency_ranges(now: datetime) -> list[tuple[int, str, list[str]]]:
+    """Due date ranges with a constant ``Task.urgency_score`` as of ``now``.
+
+    Returns ``(urgency, SQL condition on due_date, params)`` from most to
+    least urgent. Together the ranges cover every due date (and none).
+    """
+
+    def at(days: int) -> str:
+        return (now + timedelta(days=days)).isoformat()
+
+    ranges: list[tuple[int, str, list[str]]] = [(100, "due_date <= ?", [at(-4)])]
+    # Overdue by 3, 2 and 1 whole days
+    for days in (3, 2, 1):
+        ranges.append((80 + days * 5, "due_date > ? AND due_date <= ?", [at(-days - 1), at(-days)]))
+    ranges += [
+        (80, "due_date > ? AND due_date < ?", [at(-1), at(0)]),
+        (70, "due_date >= ? AND due_date < ?", [at(0), at(1)]),
+        (60, "due_date >= ? AND due_date < ?", [at(1), at(2)]),
+        (50, "due_date >= ? AND due_date < ?", [at(2), at(8)]),
+        (30, "due_date >= ? AND due_date < ?", [at(8), at(31)]),
+        (10, "due_date >= ?", [at(31)]),
+        (0, "due_date IS NULL", []),
+    ]
+    return ranges
+
+
 class TaskStore:
     """SQLite-based task storage."""
 
@@ -175,6 +201,14 @@ class TaskStore:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_area ON tasks(area)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date)")
+            # Ranking: one ordered range per (priority, urgency band), see get_top_tasks
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tasks_rank
+                ON tasks(priority, due_date, created_at DESC)
+                WHERE status != 'completed'
+            """)
+            # Covers get_stats, so its single grouped scan never touches the table
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_stats ON tasks(status, priority, area, due_date)")
 
             # FTS for search
             conn.execute("""
@@ -362,14 +396,57 @@ class TaskStore:
             return [self._row_to_task(row) for row in rows]
 
     def get_top_tasks(self, limit: int = 5) -> list[Task]:
-        """Get top priority tasks sorted by score."""
-        # Get all active tasks
-        tasks = self.list_tasks(include_completed=False, limit=100)
+        """Get top priority tasks sorted by score.
+
+        Exact over all active tasks. The score (priority plus due date
+        urgency) is constant within each priority and urgency band, so the
+        bands are visited from the highest score down, each an ordered range
+        of ``idx_tasks_rank`` read with ``LIMIT``, until ``limit`` tasks are
+        found. Cost depends on ``limit``, not on the number of tasks.
 
-        # Sort by total score (priority + urgency)
-        tasks.sort(key=lambda t: t.total_score, reverse=True)
+        Ties are broken by earliest due date, then newest task.
+        """
+        if limit <= 0:
+            return []
+
+        # Integer multiple of Task.total_score, so equal scores compare equal
+        bands = sorted(
+            (
+                (priority.score * 3 + urgency * 2, priority, condition, params)
+                for priority in TaskPriority
+                for urgency, condition, params in _urgency_ranges(datetime.now())
+            ),
+            key=lambda band: -band[0],
+        )
 
-        return tasks[:limit]
+        top: list[Task] = []
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            i = 0
+            while i < len(bands) and len(top) < limit:
+                # Bands with equal scores are merged on the tie-breakers
+                j = i
+                while j < len(bands) and bands[j][0] == bands[i][0]:
+                    j += 1
+                tied: list[Task] = []
+                for _, priority, condition, params in bands[i:j]:
+                    rows = conn.execute(
+                        f"""
+                        SELECT * FROM tasks
+                        WHERE status != 'completed' AND priority = ? AND {condition}
+                        ORDER BY due_date, created_at DESC
+                        LIMIT ?
+                        """,
+                        [priority.value, *params, limit - len(top)],
+                    ).fetchall()
+                    tied.extend(self._row_to_task(row) for row in rows)
+                if j - i > 1:
+                    tied.sort(key=lambda t: -t.created_at.timestamp())
+                    tied.sort(key=lambda t: t.due_date or datetime.max)
+                top.extend(tied[: limit - len(top)])
+                i = j
+
+        return top
 
     def get_focus_task(self) -> Task | None:
         """Get the single most important task to focus on."""
@@ -402,54 +479,50 @@ class TaskStore:
 
     def get_stats(self) -> dict[str, Any]:
         """Get task statistics."""
+        now = datetime.now()
         with sqlite3.connect(self.db_path) as conn:
-            total = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
-
-            status_counts = conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
-
-            priority_counts = conn.execute(
-                "SELECT priority, COUNT(*) FROM tasks WHERE status != 'completed' GROUP BY priority"
-            ).fetchall()
-
-            overdue = conn.execute(
-                "SELECT COUNT(*) FROM tasks WHERE due_date < ? AND status != ?",
-                (datetime.now().isoformat(), TaskStatus.COMPLETED.value),
-            ).fetchone()[0]
-
-            due_today = conn.execute(
-                """
-                SELECT COUNT(*) FROM tasks
-                WHERE date(due_date) = date('now') AND status != ?
-                """,
-                (TaskStatus.COMPLETED.value,),
-            ).fetchone()[0]
-
-            due_this_week = conn.execute(
+            rows = conn.execute(
                 """
-                SELECT COUNT(*) FROM tasks
-                WHERE due_date BETWEEN ? AND ? AND status != ?
+                SELECT
+                    status,
+                    priority,
+                    area,
+                    COUNT(*),
+                    SUM(due_date < ?),
+                    SUM(substr(due_date, 1, 10) = ?),
+                    SUM(due_date BETWEEN ? AND ?)
+                FROM tasks
+                GROUP BY status, priority, area
                 """,
                 (
-                    datetime.now().isoformat(),
-                    (datetime.now() + timedelta(days=7)).isoformat(),
-                    TaskStatus.COMPLETED.value,
+                    now.isoformat(),
+                    now.date().isoformat(),
+                    now.isoformat(),
+                    (now + timedelta(days=7)).isoformat(),
                 ),
-            ).fetchone()[0]
-
-            # Area breakdown
-            area_counts = conn.execute(
-                "SELECT area, COUNT(*) FROM tasks WHERE status != 'completed' AND area != '' GROUP BY area"
             ).fetchall()
 
-            return {
-                "total": total,
-                "by_status": {row[0]: row[1] for row in status_counts},
-                "by_priority": {row[0]: row[1] for row in priority_counts},
-                "by_area": {row[0]: row[1] for row in area_counts},
-                "overdue": overdue,
-                "due_today": due_today,
-                "due_this_week": due_this_week,
-            }
+        stats: dict[str, Any] = {
+            "total": 0,
+            "by_status": {},
+            "by_priority": {},
+            "by_area": {},
+            "overdue": 0,
+            "due_today": 0,
+            "due_this_week": 0,
+        }
+        for status, priority, area, count, overdue, due_today, due_this_week in rows:
+            stats["total"] += count
+            stats["by_status"][status] = stats["by_status"].get(status, 0) + count
+            if status == TaskStatus.COMPLETED.value:
+                continue
+            stats["by_priority"][priority] = stats["by_priority"].get(priority, 0) + count
+            if area:
+                stats["by_area"][area] = stats["by_area"].get(area, 0) + count
+            stats["overdue"] += overdue or 0
+            stats["due_today"] += due_today or 0
+            stats["due_this_week"] += due_this_week or 0
+        return stats
 
     def get_areas(self) -> list[str]:
         """Get list of all areas."""
@@ -1,19 +1,25 @@
 """Built-in web plugin for Mother AI OS.
 
-Provides HTTP requests and web content fetching.
+Provides HTTP requests and web content fetching. GET requests made by fetch,
+get, get_json and extract_links go through an HTTP cache (see :mod:`.cache`).
+Response bodies are streamed and cut at ``max_response_size`` (see :mod:`.body`).
+fetch returns the readable text of HTML pages by default (see :mod:`.extract`);
+fetch_many does the same for a list of URLs concurrently.
 """
 
 from __future__ import annotations
 
+import asyncio
 import re
+import time
 from pathlib import Path
 from typing import Any
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
 import httpx
 
-from ..base import PluginBase, PluginResult
-from ..manifest import (
+from ...base import PluginBase, PluginResult
+from ...manifest import (
     CapabilitySpec,
     ExecutionSpec,
     ExecutionType,
@@ -23,13 +29,51 @@ from ..manifest import (
     PluginMetadata,
     PythonExecutionSpec,
 )
+from .body import decode_text, read_response
+from .cache import CACHE_MODES, DEFAULT_MAX_BYTES, HTTPCache
+from .extract import DEFAULT_MAX_TOKENS, FORMATS, extract_links, html_to_text, is_html, limit_text
+from .robots import RobotsCache
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # Default user agent
 DEFAULT_USER_AGENT = "Mother-AI/1.0 (https://github.com/Mother-AI-OS/mother)"
 
-# Maximum response size (10MB)
+# Maximum response size (10MB); longer bodies are truncated
 MAX_RESPONSE_SIZE = 10 * 1024 * 1024
 
+TRUNCATION_MARKER = "\n... (truncated)"
+
+# Pages longer than this are converted in a worker thread
+EXTRACT_IN_THREAD_CHARS = 256 * 1024
+
+# fetch_many limits
+MAX_FETCH_MANY_URLS = 50
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST = 2
+# Per-page token budget floor when the default budget is split across URLs
+MIN_TOKENS_PER_URL = 1000
+
+
+def _cache_param() -> ParameterSpec:
+    return ParameterSpec(
+        name="cache",
+        type=ParameterType.STRING,
+        description=(
+            "HTTP cache use: 'prefer' serves fresh cached copies and revalidates stale ones (default), "
+            "'bypass' always fetches, 'only' answers from the cache without touching the network"
+        ),
+        required=False,
+        default="prefer",
+        choices=list(CACHE_MODES),
+    )
+
 
 def _create_manifest() -> PluginManifest:
     """Create the web plugin manifest programmatically."""
@@ -46,7 +90,10 @@ def _create_manifest() -> PluginManifest:
             # Fetch URL content
             CapabilitySpec(
                 name="fetch",
-                description="Fetch content from a URL. Returns the response body as text. Good for fetching web pages, APIs, etc.",
+                description=(
+                    "Fetch content from a URL. HTML pages are returned as their readable text "
+                    "(scripts, styles and navigation removed); other content as is. Good for fetching web pages, APIs, etc."
+                ),
                 timeout=60,
                 parameters=[
                     ParameterSpec(
@@ -55,6 +102,24 @@ def _create_manifest() -> PluginManifest:
                         description="The URL to fetch",
                         required=True,
                     ),
+                    ParameterSpec(
+                        name="format",
+                        type=ParameterType.STRING,
+                        description=(
+                            "How to return HTML: 'text' (default), 'markdown' (keeps headings, links, "
+                            "emphasis and tables as Markdown) or 'raw' (the HTML source)"
+                        ),
+                        required=False,
+                        default="text",
+                        choices=list(FORMATS),
+                    ),
+                    ParameterSpec(
+                        name="max_tokens",
+                        type=ParameterType.INTEGER,
+                        description=f"Approximate token limit for text and markdown output (default: {DEFAULT_MAX_TOKENS})",
+                        required=False,
+                        default=DEFAULT_MAX_TOKENS,
+                    ),
                     ParameterSpec(
                         name="headers",
                         type=ParameterType.OBJECT,
@@ -75,6 +140,72 @@ def _create_manifest() -> PluginManifest:
                         required=False,
                         default=True,
                     ),
+                    _cache_param(),
+                ],
+            ),
+            # Fetch several URLs at once
+            CapabilitySpec(
+                name="fetch_many",
+                description=(
+                    "Fetch several URLs concurrently in one call. Returns one result per URL, in the order given, "
+                    "with status, timing and the page's readable text. Prefer this over repeated fetch calls "
+                    f"when you need more than one page (up to {MAX_FETCH_MANY_URLS} URLs)."
+                ),
+                timeout=180,
+                parameters=[
+                    ParameterSpec(
+                        name="urls",
+                        type=ParameterType.ARRAY,
+                        description="The URLs to fetch",
+                        required=True,
+                        items_type=ParameterType.STRING,
+                    ),
+                    ParameterSpec(
+                        name="format",
+                        type=ParameterType.STRING,
+                        description="How to return HTML: 'text' (default), 'markdown' or 'raw'",
+                        required=False,
+                        default="text",
+                        choices=list(FORMATS),
+                    ),
+                    ParameterSpec(
+                        name="max_tokens",
+                        type=ParameterType.INTEGER,
+                        description=(
+                            "Approximate token limit per page (default: the fetch budget split across the URLs, "
+                            f"at least {MIN_TOKENS_PER_URL})"
+                        ),
+                        required=False,
+                    ),
+                    ParameterSpec(
+                        name="concurrency",
+                        type=ParameterType.INTEGER,
+                        description=f"Maximum requests in flight (default: {DEFAULT_CONCURRENCY})",
+                        required=False,
+                        default=DEFAULT_CONCURRENCY,
+                    ),
+                    ParameterSpec(
+                        name="per_host",
+                        type=ParameterType.INTEGER,
+                        description=f"Maximum requests in flight to one host (default: {DEFAULT_PER_HOST})",
+                        required=False,
+                        default=DEFAULT_PER_HOST,
+                    ),
+                    ParameterSpec(
+                        name="respect_robots",
+                        type=ParameterType.BOOLEAN,
+                        description="Skip URLs that the site's robots.txt disallows (default: false)",
+                        required=False,
+                        default=False,
+                    ),
+                    ParameterSpec(
+                        name="timeout",
+                        type=ParameterType.INTEGER,
+                        description="Request timeout per URL in seconds (default: 30)",
+                        required=False,
+                        default=30,
+                    ),
+                    _cache_param(),
                 ],
             ),
             # GET request with full control
@@ -108,6 +239,7 @@ def _create_manifest() -> PluginManifest:
                         required=False,
                         default=30,
                     ),
+                    _cache_param(),
                 ],
             ),
             # POST request
@@ -257,6 +389,7 @@ def _create_manifest() -> PluginManifest:
                         required=False,
                         default=30,
                     ),
+                    _cache_param(),
                 ],
             ),
             # Extract links
@@ -299,6 +432,12 @@ def _create_manifest() -> PluginManifest:
                     ),
                 ],
             ),
+            # Cache statistics
+            CapabilitySpec(
+                name="cache_stats",
+                description="Show HTTP cache statistics: hits, misses, revalidations, hit rate and storage use.",
+                parameters=[],
+            ),
             # Encode URL
             CapabilitySpec(
                 name="encode_url",
@@ -343,6 +482,8 @@ class WebPlugin(PluginBase):
         # Configuration
         self._user_agent = config.get("user_agent", DEFAULT_USER_AGENT) if config else DEFAULT_USER_AGENT
         self._max_response_size = config.get("max_response_size", MAX_RESPONSE_SIZE) if config else MAX_RESPONSE_SIZE
+        self._max_tokens = config.get("max_tokens", DEFAULT_MAX_TOKENS) if config else DEFAULT_MAX_TOKENS
+        self._http2 = HTTP2_AVAILABLE and (config.get("http2", True) if config else True)
 
         # Security: blocked domains
         self._blocked_domains: list[str] = []
@@ -351,6 +492,15 @@ class WebPlugin(PluginBase):
 
         # HTTP client (created lazily)
         self._client: httpx.AsyncClient | None = None
+        self._robots: RobotsCache | None = None
+
+        # HTTP cache for GET requests (nothing is written until a response is stored)
+        self._cache: HTTPCache | None = None
+        if not config or config.get("http_cache", True):
+            self._cache = HTTPCache(
+                Path(config["cache_db_path"]).expanduser() if config and "cache_db_path" in config else None,
+                max_bytes=config.get("cache_max_bytes", DEFAULT_MAX_BYTES) if config else DEFAULT_MAX_BYTES,
+            )
 
     async def initialize(self) -> None:
         """Initialize the HTTP client."""
@@ -358,6 +508,7 @@ class WebPlugin(PluginBase):
             headers={"User-Agent": self._user_agent},
             follow_redirects=True,
             timeout=30.0,
+            http2=self._http2,
         )
 
     async def shutdown(self) -> None:
@@ -404,6 +555,7 @@ class WebPlugin(PluginBase):
         """Execute a web capability."""
         handlers = {
             "fetch": self._fetch,
+            "fetch_many": self._fetch_many,
             "get": self._get,
             "post": self._post,
             "head": self._head,
@@ -413,6 +565,7 @@ class WebPlugin(PluginBase):
             "extract_links": self._extract_links,
             "parse_url": self._parse_url,
             "encode_url": self._encode_url,
+            "cache_stats": self._cache_stats,
         }
 
         handler = handlers.get(capability)
@@ -424,91 +577,254 @@ class WebPlugin(PluginBase):
 
         try:
             return await handler(**params)
-        except httpx.TimeoutException:
+        except Exception as e:
+            return self._error_result(e)
+
+    @staticmethod
+    def _error_result(error: Exception) -> PluginResult:
+        """Map an exception raised while handling a request to a result."""
+        if isinstance(error, httpx.TimeoutException):
             return PluginResult.error_result(
                 "Request timed out",
                 code="TIMEOUT",
             )
-        except httpx.ConnectError as e:
+        if isinstance(error, httpx.ConnectError):
             return PluginResult.error_result(
-                f"Connection failed: {e}",
+                f"Connection failed: {error}",
                 code="CONNECTION_ERROR",
             )
-        except Exception as e:
-            return PluginResult.error_result(
-                f"Error: {e}",
-                code="WEB_ERROR",
-            )
+        return PluginResult.error_result(
+            f"Error: {error}",
+            code="WEB_ERROR",
+        )
+
+    async def _cached_get(
+        self,
+        url: str,
+        cache: str,
+        headers: dict[str, str] | None = None,
+        follow_redirects: bool = True,
+        **kwargs: Any,
+    ) -> tuple[httpx.Response | None, str]:
+        """GET through the HTTP cache.
+
+        Returns:
+            ``(response, cache status)``; see :meth:`HTTPCache.fetch`
+        """
+        client = await self._get_client()
+
+        async def send(validators: dict[str, str]) -> httpx.Response:
+            request_headers = {**(headers or {}), **validators} if validators else headers
+            async with client.stream(
+                "GET", url, headers=request_headers, follow_redirects=follow_redirects, **kwargs
+            ) as response:
+                return await read_response(response, self._max_response_size)
+
+        if self._cache is None:
+            if cache == "only":
+                return None, "miss"
+            return await send({}), "bypass"
+
+        params = kwargs.get("params")
+        full_url = str(httpx.URL(url).copy_merge_params(params)) if params else url
+        return await self._cache.fetch(full_url, headers, send, cache, follow_redirects)
+
+    @staticmethod
+    def _text(response: httpx.Response) -> tuple[str, bool]:
+        """Decoded body, with a marker appended if it was cut at the size cap."""
+        truncated = response.extensions.get("truncated", False)
+        content = decode_text(response)
+        return (content + TRUNCATION_MARKER if truncated else content), truncated
+
+    async def _render(self, response: httpx.Response, fmt: str, max_tokens: int | None) -> tuple[str, bool]:
+        """Body as text in ``fmt``; returns ``(content, cut to max_tokens)``."""
+        text = decode_text(response)
+        if fmt == "raw":
+            return text, False
+        if not is_html(response.headers.get("content-type"), text):
+            return limit_text(text, max_tokens)
+        if len(text) > EXTRACT_IN_THREAD_CHARS:
+            return await asyncio.to_thread(html_to_text, text, fmt, str(response.url), max_tokens)
+        return html_to_text(text, fmt, str(response.url), max_tokens)
+
+    def _not_cached(self, url: str) -> PluginResult:
+        return PluginResult.error_result(
+            f"Not in cache: {url}",
+            code="NOT_CACHED",
+        )
 
     async def _fetch(
         self,
         url: str,
+        format: str = "text",
+        max_tokens: int | None = None,
         headers: dict[str, str] | None = None,
         timeout: int = 30,
         follow_redirects: bool = True,
+        cache: str = "prefer",
     ) -> PluginResult:
         """Fetch content from a URL."""
         allowed, error = self._check_url_allowed(url)
         if not allowed:
             return PluginResult.error_result(error, code="URL_NOT_ALLOWED")
+        if format not in FORMATS:
+            return PluginResult.error_result(
+                f"Unknown format: {format}. Use one of: {', '.join(FORMATS)}",
+                code="INVALID_INPUT",
+            )
 
-        client = await self._get_client()
-
-        response = await client.get(
+        response, cache_status = await self._cached_get(
             url,
+            cache,
             headers=headers,
             timeout=timeout,
             follow_redirects=follow_redirects,
         )
+        if response is None:
+            return self._not_cached(url)
 
-        # Check response size
-        content_length = response.headers.get("content-length")
-        if content_length and int(content_length) > self._max_response_size:
-            return PluginResult.error_result(
-                f"Response too large: {content_length} bytes",
-                code="RESPONSE_TOO_LARGE",
-            )
-
-        content = response.text
-
-        # Truncate if too long
-        if len(content) > self._max_response_size:
-            content = content[: self._max_response_size] + "\n... (truncated)"
+        content, cut = await self._render(response, format, max_tokens or self._max_tokens)
+        truncated = cut or response.extensions.get("truncated", False)
+        if truncated:
+            content += TRUNCATION_MARKER
 
         return PluginResult.success_result(
             data={
                 "url": str(response.url),
                 "status_code": response.status_code,
                 "content_type": response.headers.get("content-type"),
+                "format": format,
                 "content_length": len(content),
                 "content": content,
+                "truncated": truncated,
+                "cache": cache_status,
+            }
+        )
+
+    async def _fetch_many(
+        self,
+        urls: list[str],
+        format: str = "text",
+        max_tokens: int | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host: int = DEFAULT_PER_HOST,
+        respect_robots: bool = False,
+        timeout: int = 30,
+        cache: str = "prefer",
+    ) -> PluginResult:
+        """Fetch several URLs concurrently over the shared client.
+
+        Requests are bounded by ``concurrency`` overall and ``per_host`` per
+        host; a URL waits for its host slot before taking a global one so a
+        long list for one site cannot starve the others.
+        """
+        if not urls:
+            return PluginResult.error_result("No URLs given", code="INVALID_INPUT")
+        if len(urls) > MAX_FETCH_MANY_URLS:
+            return PluginResult.error_result(
+                f"Too many URLs: {len(urls)} (limit {MAX_FETCH_MANY_URLS})",
+                code="INVALID_INPUT",
+            )
+        if format not in FORMATS:
+            return PluginResult.error_result(
+                f"Unknown format: {format}. Use one of: {', '.join(FORMATS)}",
+                code="INVALID_INPUT",
+            )
+
+        budget = max_tokens or max(self._max_tokens // len(urls), MIN_TOKENS_PER_URL)
+        slots = asyncio.Semaphore(max(concurrency, 1))
+        host_slots: dict[str, asyncio.Semaphore] = {}
+
+        async def fetch_one(url: str) -> dict[str, Any]:
+            host = urlparse(url).netloc.lower()
+            host_slot = host_slots.setdefault(host, asyncio.Semaphore(max(per_host, 1)))
+            async with host_slot, slots:
+                started = time.perf_counter()
+                allowed, error = self._check_url_allowed(url)
+                try:
+                    if not allowed:
+                        result = PluginResult.error_result(error, code="URL_NOT_ALLOWED")
+                    elif respect_robots and not await self._robots_allowed(url):
+                        result = PluginResult.error_result(
+                            f"Disallowed by robots.txt: {url}",
+                            code="ROBOTS_DISALLOWED",
+                        )
+                    else:
+                        result = await self._fetch(url, format=format, max_tokens=budget, timeout=timeout, cache=cache)
+                except Exception as e:
+                    result = self._error_result(e)
+                elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+
+            if not result.success:
+                return {
+                    "url": url,
+                    "success": False,
+                    "error": result.error_message,
+                    "error_code": result.error_code,
+                    "elapsed_ms": elapsed_ms,
+                }
+            data = result.data
+            return {
+                "url": url,
+                "success": True,
+                "final_url": data["url"],
+                "status_code": data["status_code"],
+                "content_type": data["content_type"],
+                "content": data["content"],
+                "truncated": data["truncated"],
+                "cache": data["cache"],
+                "elapsed_ms": elapsed_ms,
             }
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(fetch_one(url) for url in urls))
+        elapsed = time.perf_counter() - started
+        succeeded = sum(1 for r in results if r["success"])
+
+        return PluginResult.success_result(
+            data={
+                "count": len(results),
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+                "elapsed_ms": round(elapsed * 1000, 1),
+                "results": results,
+            },
+            message=f"Fetched {succeeded} of {len(results)} URLs in {elapsed:.1f}s",
         )
 
+    async def _robots_allowed(self, url: str) -> bool:
+        if self._robots is None:
+            self._robots = RobotsCache(self._user_agent, self._fetch_robots)
+        return await self._robots.allowed(url)
+
+    async def _fetch_robots(self, url: str) -> httpx.Response:
+        response, _ = await self._cached_get(url, "prefer", timeout=10)
+        return response
+
     async def _get(
         self,
         url: str,
         params: dict[str, str] | None = None,
         headers: dict[str, str] | None = None,
         timeout: int = 30,
+        cache: str = "prefer",
     ) -> PluginResult:
         """Make a GET request."""
         allowed, error = self._check_url_allowed(url)
         if not allowed:
             return PluginResult.error_result(error, code="URL_NOT_ALLOWED")
 
-        client = await self._get_client()
-
-        response = await client.get(
+        response, cache_status = await self._cached_get(
             url,
+            cache,
             params=params,
             headers=headers,
             timeout=timeout,
         )
+        if response is None:
+            return self._not_cached(url)
 
-        content = response.text
-        if len(content) > self._max_response_size:
-            content = content[: self._max_response_size] + "\n... (truncated)"
+        content, truncated = self._text(response)
 
         return PluginResult.success_result(
             data={
@@ -517,6 +833,8 @@ class WebPlugin(PluginBase):
                 "headers": dict(response.headers),
                 "content_type": response.headers.get("content-type"),
                 "content": content,
+                "truncated": truncated,
+                "cache": cache_status,
             }
         )
 
@@ -535,17 +853,21 @@ class WebPlugin(PluginBase):
 
         client = await self._get_client()
 
-        response = await client.post(
+        async with client.stream(
+            "POST",
             url,
             data=data,
             json=json,
             headers=headers,
             timeout=timeout,
-        )
+        ) as streamed:
+            response = await read_response(streamed, self._max_response_size)
 
-        content = response.text
-        if len(content) > self._max_response_size:
-            content = content[: self._max_response_size] + "\n... (truncated)"
+        # A successful unsafe request invalidates what is cached for the URL
+        if self._cache is not None and response.status_code < 400:
+            await self._cache.invalidate(url)
+
+        content, truncated = self._text(response)
 
         return PluginResult.success_result(
             data={
@@ -554,6 +876,7 @@ class WebPlugin(PluginBase):
                 "headers": dict(response.headers),
                 "content_type": response.headers.get("content-type"),
                 "content": content,
+                "truncated": truncated,
             }
         )
 
@@ -673,20 +996,28 @@ class WebPlugin(PluginBase):
         params: dict[str, str] | None = None,
         headers: dict[str, str] | None = None,
         timeout: int = 30,
+        cache: str = "prefer",
     ) -> PluginResult:
         """Fetch and parse JSON from URL."""
         allowed, error = self._check_url_allowed(url)
         if not allowed:
             return PluginResult.error_result(error, code="URL_NOT_ALLOWED")
 
-        client = await self._get_client()
-
-        response = await client.get(
+        response, cache_status = await self._cached_get(
             url,
+            cache,
             params=params,
             headers=headers,
             timeout=timeout,
         )
+        if response is None:
+            return self._not_cached(url)
+
+        if response.extensions.get("truncated"):
+            return PluginResult.error_result(
+                f"Response too large (>{self._max_response_size} bytes)",
+                code="RESPONSE_TOO_LARGE",
+            )
 
         try:
             data = response.json()
@@ -695,6 +1026,7 @@ class WebPlugin(PluginBase):
                     "url": str(response.url),
                     "status_code": response.status_code,
                     "json": data,
+                    "cache": cache_status,
                 }
             )
         except Exception as e:
@@ -714,20 +1046,8 @@ class WebPlugin(PluginBase):
         if not allowed:
             return PluginResult.error_result(error, code="URL_NOT_ALLOWED")
 
-        client = await self._get_client()
-
-        response = await client.get(url, timeout=30)
-        html = response.text
-
-        # Simple regex to find links
-        # Matches href="..." and href='...'
-        link_pattern = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
-        links = link_pattern.findall(html)
-
-        # Convert to absolute URLs if requested
-        if absolute:
-            base_url = str(response.url)
-            links = [urljoin(base_url, link) for link in links]
+        response, _ = await self._cached_get(url, "prefer", timeout=30)
+        links = extract_links(decode_text(response), str(response.url) if absolute else None)
 
         # Filter by pattern if provided
         if filter_pattern:
@@ -756,6 +1076,18 @@ class WebPlugin(PluginBase):
             }
         )
 
+    async def _cache_stats(self) -> PluginResult:
+        """Report HTTP cache statistics."""
+        if self._cache is None:
+            return PluginResult.success_result(data={"enabled": False}, message="HTTP cache is disabled")
+
+        stats = await asyncio.to_thread(self._cache.stats)
+        return PluginResult.success_result(
+            data={"enabled": True, **stats},
+            message=f"HTTP cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+            f"{stats['misses']} misses (hit rate {stats['hit_rate']:.0%})",
+        )
+
     async def _parse_url(self, url: str) -> PluginResult:
         """Parse a URL into components."""
         try:
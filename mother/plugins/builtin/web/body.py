@@ -0,0 +1,124 @@
+"""Size-capped response bodies for the web plugin.
+
+Bodies are read from ``client.stream()`` chunk by chunk and reading stops
+as soon as the size cap is reached, which closes the connection instead of
+draining it. gzip and deflate are decompressed here with a bounded output
+size, so a chunked body without Content-Length, a server that lies about
+it, or a compression bomb cannot push more than the cap into memory. The
+cap applies to the decoded bytes.
+
+Text is decoded with the charset from Content-Type, a byte order mark or
+an HTML ``<meta charset>``. An incremental decoder is used so a multi-byte
+character cut in half at the cap is dropped rather than garbled.
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+import zlib
+
+import httpx
+
+# Headers that no longer describe a body that has been decoded and maybe cut
+_BODY_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+# Bytes at the start of an HTML document searched for <meta charset>
+_SNIFF_BYTES = 2048
+
+
+class _Inflater:
+    """zlib decompressor for gzip or deflate that never outputs more than asked."""
+
+    def __init__(self, encoding: str):
+        self._gzip = encoding in ("gzip", "x-gzip")
+        self._first = True
+        self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS if self._gzip else zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        if self._first and not self._gzip:
+            self._first = False
+            try:
+                return self._obj.decompress(data, max_length)
+            except zlib.error:
+                # "deflate" is often sent as a raw stream without the zlib header
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(data, max_length)
+
+
+async def read_body(response: httpx.Response, limit: int) -> tuple[bytes, bool]:
+    """Read a streamed response body up to ``limit`` decoded bytes.
+
+    Returns:
+        ``(content, truncated)``
+    """
+    if response.is_stream_consumed:
+        # The transport buffered the body already (mock and ASGI transports do)
+        return response.content[:limit], len(response.content) > limit
+
+    encodings = [e.strip().lower() for e in response.headers.get("content-encoding", "").split(",")]
+    encodings = [e for e in encodings if e and e != "identity"]
+    body = bytearray()
+
+    if not encodings or (len(encodings) == 1 and encodings[0] in ("gzip", "x-gzip", "deflate")):
+        inflater = _Inflater(encodings[0]) if encodings else None
+        async for raw in response.aiter_raw():
+            room = limit + 1 - len(body)  # one byte over the cap tells us it was cut
+            body += inflater.decompress(raw, room) if inflater else raw[:room]
+            if len(body) > limit:
+                break
+    else:
+        # br, zstd or stacked encodings: let httpx decode, chunk by chunk
+        async for chunk in response.aiter_bytes():
+            body += chunk[: limit + 1 - len(body)]
+            if len(body) > limit:
+                break
+
+    truncated = len(body) > limit
+    return bytes(body[:limit]) if truncated else bytes(body), truncated
+
+
+def buffered_response(response: httpx.Response, content: bytes, truncated: bool) -> httpx.Response:
+    """A read-only copy of a streamed response holding the decoded body.
+
+    ``extensions["truncated"]`` records whether the body was cut at the cap.
+    """
+    return httpx.Response(
+        response.status_code,
+        headers=[(k, v) for k, v in response.headers.multi_items() if k.lower() not in _BODY_HEADERS],
+        content=content,
+        request=response.request,
+        extensions={"truncated": truncated},
+    )
+
+
+async def read_response(response: httpx.Response, limit: int) -> httpx.Response:
+    """Read a streamed response into a :func:`buffered_response`."""
+    content, truncated = await read_body(response, limit)
+    return buffered_response(response, content, truncated)
+
+
+def detect_encoding(response: httpx.Response) -> str:
+    """Text encoding of a response body."""
+    content = response.content
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding
+    charset = response.charset_encoding
+    if not charset and "html" in response.headers.get("content-type", "html"):
+        match = _META_CHARSET.search(content[:_SNIFF_BYTES])
+        charset = match.group(1).decode("ascii", "ignore") if match else None
+    try:
+        return codecs.lookup(charset or "utf-8").name
+    except LookupError:
+        return "utf-8"
+
+
+def decode_text(response: httpx.Response) -> str:
+    """Decode a response body, tolerating a body cut at the size cap."""
+    decoder = codecs.getincrementaldecoder(detect_encoding(response))(errors="replace")
+    return decoder.decode(response.content, final=not response.extensions.get("truncated", False))
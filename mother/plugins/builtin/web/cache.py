@@ -0,0 +1,535 @@
+"""HTTP response cache for the web plugin.
+
+A shared cache in the spirit of RFC 9111 in front of the plugin's httpx
+client (one plugin instance serves every API key):
+
+* GET responses are stored when their status is cacheable and neither the
+  request nor the response says ``no-store``. Responses marked ``private``
+  are not stored, nor are responses to requests carrying ``Authorization``
+  or ``Cookie`` unless they are marked ``public`` or carry ``s-maxage``.
+  Request headers named in ``Vary`` are recorded and must match on lookup.
+* Freshness comes from ``max-age``, then ``Expires``, then a heuristic of
+  10% of the time since ``Last-Modified`` (at most a day).
+* Stale entries with an ``ETag`` or ``Last-Modified`` are revalidated with a
+  conditional request. A 304 refreshes the stored headers and the stored
+  body is served.
+* Identical requests in flight at the same time share one network fetch.
+
+Entries are kept in an in-memory LRU in front of a size-bounded SQLite
+store, so they survive restarts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field, replace
+from datetime import UTC
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger("mother.plugins.web.cache")
+
+# prefer: use fresh entries, revalidate stale ones; bypass: always fetch
+# (and store the result); only: never touch the network
+CACHE_MODES = ("prefer", "bypass", "only")
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MEMORY_BYTES = 32 * 1024 * 1024
+DEFAULT_MEMORY_ENTRIES = 128
+
+# Heuristic freshness for responses with only Last-Modified (RFC 9111 4.2.2)
+HEURISTIC_FRACTION = 0.1
+MAX_HEURISTIC_LIFETIME = 24 * 3600
+
+# Statuses that are cacheable without explicit freshness (RFC 9110 15.1)
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+
+# Headers that describe the transfer rather than the stored, decoded body
+_UNSTORED_HEADERS = frozenset(
+    {"connection", "keep-alive", "transfer-encoding", "content-encoding", "content-length", "set-cookie"}
+)
+
+# Credentials that make a response specific to the requester (RFC 9111 3.5)
+_CREDENTIAL_HEADERS = frozenset({"authorization", "cookie"})
+
+# A request carrying its own validators wants the server's answer, not ours
+_CONDITIONAL_HEADERS = frozenset({"if-none-match", "if-modified-since", "if-match", "if-unmodified-since", "if-range"})
+
+Sender = Callable[[dict[str, str]], Awaitable[httpx.Response]]
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """Parse a Cache-Control header into ``{directive: argument}``."""
+    directives: dict[str, str | None] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.strip().lower()] = argument.strip().strip('"') if argument else None
+    return directives
+
+
+def _seconds(value: str | None) -> int | None:
+    try:
+        return max(0, int(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp()
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A stored response."""
+
+    url: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    request_time: float
+    response_time: float
+    vary: dict[str, str | None] = field(default_factory=dict)
+
+    def header(self, name: str) -> str | None:
+        for key, value in self.headers:
+            if key == name:
+                return value
+        return None
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def freshness_lifetime(self) -> float:
+        """Seconds the response is fresh for after it was generated."""
+        directives = parse_cache_control(self.header("cache-control"))
+        if "no-cache" in directives:
+            return 0.0
+        max_age = _seconds(directives.get("max-age"))
+        if max_age is not None:
+            return float(max_age)
+        date = _http_date(self.header("date")) or self.response_time
+        expires = self.header("expires")
+        if expires is not None:
+            expires_at = _http_date(expires)
+            return max(0.0, expires_at - date) if expires_at is not None else 0.0
+        last_modified = _http_date(self.header("last-modified"))
+        if last_modified is not None and self.status_code in CACHEABLE_STATUSES:
+            return min(MAX_HEURISTIC_LIFETIME, max(0.0, date - last_modified) * HEURISTIC_FRACTION)
+        return 0.0
+
+    def age(self, now: float) -> float:
+        """Current age of the response (RFC 9111 4.2.3)."""
+        date = _http_date(self.header("date"))
+        apparent_age = max(0.0, self.response_time - date) if date is not None else 0.0
+        corrected_age = (_seconds(self.header("age")) or 0) + (self.response_time - self.request_time)
+        return max(apparent_age, corrected_age) + (now - self.response_time)
+
+    def is_fresh(self, now: float) -> bool:
+        return self.age(now) < self.freshness_lifetime()
+
+    def validators(self) -> dict[str, str]:
+        """Headers that make a conditional request for this entry."""
+        headers = {}
+        if etag := self.header("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := self.header("last-modified"):
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def matches(self, request_headers: Mapping[str, str]) -> bool:
+        """Whether the request agrees with the stored one on the Vary headers."""
+        return all(request_headers.get(name) == value for name, value in self.vary.items())
+
+    def refreshed(self, headers: httpx.Headers, request_time: float, response_time: float) -> CacheEntry:
+        """The entry updated with the headers of a 304 response."""
+        updates = {k.lower(): v for k, v in headers.items() if k.lower() not in _UNSTORED_HEADERS}
+        kept = [(k, v) for k, v in self.headers if k not in updates]
+        return replace(
+            self,
+            headers=kept + list(updates.items()),
+            request_time=request_time,
+            response_time=response_time,
+        )
+
+    def to_response(self) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=httpx.Request("GET", self.url),
+        )
+
+
+def _sent_credentials(response: httpx.Response, request_headers: Mapping[str, str]) -> bool:
+    """Whether the request carried credentials, including cookies added by the client's jar."""
+    if _CREDENTIAL_HEADERS & request_headers.keys():
+        return True
+    try:
+        sent = response.request.headers
+    except RuntimeError:  # a response built without a request
+        return False
+    return any(name in sent for name in _CREDENTIAL_HEADERS)
+
+
+def _entry_from_response(
+    response: httpx.Response,
+    request_headers: Mapping[str, str],
+    request_time: float,
+    response_time: float,
+) -> CacheEntry | None:
+    """Build a cache entry, or None if the response must not or need not be stored."""
+    headers = [(k.lower(), v) for k, v in response.headers.items()]
+    directives = parse_cache_control(response.headers.get("cache-control"))
+    if "no-store" in directives or "no-store" in parse_cache_control(request_headers.get("cache-control")):
+        return None
+    if "private" in directives:
+        return None
+    if _sent_credentials(response, request_headers) and not ("public" in directives or "s-maxage" in directives):
+        return None
+    if response.extensions.get("truncated"):
+        return None
+    explicit = "max-age" in directives or "expires" in response.headers
+    if response.status_code not in CACHEABLE_STATUSES and not (explicit and response.status_code not in (206, 304)):
+        return None
+
+    vary_names = [v.strip().lower() for v in response.headers.get("vary", "").split(",") if v.strip()]
+    if "*" in vary_names:
+        return None
+
+    entry = CacheEntry(
+        url=str(response.url),
+        status_code=response.status_code,
+        headers=[(k, v) for k, v in headers if k not in _UNSTORED_HEADERS],
+        content=response.content,
+        request_time=request_time,
+        response_time=response_time,
+        vary={name: request_headers.get(name) for name in vary_names},
+    )
+    # Nothing to gain from an entry that is never fresh and cannot be revalidated
+    if not entry.validators() and entry.freshness_lifetime() <= 0:
+        return None
+    return entry
+
+
+class _DiskStore:
+    """SQLite table of entries, evicted least recently used first."""
+
+    def __init__(self, db_path: Path, max_bytes: int):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._ready = False
+
+    def _connect(self, create: bool = False) -> sqlite3.Connection | None:
+        if not self._ready:
+            if not create and not self.db_path.exists():
+                return None
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with sqlite3.connect(self.db_path, timeout=30) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        url TEXT NOT NULL,
+                        status INTEGER NOT NULL,
+                        headers TEXT NOT NULL,
+                        vary TEXT NOT NULL,
+                        content BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        request_time REAL NOT NULL,
+                        response_time REAL NOT NULL,
+                        accessed REAL NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed)")
+            self._ready = True
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, key: str) -> CacheEntry | None:
+        conn = self._connect()
+        if conn is None:
+            return None
+        with conn:
+            row = conn.execute(
+                "SELECT url, status, headers, vary, content, request_time, response_time FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+        conn.close()
+        url, status, headers, vary, content, request_time, response_time = row
+        return CacheEntry(
+            url=url,
+            status_code=status,
+            headers=[tuple(h) for h in json.loads(headers)],
+            content=content,
+            request_time=request_time,
+            response_time=response_time,
+            vary=json.loads(vary),
+        )
+
+    def put(self, key: str, entry: CacheEntry) -> int:
+        """Store an entry and evict old ones beyond the size limit.
+
+        Returns:
+            Number of entries evicted
+        """
+        if entry.size > self.max_bytes:
+            return 0
+        conn = self._connect(create=True)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.url,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    json.dumps(entry.vary),
+                    entry.content,
+                    entry.size,
+                    entry.request_time,
+                    entry.response_time,
+                    time.time(),
+                ),
+            )
+            (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            evicted = 0
+            if total > self.max_bytes:
+                evicted = conn.execute(
+                    """
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS running FROM responses
+                        ) WHERE running > ?
+                    )
+                    """,
+                    (self.max_bytes,),
+                ).rowcount
+        conn.close()
+        return evicted
+
+    def delete(self, keys: list[str]) -> None:
+        conn = self._connect()
+        if conn is None:
+            return
+        with conn:
+            conn.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in keys])
+        conn.close()
+
+    def usage(self) -> tuple[int, int]:
+        """(entries, bytes) on disk."""
+        conn = self._connect()
+        if conn is None:
+            return 0, 0
+        with conn:
+            count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        conn.close()
+        return count, size
+
+
+class HTTPCache:
+    """Two-level HTTP cache with revalidation and request collapsing."""
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the cache. Nothing is written until a response is stored.
+
+        Args:
+            db_path: SQLite file for the persistent store. Defaults to ~/.config/mother/web_cache.db
+            max_bytes: Size limit of stored bodies on disk
+            memory_entries: Entries kept in memory
+            memory_bytes: Size limit of bodies kept in memory
+            clock: Wall clock, for tests
+        """
+        if db_path is None:
+            db_path = Path.home() / ".config" / "mother" / "web_cache.db"
+        self._disk = _DiskStore(db_path, max_bytes)
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._memory_bytes = 0
+        self.memory_entries = memory_entries
+        self.memory_bytes = memory_bytes
+        self._clock = clock
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "collapsed": 0,
+            "disk_reads": 0,
+            "stored": 0,
+            "evicted": 0,
+        }
+
+    @staticmethod
+    def _key(url: str, follow_redirects: bool) -> str:
+        return f"GET {url}" if follow_redirects else f"GET {url} no-redirects"
+
+    async def fetch(
+        self,
+        url: str,
+        headers: Mapping[str, str] | None,
+        send: Sender,
+        mode: str = "prefer",
+        follow_redirects: bool = True,
+    ) -> tuple[httpx.Response | None, str]:
+        """Answer a GET from the cache or through ``send``.
+
+        Args:
+            url: Full request URL, query included
+            headers: Per-request headers
+            send: Sends the GET with extra headers added and returns the
+                response with its body read
+            mode: One of CACHE_MODES
+            follow_redirects: Whether ``send`` follows redirects (cached separately)
+
+        Returns:
+            ``(response, status)`` where status is hit, stale, revalidated,
+            miss or bypass. The response is None in "only" mode when nothing
+            is stored.
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}. Use one of: {', '.join(CACHE_MODES)}")
+
+        request_headers = {k.lower(): v for k, v in (headers or {}).items()}
+        key = self._key(url, follow_redirects)
+        flight = (key, mode, tuple(sorted(request_headers.items())))
+        task = self._inflight.get(flight)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, request_headers, send, mode))
+            self._inflight[flight] = task
+            task.add_done_callback(lambda t: self._land(flight, t))
+        else:
+            self._stats["collapsed"] += 1
+        return await asyncio.shield(task)
+
+    def _land(self, flight: tuple, task: asyncio.Future) -> None:
+        self._inflight.pop(flight, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller was cancelled
+
+    async def _fetch(
+        self,
+        key: str,
+        request_headers: dict[str, str],
+        send: Sender,
+        mode: str,
+    ) -> tuple[httpx.Response | None, str]:
+        entry = None
+        if mode != "bypass" and not _CONDITIONAL_HEADERS & request_headers.keys():
+            entry = await self._lookup(key, request_headers)
+
+        if mode == "only":
+            if entry is None:
+                self._stats["misses"] += 1
+                return None, "miss"
+            self._stats["hits"] += 1
+            return entry.to_response(), "hit" if entry.is_fresh(self._clock()) else "stale"
+
+        request_directives = parse_cache_control(request_headers.get("cache-control"))
+        revalidate = "no-cache" in request_directives or _seconds(request_directives.get("max-age")) == 0
+        if entry is not None and not revalidate and entry.is_fresh(self._clock()):
+            self._stats["hits"] += 1
+            return entry.to_response(), "hit"
+
+        request_time = self._clock()
+        response = await send(entry.validators() if entry is not None else {})
+        response_time = self._clock()
+
+        if entry is not None and response.status_code == 304:
+            entry = entry.refreshed(response.headers, request_time, response_time)
+            await self._store(key, entry)
+            self._stats["revalidated"] += 1
+            return entry.to_response(), "revalidated"
+
+        status = "bypass" if mode == "bypass" else "miss"
+        self._stats["bypassed" if mode == "bypass" else "misses"] += 1
+        if response.status_code != 304:
+            fresh = _entry_from_response(response, request_headers, request_time, response_time)
+            if fresh is not None:
+                await self._store(key, fresh)
+            elif entry is not None:
+                await self._drop([key])
+        return response, status
+
+    async def _lookup(self, key: str, request_headers: Mapping[str, str]) -> CacheEntry | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        else:
+            entry = await asyncio.to_thread(self._disk.get, key)
+            if entry is None:
+                return None
+            self._stats["disk_reads"] += 1
+            self._remember(key, entry)
+        return entry if entry.matches(request_headers) else None
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old.size
+        if entry.size > self.memory_bytes:
+            return
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+        while len(self._memory) > self.memory_entries or self._memory_bytes > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+
+    async def _store(self, key: str, entry: CacheEntry) -> None:
+        self._remember(key, entry)
+        try:
+            self._stats["evicted"] += await asyncio.to_thread(self._disk.put, key, entry)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not store {entry.url} in the HTTP cache: {e}")
+        self._stats["stored"] += 1
+
+    async def _drop(self, keys: list[str]) -> None:
+        for key in keys:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old.size
+        await asyncio.to_thread(self._disk.delete, keys)
+
+    async def invalidate(self, url: str) -> None:
+        """Forget stored responses for ``url``, e.g. after a POST to it."""
+        await self._drop([self._key(url, True), self._key(url, False)])
+
+    def stats(self) -> dict[str, Any]:
+        """Counters, hit rate and storage use."""
+        lookups = self._stats["hits"] + self._stats["revalidated"] + self._stats["misses"]
+        disk_entries, disk_bytes = self._disk.usage()
+        return {
+            **self._stats,
+            "hit_rate": round((self._stats["hits"] + self._stats["revalidated"]) / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": disk_entries,
+            "disk_bytes": disk_bytes,
+        }
@@ -0,0 +1,562 @@
+"""HTML to plain text or Markdown for the web plugin.
+
+Pages fetched for the LLM are mostly scripts, styles and navigation, and a
+tool result is resent on every later turn. :func:`html_to_text` feeds the
+document through :class:`html.parser.HTMLParser` in chunks, drops elements
+that carry no content (scripts, forms, ``<nav>``, cookie banners, ...),
+keeps only ``<main>``/``<article>`` when the page has one, and renders
+headings, lists, links, code and tables. Output is cut to a token budget,
+and parsing stops early once the main content already fills it.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+FORMATS = ("raw", "text", "markdown")
+
+# Rough average for English prose with BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+DEFAULT_MAX_TOKENS = 8000
+
+# Documents are parsed in slices of this many characters so parsing can stop early
+_FEED_CHARS = 64 * 1024
+
+# Elements without readable content, skipped with everything inside them
+_SKIP_TAGS = frozenset(
+    {
+        "script",
+        "style",
+        "noscript",
+        "template",
+        "svg",
+        "canvas",
+        "iframe",
+        "object",
+        "form",
+        "button",
+        "select",
+        "textarea",
+        "dialog",
+        "nav",
+        "aside",
+    }
+)
+
+# Page chrome unless it sits inside the main content (an article's own header)
+_CHROME_TAGS = frozenset({"header", "footer"})
+
+_CHROME_ROLES = frozenset({"navigation", "banner", "contentinfo", "complementary", "search", "dialog", "menu"})
+
+_CHROME_NAMES = re.compile(
+    r"\b(nav|navbar|menu|breadcrumbs?|sidebar|cookies?|consent|banner|advert|ads?|promo|share|sharing|social"
+    r"|related|comments?|newsletter|subscribe|popup|modal|skip-link)\b",
+    re.IGNORECASE,
+)
+
+# Chrome by class or id only outside the main content
+_OUTER_CHROME_NAMES = re.compile(r"\b(header|footer|masthead|topbar)\b", re.IGNORECASE)
+
+# Class or id words that mark a content container even if a chrome word also appears ("page has-sidebar")
+_CONTENT_NAMES = re.compile(r"\b(article|body|content|main|post|entry|story|page|column)\b", re.IGNORECASE)
+
+_VOID_TAGS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"}
+)
+
+_BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "article",
+        "blockquote",
+        "dd",
+        "details",
+        "div",
+        "dl",
+        "dt",
+        "figcaption",
+        "figure",
+        "footer",
+        "header",
+        "hr",
+        "li",
+        "main",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "summary",
+        "table",
+        "ul",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+    }
+)
+
+_HEADINGS = {f"h{n}": n for n in range(1, 7)}
+
+# Start tags that end an open element of the same kind (HTML's implied end tags)
+_IMPLIED_END = {
+    "p": frozenset({"p"}),
+    "li": frozenset({"li"}),
+    "dt": frozenset({"dt", "dd"}),
+    "dd": frozenset({"dt", "dd"}),
+    "tr": frozenset({"tr", "td", "th"}),
+    "td": frozenset({"td", "th"}),
+    "th": frozenset({"td", "th"}),
+}
+
+_MARKDOWN_WRAP = {"b": "**", "strong": "**", "i": "*", "em": "*", "code": "`"}
+
+_SPACE = re.compile(r"\s+")
+
+
+@dataclass
+class _Block:
+    text: str
+    in_main: bool
+    # Consecutive list items and table rows are joined with single newlines
+    tight: bool = False
+
+
+@dataclass
+class _Table:
+    rows: list[list[str]] = field(default_factory=list)
+    row: list[str] | None = None
+    cell: list[str] | None = None
+
+
+class _Extractor(HTMLParser):
+    """Collects readable blocks from an HTML document."""
+
+    def __init__(self, markdown: bool, base_url: str | None, strip_chrome: bool = True):
+        super().__init__(convert_charrefs=True)
+        self.markdown = markdown
+        self.base_url = base_url
+        self.strip_chrome = strip_chrome
+        self.title = ""
+        self.blocks: list[_Block] = []
+        self.main_chars = 0
+        self.saw_main = False
+
+        self._stack: list[tuple[str, str | None]] = []  # (tag, what closing it undoes)
+        self._skip = 0
+        self._main = 0
+        self._in_title = False
+        self._pre = 0
+        self._quote = 0
+        self._lists: list[list[int]] = []  # [next number] for <ol>, [] for <ul>
+        self._tables: list[_Table] = []
+        self._line: list[str] = []
+        self._prefix = ""
+        self._tight = False
+        # Open inline spans: (start index in _line, wrapper kind, href)
+        self._spans: list[tuple[int, str, str | None]] = []
+
+    # -- element tracking ---------------------------------------------------
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _VOID_TAGS:
+            if not self._skip:
+                self._void(tag, dict(attrs))
+            return
+
+        implied = _IMPLIED_END.get(tag)
+        if implied and self._stack and self._stack[-1][0] in implied:
+            self._pop()
+
+        if self._skip:
+            self._stack.append((tag, None))
+            return
+
+        attributes = dict(attrs)
+        if self._is_chrome(tag, attributes):
+            self._skip += 1
+            self._stack.append((tag, "skip"))
+            return
+
+        self._stack.append((tag, self._open(tag, attributes)))
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _VOID_TAGS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            if tag == "p" and not self._skip:
+                self._flush()  # a stray </p> still ends a paragraph
+            return
+        while self._stack:
+            if self._pop() == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif self._skip:
+            return
+        elif self._pre:
+            self._line.append(data)
+        else:
+            self._line.append(_SPACE.sub(" ", data))
+
+    def _pop(self) -> str:
+        tag, undo = self._stack.pop()
+        if undo == "skip":
+            self._skip -= 1
+        elif undo is not None and not self._skip:
+            self._close(tag, undo)
+        return tag
+
+    def _is_chrome(self, tag: str, attrs: dict[str, str | None]) -> bool:
+        if tag in _SKIP_TAGS:
+            return True
+        if "hidden" in attrs or attrs.get("aria-hidden") == "true":
+            return True
+        if not self.strip_chrome:
+            return False
+        if tag in _CHROME_TAGS and not self._main:
+            return True
+        if (attrs.get("role") or "").lower() in _CHROME_ROLES:
+            return True
+        if tag in ("main", "article", "body", "html"):
+            return False
+        names = f"{attrs.get('class') or ''} {attrs.get('id') or ''}"
+        if not names.strip() or _CONTENT_NAMES.search(names):
+            return False
+        return bool(_CHROME_NAMES.search(names) or (not self._main and _OUTER_CHROME_NAMES.search(names)))
+
+    # -- opening and closing ------------------------------------------------
+
+    def _open(self, tag: str, attrs: dict[str, str | None]) -> str | None:
+        """Start an element; returns the key :meth:`_close` uses to finish it."""
+        if tag == "title":
+            self._in_title = True
+            return "title"
+        if tag in ("main", "article") or (attrs.get("role") or "").lower() == "main":
+            self._flush()
+            self._main += 1
+            self.saw_main = True
+            return "main"
+        if tag in ("td", "th") and self._tables:
+            self._end_cell()
+            table = self._tables[-1]
+            if table.row is None:
+                table.row = []
+            table.cell = []
+            return "cell"
+        if tag == "tr" and self._tables:
+            self._end_row()
+            self._tables[-1].row = []
+            return "row"
+        if tag == "table":
+            self._flush()
+            self._tables.append(_Table())
+            return "table"
+        if tag == "pre":
+            self._flush()
+            self._pre += 1
+            return "pre"
+        if tag == "a":
+            href = attrs.get("href")
+            self._spans.append((len(self._line), "a", href))
+            return "span"
+        if tag in _MARKDOWN_WRAP and self.markdown and not self._pre:
+            self._spans.append((len(self._line), tag, None))
+            return "span"
+        if tag in ("ul", "ol"):
+            self._flush()
+            start = attrs.get("start") or "1"
+            self._lists.append([int(start) if start.isdigit() else 1] if tag == "ol" else [])
+            return "list"
+        if tag == "blockquote":
+            self._flush()
+            self._quote += 1
+            return "quote"
+        if tag in _BLOCK_TAGS or tag == "tr":
+            self._flush()
+            if tag in _HEADINGS:
+                self._prefix = "#" * _HEADINGS[tag] + " " if self.markdown else ""
+            elif tag == "li":
+                self._prefix = self._bullet()
+                self._tight = True
+            return "block"
+        return None
+
+    def _close(self, tag: str, undo: str) -> None:
+        if undo == "title":
+            self._in_title = False
+        elif undo == "main":
+            self._flush()
+            self._main -= 1
+        elif undo == "cell":
+            self._end_cell()
+        elif undo == "row":
+            self._end_row()
+        elif undo == "table":
+            self._end_table()
+        elif undo == "pre":
+            self._end_pre()
+        elif undo == "span":
+            self._end_span()
+        elif undo == "list":
+            self._flush()
+            self._lists.pop()
+        elif undo == "quote":
+            self._flush()
+            self._quote -= 1
+        elif undo == "block":
+            self._flush()
+            # An empty heading or list item must not prefix the next block
+            self._prefix = ""
+            self._tight = False
+
+    def _void(self, tag: str, attrs: dict[str, str | None]) -> None:
+        if tag == "br":
+            self._line.append("\n")
+        elif tag == "hr":
+            self._flush()
+            if self.markdown:
+                self._emit("---")
+        elif tag == "img":
+            alt = _SPACE.sub(" ", attrs.get("alt") or "").strip()
+            src = attrs.get("src")
+            if alt and self.markdown and src and not src.startswith("data:"):
+                self._line.append(f"![{alt}]({self._url(src)})")
+            elif alt:
+                self._line.append(alt)
+
+    def _bullet(self) -> str:
+        depth = max(len(self._lists) - 1, 0)
+        if self._lists and self._lists[-1]:
+            number = self._lists[-1][0]
+            self._lists[-1][0] += 1
+            return "   " * depth + f"{number}. "
+        return "  " * depth + "- "
+
+    def _url(self, href: str) -> str:
+        return urljoin(self.base_url, href) if self.base_url else href
+
+    def _end_span(self) -> None:
+        start, kind, href = self._spans.pop()
+        raw = "".join(self._line[start:])
+        del self._line[start:]
+        text = _SPACE.sub(" ", raw).strip()
+        if not text:
+            self._line.append(raw)
+            return
+        if kind != "a":
+            wrap = _MARKDOWN_WRAP[kind]
+            text = f"{wrap}{text}{wrap}"
+        elif href and not href.startswith(("#", "javascript:")):
+            url = self._url(href)
+            if self.markdown:
+                text = f"[{text}]({url})"
+            elif text != url:
+                text = f"{text} ({url})"
+        # Keep the whitespace around the element so words do not run together
+        lead = " " if raw[:1].isspace() else ""
+        trail = " " if raw[-1:].isspace() else ""
+        self._line.append(lead + text + trail)
+
+    # -- blocks ---------------------------------------------------------------
+
+    def _take_line(self) -> str:
+        while self._spans:
+            # Unclosed inline elements are rendered at the end of their block
+            self._end_span()
+        lines = (_SPACE.sub(" ", line).strip() for line in "".join(self._line).split("\n"))
+        self._line = []
+        return "\n".join(line for line in lines if line)
+
+    def _flush(self) -> None:
+        if self._pre:
+            return
+        text = self._take_line()
+        if not text:
+            return  # keeps the prefix for <li><p>...</p></li>
+        prefix, self._prefix = self._prefix, ""
+        tight, self._tight = self._tight, False
+        self._emit(prefix + text, tight=tight)
+
+    def _emit(self, text: str, tight: bool = False) -> None:
+        if self._tables and self._tables[-1].cell is not None:
+            self._tables[-1].cell.append(text)
+            return
+        if self._quote and self.markdown:
+            text = "\n".join("> " + line for line in text.split("\n"))
+        self.blocks.append(_Block(text, self._main > 0, tight))
+        if self._main:
+            self.main_chars += len(text)
+
+    def _end_pre(self) -> None:
+        self._pre -= 1
+        if self._pre:
+            return
+        text = "".join(self._line).strip("\n")
+        self._line = []
+        if text.strip():
+            self._emit(f"```\n{text}\n```" if self.markdown else text)
+
+    def _end_cell(self) -> None:
+        table = self._tables[-1]
+        if table.cell is None:
+            return
+        parts = [*table.cell, self._take_line()]
+        table.cell = None
+        text = " ".join(" ".join(parts).split())
+        if table.row is None:
+            table.row = []
+        table.row.append(text.replace("|", "\\|") if self.markdown else text)
+
+    def _end_row(self) -> None:
+        table = self._tables[-1]
+        self._end_cell()
+        if table.row and any(table.row):
+            table.rows.append(table.row)
+        table.row = None
+
+    def _end_table(self) -> None:
+        self._end_row()
+        table = self._tables.pop()
+        self._line = []
+        if not table.rows:
+            return
+        width = max(len(row) for row in table.rows)
+        if width == 1:
+            # A layout table: its cells are just paragraphs
+            for row in table.rows:
+                self._emit(row[0])
+            return
+        rows = [row + [""] * (width - len(row)) for row in table.rows]
+        if self.markdown:
+            lines = [f"| {' | '.join(rows[0])} |", "|" + " --- |" * width]
+            lines += [f"| {' | '.join(row)} |" for row in rows[1:]]
+        else:
+            lines = [" | ".join(row) for row in rows]
+        self._emit("\n".join(lines))
+
+    def finish(self) -> None:
+        self.close()
+        while self._stack:
+            self._pop()
+        self._flush()
+
+
+def html_to_text(
+    html: str,
+    fmt: str = "text",
+    base_url: str | None = None,
+    max_tokens: int | None = DEFAULT_MAX_TOKENS,
+) -> tuple[str, bool]:
+    """Render the readable content of an HTML document.
+
+    Args:
+        html: The document
+        fmt: ``"text"`` or ``"markdown"``
+        base_url: URL relative links are resolved against
+        max_tokens: Output budget in (estimated) tokens; None for no limit
+
+    Returns:
+        ``(content, truncated)``; ``truncated`` is True if the budget cut it
+    """
+    limit = max_tokens * CHARS_PER_TOKEN if max_tokens else None
+    parser = _parse(html, fmt, base_url, limit, strip_chrome=True)
+    if not parser.blocks:
+        # Everything looked like chrome; better too much text than none
+        parser = _parse(html, fmt, base_url, limit, strip_chrome=False)
+
+    blocks = parser.blocks
+    if parser.saw_main and parser.main_chars:
+        blocks = [block for block in blocks if block.in_main]
+
+    title = _SPACE.sub(" ", parser.title).strip()
+    if title and not (blocks and blocks[0].text.lstrip("# ") == title):
+        blocks.insert(0, _Block(f"# {title}" if fmt == "markdown" else title, True))
+
+    return _join(blocks, limit)
+
+
+def _parse(html: str, fmt: str, base_url: str | None, limit: int | None, strip_chrome: bool) -> _Extractor:
+    parser = _Extractor(markdown=fmt == "markdown", base_url=base_url, strip_chrome=strip_chrome)
+    for start in range(0, len(html), _FEED_CHARS):
+        parser.feed(html[start : start + _FEED_CHARS])
+        if limit is not None and parser.main_chars > limit:
+            break
+    parser.finish()
+    return parser
+
+
+def _join(blocks: list[_Block], limit: int | None) -> tuple[str, bool]:
+    out: list[str] = []
+    size = 0
+    for block in blocks:
+        separator = "" if not out else "\n" if block.tight else "\n\n"
+        if limit is not None and size + len(separator) + len(block.text) > limit:
+            room = limit - size - len(separator)
+            if room > 0:
+                out.append(separator + _cut(block.text, room))
+            return "".join(out), True
+        out.append(separator + block.text)
+        size += len(separator) + len(block.text)
+    return "".join(out), False
+
+
+def _cut(text: str, limit: int) -> str:
+    """Cut ``text`` to at most ``limit`` characters, at a word boundary if one is near."""
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit + 1)
+    return text[: cut if cut > limit // 2 else limit].rstrip()
+
+
+def limit_text(text: str, max_tokens: int | None) -> tuple[str, bool]:
+    """Cut non-HTML text to a token budget."""
+    if not max_tokens or len(text) <= max_tokens * CHARS_PER_TOKEN:
+        return text, False
+    return _cut(text, max_tokens * CHARS_PER_TOKEN), True
+
+
+def is_html(content_type: str | None, text: str) -> bool:
+    """Whether a body should be treated as HTML."""
+    if content_type:
+        return "html" in content_type.lower()
+    return text.lstrip()[:15].lower().startswith(("<!doctype html", "<html"))
+
+
+class _LinkParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.links: list[str] = []
+        self.base: str | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in ("a", "area"):
+            href = dict(attrs).get("href")
+            if href and href.strip():
+                self.links.append(href.strip())
+        elif tag == "base" and self.base is None:
+            self.base = dict(attrs).get("href")
+
+
+def extract_links(html: str, base_url: str | None = None) -> list[str]:
+    """``href`` targets of ``<a>`` and ``<area>`` elements, in document order.
+
+    Relative links are resolved against ``base_url`` (and the document's
+    ``<base href>``) when ``base_url`` is given.
+    """
+    parser = _LinkParser()
+    parser.feed(html)
+    parser.close()
+    if base_url is None:
+        return parser.links
+    base = urljoin(base_url, parser.base) if parser.base else base_url
+    return [urljoin(base, link) for link in parser.links]
@@ -0,0 +1,70 @@
+"""robots.txt checks for the web plugin's fetch_many.
+
+Rules are fetched once per origin and kept for :data:`ROBOTS_TTL` seconds;
+concurrent checks against the same origin share one fetch. Status codes
+are handled as in RFC 9309: a 4xx means no restrictions, a 5xx or an
+unreachable server means the whole site is disallowed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+ROBOTS_TTL = 3600.0
+
+# robots.txt files are small; anything past this is ignored
+MAX_ROBOTS_BYTES = 512 * 1024
+
+
+class RobotsCache:
+    """Per-origin robots.txt rules.
+
+    Args:
+        user_agent: User agent the rules are matched against
+        fetch: Coroutine that GETs a URL and returns the response
+        clock: Time source, replaceable in tests
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        fetch: Callable[[str], Awaitable[httpx.Response]],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._user_agent = user_agent
+        self._fetch = fetch
+        self._clock = clock
+        self._rules: dict[str, tuple[float, asyncio.Future[RobotFileParser]]] = {}
+
+    async def allowed(self, url: str) -> bool:
+        """Whether robots.txt lets us fetch ``url``."""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        cached = self._rules.get(origin)
+        if cached is None or self._clock() - cached[0] > ROBOTS_TTL:
+            cached = (self._clock(), asyncio.ensure_future(self._load(origin)))
+            self._rules[origin] = cached
+        rules = await asyncio.shield(cached[1])
+        return rules.can_fetch(self._user_agent, url)
+
+    async def _load(self, origin: str) -> RobotFileParser:
+        rules = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            response = await self._fetch(f"{origin}/robots.txt")
+        except httpx.HTTPError:
+            rules.disallow_all = True
+            return rules
+        if response.status_code >= 500:
+            rules.disallow_all = True
+        elif response.status_code >= 400:
+            rules.allow_all = True
+        else:
+            text = response.content[:MAX_ROBOTS_BYTES].decode("utf-8", errors="replace")
+            rules.parse(text.splitlines())
+        return rules
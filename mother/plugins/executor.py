@@ -20,6 +20,7 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from ..tracing import traced
 from .base import PluginBase, PluginResult
 from .exceptions import (
     ExecutionError,
@@ -27,6 +28,7 @@ from .exceptions import (
     PluginTimeoutError,
     PolicyViolationError,
 )
+from .process import limits_from_config, run_process
 
 if TYPE_CHECKING:
     from .manifest import (
@@ -223,6 +225,7 @@ class ExecutorBase(ABC):
         if decision.requires_audit:
             logger.info(f"[AUDIT] Capability execution allowed: {capability} (reason: {decision.reason})")
 
+    @traced("plugin.validate")
     def validate_params(
         self,
         capability: str,
@@ -624,33 +627,25 @@ class CLIExecutor(ExecutorBase):
 
         # Get timeout
         timeout = self.get_timeout(capability)
-        start_time = time.time()
 
         try:
-            # Run subprocess
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env,
+            # Run subprocess under the plugin's resource limits
+            outcome = await run_process(
+                cmd,
+                timeout=timeout,
                 cwd=self.spec.cwd,
+                env=env,
+                limits=limits_from_config(self.config),
+                name=self.plugin_name,
             )
-
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=timeout,
-                )
-            except TimeoutError:
-                process.kill()
-                await process.wait()
+            if outcome.timed_out:
                 return PluginResult.timeout_result(timeout)
 
-            execution_time = time.time() - start_time
-            stdout_str = stdout.decode("utf-8", errors="replace")
-            stderr_str = stderr.decode("utf-8", errors="replace")
+            execution_time = outcome.wall_time
+            stdout_str = outcome.stdout.decode("utf-8", errors="replace")
+            stderr_str = outcome.stderr.decode("utf-8", errors="replace")
 
-            if process.returncode == 0:
+            if outcome.returncode == 0:
                 # Try to parse output as structured data
                 parsed_data = self._parse_output(stdout_str, capability)
                 return PluginResult.success_result(
@@ -658,14 +653,16 @@ class CLIExecutor(ExecutorBase):
                     raw_output=stdout_str,
                     execution_time=execution_time,
                     command=cmd,
+                    **outcome.metadata(),
                 )
             else:
                 return PluginResult.error_result(
-                    message=stderr_str or f"Command failed with exit code {process.returncode}",
-                    code=f"EXIT_{process.returncode}",
+                    message=stderr_str or f"Command failed with exit code {outcome.returncode}",
+                    code=f"EXIT_{outcome.returncode}",
                     raw_output=stdout_str + stderr_str,
                     execution_time=execution_time,
                     command=cmd,
+                    **outcome.metadata(),
                 )
 
         except Exception as e:
@@ -0,0 +1,677 @@
+"""Resource-limited subprocess execution for plugins.
+
+Shell commands and CLI plugins run arbitrary programs on the host. This
+module launches them with kernel-enforced caps so a runaway child cannot
+starve the agent server:
+
+- rlimit caps (CPU seconds, address space, file size, open files, process
+  count) set from the plugin's ``resource_limits``; a cap of 0 leaves the
+  inherited value
+- a lowered scheduling priority (``nice``)
+- an optional per-plugin cgroup v2 subtree (memory.max, cpu.max, pids.max)
+  when a delegated cgroup root is configured and writable
+- a new session per child, so a timeout kills the whole process group
+- stdout/stderr read incrementally into bounded head+tail buffers, so
+  memory per call stays fixed however much the child prints; the child can
+  optionally be killed once a stream passes its cap, and an ``on_output``
+  callback receives chunks live as they arrive (set per call, or for a
+  whole request with :func:`stream_output`)
+
+The server is multi-threaded, so no Python code runs in the forked child
+before exec (``preexec_fn`` can deadlock there). Instead the child execs a
+small wrapper (a fresh ``python -I -S``) that joins the cgroup, sets the
+caps and the priority on itself and then execs the command, so the
+command never runs uncapped. The wrapper costs an interpreter start
+(~10 ms) per call and is skipped when there is nothing to apply.
+
+Children are reaped with ``os.wait4`` so the actual CPU time, peak RSS and
+block I/O of each run are reported back as :class:`ResourceUsage`. The
+wait is driven by a pidfd on the event loop (or WNOHANG polling), so a
+long-running child does not hold a thread.
+
+On platforms without ``resource``/``wait4`` the runner falls back to a plain
+asyncio subprocess without limits or usage figures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import errno
+import inspect
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .sandbox import ResourceLimits
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger("mother.plugins.process")
+
+# ru_inblock/ru_oublock are counted in 512-byte units
+_BLOCK_SIZE = 512
+
+# Seconds between SIGXCPU at the soft CPU limit and SIGKILL at the hard one
+_CPU_GRACE_SECONDS = 5
+
+# Longest sleep between WNOHANG polls where pidfds are unavailable
+_REAP_POLL_MAX = 0.05
+
+_CGROUP_MOUNT = Path("/sys/fs/cgroup")
+
+_READ_CHUNK = 64 * 1024
+
+# Live output hook: (stream name, chunk) -> None or awaitable
+OutputCallback = Callable[[str, bytes], Awaitable[None] | None]
+
+_live_output: ContextVar[OutputCallback | None] = ContextVar("mother_live_output", default=None)
+
+
+@contextlib.contextmanager
+def stream_output(callback: OutputCallback | None) -> Iterator[None]:
+    """Send output of every child started in this context to ``callback``.
+
+    Lets a request handler stream tool output (e.g. over SSE) without the
+    plugins knowing about the transport.
+    """
+    token = _live_output.set(callback)
+    try:
+        yield
+    finally:
+        _live_output.reset(token)
+
+
+def live_output_callback() -> OutputCallback | None:
+    """Get the callback set by :func:`stream_output`, if any.
+
+    For plugins that produce output without a local child process (e.g.
+    remote commands) and want to stream it the same way.
+    """
+    return _live_output.get()
+
+
+def limits_from_config(config: dict[str, Any] | None) -> ResourceLimits:
+    """Build ResourceLimits from a plugin config's ``resource_limits`` entry."""
+    raw = (config or {}).get("resource_limits")
+    if isinstance(raw, ResourceLimits):
+        return raw
+    return ResourceLimits(**(raw or {}))
+
+
+@dataclass
+class ResourceUsage:
+    """Resources consumed by a finished child process.
+
+    Attributes:
+        cpu_user_seconds: User-mode CPU time
+        cpu_system_seconds: Kernel-mode CPU time
+        max_rss_bytes: Peak resident set size. On Linux the kernel carries
+            the pre-exec high-water mark across exec, so this is never less
+            than the server's own RSS at spawn time; it is meaningful for
+            children that grow beyond that.
+        io_read_bytes: Bytes read from block devices
+        io_write_bytes: Bytes written to block devices
+    """
+
+    cpu_user_seconds: float = 0.0
+    cpu_system_seconds: float = 0.0
+    max_rss_bytes: int = 0
+    io_read_bytes: int = 0
+    io_write_bytes: int = 0
+
+    @classmethod
+    def from_rusage(cls, usage: Any) -> ResourceUsage:
+        """Convert a ``resource.struct_rusage`` from ``os.wait4``."""
+        # Linux reports ru_maxrss in kilobytes, macOS in bytes
+        rss_scale = 1 if sys.platform == "darwin" else 1024
+        return cls(
+            cpu_user_seconds=round(usage.ru_utime, 6),
+            cpu_system_seconds=round(usage.ru_stime, 6),
+            max_rss_bytes=usage.ru_maxrss * rss_scale,
+            io_read_bytes=usage.ru_inblock * _BLOCK_SIZE,
+            io_write_bytes=usage.ru_oublock * _BLOCK_SIZE,
+        )
+
+    @property
+    def cpu_seconds(self) -> float:
+        """Total CPU time."""
+        return self.cpu_user_seconds + self.cpu_system_seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a dictionary for PluginResult metadata."""
+        return {
+            "cpu_user_seconds": self.cpu_user_seconds,
+            "cpu_system_seconds": self.cpu_system_seconds,
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "max_rss_bytes": self.max_rss_bytes,
+            "io_read_bytes": self.io_read_bytes,
+            "io_write_bytes": self.io_write_bytes,
+        }
+
+
+class StreamBuffer:
+    """Bounded capture of one output stream.
+
+    Keeps the first and last ``max_bytes // 2`` bytes and counts the rest;
+    the elided middle is replaced by a marker in :meth:`getvalue`.
+    """
+
+    def __init__(self, max_bytes: int):
+        """Initialize the buffer.
+
+        Args:
+            max_bytes: Maximum bytes retained (head plus tail)
+        """
+        self.max_bytes = max(max_bytes, 0)
+        self._head_limit = self.max_bytes // 2
+        self._tail_limit = self.max_bytes - self._head_limit
+        self._head = bytearray()
+        self._tail = bytearray()
+        self.total = 0
+
+    def write(self, data: bytes) -> None:
+        """Append a chunk, discarding from the middle once full."""
+        self.total += len(data)
+        room = self._head_limit - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if not data or not self._tail_limit:
+            return
+        if len(data) >= self._tail_limit:
+            self._tail[:] = data[-self._tail_limit :]
+            return
+        self._tail += data
+        excess = len(self._tail) - self._tail_limit
+        if excess > 0:
+            # Deleting from the front of a bytearray is amortized O(1)
+            del self._tail[:excess]
+
+    @property
+    def truncated(self) -> bool:
+        """Whether any output was dropped."""
+        return self.total > len(self._head) + len(self._tail)
+
+    def getvalue(self) -> bytes:
+        """Captured bytes, with a marker where output was elided."""
+        if not self.truncated:
+            return bytes(self._head + self._tail)
+        elided = self.total - len(self._head) - len(self._tail)
+        marker = f"\n... [{elided} bytes elided] ...\n".encode()
+        return bytes(self._head) + marker + bytes(self._tail)
+
+
+@dataclass
+class ProcessOutcome:
+    """Result of a limited subprocess run.
+
+    Attributes:
+        returncode: Exit code; negative for death by signal (like Popen)
+        stdout: Captured standard output
+        stderr: Captured standard error
+        wall_time: Wall-clock duration in seconds
+        timed_out: True if the run was killed at the timeout
+        usage: Resource usage, if the platform reports it
+        cgroup: cgroup path the child ran in, if any
+        stdout_bytes: Total bytes the child wrote to stdout
+        stderr_bytes: Total bytes the child wrote to stderr
+        truncated: True if either stream was cut to its cap
+        output_capped: True if the child was killed for exceeding the cap
+    """
+
+    returncode: int
+    stdout: bytes
+    stderr: bytes
+    wall_time: float
+    timed_out: bool = False
+    usage: ResourceUsage | None = None
+    cgroup: str | None = None
+    stdout_bytes: int = 0
+    stderr_bytes: int = 0
+    truncated: bool = False
+    output_capped: bool = False
+
+    @property
+    def limit_signal(self) -> str | None:
+        """Name of the signal that suggests a resource cap was hit."""
+        if self.timed_out or self.output_capped or self.returncode >= 0:
+            return None
+        sig = -self.returncode
+        if sig in (signal.SIGXCPU, signal.SIGXFSZ, signal.SIGKILL):
+            return signal.Signals(sig).name
+        return None
+
+    def metadata(self) -> dict[str, Any]:
+        """Metadata entries to attach to a PluginResult."""
+        meta: dict[str, Any] = {"wall_time": round(self.wall_time, 6)}
+        if self.usage is not None:
+            meta["resource_usage"] = self.usage.to_dict()
+        if self.cgroup:
+            meta["cgroup"] = self.cgroup
+        if self.limit_signal:
+            meta["limit_signal"] = self.limit_signal
+        if self.truncated:
+            meta["output_truncated"] = True
+            meta["stdout_bytes"] = self.stdout_bytes
+            meta["stderr_bytes"] = self.stderr_bytes
+        if self.output_capped:
+            meta["output_capped"] = True
+        return meta
+
+
+def _rlimits(limits: ResourceLimits) -> list[tuple[int, int]]:
+    """Translate ResourceLimits into (RLIMIT_*, value) pairs."""
+    pairs: list[tuple[int, int]] = []
+    if resource is None:
+        return pairs
+    if limits.max_cpu_seconds:
+        pairs.append((resource.RLIMIT_CPU, limits.max_cpu_seconds))
+    if limits.max_address_space_mb:
+        pairs.append((resource.RLIMIT_AS, limits.max_address_space_mb * 1024 * 1024))
+    if limits.max_file_size_mb:
+        pairs.append((resource.RLIMIT_FSIZE, limits.max_file_size_mb * 1024 * 1024))
+    if limits.max_open_files:
+        pairs.append((resource.RLIMIT_NOFILE, limits.max_open_files))
+    if limits.max_processes and hasattr(resource, "RLIMIT_NPROC"):
+        pairs.append((resource.RLIMIT_NPROC, limits.max_processes))
+    return pairs
+
+
+def _clamp(current: tuple[int, int], value: int, grace: int = 0) -> tuple[int, int]:
+    """New (soft, hard) pair that only ever tightens the existing limits."""
+
+    def lower(a: int, b: int) -> int:
+        if a == resource.RLIM_INFINITY:
+            return b
+        if b == resource.RLIM_INFINITY:
+            return a
+        return min(a, b)
+
+    soft_cur, hard_cur = current
+    hard = lower(hard_cur, value + grace)
+    soft = lower(lower(soft_cur, value), hard)
+    return soft, hard
+
+
+# Run in the child in place of the command: joins the cgroup, applies the
+# caps and the priority, then execs the command. Arguments: the rlimit plan
+# ("resource:soft:hard,..."), the nice increment, the cgroup.procs path (or
+# ""), the program path and the command's argv.
+_LIMIT_WRAPPER = """\
+import os, resource, sys
+plan, nice, procs, path = sys.argv[1:5]
+if procs:
+    try:
+        with open(procs, "w") as f:
+            f.write("0")
+    except OSError:
+        pass
+for item in filter(None, plan.split(",")):
+    rlimit, soft, hard = map(int, item.split(":"))
+    try:
+        resource.setrlimit(rlimit, (soft, hard))
+    except (OSError, ValueError):
+        pass
+if int(nice):
+    try:
+        os.nice(int(nice))
+    except OSError:
+        pass
+os.execv(path, sys.argv[5:])
+"""
+
+
+def _resolve_program(program: str, cwd: str | None, env: dict[str, str] | None) -> str:
+    """Path the wrapper execs, raising like Popen when it cannot be run."""
+    if os.sep in program:
+        target = os.path.join(cwd, program) if cwd else program
+        if not os.path.exists(target):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), program)
+        if not os.access(target, os.X_OK):
+            raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), program)
+        return program
+    path = shutil.which(program, path=(env if env is not None else os.environ).get("PATH", os.defpath))
+    if path is None:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), program)
+    return path
+
+
+def _limited_argv(
+    argv: Sequence[str],
+    limits: ResourceLimits,
+    cgroup: Path | None,
+    cwd: str | None,
+    env: dict[str, str] | None,
+) -> list[str]:
+    """The command line that runs ``argv`` under ``limits``."""
+    plan = []
+    for rlimit, value in _rlimits(limits):
+        grace = _CPU_GRACE_SECONDS if rlimit == resource.RLIMIT_CPU else 0
+        soft, hard = _clamp(resource.getrlimit(rlimit), value, grace)
+        plan.append(f"{rlimit}:{soft}:{hard}")
+    if not plan and not limits.nice_increment and cgroup is None:
+        return list(argv)
+    return [
+        sys.executable,
+        "-I",
+        "-S",
+        "-c",
+        _LIMIT_WRAPPER,
+        ",".join(plan),
+        str(limits.nice_increment),
+        str(cgroup / "cgroup.procs") if cgroup else "",
+        _resolve_program(argv[0], cwd, env),
+        *argv,
+    ]
+
+
+async def _reap(pid: int) -> tuple[int, int, Any]:
+    """``os.wait4`` a child without blocking a thread until it exits."""
+    pidfd = None
+    if hasattr(os, "pidfd_open"):
+        with contextlib.suppress(OSError):
+            pidfd = os.pidfd_open(pid)
+    if pidfd is not None:
+        loop = asyncio.get_running_loop()
+        exited = loop.create_future()
+        loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+        try:
+            await exited
+        finally:
+            loop.remove_reader(pidfd)
+            os.close(pidfd)
+        return os.wait4(pid, 0)
+
+    delay = 0.001
+    while True:
+        reaped, status, usage = os.wait4(pid, os.WNOHANG)
+        if reaped:
+            return reaped, status, usage
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _REAP_POLL_MAX)
+
+
+class CgroupManager:
+    """Creates per-plugin cgroup v2 subtrees under a delegated root.
+
+    The root must be a cgroup v2 directory the server may write to (e.g. a
+    systemd unit with ``Delegate=yes``) with the memory/cpu/pids controllers
+    enabled in its ``cgroup.subtree_control``. Anything missing simply
+    disables cgroup placement.
+    """
+
+    def __init__(self, root: str | Path | None):
+        """Initialize the manager.
+
+        Args:
+            root: Delegated cgroup v2 directory, or None to disable
+        """
+        self.root = Path(root) if root else None
+        self._prepared: dict[str, Path | None] = {}
+
+    @property
+    def available(self) -> bool:
+        """Whether cgroup v2 placement can be used."""
+        return (
+            self.root is not None
+            and (_CGROUP_MOUNT / "cgroup.controllers").exists()
+            and (self.root / "cgroup.procs").exists()
+            and os.access(self.root, os.W_OK)
+        )
+
+    def prepare(self, name: str, limits: ResourceLimits) -> Path | None:
+        """Create (once) and configure the subtree for a plugin.
+
+        Args:
+            name: Plugin name
+            limits: Limits to write into the controller files
+
+        Returns:
+            The cgroup directory, or None if unavailable
+        """
+        if name in self._prepared:
+            return self._prepared[name]
+
+        path: Path | None = None
+        if self.available:
+            candidate = self.root / f"mother-{name}"
+            try:
+                candidate.mkdir(exist_ok=True)
+                self._write(candidate, "memory.max", str(limits.max_memory_mb * 1024 * 1024))
+                self._write(candidate, "cpu.max", f"{limits.cgroup_cpu_quota_percent * 1000} 100000")
+                if limits.max_processes:
+                    self._write(candidate, "pids.max", str(limits.max_processes))
+                path = candidate
+                logger.info(f"Using cgroup {candidate} for plugin '{name}'")
+            except OSError as e:
+                logger.warning(f"Could not prepare cgroup for plugin '{name}': {e}")
+
+        self._prepared[name] = path
+        return path
+
+    @staticmethod
+    def _write(cgroup: Path, filename: str, value: str) -> None:
+        target = cgroup / filename
+        if target.exists():
+            target.write_text(value)
+
+
+_cgroup_managers: dict[str, CgroupManager] = {}
+
+
+def _cgroup_for(limits: ResourceLimits, name: str | None) -> Path | None:
+    if not name or not limits.cgroup_root:
+        return None
+    manager = _cgroup_managers.get(limits.cgroup_root)
+    if manager is None:
+        manager = _cgroup_managers[limits.cgroup_root] = CgroupManager(limits.cgroup_root)
+    return manager.prepare(name, limits)
+
+
+def _kill_group(pid: int) -> None:
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+class _OutputPump:
+    """Reads a child's stdout/stderr into StreamBuffers."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        kill_on_cap: bool,
+        on_output: OutputCallback | None,
+        kill: Callable[[], None],
+    ):
+        self.buffers = {"stdout": StreamBuffer(max_bytes), "stderr": StreamBuffer(max_bytes)}
+        self.max_bytes = max_bytes
+        self.kill_on_cap = kill_on_cap
+        self.on_output = on_output
+        self.capped = False
+        self._kill = kill
+
+    async def pump(self, name: str, reader: asyncio.StreamReader) -> None:
+        buffer = self.buffers[name]
+        while True:
+            chunk = await reader.read(_READ_CHUNK)
+            if not chunk:
+                return
+            buffer.write(chunk)
+            if self.on_output is not None:
+                await self._emit(name, chunk)
+            if self.kill_on_cap and not self.capped and buffer.total > self.max_bytes:
+                logger.warning(f"Killing child: {name} exceeded {self.max_bytes} bytes")
+                self.capped = True
+                self._kill()
+
+    async def _emit(self, name: str, chunk: bytes) -> None:
+        try:
+            result = self.on_output(name, chunk)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Output callback failed, disabling it: {e}")
+            self.on_output = None
+
+    def fill(self, outcome: ProcessOutcome) -> ProcessOutcome:
+        out, err = self.buffers["stdout"], self.buffers["stderr"]
+        outcome.stdout = out.getvalue()
+        outcome.stderr = err.getvalue()
+        outcome.stdout_bytes = out.total
+        outcome.stderr_bytes = err.total
+        outcome.truncated = out.truncated or err.truncated
+        outcome.output_capped = self.capped
+        return outcome
+
+
+async def _pipe_reader(pipe: Any) -> tuple[asyncio.StreamReader, asyncio.BaseTransport]:
+    """Wrap a Popen pipe in a StreamReader on the running loop."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=_READ_CHUNK, loop=loop)
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe)
+    return reader, transport
+
+
+async def run_process(
+    argv: Sequence[str],
+    *,
+    timeout: float,
+    cwd: str | None = None,
+    env: dict[str, str] | None = None,
+    limits: ResourceLimits | None = None,
+    name: str | None = None,
+    on_output: OutputCallback | None = None,
+) -> ProcessOutcome:
+    """Run a command under resource limits and collect its usage.
+
+    Args:
+        argv: Program and arguments
+        timeout: Wall-clock timeout in seconds; the process group is killed
+        cwd: Working directory
+        env: Environment (defaults to the server's)
+        limits: Caps to enforce (defaults to ResourceLimits())
+        name: Plugin name, used for the cgroup subtree
+        on_output: Called with ("stdout" | "stderr", chunk) as output
+            arrives; defaults to the callback set by stream_output()
+
+    Returns:
+        ProcessOutcome with bounded output, exit status and usage
+    """
+    limits = limits or ResourceLimits()
+    on_output = on_output or _live_output.get()
+    if resource is None or not hasattr(os, "wait4"):
+        return await _run_unlimited(argv, timeout=timeout, cwd=cwd, env=env, limits=limits, on_output=on_output)
+
+    cgroup = _cgroup_for(limits, name)
+
+    start = time.monotonic()
+    proc = subprocess.Popen(
+        _limited_argv(argv, limits, cgroup, cwd, env),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        env=env,
+        start_new_session=True,
+    )
+    # Reaped below with wait4 instead of the asyncio child watcher, which
+    # would discard the rusage.
+    reap = asyncio.ensure_future(_reap(proc.pid))
+    pump = _OutputPump(limits.max_output_bytes, limits.kill_on_output_cap, on_output, lambda: _kill_group(proc.pid))
+    (out_reader, out_transport), (err_reader, err_transport) = (
+        await _pipe_reader(proc.stdout),
+        await _pipe_reader(proc.stderr),
+    )
+    output = asyncio.gather(pump.pump("stdout", out_reader), pump.pump("stderr", err_reader))
+
+    timed_out = False
+    try:
+        await asyncio.wait_for(asyncio.shield(output), timeout=timeout)
+        _, status, usage = await asyncio.wait_for(
+            asyncio.shield(reap), timeout=max(0.0, timeout - (time.monotonic() - start))
+        )
+    except (TimeoutError, asyncio.CancelledError) as e:
+        _kill_group(proc.pid)
+        _, status, usage = await reap
+        await output
+        if isinstance(e, asyncio.CancelledError):
+            raise
+        timed_out = True
+    finally:
+        out_transport.close()
+        err_transport.close()
+
+    returncode = os.waitstatus_to_exitcode(status)
+    # Popen never saw the exit; record it so it does not try to reap again
+    proc.returncode = returncode
+
+    return pump.fill(
+        ProcessOutcome(
+            returncode=returncode,
+            stdout=b"",
+            stderr=b"",
+            wall_time=time.monotonic() - start,
+            timed_out=timed_out,
+            usage=ResourceUsage.from_rusage(usage),
+            cgroup=str(cgroup) if cgroup else None,
+        )
+    )
+
+
+async def _run_unlimited(
+    argv: Sequence[str],
+    *,
+    timeout: float,
+    cwd: str | None,
+    env: dict[str, str] | None,
+    limits: ResourceLimits,
+    on_output: OutputCallback | None,
+) -> ProcessOutcome:
+    """Fallback without rlimits or rusage; output is still bounded."""
+    start = time.monotonic()
+    process = await asyncio.create_subprocess_exec(
+        *argv,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        env=env,
+    )
+    pump = _OutputPump(limits.max_output_bytes, limits.kill_on_output_cap, on_output, process.kill)
+    output = asyncio.gather(pump.pump("stdout", process.stdout), pump.pump("stderr", process.stderr))
+    try:
+        await asyncio.wait_for(asyncio.shield(output), timeout=timeout)
+        await process.wait()
+        timed_out = False
+    except TimeoutError:
+        process.kill()
+        await output
+        await process.wait()
+        timed_out = True
+    return pump.fill(
+        ProcessOutcome(
+            returncode=process.returncode,
+            stdout=b"",
+            stderr=b"",
+            wall_time=time.monotonic() - start,
+            timed_out=timed_out,
+        )
+    )
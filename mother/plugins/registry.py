@@ -6,12 +6,16 @@ enabling efficient lookup and schema generation for Claude tool_use.
 
 from __future__ import annotations
 
+import json
 import logging
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any
 
 from .base import PluginInfo
 from .exceptions import CapabilityNotFoundError
+from .search import Embedder, SearchIndex
 
 if TYPE_CHECKING:
     from .executor import ExecutorBase
@@ -20,6 +24,15 @@ if TYPE_CHECKING:
 logger = logging.getLogger("mother.plugins.registry")
 
 
+def _freeze(value: Any) -> Any:
+    """Deep read-only copy of a JSON-like value: dicts become mapping proxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 @dataclass
 class CapabilityEntry:
     """Registry entry for a capability."""
@@ -30,11 +43,31 @@ class CapabilityEntry:
     spec: CapabilitySpec
     executor: ExecutorBase
     confirmation_required: bool = False
+    _schema: Mapping[str, Any] | None = field(default=None, init=False, repr=False, compare=False)
+    _schema_json: bytes | None = field(default=None, init=False, repr=False, compare=False)
+
+    def warm(self) -> None:
+        """Build and cache the schema and its JSON encoding."""
+        if self._schema is None:
+            schema = self.spec.to_anthropic_schema(self.plugin_name)
+            self._schema_json = json.dumps(schema, separators=(",", ":")).encode()
+            self._schema = _freeze(schema)
+
+    @property
+    def anthropic_schema(self) -> Mapping[str, Any]:
+        """Get the Anthropic tool_use schema for this capability.
+
+        Built once and shared by every caller, so it is deep-frozen: dicts
+        are read-only mappings and lists are tuples.
+        """
+        self.warm()
+        return self._schema
 
     @property
-    def anthropic_schema(self) -> dict[str, Any]:
-        """Get the Anthropic tool_use schema for this capability."""
-        return self.spec.to_anthropic_schema(self.plugin_name)
+    def anthropic_schema_json(self) -> bytes:
+        """Get the schema pre-serialized as compact JSON for API responses."""
+        self.warm()
+        return self._schema_json
 
 
 class PluginRegistry:
@@ -50,6 +83,13 @@ class PluginRegistry:
         self._manifests: dict[str, PluginManifest] = {}
         self._capabilities: dict[str, CapabilityEntry] = {}  # full_name -> entry
         self._plugin_capabilities: dict[str, list[str]] = {}  # plugin -> [full_names]
+        self._search_index = SearchIndex(
+            {"capability": 3.0, "full_name": 2.0, "description": 1.0, "plugin": 1.0},
+        )
+        # Bumped on every register/unregister; keys the schema caches below
+        self._version = 0
+        self._schemas: tuple[Mapping[str, Any], ...] | None = None
+        self._schemas_json: bytes | None = None
 
     def register(
         self,
@@ -81,12 +121,24 @@ class PluginRegistry:
                 executor=executor,
                 confirmation_required=cap_spec.confirmation_required,
             )
+            # Materialize schemas now rather than on every agent iteration
+            entry.warm()
 
             self._capabilities[full_name] = entry
             self._plugin_capabilities[plugin_name].append(full_name)
+            self._search_index.add(
+                full_name,
+                {
+                    "capability": cap_spec.name,
+                    "full_name": full_name,
+                    "description": cap_spec.description,
+                    "plugin": plugin_name,
+                },
+            )
 
             logger.debug(f"Registered capability: {full_name}")
 
+        self._invalidate_schemas()
         logger.info(f"Registered plugin '{plugin_name}' with {len(manifest.capabilities)} capabilities")
 
     def unregister(self, plugin_name: str) -> None:
@@ -101,14 +153,27 @@ class PluginRegistry:
         # Remove capabilities
         for full_name in self._plugin_capabilities.get(plugin_name, []):
             self._capabilities.pop(full_name, None)
+            self._search_index.remove(full_name)
 
         # Remove plugin
         self._plugins.pop(plugin_name, None)
         self._manifests.pop(plugin_name, None)
         self._plugin_capabilities.pop(plugin_name, None)
+        self._invalidate_schemas()
 
         logger.info(f"Unregistered plugin: {plugin_name}")
 
+    def _invalidate_schemas(self) -> None:
+        """Drop cached schema collections after the capability set changed."""
+        self._version += 1
+        self._schemas = None
+        self._schemas_json = None
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever the set of capabilities changes."""
+        return self._version
+
     def get_plugin(self, plugin_name: str) -> ExecutorBase | None:
         """Get a registered plugin's executor.
 
@@ -224,15 +289,31 @@ class PluginRegistry:
             return self._plugin_capabilities.get(plugin_name, []).copy()
         return list(self._capabilities.keys())
 
-    def get_all_anthropic_schemas(self) -> list[dict[str, Any]]:
+    def get_all_anthropic_schemas(self) -> tuple[Mapping[str, Any], ...]:
         """Get all capabilities as Anthropic tool_use schemas.
 
+        The tuple is cached until the next register/unregister and the
+        schemas are the entries' read-only mappings.
+
         Returns:
-            List of tool schemas for Claude
+            Tuple of tool schemas for Claude
         """
-        return [entry.anthropic_schema for entry in self._capabilities.values()]
+        if self._schemas is None:
+            self._schemas = tuple(entry.anthropic_schema for entry in self._capabilities.values())
+        return self._schemas
 
-    def get_plugin_schemas(self, plugin_name: str) -> list[dict[str, Any]]:
+    def get_all_anthropic_schemas_json(self) -> bytes:
+        """Get all schemas as a pre-serialized JSON array.
+
+        Returns:
+            UTF-8 JSON bytes, cached until the capability set changes
+        """
+        if self._schemas_json is None:
+            parts = [entry.anthropic_schema_json for entry in self._capabilities.values()]
+            self._schemas_json = b"[" + b",".join(parts) + b"]"
+        return self._schemas_json
+
+    def get_plugin_schemas(self, plugin_name: str) -> list[Mapping[str, Any]]:
         """Get schemas for a specific plugin's capabilities.
 
         Args:
@@ -264,43 +345,33 @@ class PluginRegistry:
         self,
         query: str,
         limit: int = 10,
+        semantic: bool = False,
     ) -> list[CapabilityEntry]:
         """Search capabilities by name or description.
 
+        Uses the inverted index maintained by register/unregister, so the
+        cost depends on the query terms rather than the number of
+        registered capabilities.
+
         Args:
             query: Search query
             limit: Maximum results to return
+            semantic: Re-rank with the embedder set via set_search_embedder()
 
         Returns:
-            List of matching CapabilityEntry objects
+            List of matching CapabilityEntry objects, best match first
         """
-        query_lower = query.lower()
-        matches = []
-
-        for entry in self._capabilities.values():
-            score = 0
+        hits = self._search_index.search(query, limit=limit, semantic=semantic)
+        return [self._capabilities[full_name] for full_name, _ in hits if full_name in self._capabilities]
 
-            # Check capability name
-            if query_lower in entry.capability_name.lower():
-                score += 10
-            if query_lower in entry.full_name.lower():
-                score += 5
+    def set_search_embedder(self, embedder: Embedder | None) -> None:
+        """Enable semantic re-ranking for search_capabilities.
 
-            # Check description
-            if query_lower in entry.spec.description.lower():
-                score += 3
-
-            # Check plugin name
-            if query_lower in entry.plugin_name.lower():
-                score += 2
-
-            if score > 0:
-                matches.append((score, entry))
-
-        # Sort by score descending
-        matches.sort(key=lambda x: x[0], reverse=True)
-
-        return [entry for _, entry in matches[:limit]]
+        Args:
+            embedder: Callable mapping text to a vector (e.g. the memory
+                system's ``EmbeddingGenerator.generate``), or None to disable
+        """
+        self._search_index.set_embedder(embedder)
 
     def __len__(self) -> int:
         """Get the number of registered capabilities."""
@@ -38,21 +38,54 @@ logger = logging.getLogger("mother.plugins.sandbox")
 class ResourceLimits(BaseModel):
     """Resource limits for sandboxed execution.
 
+    Child processes get a CPU time cap (twice the wall-clock timeout, so
+    only multi-threaded children spinning on several cores hit it) and an
+    open file cap by default. A value of 0 means the child inherits the
+    server's limit. Three caps stay opt-in (0 by default) because a fixed
+    default breaks ordinary work:
+
+    - ``max_address_space_mb``: JVM, Node and Go runtimes reserve far more
+      address space than they touch; memory is capped by the cgroup's
+      memory.max instead
+    - ``max_file_size_mb``: archives, disk images and dumps legitimately
+      exceed any fixed size
+    - ``max_processes``: RLIMIT_NPROC counts every process of the server's
+      user, not just the child's, so a default would fail forks on busy
+      hosts; the cgroup's pids.max is the per-plugin cap
+
     Attributes:
-        max_cpu_seconds: Maximum CPU time in seconds
-        max_memory_mb: Maximum memory usage in MB
+        max_cpu_seconds: CPU time cap (RLIMIT_CPU) in seconds, 0 for none
+        max_memory_mb: Maximum memory usage in MB (cgroup memory.max)
         max_execution_time: Maximum wall-clock time in seconds
-        max_file_size_mb: Maximum file size that can be written
-        max_open_files: Maximum number of open file descriptors
+        max_file_size_mb: File size cap (RLIMIT_FSIZE) in MB, 0 for none
+        max_open_files: Open file descriptor cap (RLIMIT_NOFILE), 0 for none
         max_subprocess: Maximum number of subprocess calls
+        max_address_space_mb: Virtual address space cap (RLIMIT_AS) for
+            child processes, 0 for none; keep it well above max_memory_mb
+            because runtimes reserve far more address space than they touch
+        max_processes: Process cap for child processes (RLIMIT_NPROC and
+            cgroup pids.max), 0 for none
+        nice_increment: Scheduling priority reduction for child processes
+        cgroup_root: Delegated cgroup v2 directory for per-plugin subtrees
+        cgroup_cpu_quota_percent: CPU share per plugin cgroup (100 = one core)
+        max_output_bytes: Output retained per stream (head and tail halves)
+        kill_on_output_cap: Kill the child once a stream exceeds
+            max_output_bytes instead of just eliding the middle
     """
 
-    max_cpu_seconds: int = Field(default=60, description="Max CPU time")
+    max_cpu_seconds: int = Field(default=600, description="Max CPU time (0 = no limit)")
     max_memory_mb: int = Field(default=512, description="Max memory in MB")
     max_execution_time: int = Field(default=300, description="Max wall-clock time")
-    max_file_size_mb: int = Field(default=100, description="Max file size in MB")
-    max_open_files: int = Field(default=100, description="Max open file descriptors")
+    max_file_size_mb: int = Field(default=0, description="Max file size in MB (0 = no limit)")
+    max_open_files: int = Field(default=4096, description="Max open file descriptors (0 = no limit)")
     max_subprocess: int = Field(default=10, description="Max subprocess calls")
+    max_address_space_mb: int = Field(default=0, description="Max child address space in MB (0 = no limit)")
+    max_processes: int = Field(default=0, description="Max child processes (0 = no limit)")
+    nice_increment: int = Field(default=5, description="Niceness added to child processes")
+    cgroup_root: str | None = Field(default=None, description="Delegated cgroup v2 root")
+    cgroup_cpu_quota_percent: int = Field(default=100, description="CPU quota per plugin cgroup")
+    max_output_bytes: int = Field(default=1024 * 1024, description="Output kept per stream in bytes")
+    kill_on_output_cap: bool = Field(default=False, description="Kill child when output exceeds the cap")
 
 
 class WorkspaceConfig(BaseModel):
@@ -230,7 +263,7 @@ class ExecutionContext:
             return f"Subprocess limit exceeded ({limits.max_subprocess} limit)"
 
         max_bytes = limits.max_file_size_mb * 1024 * 1024
-        if self.bytes_written > max_bytes:
+        if max_bytes and self.bytes_written > max_bytes:
             return f"File write size exceeded ({limits.max_file_size_mb}MB limit)"
 
         return None
@@ -0,0 +1,380 @@
+"""Inverted index for capability and catalog search.
+
+The registry and the tool catalog used to lowercase and substring-scan every
+entry on every query. This module keeps a small in-memory inverted index that
+is maintained incrementally as entries are added and removed, so a query only
+touches the postings of the terms it mentions.
+
+Ranking uses BM25 over weighted fields (a name match counts for more than a
+description match). Each query token is expanded to:
+
+- the exact stemmed term,
+- terms that start with it (typeahead: "sen" finds "send"),
+- terms that contain it, found through a trigram index ("mail" finds "email").
+
+An optional embedder (any ``text -> vector`` callable, e.g.
+``EmbeddingGenerator.generate`` from mother.memory) can re-rank the top
+lexical candidates by cosine similarity.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import logging
+import math
+import re
+from collections.abc import Callable, Iterable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("mother.plugins.search")
+
+Embedder = Callable[[str], Sequence[float] | None]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+# Expansion weights relative to an exact term hit
+_PREFIX_WEIGHT = 0.6
+_SUBSTRING_WEIGHT = 0.3
+# Cap on how many index terms a single query token may expand to
+_MAX_EXPANSIONS = 32
+# Bonus added when the query equals the primary field (e.g. exact tool name)
+_EXACT_BONUS = 5.0
+
+
+def stem(token: str) -> str:
+    """Reduce a lowercase token to a crude stem.
+
+    Deliberately light: the goal is that "emails"/"email",
+    "sending"/"send" and "deleted"/"delete" land on the same term, not
+    linguistic accuracy. The same function is applied to documents and
+    queries, so consistency matters more than correctness.
+    """
+    if len(token) <= 3 or token.isdigit():
+        return token
+
+    if token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith("sses"):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+
+    for suffix in ("ing", "ed"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+            token = token[: -len(suffix)]
+            # "embedding" -> "embedd" -> "embed"
+            if len(token) > 4 and token[-1] == token[-2] and token[-1] not in "lsz":
+                token = token[:-1]
+            break
+
+    if token.endswith("e") and len(token) > 4:
+        token = token[:-1]
+
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase, stemmed tokens.
+
+    Splits on anything that is not a letter or digit (so ``send_message``,
+    ``send-message`` and ``sendMessage`` all yield ``send``, ``messag``).
+    """
+    if not text:
+        return []
+    text = _CAMEL_RE.sub(" ", text).lower()
+    return [stem(t) for t in _TOKEN_RE.findall(text)]
+
+
+def _trigrams(term: str) -> set[str]:
+    return {term[i : i + 3] for i in range(len(term) - 2)}
+
+
+class SearchIndex:
+    """Incrementally maintained BM25 index over weighted text fields.
+
+    Documents are identified by a string key and consist of named fields.
+    Field weights are fixed at construction; the first field is treated as
+    the primary one for the exact-match bonus.
+
+    Example:
+        index = SearchIndex({"name": 3.0, "description": 1.0})
+        index.add("email_send", {"name": "send", "description": "Send an email"})
+        index.search("mail")  # -> [("email_send", 0.87)]
+    """
+
+    def __init__(
+        self,
+        field_weights: dict[str, float],
+        k1: float = 1.2,
+        b: float = 0.75,
+        embedder: Embedder | None = None,
+    ):
+        """Initialize the index.
+
+        Args:
+            field_weights: Mapping of field name to weight
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            embedder: Optional callable used for semantic re-ranking
+        """
+        if not field_weights:
+            raise ValueError("SearchIndex requires at least one field")
+        self._weights = dict(field_weights)
+        self._primary = next(iter(field_weights))
+        self._k1 = k1
+        self._b = b
+        self._embedder = embedder
+        self._reset()
+
+    def _reset(self) -> None:
+        self._postings: dict[str, dict[str, float]] = {}  # term -> {doc: weighted tf}
+        self._doc_terms: dict[str, tuple[str, ...]] = {}  # doc -> distinct terms
+        self._doc_len: dict[str, float] = {}
+        self._doc_text: dict[str, str] = {}  # for embeddings
+        self._primary_text: dict[str, str] = {}
+        self._total_len = 0.0
+        self._order: dict[str, int] = {}  # insertion order, stable tie-break
+        self._seq = 0
+
+        self._trigram_index: dict[str, set[str]] = {}
+        self._sorted_terms: list[str] = []
+        self._terms_dirty = False
+
+        self._vectors: dict[str, np.ndarray | None] = {}
+        # term -> {doc: bm25 contribution}; depends on corpus stats, so any
+        # add/remove drops it wholesale
+        self._score_cache: dict[str, dict[str, float]] = {}
+
+    # -- maintenance ---------------------------------------------------------
+
+    def add(self, doc_id: str, fields: dict[str, str | Iterable[str] | None]) -> None:
+        """Add or replace a document.
+
+        Args:
+            doc_id: Document key
+            fields: Field name -> text (or iterable of strings, e.g. tags)
+        """
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+        self._score_cache.clear()
+
+        tf: dict[str, float] = {}
+        length = 0.0
+        parts: list[str] = []
+        for name, value in fields.items():
+            weight = self._weights.get(name)
+            if weight is None or not value:
+                continue
+            text = value if isinstance(value, str) else " ".join(value)
+            parts.append(text)
+            tokens = tokenize(text)
+            length += weight * len(tokens)
+            for token in tokens:
+                tf[token] = tf.get(token, 0.0) + weight
+
+        for term, freq in tf.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                for gram in _trigrams(term):
+                    self._trigram_index.setdefault(gram, set()).add(term)
+                self._terms_dirty = True
+            postings[doc_id] = freq
+
+        primary = fields.get(self._primary) or ""
+        self._doc_terms[doc_id] = tuple(tf)
+        self._doc_len[doc_id] = length
+        self._doc_text[doc_id] = " ".join(parts)
+        self._primary_text[doc_id] = (primary if isinstance(primary, str) else " ".join(primary)).lower()
+        self._total_len += length
+        self._order[doc_id] = self._seq
+        self._seq += 1
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document if present."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._score_cache.clear()
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                for gram in _trigrams(term):
+                    bucket = self._trigram_index.get(gram)
+                    if bucket is not None:
+                        bucket.discard(term)
+                        if not bucket:
+                            del self._trigram_index[gram]
+                self._terms_dirty = True
+
+        self._total_len -= self._doc_len.pop(doc_id, 0.0)
+        self._doc_text.pop(doc_id, None)
+        self._primary_text.pop(doc_id, None)
+        self._order.pop(doc_id, None)
+        self._vectors.pop(doc_id, None)
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        self._reset()
+
+    def set_embedder(self, embedder: Embedder | None) -> None:
+        """Set (or clear) the embedder used for semantic re-ranking."""
+        self._embedder = embedder
+        self._vectors.clear()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    # -- query ---------------------------------------------------------------
+
+    def _expand(self, token: str) -> dict[str, float]:
+        """Map a query token to index terms with their expansion weight."""
+        expanded: dict[str, float] = {}
+        if token in self._postings:
+            expanded[token] = 1.0
+
+        if self._terms_dirty:
+            self._sorted_terms = sorted(self._postings)
+            self._terms_dirty = False
+
+        terms = self._sorted_terms
+        i = bisect.bisect_left(terms, token)
+        while i < len(terms) and terms[i].startswith(token) and len(expanded) < _MAX_EXPANSIONS:
+            expanded.setdefault(terms[i], _PREFIX_WEIGHT)
+            i += 1
+
+        if len(token) >= 3 and len(expanded) < _MAX_EXPANSIONS:
+            buckets = [self._trigram_index.get(g) for g in _trigrams(token)]
+            if all(buckets):
+                candidates = set.intersection(*buckets)  # type: ignore[arg-type]
+                for term in sorted(candidates):
+                    if len(expanded) >= _MAX_EXPANSIONS:
+                        break
+                    if token in term:
+                        expanded.setdefault(term, _SUBSTRING_WEIGHT)
+
+        return expanded
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = 10,
+        semantic: bool = False,
+        rerank_depth: int = 50,
+    ) -> list[tuple[str, float]]:
+        """Search the index.
+
+        Args:
+            query: Free-text query
+            limit: Maximum results (None for all matches)
+            semantic: Re-rank lexical candidates with the embedder, if set
+            rerank_depth: How many lexical candidates to re-rank
+
+        Returns:
+            List of (doc_id, score) sorted by descending score
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        scores: dict[str, float] = {}
+        for token in tokens:
+            expanded = self._expand(token)
+            if len(expanded) == 1:
+                # Common case: no need to take a per-document max
+                ((term, weight),) = expanded.items()
+                for doc_id, score in self._term_scores(term).items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * score
+                continue
+            token_scores: dict[str, float] = {}
+            for term, weight in expanded.items():
+                for doc_id, score in self._term_scores(term).items():
+                    score *= weight
+                    if score > token_scores.get(doc_id, 0.0):
+                        token_scores[doc_id] = score
+            for doc_id, score in token_scores.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+        if not scores:
+            return []
+
+        query_lower = query.strip().lower()
+        for doc_id in scores:
+            if self._primary_text[doc_id] == query_lower:
+                scores[doc_id] += _EXACT_BONUS
+
+        order = self._order
+        if semantic and self._embedder is not None:
+            depth = max(rerank_depth, limit or 0)
+            top = heapq.nsmallest(depth, scores.items(), key=lambda kv: (-kv[1], order[kv[0]]))
+            ranked = self._rerank(query, top)
+        elif limit is None:
+            ranked = sorted(scores.items(), key=lambda kv: (-kv[1], order[kv[0]]))
+        else:
+            ranked = heapq.nsmallest(limit, scores.items(), key=lambda kv: (-kv[1], order[kv[0]]))
+
+        return ranked if limit is None else ranked[:limit]
+
+    def _term_scores(self, term: str) -> dict[str, float]:
+        """BM25 contribution of ``term`` for every document containing it."""
+        cached = self._score_cache.get(term)
+        if cached is not None:
+            return cached
+
+        postings = self._postings[term]
+        n_docs = len(self._doc_terms)
+        avgdl = self._total_len / n_docs if n_docs else 0.0
+        k1, b = self._k1, self._b
+        idf = math.log(1.0 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+        doc_len = self._doc_len
+
+        scores = {}
+        for doc_id, tf in postings.items():
+            norm = k1 * (1.0 - b + b * doc_len[doc_id] / avgdl) if avgdl else k1
+            scores[doc_id] = idf * tf * (k1 + 1.0) / (tf + norm)
+        self._score_cache[term] = scores
+        return scores
+
+    def _vector(self, doc_id: str) -> np.ndarray | None:
+        if doc_id not in self._vectors:
+            self._vectors[doc_id] = self._embed(self._doc_text[doc_id])
+        return self._vectors[doc_id]
+
+    def _embed(self, text: str) -> np.ndarray | None:
+        try:
+            raw = self._embedder(text) if self._embedder else None
+        except Exception as e:
+            logger.warning(f"Embedding failed during search re-rank: {e}")
+            return None
+        if raw is None:
+            return None
+        vec = np.asarray(raw, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else None
+
+    def _rerank(self, query: str, candidates: list[tuple[str, float]]) -> list[tuple[str, float]]:
+        """Blend normalized lexical scores with cosine similarity."""
+        query_vec = self._embed(query)
+        if query_vec is None or not candidates:
+            return candidates
+
+        best = candidates[0][1] or 1.0
+        blended = []
+        for doc_id, score in candidates:
+            vec = self._vector(doc_id)
+            cosine = float(np.dot(query_vec, vec)) if vec is not None and vec.shape == query_vec.shape else 0.0
+            blended.append((doc_id, 0.5 * (score / best) + 0.5 * max(cosine, 0.0)))
+
+        blended.sort(key=lambda kv: (-kv[1], self._order[kv[0]]))
+        return blended
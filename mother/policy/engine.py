@@ -11,6 +11,7 @@ import logging
 import re
 from typing import Any
 
+from ..tracing import traced
 from .conditions import (
     evaluate_command_condition,
     evaluate_data_condition,
@@ -69,6 +70,7 @@ class PolicyEngine:
         self._capability_rules_cache.clear()
         logger.info(f"Policy reloaded: {self.config.name}")
 
+    @traced("policy.evaluate")
     def evaluate(
         self,
         capability_name: str,
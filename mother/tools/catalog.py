@@ -14,6 +14,7 @@ from typing import Any
 
 import yaml
 
+from ..plugins.search import SearchIndex
 from .exceptions import CatalogError
 
 logger = logging.getLogger("mother.tools.catalog")
@@ -94,6 +95,11 @@ class ToolCatalog:
         self._entries: dict[str, CatalogEntry] = {}
         self._loaded = False
         self._version: str = "unknown"
+        self._index = self._new_index()
+
+    @staticmethod
+    def _new_index() -> SearchIndex:
+        return SearchIndex({"name": 4.0, "description": 1.0, "tags": 1.5, "author": 0.5})
 
     @property
     def catalog_path(self) -> Path:
@@ -105,6 +111,7 @@ class ToolCatalog:
         if not self._catalog_path.exists():
             logger.warning(f"Catalog file not found: {self._catalog_path}")
             self._entries = {}
+            self._index = self._new_index()
             self._loaded = True
             return
 
@@ -119,10 +126,20 @@ class ToolCatalog:
             tools_data = data.get("tools", [])
 
             self._entries = {}
+            self._index = self._new_index()
             for tool_data in tools_data:
                 try:
                     entry = CatalogEntry.from_dict(tool_data)
                     self._entries[entry.name] = entry
+                    self._index.add(
+                        entry.name,
+                        {
+                            "name": entry.name,
+                            "description": entry.description,
+                            "tags": entry.tags,
+                            "author": entry.author,
+                        },
+                    )
                 except Exception as e:
                     logger.warning(f"Failed to parse catalog entry: {e}")
 
@@ -177,7 +194,8 @@ class ToolCatalog:
     def search(self, query: str, include_deprecated: bool = False) -> list[CatalogEntry]:
         """Search the catalog by query.
 
-        Searches tool names, descriptions, and tags.
+        Searches tool names, descriptions, tags, and authors through an
+        inverted index built at load time.
 
         Args:
             query: Search query
@@ -187,41 +205,13 @@ class ToolCatalog:
             List of matching entries, sorted by relevance
         """
         self._ensure_loaded()
-        query_lower = query.lower()
-        matches = []
-
-        for entry in self._entries.values():
+        results = []
+        for name, _ in self._index.search(query, limit=None):
+            entry = self._entries[name]
             if entry.deprecated and not include_deprecated:
                 continue
-
-            score = 0
-
-            # Name match (highest priority)
-            if query_lower in entry.name.lower():
-                score += 10
-                if entry.name.lower() == query_lower:
-                    score += 5  # Exact match bonus
-
-            # Description match
-            if query_lower in entry.description.lower():
-                score += 3
-
-            # Tag match
-            for tag in entry.tags:
-                if query_lower in tag.lower():
-                    score += 2
-                    break
-
-            # Author match
-            if entry.author and query_lower in entry.author.lower():
-                score += 1
-
-            if score > 0:
-                matches.append((score, entry))
-
-        # Sort by score descending
-        matches.sort(key=lambda x: x[0], reverse=True)
-        return [entry for _, entry in matches]
+            results.append(entry)
+        return results
 
     def list_by_risk(self, risk_level: str) -> list[CatalogEntry]:
         """List tools by risk level.
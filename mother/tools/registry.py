@@ -12,6 +12,7 @@ All tool functionality is now provided by plugins in mother.plugins.builtin:
 """
 
 import logging
+from collections.abc import Iterable, Mapping
 from typing import Any, Optional
 
 from ..config.settings import Settings
@@ -96,20 +97,85 @@ class ToolRegistry:
         """
         return self.wrappers.get(name)
 
-    def get_all_anthropic_schemas(self) -> list[dict]:
+    def get_all_anthropic_schemas(self) -> tuple[Mapping[str, Any], ...]:
         """Get all tool schemas in Anthropic format.
 
-        Returns schemas from all registered plugins.
+        Returns the plugin registry's cached tuple of shared, read-only
+        schemas.
         """
-        schemas = []
+        if self._plugin_manager is None:
+            return ()
+        return self._plugin_manager.get_all_schemas()
 
-        # Plugin schemas
-        if self._plugin_manager is not None:
-            for schema in self._plugin_manager.get_all_schemas():
-                schemas.append(schema)
+    def get_all_anthropic_schemas_json(self) -> bytes:
+        """Get all tool schemas as a pre-serialized JSON array."""
+        if self._plugin_manager is None:
+            return b"[]"
+        return self._plugin_manager.registry.get_all_anthropic_schemas_json()
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever plugins are registered or removed."""
+        if self._plugin_manager is None:
+            return 0
+        return self._plugin_manager.registry.version
+
+    def get_schemas(self, names: Iterable[str]) -> list[Mapping[str, Any]]:
+        """Get Anthropic schemas for specific capabilities.
+
+        Unknown names are skipped.
+
+        Args:
+            names: Full capability names
+
+        Returns:
+            Schemas in the order given
+        """
+        if self._plugin_manager is None:
+            return []
 
+        schemas = []
+        for name in names:
+            entry = self._plugin_manager.get_capability(name)
+            if entry is not None:
+                schemas.append(entry.anthropic_schema)
         return schemas
 
+    def get_schemas_json(self, names: Iterable[str]) -> bytes:
+        """Get schemas for specific capabilities as a pre-serialized JSON array.
+
+        Unknown names are skipped, as in :meth:`get_schemas`.
+        """
+        if self._plugin_manager is None:
+            return b"[]"
+
+        parts = []
+        for name in names:
+            entry = self._plugin_manager.get_capability(name)
+            if entry is not None:
+                parts.append(entry.anthropic_schema_json)
+        return b"[" + b",".join(parts) + b"]"
+
+    def list_capability_names(self) -> list[str]:
+        """List the full names of all registered plugin capabilities."""
+        if self._plugin_manager is None:
+            return []
+        return self._plugin_manager.list_capabilities()
+
+    def search_capabilities(self, query: str, limit: int = 10) -> list[str]:
+        """Search plugin capabilities by name or description.
+
+        Args:
+            query: Search query
+            limit: Maximum results
+
+        Returns:
+            Full capability names, best match first
+        """
+        if self._plugin_manager is None:
+            return []
+        return [entry.full_name for entry in self._plugin_manager.search_capabilities(query, limit)]
+
     def list_tools(self) -> dict[str, dict]:
         """List all available tools with their info."""
         result = {}
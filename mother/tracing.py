@@ -0,0 +1,406 @@
+"""Lightweight span tracing for the request hot path.
+
+A trace covers one agent request; spans inside it time the LLM calls,
+memory recall, embeddings, policy evaluation, schema validation, plugin
+execution, session saves and audit writes. The current trace and span are
+kept in context variables, so spans opened in asyncio tasks and helper
+functions nest under the request that started them without being passed
+around.
+
+Tracing is off by default. When off, or when a request is not sampled,
+:func:`span` is a single context variable lookup returning a shared no-op
+context manager. Finished traces are:
+
+- returned to the caller as a per-span-name latency breakdown
+  (:meth:`Trace.timings`),
+- aggregated into per-span-name latency histograms (:func:`histograms`),
+- optionally appended to a file as OpenTelemetry (OTLP/JSON) lines by a
+  background thread, so the request never waits on disk I/O.
+
+Usage::
+
+    tracing.configure(enabled=True, sample_rate=0.1, export_path="traces.jsonl")
+
+    with tracing.start_trace("agent.process_command") as trace:
+        with tracing.span("llm.create_message", model="..."):
+            ...
+    trace.timings()  # None when the request was not sampled
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger("mother.tracing")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+HISTOGRAM_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+SERVICE_NAME = "mother"
+
+# Finished traces waiting for the export thread; more are dropped
+EXPORT_QUEUE_SIZE = 1000
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed operation inside a trace."""
+
+    name: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+@dataclass
+class Trace:
+    """The spans recorded for one request."""
+
+    name: str
+    trace_id: str = field(default_factory=lambda: os.urandom(16).hex())
+    spans: list[Span] = field(default_factory=list)
+    # Wall clock at start; span times are monotonic and offset from it
+    wall_start_ns: int = field(default_factory=time.time_ns)
+    start_ns: int = field(default_factory=time.perf_counter_ns)
+
+    @property
+    def root(self) -> Span | None:
+        return self.spans[0] if self.spans else None
+
+    def timings(self) -> dict[str, Any]:
+        """Latency breakdown: total ms, plus count and ms per span name.
+
+        Nested spans are counted in their own name and in their parent's,
+        so the per-name totals do not add up to ``total_ms``.
+        """
+        spans: dict[str, dict[str, Any]] = {}
+        for item in self.spans[1:]:
+            entry = spans.setdefault(item.name, {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += item.duration_ms
+        for entry in spans.values():
+            entry["total_ms"] = round(entry["total_ms"], 3)
+        root = self.root
+        if root is None:
+            total_ms = 0.0
+        else:
+            # A trace read from inside a nested entry point is still open
+            total_ms = ((root.end_ns or time.perf_counter_ns()) - root.start_ns) / 1e6
+        return {"trace_id": self.trace_id, "total_ms": round(total_ms, 3), "spans": spans}
+
+    def to_otlp(self) -> dict[str, Any]:
+        """The trace in OpenTelemetry's OTLP/JSON encoding."""
+        offset = self.wall_start_ns - self.start_ns
+        spans = []
+        for item in self.spans:
+            otlp: dict[str, Any] = {
+                "traceId": self.trace_id,
+                "spanId": item.span_id,
+                "name": item.name,
+                "kind": 1,
+                "startTimeUnixNano": str(item.start_ns + offset),
+                "endTimeUnixNano": str(item.end_ns + offset),
+                "attributes": [_otlp_attribute(key, value) for key, value in item.attributes.items()],
+                "status": {"code": 2, "message": item.error} if item.error else {"code": 1},
+            }
+            if item.parent_id:
+                otlp["parentSpanId"] = item.parent_id
+            spans.append(otlp)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                    "scopeSpans": [{"scope": {"name": "mother.tracing"}, "spans": spans}],
+                }
+            ]
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class LatencyHistogram:
+    """Bucketed latency distribution of one span name."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect_left(HISTOGRAM_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+
+    def snapshot(self) -> dict[str, Any]:
+        """Count, sum and per-bucket counts (keyed by upper bound in ms)."""
+        buckets = {str(bound): n for bound, n in zip(HISTOGRAM_BUCKETS_MS, self.counts, strict=False)}
+        buckets["+Inf"] = self.counts[-1]
+        return {"count": self.count, "sum_ms": round(self.sum_ms, 3), "buckets": buckets}
+
+
+class _Exporter:
+    """Appends OTLP/JSON lines to the export file from a background thread."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[tuple[Path, dict[str, Any]]] = queue.Queue(EXPORT_QUEUE_SIZE)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: Path, otlp: dict[str, Any]) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="mother-trace-export", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait((path, otlp))
+        except queue.Full:
+            logger.warning("Trace export is falling behind, dropping a trace")
+
+    def flush(self) -> None:
+        """Wait until every submitted trace has been written."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines: dict[Path, list[str]] = {}
+            for path, otlp in batch:
+                lines.setdefault(path, []).append(json.dumps(otlp, separators=(",", ":")) + "\n")
+            for path, chunk in lines.items():
+                try:
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.writelines(chunk)
+                except OSError as e:
+                    logger.warning(f"Failed to export {len(chunk)} trace(s): {e}")
+            for _ in batch:
+                self._queue.task_done()
+
+
+class _Tracer:
+    """Process-wide tracing configuration and aggregates."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.export_path: Path | None = None
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._exporter = _Exporter()
+
+    def sampled(self, force: bool) -> bool:
+        if not self.enabled:
+            return False
+        return force or self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def record(self, trace: Trace) -> None:
+        with self._lock:
+            for item in trace.spans:
+                if not item.end_ns:
+                    continue  # still running in a task that outlived the request
+                histogram = self.histograms.get(item.name)
+                if histogram is None:
+                    histogram = self.histograms[item.name] = LatencyHistogram()
+                histogram.observe(item.duration_ms)
+        export_path = self.export_path
+        if export_path is not None:
+            self._exporter.submit(export_path, trace.to_otlp())
+
+
+_tracer = _Tracer()
+atexit.register(_tracer._exporter.flush)
+_current_trace: ContextVar[Trace | None] = ContextVar("mother_trace", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("mother_span", default=None)
+
+
+def configure(
+    enabled: bool = True,
+    sample_rate: float = 1.0,
+    export_path: str | Path | None = None,
+) -> None:
+    """Configure tracing for the process.
+
+    Args:
+        enabled: Trace requests at all (forced traces included)
+        sample_rate: Fraction of requests traced, 0.0 to 1.0
+        export_path: File that finished traces are appended to as OTLP/JSON
+            lines (no export when None)
+    """
+    _tracer.enabled = enabled
+    _tracer.sample_rate = min(max(sample_rate, 0.0), 1.0)
+    _tracer.export_path = Path(export_path).expanduser() if export_path else None
+    if _tracer.export_path is not None:
+        _tracer.export_path.parent.mkdir(parents=True, exist_ok=True)
+
+
+def is_enabled() -> bool:
+    return _tracer.enabled
+
+
+def histograms() -> dict[str, dict[str, Any]]:
+    """Latency histograms of every span name recorded so far."""
+    with _tracer._lock:
+        return {name: histogram.snapshot() for name, histogram in sorted(_tracer.histograms.items())}
+
+
+def flush() -> None:
+    """Wait until finished traces have been written to the export file."""
+    _tracer._exporter.flush()
+
+
+def reset_histograms() -> None:
+    with _tracer._lock:
+        _tracer.histograms.clear()
+
+
+def current_trace() -> Trace | None:
+    """The trace of the running request, if it is being traced."""
+    return _current_trace.get()
+
+
+class _SpanContext:
+    __slots__ = ("_trace", "_span", "_token")
+
+    def __init__(self, trace: Trace, name: str, attributes: dict[str, Any]):
+        parent = _current_span.get()
+        self._trace = trace
+        self._span = Span(
+            name=name,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            start_ns=0,
+            attributes=attributes,
+        )
+
+    def __enter__(self) -> Span:
+        self._trace.spans.append(self._span)
+        self._token = _current_span.set(self._span)
+        self._span.start_ns = time.perf_counter_ns()
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._span.end_ns = time.perf_counter_ns()
+        if exc is not None:
+            self._span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attributes: Any) -> _SpanContext | _NoopSpan:
+    """Time a block as a span of the current trace (a no-op outside one)."""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP
+    return _SpanContext(trace, name, attributes)
+
+
+@contextmanager
+def start_trace(name: str, force: bool = False, **attributes: Any) -> Iterator[Trace | None]:
+    """Trace a request, subject to sampling.
+
+    Yields the new trace, or None when the request is not sampled. Inside
+    an already traced request this opens a span and yields the outer
+    trace instead, so nested entry points do not start their own.
+
+    Args:
+        name: Name of the root span
+        force: Trace even if the request is not sampled (e.g. the client
+            asked for timings); ignored while tracing is disabled
+        attributes: Attributes of the root span
+    """
+    outer = _current_trace.get()
+    if outer is not None:
+        with _SpanContext(outer, name, attributes):
+            yield outer
+        return
+    if not _tracer.sampled(force):
+        yield None
+        return
+
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    try:
+        with _SpanContext(trace, name, attributes):
+            yield trace
+    finally:
+        _current_trace.reset(token)
+        _tracer.record(trace)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator running a function (sync or async) inside a span."""
+
+    def decorate(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                trace = _current_trace.get()
+                if trace is None:
+                    return await func(*args, **kwargs)
+                with _SpanContext(trace, name, {}):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with _SpanContext(trace, name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
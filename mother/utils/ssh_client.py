@@ -2,13 +2,25 @@
 
 This module provides reusable SSH connection management, file operations,
 and VM configuration loading for accessing remote virtual machines.
+
+Each VM gets one SSH transport; commands open their own exec channel on it,
+so several commands can run on a VM concurrently without extra handshakes.
+Liveness is checked with transport keepalives instead of a probe command,
+and ``SSHConnectionPool.run`` executes the blocking paramiko calls in a
+bounded thread pool so async callers never stall the event loop.
 """
 
+import asyncio
 import logging
+import select
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 import paramiko
 import yaml
@@ -16,6 +28,19 @@ from scp import SCPClient
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Concurrent exec channels per transport; OpenSSH's MaxSessions defaults to 10
+DEFAULT_MAX_CHANNELS = 8
+
+# Seconds between transport keepalive packets
+DEFAULT_KEEPALIVE_INTERVAL = 30
+
+_RECV_CHUNK = 32 * 1024
+
+# Errors after which a transport cannot be trusted any more
+CONNECTION_ERRORS: tuple[type[BaseException], ...] = (paramiko.SSHException, EOFError, ConnectionError)
+
 
 @dataclass
 class CommandResult:
@@ -98,61 +123,90 @@ class SSHConnection:
     Handles connection pooling and automatic reconnection.
     """
 
-    def __init__(self, config: VMConfig):
+    def __init__(
+        self,
+        config: VMConfig,
+        max_channels: int = DEFAULT_MAX_CHANNELS,
+        keepalive_interval: int = DEFAULT_KEEPALIVE_INTERVAL,
+    ):
         """Initialize SSH connection.
 
         Args:
             config: VM configuration
+            max_channels: Commands allowed to run concurrently on the transport
+            keepalive_interval: Seconds between keepalive packets (0 disables)
         """
         self.config = config
+        self.keepalive_interval = keepalive_interval
         self._client: paramiko.SSHClient | None = None
         self._connected = False
+        self._connect_lock = threading.Lock()
+        self._channel_slots = threading.BoundedSemaphore(max_channels)
+
+    def is_alive(self) -> bool:
+        """Check the transport without running a remote command.
+
+        Sends an SSH_MSG_IGNORE packet, which fails fast on a dead socket.
+        """
+        transport = self._client.get_transport() if self._client else None
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+            return True
+        except Exception:
+            return False
 
     def connect(self) -> None:
         """Establish SSH connection to the VM.
 
+        Does nothing if the existing transport is still alive. Safe to call
+        from several threads; only one of them connects.
+
         Raises:
             paramiko.SSHException: If connection fails
             FileNotFoundError: If SSH key file not found
         """
-        if self._connected and self._client:
-            # Test if connection is still alive
-            try:
-                self._client.exec_command("echo test", timeout=5)
-                return  # Connection still alive
-            except Exception:
+        with self._connect_lock:
+            if self._connected and self._client:
+                if self.is_alive():
+                    return
                 # Connection dead, reconnect
+                logger.info(f"SSH transport to '{self.config.name}' is dead, reconnecting")
+                self._client.close()
                 self._connected = False
                 self._client = None
 
-        # Create new connection
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            # Create new connection
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
-        # Resolve SSH key path
-        ssh_key_path = self.config.ssh_key_path.expanduser()
+            # Resolve SSH key path
+            ssh_key_path = self.config.ssh_key_path.expanduser()
 
-        if not ssh_key_path.exists():
-            raise FileNotFoundError(f"SSH key not found: {ssh_key_path}")
+            if not ssh_key_path.exists():
+                raise FileNotFoundError(f"SSH key not found: {ssh_key_path}")
 
-        try:
-            # Try connecting using ssh-agent first (for passphrase-protected keys)
-            client.connect(
-                hostname=self.config.host,
-                port=self.config.port,
-                username=self.config.user,
-                key_filename=str(ssh_key_path),
-                timeout=10,
-                look_for_keys=True,  # Use ssh-agent if available
-                allow_agent=True,
-            )
-            self._client = client
-            self._connected = True
-            logger.info(f"Connected to VM '{self.config.name}' at {self.config.host}")
+            try:
+                # Try connecting using ssh-agent first (for passphrase-protected keys)
+                client.connect(
+                    hostname=self.config.host,
+                    port=self.config.port,
+                    username=self.config.user,
+                    key_filename=str(ssh_key_path),
+                    timeout=10,
+                    look_for_keys=True,  # Use ssh-agent if available
+                    allow_agent=True,
+                )
+                if self.keepalive_interval:
+                    client.get_transport().set_keepalive(self.keepalive_interval)
+                self._client = client
+                self._connected = True
+                logger.info(f"Connected to VM '{self.config.name}' at {self.config.host}")
 
-        except Exception as e:
-            logger.error(f"Failed to connect to {self.config.name}: {e}")
-            raise
+            except Exception as e:
+                logger.error(f"Failed to connect to {self.config.name}: {e}")
+                raise
 
     def disconnect(self) -> None:
         """Close SSH connection."""
@@ -165,6 +219,9 @@ class SSHConnection:
     def run_command(self, command: str, timeout: int = 30) -> CommandResult:
         """Execute a command on the remote VM.
 
+        Opens a new channel on the shared transport, so calls from several
+        threads run concurrently (up to ``max_channels``).
+
         Args:
             command: Command to execute
             timeout: Command timeout in seconds
@@ -174,30 +231,57 @@ class SSHConnection:
 
         Raises:
             RuntimeError: If not connected
+            TimeoutError: If the command does not finish within timeout
             paramiko.SSHException: If command execution fails
         """
         if not self._connected or not self._client:
             raise RuntimeError(f"Not connected to VM '{self.config.name}'")
 
-        try:
-            stdin, stdout, stderr = self._client.exec_command(command, timeout=timeout)
-            exit_code = stdout.channel.recv_exit_status()
-
-            result = CommandResult(
-                stdout=stdout.read().decode("utf-8", errors="replace"),
-                stderr=stderr.read().decode("utf-8", errors="replace"),
-                exit_code=exit_code,
-                success=exit_code == 0,
-            )
+        with self._channel_slots:
+            try:
+                channel = self._client.get_transport().open_session(timeout=timeout)
+                try:
+                    channel.exec_command(command)
+                    stdout, stderr = self._collect(channel, timeout)
+                    exit_code = channel.recv_exit_status()
+                finally:
+                    channel.close()
+
+                result = CommandResult(
+                    stdout=stdout.decode("utf-8", errors="replace"),
+                    stderr=stderr.decode("utf-8", errors="replace"),
+                    exit_code=exit_code,
+                    success=exit_code == 0,
+                )
 
-            logger.debug(
-                f"Command on {self.config.name}: {command[:50]}... -> exit_code={exit_code}"
-            )
-            return result
+                logger.debug(f"Command on {self.config.name}: {command[:50]}... -> exit_code={exit_code}")
+                return result
 
-        except Exception as e:
-            logger.error(f"Command execution failed on {self.config.name}: {e}")
-            raise
+            except Exception as e:
+                logger.error(f"Command execution failed on {self.config.name}: {e}")
+                raise
+
+    def _collect(self, channel: paramiko.Channel, timeout: float) -> tuple[bytes, bytes]:
+        """Read stdout and stderr until the command exits.
+
+        Both streams are drained together so a command that fills the
+        stderr window cannot stall while stdout is being read.
+        """
+        deadline = time.monotonic() + timeout
+        stdout, stderr = bytearray(), bytearray()
+        while True:
+            while channel.recv_ready():
+                stdout += channel.recv(_RECV_CHUNK)
+            while channel.recv_stderr_ready():
+                stderr += channel.recv_stderr(_RECV_CHUNK)
+            if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                return bytes(stdout), bytes(stderr)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Command timed out after {timeout}s on '{self.config.name}'")
+            # The channel becomes readable on stdout data and on EOF; the
+            # short cap also catches stderr data and the exit status
+            select.select([channel], [], [], min(remaining, 0.1))
 
     def read_file(self, remote_path: str, max_size: int = 1024 * 1024) -> str:
         """Read a file from the remote VM.
@@ -229,9 +313,7 @@ class SSHConnection:
             raise FileNotFoundError(f"File not found: {remote_path}")
 
         if file_size > max_size:
-            raise RuntimeError(
-                f"File too large: {file_size} bytes (max: {max_size} bytes)"
-            )
+            raise RuntimeError(f"File too large: {file_size} bytes (max: {max_size} bytes)")
 
         # Read file content
         cat_cmd = f"cat '{remote_path}'"
@@ -495,19 +577,40 @@ class VMRegistry:
 class SSHConnectionPool:
     """Connection pool for managing SSH connections to multiple VMs.
 
-    Maintains persistent connections and handles automatic reconnection.
-    Thread-safe for concurrent access.
+    Maintains one persistent transport per VM and handles automatic
+    reconnection. Thread-safe for concurrent access; connecting to one VM
+    does not block access to the others.
     """
 
-    def __init__(self, registry: VMRegistry):
+    def __init__(
+        self,
+        registry: VMRegistry,
+        max_workers: int = 16,
+        max_channels: int = DEFAULT_MAX_CHANNELS,
+        keepalive_interval: int = DEFAULT_KEEPALIVE_INTERVAL,
+    ):
         """Initialize connection pool.
 
         Args:
             registry: VM registry with configurations
+            max_workers: Threads available to async callers of run()
+            max_channels: Concurrent commands per VM
+            keepalive_interval: Seconds between keepalive packets (0 disables)
         """
         self.registry = registry
+        self.max_channels = max_channels
+        self.keepalive_interval = keepalive_interval
+        self.max_workers = max_workers
         self._connections: dict[str, SSHConnection] = {}
-        self._lock = __import__("threading").Lock()
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool for run(), creating it on first use or after close_all()."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mother-ssh")
+            return self._executor
 
     def get_connection(self, vm_name: str) -> SSHConnection:
         """Get or create SSH connection to a VM.
@@ -523,25 +626,65 @@ class SSHConnectionPool:
             paramiko.SSHException: If connection fails
         """
         with self._lock:
-            if vm_name not in self._connections:
+            conn = self._connections.get(vm_name)
+            if conn is None:
                 config = self.registry.get_vm(vm_name)
-                conn = SSHConnection(config)
+                conn = SSHConnection(config, self.max_channels, self.keepalive_interval)
                 self._connections[vm_name] = conn
 
-            conn = self._connections[vm_name]
+        # Ensure connection is active (outside the pool lock, so slow
+        # handshakes to one VM do not hold up the others)
+        try:
+            conn.connect()
+        except Exception:
+            # Remove dead connection from pool
+            with self._lock:
+                if self._connections.get(vm_name) is conn:
+                    del self._connections[vm_name]
+            raise
 
-            # Ensure connection is active
-            try:
-                conn.connect()
-            except Exception as e:
-                # Remove dead connection from pool
-                del self._connections[vm_name]
-                raise
+        return conn
 
-            return conn
+    async def run(
+        self,
+        vm_name: str,
+        operation: Callable[[SSHConnection], T],
+        retry: bool = True,
+    ) -> T:
+        """Run a blocking operation on a pooled connection in a worker thread.
+
+        Args:
+            vm_name: Name of the VM
+            operation: Called with a connected SSHConnection
+            retry: Retry once on a fresh connection if the transport turns
+                out to be dead (only for operations safe to repeat)
+
+        Returns:
+            The operation's return value
+        """
+
+        def call() -> T:
+            conn = self.get_connection(vm_name)
+            try:
+                return operation(conn)
+            except CONNECTION_ERRORS as e:
+                # Command-level errors leave the transport usable
+                if not retry or conn.is_alive():
+                    raise
+                logger.info(f"SSH connection to '{vm_name}' dropped ({e}), reconnecting")
+                conn.disconnect()
+                return operation(self.get_connection(vm_name))
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), call)
 
     def close_all(self) -> None:
-        """Close all connections in the pool."""
+        """Close all connections in the pool and stop its worker threads.
+
+        Queued operations are cancelled; one already running finishes on
+        its own thread without holding up the close. A later run() starts
+        a new worker pool.
+        """
         with self._lock:
             for conn in self._connections.values():
                 try:
@@ -550,8 +693,12 @@ class SSHConnectionPool:
                     logger.warning(f"Error closing connection: {e}")
 
             self._connections.clear()
+            executor, self._executor = self._executor, None
             logger.info("All SSH connections closed")
 
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def __enter__(self):
         """Context manager entry."""
         return self
@@ -0,0 +1,143 @@
+"""Minimal in-process HTTP server for web plugin tests.
+
+Serves canned routes on localhost and records every request so tests can
+assert on round trips and the headers that were sent.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class Route:
+    """A canned response."""
+
+    body: bytes = b""
+    status: int = 200
+    headers: dict[str, str] = field(default_factory=dict)
+    # Answer a matching If-None-Match with 304 Not Modified
+    etag: str | None = None
+    # Seconds to wait before answering
+    delay: float = 0.0
+    # Send the body with chunked transfer encoding instead of Content-Length
+    chunked: bool = False
+
+
+@dataclass
+class RecordedRequest:
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes = b""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubHTTPServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        with self.server.lock:
+            self.server.requests.append(RecordedRequest(method, self.path, headers, body))
+        route = self.server.routes.get(self.path) or self.server.routes.get(self.path.split("?", 1)[0])
+        if route is None:
+            route = Route(b"not found", status=404)
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        try:
+            if route.delay:
+                time.sleep(route.delay)
+            self._respond(method, route, headers)
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def _respond(self, method: str, route: Route, headers: dict[str, str]) -> None:
+
+        if route.etag and headers.get("if-none-match") == route.etag:
+            self.send_response(304)
+            self.send_header("ETag", route.etag)
+            for name, value in route.headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(route.status)
+        for name, value in route.headers.items():
+            self.send_header(name, value)
+        if route.etag:
+            self.send_header("ETag", route.etag)
+        if route.chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(route.body)))
+        self.end_headers()
+        if method == "HEAD":
+            return
+        try:
+            if route.chunked:
+                for start in range(0, len(route.body), 16384):
+                    chunk = route.body[start : start + 16384]
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.write(b"0\r\n\r\n")
+            else:
+                self.wfile.write(route.body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):  # noqa: N802
+        self._handle("GET")
+
+    def do_HEAD(self):  # noqa: N802
+        self._handle("HEAD")
+
+    def do_POST(self):  # noqa: N802
+        self._handle("POST")
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP stand-in bound to localhost."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.routes: dict[str, Route] = {}
+        self.requests: list[RecordedRequest] = []
+        # Requests being answered right now, and the most seen at once
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def start(self) -> StubHTTPServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def hits(self, path: str) -> list[RecordedRequest]:
+        """Requests received for ``path``."""
+        with self.lock:
+            return [r for r in self.requests if r.path == path]
@@ -0,0 +1,407 @@
+"""Minimal in-process IMAP server for email plugin tests.
+
+Speaks enough IMAP4rev1 for imaplib: CAPABILITY, LOGIN, LIST, SELECT,
+STATUS, NOOP, CLOSE, LOGOUT, EXPUNGE and UID SEARCH/FETCH/STORE/COPY,
+including partial fetches of numbered body parts. Every command is
+recorded so tests can assert on round trips.
+"""
+
+from __future__ import annotations
+
+import email
+import email.utils
+import re
+import shlex
+import socket
+import socketserver
+import threading
+from dataclasses import dataclass, field
+from email.message import Message
+
+
+@dataclass
+class StubMessage:
+    uid: int
+    raw: bytes
+    flags: set[str] = field(default_factory=set)
+    modseq: int = 1
+
+
+def make_message(
+    subject: str,
+    sender: str = "Alice <alice@example.com>",
+    to: str = "bob@example.com",
+    body: str = "Hello",
+    attachment: tuple[str, bytes] | None = None,
+    date: str = "Mon, 01 Jan 2024 12:00:00 +0000",
+) -> bytes:
+    """Build a raw RFC 822 message."""
+    from email.message import EmailMessage
+
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = sender
+    msg["To"] = to
+    msg["Date"] = date
+    msg.set_content(body)
+    if attachment:
+        name, data = attachment
+        msg.add_attachment(data, maintype="application", subtype="octet-stream", filename=name)
+    return msg.as_bytes()
+
+
+def _quote(value: str | None) -> bytes:
+    if value is None:
+        return b"NIL"
+    data = value.encode()
+    if any(c > 127 for c in data) or b'"' in data or b"\\" in data or b"\r" in data or b"\n" in data:
+        return b"{%d}\r\n" % len(data) + data
+    return b'"' + data + b'"'
+
+
+def _addresses(header: str | None) -> bytes:
+    if not header:
+        return b"NIL"
+    parts = []
+    for name, addr in email.utils.getaddresses([header]):
+        mailbox, _, host = addr.partition("@")
+        parts.append(b"(" + b" ".join([_quote(name or None), b"NIL", _quote(mailbox), _quote(host)]) + b")")
+    return b"(" + b"".join(parts) + b")"
+
+
+def _envelope(msg: Message) -> bytes:
+    fields = [
+        _quote(msg.get("Date")),
+        _quote(msg.get("Subject")),
+        _addresses(msg.get("From")),
+        _addresses(msg.get("Sender") or msg.get("From")),
+        _addresses(msg.get("Reply-To") or msg.get("From")),
+        _addresses(msg.get("To")),
+        _addresses(msg.get("Cc")),
+        _addresses(msg.get("Bcc")),
+        _quote(msg.get("In-Reply-To")),
+        _quote(msg.get("Message-ID")),
+    ]
+    return b"(" + b" ".join(fields) + b")"
+
+
+def _bodystructure(part: Message) -> bytes:
+    if part.is_multipart():
+        children = b"".join(_bodystructure(p) for p in part.get_payload())
+        return b"(" + children + b" " + _quote(part.get_content_subtype().upper()) + b")"
+
+    params = part.get_params() or []
+    param_list = b" ".join(_quote(k.upper()) + b" " + _quote(v) for k, v in params[1:])
+    payload = part.get_payload(decode=False) or ""
+    size = len(payload.encode() if isinstance(payload, str) else payload)
+    fields = [
+        _quote(part.get_content_maintype().upper()),
+        _quote(part.get_content_subtype().upper()),
+        b"(" + param_list + b")" if param_list else b"NIL",
+        b"NIL",
+        b"NIL",
+        _quote((part.get("Content-Transfer-Encoding") or "7BIT").upper()),
+        str(size).encode(),
+    ]
+    if part.get_content_maintype() == "text":
+        fields.append(str(payload.count("\n")).encode())
+    disposition = b"NIL"
+    if part.get_content_disposition():
+        filename = part.get_filename()
+        disp_params = b"(" + _quote("FILENAME") + b" " + _quote(filename) + b")" if filename else b"NIL"
+        disposition = b"(" + _quote(part.get_content_disposition().upper()) + b" " + disp_params + b")"
+    fields += [b"NIL", disposition, b"NIL", b"NIL"]
+    return b"(" + b" ".join(fields) + b")"
+
+
+# Partial fetch of a numbered body part, e.g. BODY.PEEK[1.2]<0.400>
+_SECTION = re.compile(r"BODY(?:\.PEEK)?\[([\d.]+)\]<(\d+)\.(\d+)>")
+
+
+def _section_bytes(msg: Message, section: str) -> bytes:
+    part = msg
+    for index in section.split("."):
+        if part.is_multipart():
+            part = part.get_payload()[int(index) - 1]
+    payload = part.get_payload(decode=False) or ""
+    return payload.encode() if isinstance(payload, str) else payload
+
+
+class StubIMAPServer(socketserver.ThreadingTCPServer):
+    """Threaded IMAP stand-in bound to localhost."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, username: str = "test@example.com", password: str = "secret"):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.username = username
+        self.password = password
+        self.folders: dict[str, list[StubMessage]] = {"INBOX": [], "Archive": []}
+        self.uidvalidity: dict[str, int] = {"INBOX": 1, "Archive": 1}
+        self.uidnext: dict[str, int] = {"INBOX": 1, "Archive": 1}
+        self.highestmodseq = 1
+        self.capabilities = ["IMAP4rev1", "LITERAL+"]
+        self.commands: list[str] = []
+        self.logins = 0
+        self.drop_next = False
+        self._connections: list[socket.socket] = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> StubIMAPServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        self.drop_connections()
+
+    def add(self, raw: bytes, folder: str = "INBOX", flags: set[str] | None = None) -> int:
+        """Append a message and return its UID."""
+        with self._lock:
+            uid = self.uidnext[folder]
+            self.uidnext[folder] = uid + 1
+            self.highestmodseq += 1
+            self.folders[folder].append(StubMessage(uid, raw, set(flags or ()), self.highestmodseq))
+            return uid
+
+    def set_flags(self, folder: str, uid: int, flags: set[str]) -> None:
+        with self._lock:
+            for msg in self.folders[folder]:
+                if msg.uid == uid:
+                    self.highestmodseq += 1
+                    msg.flags = set(flags)
+                    msg.modseq = self.highestmodseq
+
+    def remove(self, folder: str, uid: int) -> None:
+        with self._lock:
+            self.folders[folder] = [m for m in self.folders[folder] if m.uid != uid]
+
+    def commands_named(self, prefix: str) -> list[str]:
+        return [c for c in self.commands if c.upper().startswith(prefix.upper())]
+
+    def drop_connections(self) -> None:
+        """Close every client socket (simulates a server-side timeout)."""
+        for conn in list(self._connections):
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+                conn.close()
+            except OSError:
+                pass
+        self._connections.clear()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: StubIMAPServer
+
+    def setup(self) -> None:
+        super().setup()
+        self.server._connections.append(self.request)
+        self.selected: str | None = None
+
+    def send(self, data: bytes) -> None:
+        self.wfile.write(data + b"\r\n")
+
+    def handle(self) -> None:
+        self.send(b"* OK IMAP4rev1 stub ready")
+        while True:
+            try:
+                line = self.rfile.readline()
+            except OSError:
+                return
+            if not line:
+                return
+            text = line.decode().rstrip("\r\n")
+            tag, _, rest = text.partition(" ")
+            command, _, args = rest.partition(" ")
+            command = command.upper()
+            if command == "UID":
+                sub, _, args = args.partition(" ")
+                command = f"UID {sub.upper()}"
+            self.server.commands.append(f"{command} {args}".strip())
+
+            if self.server.drop_next:
+                self.server.drop_next = False
+                self.request.close()
+                return
+
+            handler = getattr(self, "cmd_" + command.replace(" ", "_").lower(), None)
+            if handler is None:
+                self.send(f"{tag} BAD unknown command".encode())
+                continue
+            if handler(tag, args) is False:
+                return
+
+    # -- commands ---------------------------------------------------------
+
+    def cmd_capability(self, tag: str, args: str) -> None:
+        self.send(("* CAPABILITY " + " ".join(self.server.capabilities)).encode())
+        self.send(f"{tag} OK CAPABILITY completed".encode())
+
+    def cmd_login(self, tag: str, args: str) -> None:
+        user, password = shlex.split(args)
+        if (user, password) != (self.server.username, self.server.password):
+            self.send(f"{tag} NO authentication failed".encode())
+            return
+        self.server.logins += 1
+        self.send(f"{tag} OK LOGIN completed".encode())
+
+    def cmd_enable(self, tag: str, args: str) -> None:
+        self.send(f"* ENABLED {args}".encode())
+        self.send(f"{tag} OK ENABLE completed".encode())
+
+    def cmd_list(self, tag: str, args: str) -> None:
+        for name in self.server.folders:
+            self.send(f'* LIST (\\HasNoChildren) "/" "{name}"'.encode())
+        self.send(f"{tag} OK LIST completed".encode())
+
+    def cmd_select(self, tag: str, args: str) -> None:
+        folder = shlex.split(args)[0]
+        if folder not in self.server.folders:
+            self.send(f"{tag} NO no such mailbox".encode())
+            return
+        self.selected = folder
+        self.send(f"* {len(self.server.folders[folder])} EXISTS".encode())
+        self.send(f"* OK [UIDVALIDITY {self.server.uidvalidity[folder]}] UIDs valid".encode())
+        self.send(f"* OK [UIDNEXT {self.server.uidnext[folder]}] next UID".encode())
+        if "CONDSTORE" in self.server.capabilities:
+            self.send(f"* OK [HIGHESTMODSEQ {self.server.highestmodseq}] modseq".encode())
+        self.send(f"{tag} OK [READ-WRITE] SELECT completed".encode())
+
+    cmd_examine = cmd_select
+
+    def cmd_status(self, tag: str, args: str) -> None:
+        folder = shlex.split(args.split("(")[0])[0]
+        unseen = sum(1 for m in self.server.folders[folder] if "\\Seen" not in m.flags)
+        items = [
+            f"MESSAGES {len(self.server.folders[folder])}",
+            f"UIDNEXT {self.server.uidnext[folder]}",
+            f"UIDVALIDITY {self.server.uidvalidity[folder]}",
+            f"UNSEEN {unseen}",
+        ]
+        if "CONDSTORE" in self.server.capabilities:
+            items.append(f"HIGHESTMODSEQ {self.server.highestmodseq}")
+        self.send(f'* STATUS "{folder}" ({" ".join(items)})'.encode())
+        self.send(f"{tag} OK STATUS completed".encode())
+
+    def cmd_noop(self, tag: str, args: str) -> None:
+        self.send(f"{tag} OK NOOP completed".encode())
+
+    def cmd_close(self, tag: str, args: str) -> None:
+        self.selected = None
+        self.send(f"{tag} OK CLOSE completed".encode())
+
+    def cmd_logout(self, tag: str, args: str) -> bool:
+        self.send(b"* BYE logging out")
+        self.send(f"{tag} OK LOGOUT completed".encode())
+        return False
+
+    def cmd_expunge(self, tag: str, args: str) -> None:
+        folder = self.selected
+        self.server.folders[folder] = [m for m in self.server.folders[folder] if "\\Deleted" not in m.flags]
+        self.send(f"{tag} OK EXPUNGE completed".encode())
+
+    def _messages(self) -> list[StubMessage]:
+        return self.server.folders[self.selected]
+
+    def _uid_set(self, spec: str) -> list[StubMessage]:
+        messages = self._messages()
+        top = max((m.uid for m in messages), default=0)
+        wanted: set[int] = set()
+        for part in spec.split(","):
+            if ":" in part:
+                lo, hi = part.split(":")
+                lo_n = top if lo == "*" else int(lo)
+                hi_n = top if hi == "*" else int(hi)
+                wanted.update(range(min(lo_n, hi_n), max(lo_n, hi_n) + 1))
+            else:
+                wanted.add(top if part == "*" else int(part))
+        return [m for m in messages if m.uid in wanted]
+
+    def cmd_uid_search(self, tag: str, args: str) -> None:
+        tokens = shlex.split(args)
+        result = []
+        for msg in self._messages():
+            parsed = email.message_from_bytes(msg.raw)
+            ok = True
+            i = 0
+            while i < len(tokens):
+                key = tokens[i].upper()
+                if key == "UNSEEN":
+                    ok &= "\\Seen" not in msg.flags
+                elif key == "SEEN":
+                    ok &= "\\Seen" in msg.flags
+                elif key in ("FROM", "SUBJECT", "TO"):
+                    i += 1
+                    ok &= tokens[i].lower() in (parsed.get(key.title()) or "").lower()
+                elif key == "UID":
+                    i += 1
+                    ok &= msg in self._uid_set(tokens[i])
+                i += 1
+            if ok:
+                result.append(str(msg.uid))
+        self.send(("* SEARCH " + " ".join(result)).encode().rstrip())
+        self.send(f"{tag} OK SEARCH completed".encode())
+
+    def cmd_uid_fetch(self, tag: str, args: str) -> None:
+        spec, _, items = args.partition(" ")
+        changed_since = None
+        if "CHANGEDSINCE" in items.upper():
+            items, _, modifier = items.upper().partition("(CHANGEDSINCE")
+            changed_since = int(modifier.strip(" )"))
+        names = items.strip().strip("()").upper().split()
+        sections = [_SECTION.fullmatch(name) for name in names]
+        for seq, msg in enumerate(self._uid_set(spec), start=1):
+            if changed_since is not None and msg.modseq <= changed_since:
+                continue
+            parsed = email.message_from_bytes(msg.raw)
+            parts = [b"UID " + str(msg.uid).encode()]
+            for name in names:
+                if name == "FLAGS":
+                    parts.append(b"FLAGS (" + " ".join(sorted(msg.flags)).encode() + b")")
+                elif name == "RFC822.SIZE":
+                    parts.append(b"RFC822.SIZE " + str(len(msg.raw)).encode())
+                elif name in ("RFC822", "BODY[]", "BODY.PEEK[]"):
+                    label = b"RFC822" if name == "RFC822" else b"BODY[]"
+                    parts.append(label + b" {%d}\r\n" % len(msg.raw) + msg.raw)
+                elif name == "ENVELOPE":
+                    parts.append(b"ENVELOPE " + _envelope(parsed))
+                elif name == "BODYSTRUCTURE":
+                    parts.append(b"BODYSTRUCTURE " + _bodystructure(parsed))
+                elif name == "MODSEQ":
+                    parts.append(b"MODSEQ (" + str(msg.modseq).encode() + b")")
+                elif match := next((m for m in sections if m and m.group(0) == name), None):
+                    section, origin, count = match.groups()
+                    data = _section_bytes(parsed, section)[int(origin) : int(origin) + int(count)]
+                    parts.append(b"BODY[%s]<%s> {%d}\r\n" % (section.encode(), origin.encode(), len(data)) + data)
+            if changed_since is not None and b"MODSEQ" not in b" ".join(parts):
+                parts.append(b"MODSEQ (" + str(msg.modseq).encode() + b")")
+            self.send(b"* " + str(seq).encode() + b" FETCH (" + b" ".join(parts) + b")")
+        self.send(f"{tag} OK FETCH completed".encode())
+
+    def cmd_uid_store(self, tag: str, args: str) -> None:
+        spec, mode, *flags = args.split(" ")
+        flag_set = {f.strip("()") for f in flags}
+        for msg in self._uid_set(spec):
+            if mode.upper().startswith("+"):
+                msg.flags |= flag_set
+            elif mode.upper().startswith("-"):
+                msg.flags -= flag_set
+            else:
+                msg.flags = flag_set
+            self.server.highestmodseq += 1
+            msg.modseq = self.server.highestmodseq
+        self.send(f"{tag} OK STORE completed".encode())
+
+    def cmd_uid_copy(self, tag: str, args: str) -> None:
+        spec, folder = args.split(" ", 1)
+        folder = shlex.split(folder)[0]
+        for msg in self._uid_set(spec):
+            self.server.add(msg.raw, folder, set(msg.flags))
+        self.send(f"{tag} OK COPY completed".encode())
@@ -0,0 +1,104 @@
+"""Minimal in-process SSH server for SSH plugin tests.
+
+Built on paramiko's server mode. Accepts any public key, runs each exec
+request as a local shell command and returns its output and exit status,
+so it behaves like a real sshd on localhost. Commands, connections and the
+peak number of concurrently open exec channels are recorded.
+"""
+
+from __future__ import annotations
+
+import socket
+import subprocess
+import threading
+
+import paramiko
+
+
+class _ServerInterface(paramiko.ServerInterface):
+    def __init__(self, stub: StubSSHServer):
+        self.stub = stub
+
+    def get_allowed_auths(self, username: str) -> str:
+        return "publickey"
+
+    def check_auth_publickey(self, username: str, key: paramiko.PKey) -> int:
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_request(self, kind: str, chanid: int) -> int:
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel: paramiko.Channel, command: bytes) -> bool:
+        threading.Thread(target=self.stub._exec, args=(channel, command.decode()), daemon=True).start()
+        return True
+
+
+class StubSSHServer:
+    """Threaded SSH stand-in bound to localhost."""
+
+    def __init__(self) -> None:
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.commands: list[str] = []
+        self.connections = 0
+        self.max_concurrent = 0
+        self._running = 0
+        self._transports: list[paramiko.Transport] = []
+        self._lock = threading.Lock()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(16)
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._sock.getsockname()[1]
+
+    def start(self) -> StubSSHServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.drop_connections()
+        self._sock.close()
+
+    def drop_connections(self) -> None:
+        """Close every open transport, as if the network went away."""
+        with self._lock:
+            transports, self._transports = self._transports, []
+        for transport in transports:
+            transport.close()
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(conn)
+            transport.add_server_key(self.host_key)
+            with self._lock:
+                self.connections += 1
+                self._transports.append(transport)
+            try:
+                transport.start_server(server=_ServerInterface(self))
+            except (paramiko.SSHException, EOFError):
+                transport.close()
+
+    def _exec(self, channel: paramiko.Channel, command: str) -> None:
+        with self._lock:
+            self.commands.append(command)
+            self._running += 1
+            self.max_concurrent = max(self.max_concurrent, self._running)
+        try:
+            proc = subprocess.run(["/bin/sh", "-c", command], capture_output=True, timeout=30)
+            channel.sendall(proc.stdout)
+            channel.sendall_stderr(proc.stderr)
+            channel.send_exit_status(proc.returncode)
+        finally:
+            with self._lock:
+                self._running -= 1
+            channel.shutdown_write()
+            channel.close()
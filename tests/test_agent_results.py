@@ -0,0 +1,243 @@
+"""Tests for shaping large tool results and paging through them."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mother.agent.core import MotherAgent
+from mother.agent.results import (
+    PREVIEW_ITEMS,
+    RESULTS_PAGE_NAME,
+    ResultStore,
+    read_page,
+    shape_result,
+)
+from mother.llm.response import LLMResponse, ToolCall
+from mother.plugins import PluginResult
+from mother.plugins.manifest import (
+    CapabilitySpec,
+    ExecutionSpec,
+    ExecutionType,
+    PluginManifest,
+    PluginMetadata,
+    PythonExecutionSpec,
+)
+from mother.tools.registry import ToolRegistry
+
+ENTRIES = [{"name": f"file_{i}.txt", "type": "file", "size": i * 10} for i in range(500)]
+
+
+@pytest.fixture
+def store() -> ResultStore:
+    return ResultStore()
+
+
+class TestShapeResult:
+    """Tests for shape_result."""
+
+    def test_small_result_is_sent_as_is(self, store):
+        data = {"path": "/tmp", "entries": ENTRIES[:3]}
+
+        assert shape_result(data, store) == json.dumps(data, indent=2)
+        assert shape_result("plain output", store) == "plain output"
+        assert len(store) == 0
+
+    def test_large_list_is_previewed(self, store):
+        data = {"path": "/tmp", "entries": ENTRIES, "count": 500}
+
+        content = shape_result(data, store, max_chars=2000)
+        shaped = json.loads(content)
+
+        assert len(content) < 2000
+        assert shaped["result_handle"] == "r1"
+        assert shaped["size_chars"] == len(json.dumps(data, indent=2))
+        assert shaped["preview"]["path"] == "/tmp"
+        assert shaped["preview"]["count"] == 500
+        assert shaped["preview"]["entries"] == ENTRIES[:PREVIEW_ITEMS]
+        assert shaped["truncated"] == {
+            "entries": {"items": 500, "shown": PREVIEW_ITEMS, "fields": ["name", "type", "size"]}
+        }
+        assert store.get("r1") is data
+
+    def test_long_text_is_previewed(self, store):
+        data = {"path": "/tmp/log", "content": "line\n" * 10_000}
+
+        shaped = json.loads(shape_result(data, store, max_chars=2000))
+
+        assert shaped["truncated"] == {"content": {"chars": 50_000, "lines": 10_001}}
+        assert shaped["preview"]["content"].startswith("line\nline")
+        assert len(shaped["preview"]["content"]) < 1100
+
+    def test_raw_output_is_previewed(self, store):
+        shaped = json.loads(shape_result("x" * 5000, store, max_chars=1000))
+
+        assert shaped["truncated"] == {".": {"chars": 5000, "lines": 1}}
+
+    def test_store_drops_oldest(self):
+        store = ResultStore(max_entries=2)
+        handles = [store.put(i) for i in range(3)]
+
+        assert len(store) == 2
+        assert store.get(handles[2]) == 2
+        with pytest.raises(KeyError):
+            store.get(handles[0])
+
+
+class TestReadPage:
+    """Tests for read_page."""
+
+    def test_pages_a_list(self, store):
+        handle = store.put({"entries": ENTRIES})
+
+        page = json.loads(read_page(store, handle, "entries", offset=10, limit=3))
+
+        assert page["items"] == ENTRIES[10:13]
+        assert page["total"] == 500
+        assert page["next_offset"] == 13
+
+    def test_last_page(self, store):
+        handle = store.put(ENTRIES)
+
+        page = json.loads(read_page(store, handle, offset=498, limit=10))
+
+        assert page["items"] == ENTRIES[498:]
+        assert page["next_offset"] is None
+
+    def test_page_stops_at_char_budget(self, store):
+        handle = store.put(ENTRIES)
+
+        page = json.loads(read_page(store, handle, limit=500, max_chars=1000))
+
+        assert 0 < len(page["items"]) < 500
+        assert page["next_offset"] == len(page["items"])
+
+    def test_pages_text_by_line(self, store):
+        handle = store.put({"messages": [{"body": "".join(f"line {i}\n" for i in range(100))}]})
+
+        page = json.loads(read_page(store, handle, "messages.0.body", offset=5, limit=2))
+
+        assert page["text"] == "line 5\nline 6\n"
+        assert page["total"] == 100
+
+    def test_pages_through_one_long_line(self, store):
+        text = "".join(f"{i:05d}" for i in range(10_000))
+        handle = store.put({"stdout": text})
+
+        pieces = []
+        offset = 0
+        while offset is not None:
+            page = json.loads(read_page(store, handle, "stdout", offset=offset, max_chars=20_000))
+            assert len(page["text"]) <= 20_000
+            pieces.append(page["text"])
+            offset = page["next_offset"]
+
+        assert "".join(pieces) == text
+        assert len(pieces) == 3
+
+    def test_oversized_item_is_previewed(self, store):
+        handle = store.put([{"body": "x" * 5000}])
+
+        page = json.loads(read_page(store, handle, max_chars=1000))
+
+        assert len(page["items"][0]["body"]) < 300
+        assert "'0'" in page["note"]
+
+    def test_errors(self, store):
+        handle = store.put({"count": 3})
+
+        with pytest.raises(KeyError, match="Unknown result handle"):
+            read_page(store, "r99")
+        with pytest.raises(KeyError, match="No key 'missing'"):
+            read_page(store, handle, "missing")
+        with pytest.raises(ValueError, match="not a list or text"):
+            read_page(store, handle, "count")
+
+
+def _registry(data) -> ToolRegistry:
+    registry = ToolRegistry()
+    executor = MagicMock()
+    executor.execute = AsyncMock(return_value=PluginResult.success_result(data=data))
+    manifest = PluginManifest(
+        schema_version="1.0",
+        plugin=PluginMetadata(name="files", version="1.0.0", description="files plugin", author="Test"),
+        capabilities=[CapabilitySpec(name="list", description="List a directory")],
+        execution=ExecutionSpec(
+            type=ExecutionType.PYTHON,
+            python=PythonExecutionSpec(module="test", **{"class": "Test"}),
+        ),
+    )
+    registry.plugin_manager.registry.register(manifest, executor)
+    return registry
+
+
+class TestAgentResultShaping:
+    """Tests for result shaping inside the agent loop."""
+
+    async def test_large_plugin_result_is_paged(self):
+        data = {"path": "/tmp", "entries": ENTRIES}
+        provider = MagicMock()
+        provider.create_message = AsyncMock(
+            side_effect=[
+                LLMResponse(text=None, tool_calls=[ToolCall(id="c1", name="files_list", arguments={})]),
+                LLMResponse(
+                    text=None,
+                    tool_calls=[
+                        ToolCall(
+                            id="c2",
+                            name=RESULTS_PAGE_NAME,
+                            arguments={"handle": "r1", "path": "entries", "offset": 100, "limit": 2},
+                        )
+                    ],
+                ),
+                LLMResponse(text="Done", tool_calls=[], stop_reason="end_turn"),
+            ]
+        )
+        agent = MotherAgent(
+            tool_registry=_registry(data),
+            provider=provider,
+            enable_memory=False,
+            enable_cognitive=False,
+            enable_session_persistence=False,
+            max_result_chars=5000,
+        )
+
+        response = await agent.process_command("list /tmp")
+
+        assert response.success
+        assert [tc["tool"] for tc in response.tool_calls] == ["files_list"]
+
+        preview = agent.state.messages[2]["content"][0]["content"]
+        assert len(preview) < 5000 < len(json.dumps(data, indent=2))
+        assert json.loads(preview)["result_handle"] == "r1"
+
+        page = json.loads(agent.state.messages[4]["content"][0]["content"])
+        assert page["items"] == ENTRIES[100:102]
+
+        calls = provider.create_message.call_args_list
+        assert RESULTS_PAGE_NAME not in [t["name"] for t in calls[0].kwargs["tools"]]
+        assert RESULTS_PAGE_NAME in [t["name"] for t in calls[1].kwargs["tools"]]
+
+    async def test_unknown_handle_is_a_tool_error(self):
+        provider = MagicMock()
+        provider.create_message = AsyncMock(
+            side_effect=[
+                LLMResponse(
+                    text=None, tool_calls=[ToolCall(id="c1", name=RESULTS_PAGE_NAME, arguments={"handle": "r7"})]
+                ),
+                LLMResponse(text="Done", tool_calls=[], stop_reason="end_turn"),
+            ]
+        )
+        agent = MotherAgent(
+            tool_registry=_registry({}),
+            provider=provider,
+            enable_memory=False,
+            enable_cognitive=False,
+            enable_session_persistence=False,
+        )
+
+        await agent.process_command("page")
+
+        result = agent.state.messages[2]["content"][0]
+        assert result["is_error"] is True
+        assert "Unknown result handle 'r7'" in result["content"]
@@ -0,0 +1,231 @@
+"""Tests for per-turn tool routing."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mother.agent.cognitive import ThinkingMode
+from mother.agent.core import MotherAgent
+from mother.agent.router import EXPAND_TOOLS_NAME, ToolRouter
+from mother.llm.base import plain_schema
+from mother.llm.providers.mock import MockProvider
+from mother.llm.response import LLMResponse, ToolCall
+from mother.plugins import PluginResult
+from mother.plugins.manifest import (
+    CapabilitySpec,
+    ExecutionSpec,
+    ExecutionType,
+    ParameterSpec,
+    ParameterType,
+    PluginManifest,
+    PluginMetadata,
+    PythonExecutionSpec,
+)
+from mother.tools.registry import ToolRegistry
+
+PLUGINS = {
+    "email": [
+        ("list_messages", "List email messages in a mailbox folder"),
+        ("read_message", "Read a single email message"),
+        ("send_message", "Send an email message"),
+        ("delete_message", "Delete an email message"),
+    ],
+    "pdf": [
+        ("merge", "Merge several PDF documents into one"),
+        ("split", "Split a PDF document into pages"),
+        ("rotate", "Rotate pages of a PDF document"),
+    ],
+    "shell": [
+        ("run_command", "Run a shell command"),
+        ("hostname", "Get the machine hostname"),
+    ],
+    "tasks": [
+        ("add", "Add a task to the todo list"),
+        ("list", "List open tasks"),
+        ("complete", "Mark a task as done"),
+    ],
+}
+
+
+def make_manifest(name: str, capabilities: list[tuple[str, str]]) -> PluginManifest:
+    return PluginManifest(
+        schema_version="1.0",
+        plugin=PluginMetadata(name=name, version="1.0.0", description=f"{name} plugin", author="Test"),
+        capabilities=[
+            CapabilitySpec(
+                name=cap,
+                description=desc,
+                parameters=[
+                    ParameterSpec(name="target", type=ParameterType.STRING, description="What to act on"),
+                    ParameterSpec(name="limit", type=ParameterType.INTEGER, description="Maximum results"),
+                ],
+            )
+            for cap, desc in capabilities
+        ],
+        execution=ExecutionSpec(
+            type=ExecutionType.PYTHON,
+            python=PythonExecutionSpec(module="test", **{"class": "Test"}),
+        ),
+    )
+
+
+@pytest.fixture
+def tool_registry() -> ToolRegistry:
+    registry = ToolRegistry()
+    executor = MagicMock()
+    executor.execute = AsyncMock(return_value=PluginResult.success_result(data={"ok": True}))
+    for name, caps in PLUGINS.items():
+        registry.plugin_manager.registry.register(make_manifest(name, caps), executor)
+    return registry
+
+
+def make_agent(tool_registry: ToolRegistry, provider, router: ToolRouter | None) -> MotherAgent:
+    return MotherAgent(
+        tool_registry=tool_registry,
+        provider=provider,
+        enable_memory=False,
+        enable_cognitive=True,
+        enable_session_persistence=False,
+        tool_router=router,
+    )
+
+
+class TestToolRouter:
+    """Tests for ToolRouter selection."""
+
+    def test_no_routing_when_everything_fits(self, tool_registry: ToolRegistry) -> None:
+        router = ToolRouter(tool_registry, top_k=50)
+        assert router.select("send an email") is None
+
+    def test_selects_relevant_tools(self, tool_registry: ToolRegistry) -> None:
+        router = ToolRouter(tool_registry, top_k=4)
+        selected = router.select("merge these pdf documents")
+        assert selected is not None
+        assert len(selected) <= 4
+        assert selected[0] == "pdf_merge"
+        assert not any(name.startswith("email_") for name in selected)
+
+    def test_recent_tools_kept(self, tool_registry: ToolRegistry) -> None:
+        router = ToolRouter(tool_registry, top_k=4, recent_k=2)
+        selected = router.select("merge pdf", recent_tools=["tasks_add", "unknown_tool", "shell_hostname"])
+        assert selected[:2] == ["tasks_add", "shell_hostname"]
+        assert "pdf_merge" in selected
+
+    def test_deliberate_mode_widens_budget(self, tool_registry: ToolRegistry) -> None:
+        router = ToolRouter(tool_registry, top_k=2, deliberate_multiplier=3)
+        assert router.budget(ThinkingMode.REACTIVE) == 2
+        assert router.budget(ThinkingMode.DELIBERATE) == 6
+
+        reactive = router.select("email message", ThinkingMode.REACTIVE)
+        deliberate = router.select("email message", ThinkingMode.DELIBERATE)
+        assert len(reactive) == 2
+        assert len(deliberate) == 4  # every email capability
+
+    def test_expand_by_query(self, tool_registry: ToolRegistry) -> None:
+        router = ToolRouter(tool_registry, top_k=2, expand_k=2)
+        added = router.expand("rotate pdf pages", active=["pdf_merge"])
+        assert "pdf_rotate" in added
+        assert "pdf_merge" not in added
+        assert len(added) <= 2
+
+    def test_expand_by_exact_name(self, tool_registry: ToolRegistry) -> None:
+        router = ToolRouter(tool_registry, top_k=2)
+        assert router.expand("shell_hostname", active=[]) == ["shell_hostname"]
+        assert router.expand("shell_hostname", active=["shell_hostname"]) == []
+
+    def test_schemas_include_expand_tool(self, tool_registry: ToolRegistry) -> None:
+        router = ToolRouter(tool_registry, top_k=2)
+        schemas = router.schemas(["pdf_merge", "missing_tool"])
+        assert [s["name"] for s in schemas] == ["pdf_merge", EXPAND_TOOLS_NAME]
+
+
+class TestAgentRouting:
+    """Tests for routing inside the agent loop."""
+
+    async def test_routed_payload_is_smaller(self, tool_registry: ToolRegistry) -> None:
+        """Routing should cut the tool payload sent with each call."""
+        payloads: dict[str, list[int]] = {"all": [], "routed": []}
+
+        for label, router in (("all", None), ("routed", ToolRouter(tool_registry, top_k=3))):
+            provider = MockProvider(api_key="test", model="mock")
+            original = provider.create_message
+
+            async def recording(messages, system_prompt=None, tools=None, _orig=original, _label=label, **kw):
+                payloads[_label].append(len(json.dumps(plain_schema(tools or []))))
+                return await _orig(messages, system_prompt=system_prompt, tools=tools, **kw)
+
+            provider.create_message = recording
+            agent = make_agent(tool_registry, provider, router)
+            response = await agent.process_command("list my inbox email")
+
+            assert response.success
+            assert [tc["tool"] for tc in response.tool_calls] == ["email_list_messages"]
+
+        assert max(payloads["routed"]) * 2 < min(payloads["all"])
+
+    async def test_disabled_router_sends_all_tools(self, tool_registry: ToolRegistry) -> None:
+        agent = make_agent(tool_registry, MockProvider(api_key="test", model="mock"), None)
+        assert len(agent.get_tools()) == len(tool_registry.list_capability_names())
+        assert EXPAND_TOOLS_NAME not in agent.get_system_prompt()
+
+    async def test_system_prompt_describes_routed_tools_only(self, tool_registry: ToolRegistry) -> None:
+        agent = make_agent(
+            tool_registry, MockProvider(api_key="test", model="mock"), ToolRouter(tool_registry, top_k=3)
+        )
+
+        agent._route_tools("list my inbox email")
+        prompt = agent.get_system_prompt()
+
+        routed = {name.split("_", 1)[0] for name in agent.state.active_tools}
+        others = sorted(set(PLUGINS) - routed)
+        assert "email" in routed and others
+        assert all(f"**{plugin}**" in prompt for plugin in routed)
+        assert not any(f"**{plugin}**" in prompt for plugin in others)
+        assert f"Other plugins: {', '.join(others)}." in prompt
+        assert EXPAND_TOOLS_NAME in prompt
+
+    async def test_expand_tools_call(self, tool_registry: ToolRegistry) -> None:
+        """The model can pull in a tool that was not routed up front."""
+        provider = MagicMock()
+        provider.create_message = AsyncMock(
+            side_effect=[
+                LLMResponse(
+                    text=None,
+                    tool_calls=[ToolCall(id="c1", name=EXPAND_TOOLS_NAME, arguments={"query": "hostname"})],
+                    stop_reason="tool_use",
+                ),
+                LLMResponse(
+                    text=None,
+                    tool_calls=[ToolCall(id="c2", name="shell_hostname", arguments={})],
+                    stop_reason="tool_use",
+                ),
+                LLMResponse(text="Done", tool_calls=[], stop_reason="end_turn"),
+            ]
+        )
+        agent = make_agent(tool_registry, provider, ToolRouter(tool_registry, top_k=2))
+
+        response = await agent.process_command("merge pdf documents")
+
+        assert response.success
+        assert [tc["tool"] for tc in response.tool_calls] == ["shell_hostname"]
+
+        first_tools = [t["name"] for t in provider.create_message.call_args_list[0].kwargs["tools"]]
+        second_tools = [t["name"] for t in provider.create_message.call_args_list[1].kwargs["tools"]]
+        assert "shell_hostname" not in first_tools
+        assert EXPAND_TOOLS_NAME in first_tools
+        assert "shell_hostname" in second_tools
+
+        expand_result = agent.state.messages[2]["content"][0]
+        assert expand_result["tool_use_id"] == "c1"
+        assert "shell_hostname" in expand_result["content"]
+
+    async def test_recent_tools_carry_over(self, tool_registry: ToolRegistry) -> None:
+        provider = MockProvider(api_key="test", model="mock")
+        agent = make_agent(tool_registry, provider, ToolRouter(tool_registry, top_k=3))
+
+        await agent.process_command("list my inbox email")
+        await agent.process_command("merge pdf documents", session_id=agent.get_session_id())
+
+        assert "email_list_messages" in agent.state.active_tools
+        assert "pdf_merge" in agent.state.active_tools
@@ -0,0 +1,229 @@
+"""Tests for token usage accounting and budgets."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from mother import metrics
+from mother.agent.core import MotherAgent
+from mother.agent.errors import ErrorCategory
+from mother.agent.usage import ANONYMOUS_KEY, TokenUsage, UsageStore, usage_tokens
+from mother.llm.base import plain_schema
+from mother.llm.response import LLMResponse, ToolCall, Usage
+from mother.plugins import PluginResult
+from mother.plugins.manifest import (
+    CapabilitySpec,
+    ExecutionSpec,
+    ExecutionType,
+    PluginManifest,
+    PluginMetadata,
+    PythonExecutionSpec,
+)
+from mother.tools.registry import ToolRegistry
+
+
+@pytest.fixture
+def store(tmp_path) -> UsageStore:
+    return UsageStore(db_path=tmp_path / "usage.db")
+
+
+def make_registry() -> ToolRegistry:
+    tools = ToolRegistry()
+    executor = MagicMock()
+    executor.execute = AsyncMock(return_value=PluginResult.success_result(data={"ok": True}))
+    manifest = PluginManifest(
+        schema_version="1.0",
+        plugin=PluginMetadata(name="counter", version="1.0.0", description="demo plugin", author="Test"),
+        capabilities=[CapabilitySpec(name="run", description="Run")],
+        execution=ExecutionSpec(
+            type=ExecutionType.PYTHON,
+            python=PythonExecutionSpec(module="test", **{"class": "Test"}),
+        ),
+    )
+    tools.plugin_manager.registry.register(manifest, executor)
+    return tools
+
+
+def make_agent(responses: list[LLMResponse], **kwargs) -> MotherAgent:
+    provider = MagicMock()
+    provider.provider_type.value = "test"
+    provider.model = "usage-model"
+    provider.create_message = AsyncMock(side_effect=responses)
+    return MotherAgent(
+        tool_registry=make_registry(),
+        provider=provider,
+        enable_memory=False,
+        enable_cognitive=False,
+        enable_session_persistence=False,
+        **kwargs,
+    )
+
+
+def tool_call_response(input_tokens: int, output_tokens: int = 10) -> LLMResponse:
+    return LLMResponse(
+        tool_calls=[ToolCall(id="c1", name="counter_run", arguments={})],
+        usage=Usage(input_tokens=input_tokens, output_tokens=output_tokens),
+    )
+
+
+class TestUsageStore:
+    """Tests for the SQLite usage rollup."""
+
+    def test_usage_tokens(self):
+        assert usage_tokens(Usage(input_tokens=3, output_tokens=4)) == (3, 4)
+        assert usage_tokens({"input_tokens": 5}) == (5, 0)
+        assert usage_tokens(None) == (0, 0)
+
+    def test_rollup(self, store):
+        store.add("ci", "s1", 100, 10, day="2026-01-01")
+        store.add("ci", "s1", 50, 5, day="2026-01-01")
+        store.add("ci", "s2", 20, 2, day="2026-01-01")
+        store.add(None, "s3", 7, 1, day="2026-01-01")
+        store.add("ci", "s1", 1000, 100, day="2026-01-02")
+
+        assert store.key_usage("ci", day="2026-01-01") == TokenUsage(170, 17, 3)
+        assert store.key_usage("ci", day="2026-01-02") == TokenUsage(1000, 100, 1)
+        assert store.key_usage("nobody", day="2026-01-01") == TokenUsage()
+        assert store.session_usage("s1") == TokenUsage(1150, 115, 3)
+
+        stats = store.get_stats(day="2026-01-01")
+        assert stats["sessions"] == 3
+        assert stats["total_tokens"] == 195
+        assert stats["llm_calls"] == 4
+        assert stats["by_key"][ANONYMOUS_KEY]["input_tokens"] == 7
+        assert stats["by_key"]["ci"] == {"input_tokens": 170, "output_tokens": 17, "llm_calls": 3, "total_tokens": 187}
+
+    def test_today_by_default(self, store):
+        store.add("ci", "s1", 10, 1)
+
+        assert store.key_usage("ci").total_tokens == 11
+        assert store.get_stats()["total_tokens"] == 11
+
+
+class TestAgentAccounting:
+    """Tests for token accounting in the agent loop."""
+
+    async def test_usage_is_recorded(self, store):
+        agent = make_agent(
+            [
+                tool_call_response(100, 20),
+                LLMResponse(text="Done", stop_reason="end_turn", usage={"input_tokens": 150}),
+            ],
+            usage_store=store,
+        )
+        before = metrics.KEY_TOKENS.value(key_id="ops", type="input")
+
+        response = await agent.process_command("run it", key_id="ops")
+
+        assert response.success
+        assert response.usage == {"input_tokens": 250, "output_tokens": 20, "llm_calls": 2, "total_tokens": 270}
+        assert store.key_usage("ops") == TokenUsage(250, 20, 2)
+        assert store.session_usage(agent.get_session_id()).total_tokens == 270
+        assert agent.get_token_usage()["by_key"]["ops"]["total_tokens"] == 270
+        assert metrics.KEY_TOKENS.value(key_id="ops", type="input") == before + 250
+
+    async def test_store_failure_does_not_fail_the_request(self, store):
+        agent = make_agent([LLMResponse(text="Done", stop_reason="end_turn", usage=Usage(5, 1))], usage_store=store)
+
+        with patch.object(store, "add", side_effect=OSError("disk full")):
+            response = await agent.process_command("hi")
+
+        assert response.success
+        assert response.usage["total_tokens"] == 6
+
+    async def test_request_input_budget_stops_the_loop(self):
+        agent = make_agent(
+            [tool_call_response(5000), LLMResponse(text="Done", stop_reason="end_turn")],
+            max_request_input_tokens=5000,
+        )
+        before = metrics.TOKEN_BUDGET_EXCEEDED.value(budget="request_input")
+
+        response = await agent.process_command("run it")
+
+        assert not response.success
+        assert agent.provider.create_message.await_count == 1
+        assert [tc["tool"] for tc in response.tool_calls] == ["counter_run"]
+        assert response.errors[-1].category == ErrorCategory.BUDGET_EXCEEDED
+        assert not response.errors[-1].recoverable
+        assert response.usage["input_tokens"] == 5000
+        assert metrics.TOKEN_BUDGET_EXCEEDED.value(budget="request_input") == before + 1
+
+    def test_history_size_is_a_running_count(self):
+        agent = make_agent([])
+        messages = [{"role": "user", "content": "hi"}]
+
+        assert agent._history_chars(messages) == len(json.dumps(messages[0]))
+
+        messages.append({"role": "assistant", "content": [{"type": "text", "text": "hello"}]})
+        with patch("mother.agent.core.json.dumps", wraps=json.dumps) as dumps:
+            chars = agent._history_chars(messages)
+        assert dumps.call_count == 1
+        assert chars == sum(len(json.dumps(m)) for m in messages)
+
+        # A different history (restored session) is measured from scratch
+        assert agent._history_chars([messages[1]]) == len(json.dumps(messages[1]))
+
+    def test_tool_size_uses_serialized_schemas(self):
+        agent = make_agent([])
+
+        assert agent._tool_schema_chars() == len(agent.tool_registry.get_all_anthropic_schemas_json())
+        assert agent._tool_schema_chars() == len(json.dumps(plain_schema(agent.get_tools()), separators=(",", ":")))
+
+    async def test_daily_key_budget(self, store):
+        store.add("ops", "earlier", 900, 100)
+        agent = make_agent(
+            [LLMResponse(text="Done", stop_reason="end_turn", usage=Usage(10, 1))],
+            usage_store=store,
+            daily_key_token_budget=1000,
+        )
+
+        refused = await agent.process_command("hi", key_id="ops")
+        allowed = await agent.process_command("hi", key_id="other")
+
+        assert not refused.success
+        assert refused.errors[0].category == ErrorCategory.BUDGET_EXCEEDED
+        assert "ops" in refused.errors[0].message
+        assert refused.usage["llm_calls"] == 0
+        assert allowed.success
+        assert agent.provider.create_message.await_count == 1
+
+    async def test_daily_key_budget_applies_to_plans(self, store):
+        store.add("ops", "earlier", 1000, 0)
+        agent = make_agent([], usage_store=store, daily_key_token_budget=1000)
+
+        response = await agent.create_plan("merge the invoices", key_id="ops")
+
+        assert not response.success
+        assert response.errors[0].category == ErrorCategory.BUDGET_EXCEEDED
+        assert agent.provider.create_message.await_count == 0
+
+
+class TestUsageEndpoints:
+    """Tests for token usage in GET /status and GET /usage."""
+
+    async def test_status_reports_token_usage(self, store):
+        from mother.api.routes import get_status
+
+        store.add("ops", "s1", 30, 3)
+        agent = make_agent([], usage_store=store)
+        registry = MagicMock()
+        registry.wrappers = {}
+
+        with patch("mother.api.routes.get_settings") as mock_settings:
+            mock_settings.return_value.claude_model = "claude-sonnet-4"
+            response = await get_status(registry, agent)
+
+        assert response.token_usage["total_tokens"] == 33
+        assert "by_key" not in response.token_usage
+
+    async def test_usage_reports_per_key(self, store):
+        from mother.api.routes import get_usage
+
+        store.add("ops", "s1", 30, 3)
+        agent = make_agent([], usage_store=store)
+
+        response = await get_usage("test-key", agent)
+
+        assert response.enabled is True
+        assert response.usage["by_key"]["ops"]["llm_calls"] == 1
@@ -1,5 +1,6 @@
 """Tests for the API routes module."""
 
+import json
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -119,13 +120,15 @@ class TestExecuteCommandEndpoint:
         mock_result.tool_calls = []
         mock_result.pending_confirmation = None
         mock_result.errors = []
+        mock_result.timings = None
+        mock_result.usage = None
 
         mock_agent.process_command = AsyncMock(return_value=mock_result)
 
         request = CommandRequest(command="test command")
 
         with patch("mother.api.routes.get_agent", return_value=mock_agent):
-            response = await execute_command(request, "test-key", mock_agent)
+            response = await execute_command(request, None, mock_agent)
 
         assert response.success is True
         assert response.response == "Command executed"
@@ -148,12 +151,14 @@ class TestExecuteCommandEndpoint:
         ]
         mock_result.pending_confirmation = None
         mock_result.errors = []
+        mock_result.timings = None
+        mock_result.usage = None
 
         mock_agent.process_command = AsyncMock(return_value=mock_result)
 
         request = CommandRequest(command="list files")
 
-        response = await execute_command(request, "test-key", mock_agent)
+        response = await execute_command(request, None, mock_agent)
 
         assert len(response.tool_calls) == 1
         assert response.tool_calls[0].tool == "filesystem"
@@ -176,12 +181,14 @@ class TestExecuteCommandEndpoint:
         mock_result.tool_calls = []
         mock_result.pending_confirmation = mock_confirmation
         mock_result.errors = []
+        mock_result.timings = None
+        mock_result.usage = None
 
         mock_agent.process_command = AsyncMock(return_value=mock_result)
 
         request = CommandRequest(command="delete file")
 
-        response = await execute_command(request, "test-key", mock_agent)
+        response = await execute_command(request, None, mock_agent)
 
         assert response.pending_confirmation is not None
         assert response.pending_confirmation.id == "confirm-123"
@@ -206,12 +213,14 @@ class TestExecuteCommandEndpoint:
         mock_result.tool_calls = []
         mock_result.pending_confirmation = None
         mock_result.errors = [mock_error]
+        mock_result.timings = None
+        mock_result.usage = None
 
         mock_agent.process_command = AsyncMock(return_value=mock_result)
 
         request = CommandRequest(command="fail")
 
-        response = await execute_command(request, "test-key", mock_agent)
+        response = await execute_command(request, None, mock_agent)
 
         assert response.success is False
         assert len(response.errors) == 1
@@ -226,10 +235,33 @@ class TestExecuteCommandEndpoint:
         request = CommandRequest(command="error")
 
         with pytest.raises(HTTPException) as exc_info:
-            await execute_command(request, "test-key", mock_agent)
+            await execute_command(request, None, mock_agent)
 
         assert exc_info.value.status_code == 500
 
+    @pytest.mark.asyncio
+    async def test_execute_command_with_timings(self, mock_agent):
+        """Test a traced request returns its latency breakdown."""
+        from mother.api.routes import execute_command
+
+        timings = {"trace_id": "abc", "total_ms": 12.5, "spans": {"llm.create_message": {"count": 1, "total_ms": 10.0}}}
+        mock_result = MagicMock()
+        mock_result.success = True
+        mock_result.text = "Done"
+        mock_result.tool_calls = []
+        mock_result.pending_confirmation = None
+        mock_result.errors = []
+        mock_result.timings = timings
+        mock_result.usage = None
+
+        mock_agent.process_command = AsyncMock(return_value=mock_result)
+
+        request = CommandRequest(command="test", trace=True)
+        response = await execute_command(request, None, mock_agent)
+
+        assert response.timings == timings
+        assert mock_agent.process_command.call_args.kwargs["trace"] is True
+
 
 class TestConfirmActionEndpoint:
     """Tests for POST /command/{session_id}/confirm endpoint."""
@@ -312,10 +344,48 @@ class TestListToolsEndpoint:
         from mother.api.routes import list_tools
 
         response = await list_tools("test-key", mock_registry)
+        tools = json.loads(response.body)["tools"]
+
+        assert len(tools) == 1
+        assert tools[0]["name"] == "filesystem"
+        assert tools[0]["description"] == "File operations"
+        assert response.headers["ETag"]
+
+    @pytest.mark.asyncio
+    async def test_list_tools_precomputed_and_etag(self, mock_registry):
+        """The body is built once per registry version and honors If-None-Match."""
+        from mother.api.routes import list_tools
+
+        mock_registry.version = 1
+        first = await list_tools("test-key", mock_registry)
+        second = await list_tools("test-key", mock_registry)
+        assert mock_registry.list_tools.call_count == 1
+        assert first.body == second.body
+
+        etag = first.headers["ETag"]
+        not_modified = await list_tools("test-key", mock_registry, if_none_match=f'"other", {etag}')
+        assert not_modified.status_code == 304
+        assert not_modified.body == b""
+
+        mock_registry.version = 2
+        mock_registry.list_tools.return_value = {"web": {"description": "Web", "commands": ["fetch"]}}
+        changed = await list_tools("test-key", mock_registry, if_none_match=etag)
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert json.loads(changed.body)["tools"][0]["name"] == "web"
+
+    @pytest.mark.asyncio
+    async def test_list_tool_schemas(self, mock_registry):
+        """Schemas are served from the registry's pre-serialized JSON."""
+        from mother.api.routes import list_tool_schemas
+
+        mock_registry.version = 1
+        mock_registry.get_all_anthropic_schemas_json.return_value = b'[{"name":"filesystem_read"}]'
+
+        response = await list_tool_schemas("test-key", mock_registry)
 
-        assert len(response.tools) == 1
-        assert response.tools[0].name == "filesystem"
-        assert response.tools[0].description == "File operations"
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == [{"name": "filesystem_read"}]
 
 
 class TestGetToolDetailsEndpoint:
@@ -434,6 +504,7 @@ class TestGetStatusEndpoint:
 
         mock_agent = MagicMock()
         mock_agent.get_memory_stats.return_value = {"total_memories": 100}
+        mock_agent.get_token_usage.return_value = None
 
         with patch("mother.api.routes.get_settings") as mock_settings:
             mock_settings.return_value.claude_model = "claude-sonnet-4"
@@ -542,7 +613,7 @@ class TestCreatePlanEndpoint:
 
         request = PlanCommandRequest(command="process file")
 
-        response = await create_plan(request, "test-key", mock_agent)
+        response = await create_plan(request, None, mock_agent)
 
         assert response.success is True
         assert response.plan is not None
@@ -559,7 +630,7 @@ class TestCreatePlanEndpoint:
         request = PlanCommandRequest(command="process file")
 
         with pytest.raises(HTTPException) as exc_info:
-            await create_plan(request, "test-key", mock_agent)
+            await create_plan(request, None, mock_agent)
 
         assert exc_info.value.status_code == 500
         assert "Plan creation failed" in exc_info.value.detail
@@ -0,0 +1,155 @@
+"""Tests for the benchmark suite."""
+
+import json
+import time
+from dataclasses import replace
+
+import pytest
+
+from mother.bench import BenchConfig, compare, flatten, run_suite, summarize
+from mother.cli import main
+from mother.llm.providers.mock import MockProvider
+from mother.llm.response import LLMResponse, ToolCall
+
+TINY = replace(
+    BenchConfig.quick(),
+    llm_latency=0.0,
+    turns=3,
+    requests=6,
+    concurrency=3,
+    policy_evals=100,
+    vector_counts=(200, 500),
+    vector_dim=8,
+    searches=2,
+    history_sizes=(4, 40),
+    audit_entries=50,
+)
+
+
+class TestMockProviderScript:
+    """Tests for the scripted mock provider."""
+
+    @pytest.fixture
+    def provider(self):
+        return MockProvider(
+            api_key="test",
+            model="mock",
+            script=[
+                LLMResponse(tool_calls=[ToolCall(id="a", name="demo_one", arguments={})]),
+                LLMResponse(tool_calls=[ToolCall(id="b", name="demo_two", arguments={})]),
+                LLMResponse(text="Done", stop_reason="end_turn"),
+            ],
+        )
+
+    async def test_script_follows_the_conversation(self, provider):
+        messages = [{"role": "user", "content": "go"}]
+        first = await provider.create_message(messages)
+        messages += [
+            {"role": "assistant", "content": []},
+            {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "a", "content": "ok"}]},
+        ]
+        second = await provider.create_message(messages)
+        messages += [
+            {"role": "assistant", "content": []},
+            {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "b", "content": "ok"}]},
+            {"role": "assistant", "content": []},
+            {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "c", "content": "ok"}]},
+        ]
+        last = await provider.create_message(messages)
+
+        assert first.tool_calls[0].name == "demo_one"
+        assert second.tool_calls[0].name == "demo_two"
+        assert last.text == "Done"
+
+    async def test_script_restarts_with_each_command(self, provider):
+        messages = [
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": []},
+            {"role": "user", "content": "second"},
+        ]
+
+        response = await provider.create_message(messages)
+
+        assert response.tool_calls[0].name == "demo_one"
+
+    async def test_latency(self):
+        provider = MockProvider(api_key="test", model="mock", latency=0.05)
+
+        started = time.perf_counter()
+        await provider.create_message([{"role": "user", "content": "hello"}])
+
+        assert time.perf_counter() - started >= 0.05
+
+
+class TestResults:
+    """Tests for summarizing and comparing results."""
+
+    def test_summarize(self):
+        summary = summarize([i / 1000 for i in range(1, 101)])
+
+        assert summary["count"] == 100
+        assert summary["p50_ms"] == 50
+        assert summary["p99_ms"] == 99
+        assert summary["max_ms"] == 100
+        assert summary["mean_ms"] == 50.5
+
+    def test_compare(self):
+        baseline = {"scenarios": {"a": {"rate": 100, "latency": {"p50_ms": 10.0}, "zero": 0, "ok": True}}}
+        current = {"scenarios": {"a": {"rate": 150, "latency": {"p50_ms": 8.0}, "zero": 1}, "b": {"rate": 1}}}
+
+        assert flatten(current["scenarios"]) == {"a.rate": 150, "a.latency.p50_ms": 8.0, "a.zero": 1, "b.rate": 1}
+        assert compare(baseline, current) == [
+            ("a.rate", 100, 150, 50.0),
+            ("a.latency.p50_ms", 10.0, 8.0, -20.0),
+            ("a.zero", 0, 1, None),
+        ]
+
+
+class TestSuite:
+    """Tests for running the scenarios."""
+
+    async def test_in_process_scenarios(self):
+        names = [
+            "turn_latency",
+            "command_throughput",
+            "tool_routing",
+            "policy_eval",
+            "memory_search",
+            "session_roundtrip",
+            "audit_write",
+        ]
+
+        results = await run_suite(names, TINY)
+
+        scenarios = results["scenarios"]
+        assert list(scenarios) == names
+        assert results["config"]["vector_counts"] == (200, 500)
+        assert scenarios["turn_latency"]["count"] == 3
+        assert scenarios["turn_latency"]["failures"] == 0
+        assert scenarios["command_throughput"]["count"] == 6
+        assert scenarios["command_throughput"]["failures"] == 0
+        routing = scenarios["tool_routing"]
+        assert routing["all_tools"]["failures"] == routing["routed"]["failures"] == 0
+        assert routing["routed"]["input_tokens_per_turn"] < routing["all_tools"]["input_tokens_per_turn"]
+        assert routing["routed"]["time_to_first_response"]["count"] == 3
+        assert scenarios["policy_eval"]["evaluations"] == 100
+        assert set(scenarios["memory_search"]["vectors"]) == {"200", "500"}
+        assert scenarios["session_roundtrip"]["messages"]["40"]["load"]["count"] == TINY.session_repeats
+        assert scenarios["audit_write"]["entries"] == 50
+        assert scenarios["audit_write"]["bytes"] > 0
+        json.dumps(results)
+
+    async def test_unknown_scenario(self):
+        with pytest.raises(ValueError, match="Unknown scenarios: nope"):
+            await run_suite(["nope"], TINY)
+
+    def test_cli(self, tmp_path, capsys):
+        output = tmp_path / "run.json"
+
+        assert main(["bench", "--quick", "policy_eval", "-o", str(output)]) == 0
+        assert main(["bench", "--quick", "policy_eval", "--compare", str(output)]) == 0
+
+        assert json.loads(output.read_text())["scenarios"]["policy_eval"]["evaluations"] == 2000
+        out = capsys.readouterr().out
+        assert "Running policy_eval..." in out
+        assert "policy_eval.evals_per_s" in out
@@ -1,5 +1,13 @@
 """Tests for the built-in datacraft plugin."""
 
+import asyncio
+import importlib.util
+import json
+import os
+import signal
+import sqlite3
+from concurrent.futures.process import BrokenProcessPool
+
 import pytest
 from pypdf import PdfWriter
 
@@ -8,7 +16,13 @@ from mother.plugins.builtin.datacraft.parsers import (
     chunk_text,
     detect_document_type,
 )
-from mother.plugins.builtin.datacraft.storage import Document, DocumentStore
+from mother.plugins.builtin.datacraft.storage import FTS_DEFER_THRESHOLD, Document, DocumentStore
+from mother.plugins.process import stream_output
+
+# Parsing goes through the external DataCraft engine
+needs_engine = pytest.mark.skipif(
+    importlib.util.find_spec("datacraft") is None, reason="needs the DataCraft parsing engine"
+)
 
 
 class TestChunkText:
@@ -165,6 +179,77 @@ class TestDocumentStore:
         assert stats["total_chunks"] == 3
         assert stats["total_entities"] == 1
 
+    def test_skips_unchanged_file_hash(self, store, sample_doc):
+        """Test a file already stored under another ID is not stored again."""
+        store.store_document(sample_doc)
+        copy = Document(doc_id="copy789", filename="copy.pdf", doc_type="invoice", content="x", file_hash="abc123")
+
+        assert store.store_document(copy) == "test123"
+        assert store.get_document("copy789") is None
+        assert len(store.list_documents()) == 1
+
+    def test_incremental_chunk_update(self, store, sample_doc):
+        """Test re-storing a changed document only rewrites changed chunks."""
+        store.store_document(sample_doc)
+        with sqlite3.connect(store.db_path) as conn:
+            before = conn.execute("SELECT chunk_index, id FROM chunks ORDER BY chunk_index").fetchall()
+
+        sample_doc.chunks = ["This is test", "revised paragraph"]
+        sample_doc.file_hash = "def456"
+        store.store_document(sample_doc)
+
+        with sqlite3.connect(store.db_path) as conn:
+            after = conn.execute("SELECT chunk_index, id FROM chunks ORDER BY chunk_index").fetchall()
+            conn.execute("INSERT INTO chunks_fts(chunks_fts, rank) VALUES('integrity-check', 1)")
+        assert after == before[:2]
+        assert store.get_document("test123").chunks == ["This is test", "revised paragraph"]
+        assert [r.doc_id for r in store.search("revised")] == ["test123"]
+        assert store.search("document") == []
+
+    def test_large_batch_is_searchable(self, store):
+        """Test a batch indexed in bulk is searchable and later writes still index."""
+        docs = [
+            Document(
+                doc_id=f"doc{i}",
+                filename=f"doc{i}.txt",
+                doc_type="other",
+                content="bulk",
+                chunks=[f"bulk{i} chunk{j}" for j in range(10)],
+                file_hash=f"hash{i}",
+            )
+            for i in range(FTS_DEFER_THRESHOLD // 10 + 1)
+        ]
+        store.store_documents(docs)
+        store.store_document(
+            Document(doc_id="late", filename="late.txt", doc_type="other", content="x", chunks=["late"])
+        )
+
+        assert store.search("bulk7")[0].doc_id == "doc7"
+        assert [r.doc_id for r in store.search("late")] == ["late"]
+        with sqlite3.connect(store.db_path) as conn:
+            conn.execute("INSERT INTO chunks_fts(chunks_fts, rank) VALUES('integrity-check', 1)")
+        store.optimize_index()
+        assert store.search("bulk7")[0].doc_id == "doc7"
+
+    def test_migrates_duplicate_file_hashes(self, tmp_path):
+        """Test databases with duplicate hashes get the unique index."""
+        db_path = tmp_path / "old.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE documents (doc_id TEXT PRIMARY KEY, filename TEXT NOT NULL, "
+                "doc_type TEXT NOT NULL, content TEXT NOT NULL, file_hash TEXT, pages INTEGER DEFAULT 0, "
+                "metadata TEXT, created_at TEXT NOT NULL)"
+            )
+            conn.executemany(
+                "INSERT INTO documents VALUES (?, ?, 'other', 'x', ?, 0, '{}', '2024-01-01T00:00:00')",
+                [("a", "a.txt", "same"), ("b", "b.txt", "same"), ("c", "c.txt", "")],
+            )
+
+        store = DocumentStore(db_path)
+
+        assert store.known_file_hashes() == {"same": "a"}
+        assert len(store.list_documents()) == 3
+
     def test_generate_doc_id(self, store):
         """Test document ID generation."""
         id1 = store.generate_doc_id("content1", "file1.pdf")
@@ -213,7 +298,7 @@ class TestDatacraftPlugin:
     def test_capabilities(self, plugin):
         """Test plugin capabilities are defined."""
         caps = plugin.get_capabilities()
-        assert len(caps) == 8
+        assert len(caps) == 10
         cap_names = [c.name for c in caps]
         assert "process" in cap_names
         assert "search" in cap_names
@@ -381,3 +466,198 @@ class TestDatacraftPlugin:
         result = await plugin.execute("process", {"path": str(unsupported)})
         # Should fail gracefully
         assert result.data["failed"] == 1
+
+
+class TestBatchIngestion:
+    """Tests for parallel, batched directory ingestion."""
+
+    @pytest.fixture
+    def plugin(self, tmp_path):
+        """Create a plugin with two parser processes."""
+        plugin = DatacraftPlugin(config={"db_path": str(tmp_path / "test.db"), "ingest_workers": 2})
+        yield plugin
+        if plugin._executor:
+            plugin._executor.shutdown(cancel_futures=True)
+
+    @pytest.fixture
+    def corpus(self, tmp_path):
+        """Create a directory of plain-text and markdown documents."""
+        docs = tmp_path / "docs"
+        (docs / "notes").mkdir(parents=True)
+        for i in range(6):
+            (docs / f"letter{i}.txt").write_text(f"Dear reader, this is letter number {i}.")
+        for i in range(4):
+            (docs / "notes" / f"note{i}.md").write_text(f"# Note {i}\n\nMeeting notes, item {i}.")
+        return docs
+
+    @needs_engine
+    @pytest.mark.asyncio
+    async def test_process_directory_recursive(self, plugin, corpus):
+        """Test every file is parsed and stored."""
+        result = await plugin.execute("process", {"path": str(corpus), "recursive": True, "batch_size": 3})
+
+        assert result.success is True
+        assert result.data["processed"] == 10
+        assert result.data["skipped"] == 0
+        assert result.data["status"] == "completed"
+
+        stats = await plugin.execute("stats", {})
+        assert stats.data["total_documents"] == 10
+
+    @needs_engine
+    @pytest.mark.asyncio
+    async def test_skips_already_stored_files(self, plugin, corpus):
+        """Test files whose hash is already stored are not parsed again."""
+        first = await plugin.execute("process", {"path": str(corpus), "recursive": True})
+        (corpus / "new.txt").write_text("A brand new document.")
+
+        second = await plugin.execute("process", {"path": str(corpus), "recursive": True})
+
+        assert second.data["processed"] == 1
+        assert second.data["skipped"] == 10
+        first_ids = {d["filename"]: d["doc_id"] for d in first.data["documents"]}
+        for doc in second.data["documents"]:
+            if doc.get("skipped"):
+                assert doc["doc_id"] == first_ids[doc["filename"]]
+
+    @needs_engine
+    @pytest.mark.asyncio
+    async def test_streams_progress(self, plugin, corpus):
+        """Test progress is reported once per file."""
+        events = []
+        with stream_output(lambda name, chunk: events.append((name, json.loads(chunk)))):
+            await plugin.execute("process", {"path": str(corpus)})
+
+        assert [name for name, _ in events] == ["progress"] * 6
+        assert sorted(e["done"] for _, e in events) == list(range(1, 7))
+        assert all(e["total"] == 6 for _, e in events)
+
+    @needs_engine
+    @pytest.mark.asyncio
+    async def test_streams_progress_to_async_callback(self, plugin, corpus):
+        """Test an async progress callback is awaited."""
+        events = []
+
+        async def on_output(name, chunk):
+            events.append(json.loads(chunk))
+
+        with stream_output(on_output):
+            await plugin.execute("process", {"path": str(corpus)})
+
+        assert len(events) == 6
+
+    @needs_engine
+    @pytest.mark.asyncio
+    async def test_failing_progress_callback_does_not_fail_job(self, plugin, corpus):
+        """Test a broken progress callback is disabled instead of failing the job."""
+        calls = []
+
+        def broken(name, chunk):
+            calls.append(name)
+            raise RuntimeError("client went away")
+
+        with stream_output(broken):
+            result = await plugin.execute("process", {"path": str(corpus)})
+
+        assert result.success is True
+        assert result.data["processed"] == 6
+        assert calls == ["progress"]
+
+    @needs_engine
+    @pytest.mark.asyncio
+    async def test_background_job_status(self, plugin, corpus):
+        """Test a background job can be polled until it completes."""
+        started = await plugin.execute("process", {"path": str(corpus), "recursive": True, "background": True})
+        job_id = started.data["job_id"]
+        assert started.data["status"] == "running"
+
+        await plugin._jobs[job_id].task
+        status = await plugin.execute("job_status", {"job_id": job_id})
+
+        assert status.success is True
+        assert status.data["status"] == "completed"
+        assert status.data["processed"] == 10
+
+    @needs_engine
+    @pytest.mark.asyncio
+    async def test_cancel_and_resume(self, plugin, corpus):
+        """Test a cancelled job keeps its progress and can be resumed."""
+        started = await plugin.execute(
+            "process", {"path": str(corpus), "recursive": True, "background": True, "batch_size": 1}
+        )
+        job_id = started.data["job_id"]
+
+        cancelled = await plugin.execute("cancel_job", {"job_id": job_id})
+        assert cancelled.success is True
+        assert cancelled.data["status"] in ("cancelled", "completed")
+        done = cancelled.data["processed"]
+
+        resumed = await plugin.execute("process", {"job_id": job_id})
+
+        assert resumed.data["job_id"] == job_id
+        assert resumed.data["status"] == "completed"
+        assert resumed.data["skipped"] == done
+        assert resumed.data["processed"] == 10 - done
+        stats = await plugin.execute("stats", {})
+        assert stats.data["total_documents"] == 10
+
+    @needs_engine
+    @pytest.mark.asyncio
+    async def test_job_status_survives_restart(self, plugin, corpus, tmp_path):
+        """Test job records are read back from the database."""
+        result = await plugin.execute("process", {"path": str(corpus)})
+
+        fresh = DatacraftPlugin(config={"db_path": str(tmp_path / "test.db")})
+        status = await fresh.execute("job_status", {"job_id": result.data["job_id"]})
+
+        assert status.data["status"] == "completed"
+        assert status.data["processed"] == 6
+
+    @pytest.mark.asyncio
+    async def test_parser_pool_replaced_after_worker_dies(self, plugin):
+        """Test a dead parser process fails its own file but not later ones."""
+        pipeline = plugin._pipeline()
+        broken = pipeline.executor
+
+        with pytest.raises(BrokenProcessPool):
+            await pipeline._submit(os._exit, 1)
+
+        assert await pipeline._submit(abs, -3) == 3
+        assert plugin._executor is pipeline.executor is not broken
+
+    @pytest.mark.asyncio
+    async def test_parser_pool_killed_between_files(self, plugin):
+        """Test a submission to a pool broken earlier runs on a new pool."""
+        pipeline = plugin._pipeline()
+        broken = pipeline.executor
+        await pipeline._submit(abs, -1)
+        os.kill(next(iter(broken._processes)), signal.SIGKILL)
+        while not broken._broken:
+            await asyncio.sleep(0.01)
+
+        assert await pipeline._submit(abs, -2) == 2
+        assert plugin._executor is not broken
+
+    @pytest.mark.asyncio
+    async def test_unknown_job(self, plugin):
+        """Test unknown job IDs are reported."""
+        status = await plugin.execute("job_status", {"job_id": "nope"})
+        cancel = await plugin.execute("cancel_job", {"job_id": "nope"})
+        resume = await plugin.execute("process", {"job_id": "nope"})
+
+        assert status.error_code == "NOT_FOUND"
+        assert cancel.error_code == "NOT_FOUND"
+        assert resume.error_code == "NOT_FOUND"
+
+    def test_store_documents_batch(self, tmp_path):
+        """Test several documents are written in one call."""
+        store = DocumentStore(tmp_path / "batch.db")
+        docs = [
+            Document(
+                doc_id=f"d{i}", filename=f"f{i}.txt", doc_type="other", content="x", chunks=["x"], file_hash=f"h{i}"
+            )
+            for i in range(5)
+        ]
+
+        assert store.store_documents(docs) == [f"d{i}" for i in range(5)]
+        assert store.known_file_hashes() == {f"h{i}": f"d{i}" for i in range(5)}
@@ -494,26 +494,119 @@ class TestListDirectory:
 
     @pytest.mark.asyncio
     async def test_list_directory_permission_error_handling(self, tmp_path):
-        """Test directory listing handles permission errors on items."""
+        """Test directory listing handles entries that cannot be stat'ed."""
         plugin = FilesystemPlugin()
-        test_file = tmp_path / "accessible.txt"
-        test_file.write_text("test")
-
-        # Mock Path.stat to raise PermissionError for specific file
-        original_stat = Path.stat
-
-        def mock_stat(self, *args, **kwargs):
-            if "accessible" in str(self):
-                raise PermissionError("access denied")
-            return original_stat(self, *args, **kwargs)
+        (tmp_path / "accessible.txt").write_text("test")
+        (tmp_path / "dangling").symlink_to(tmp_path / "missing")
 
-        with patch.object(Path, "stat", mock_stat):
-            result = await plugin.execute("list_directory", {"path": str(tmp_path)})
+        result = await plugin.execute("list_directory", {"path": str(tmp_path)})
 
         assert result.success is True
         # Should still have entries, but with error info
         entries_with_error = [e for e in result.data["entries"] if "error" in e]
-        assert len(entries_with_error) > 0
+        assert [e["name"] for e in entries_with_error] == ["dangling"]
+
+    @pytest.mark.asyncio
+    async def test_list_directory_pagination(self, tmp_path):
+        """Test resuming a recursive listing from its cursor."""
+        plugin = FilesystemPlugin()
+        for d in range(3):
+            (tmp_path / f"dir{d}" / "sub").mkdir(parents=True)
+            for f in range(4):
+                (tmp_path / f"dir{d}" / f"file{f}.txt").write_text("x")
+                (tmp_path / f"dir{d}" / "sub" / f"nested{f}.txt").write_text("x")
+
+        full = await plugin.execute("list_directory", {"path": str(tmp_path), "recursive": True})
+        paged, cursor = [], None
+        while True:
+            params = {"path": str(tmp_path), "recursive": True, "max_entries": 5}
+            if cursor:
+                params["cursor"] = cursor
+            page = await plugin.execute("list_directory", params)
+            paged += page.data["entries"]
+            cursor = page.data.get("next_cursor")
+            if not cursor:
+                break
+
+        assert full.data["count"] == 30
+        assert full.data["truncated"] is False
+        assert [e["path"] for e in paged] == [e["path"] for e in full.data["entries"]]
+
+    @pytest.mark.asyncio
+    async def test_list_directory_invalid_cursor(self, tmp_path):
+        """Test that malformed cursors are rejected."""
+        plugin = FilesystemPlugin()
+
+        result = await plugin.execute("list_directory", {"path": str(tmp_path), "cursor": "not-a-cursor"})
+
+        assert result.error_code == "INVALID_CURSOR"
+
+    @pytest.mark.asyncio
+    async def test_list_directory_max_depth(self, tmp_path):
+        """Test that max_depth limits recursion."""
+        plugin = FilesystemPlugin()
+        (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+        (tmp_path / "a" / "b" / "c" / "deep.txt").write_text("x")
+
+        result = await plugin.execute("list_directory", {"path": str(tmp_path), "recursive": True, "max_depth": 2})
+
+        assert [e["name"] for e in result.data["entries"]] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_list_directory_prunes_hidden_and_ignored(self, tmp_path):
+        """Test that hidden and .gitignore'd directories are not descended."""
+        plugin = FilesystemPlugin()
+        (tmp_path / ".git" / "objects").mkdir(parents=True)
+        (tmp_path / ".git" / "objects" / "ab").write_text("x")
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_path / "node_modules" / "pkg" / "index.js").write_text("x")
+        (tmp_path / "build.pyc").write_text("x")
+        (tmp_path / "main.py").write_text("x")
+        (tmp_path / ".gitignore").write_text("node_modules/\n*.pyc\n")
+
+        result = await plugin.execute("list_directory", {"path": str(tmp_path), "recursive": True})
+        unfiltered = await plugin.execute(
+            "list_directory", {"path": str(tmp_path), "recursive": True, "respect_ignore": False}
+        )
+
+        assert [e["name"] for e in result.data["entries"]] == ["main.py"]
+        assert "index.js" in [e["name"] for e in unfiltered.data["entries"]]
+
+    @pytest.mark.asyncio
+    async def test_list_directory_flat_listing_is_not_capped_or_filtered(self, tmp_path):
+        """Test that a non-recursive listing keeps returning every entry by default."""
+        plugin = FilesystemPlugin()
+        for i in range(1005):
+            (tmp_path / f"f{i:04d}.txt").write_text("x")
+        (tmp_path / "build.pyc").write_text("x")
+        (tmp_path / ".gitignore").write_text("*.pyc\n")
+
+        flat = await plugin.execute("list_directory", {"path": str(tmp_path)})
+        walked = await plugin.execute("list_directory", {"path": str(tmp_path), "recursive": True})
+
+        assert flat.data["count"] == 1006
+        assert flat.data["truncated"] is False
+        assert "build.pyc" in [e["name"] for e in flat.data["entries"]]
+        assert walked.data["count"] == 1000
+        assert walked.data["truncated"] is True
+        assert "build.pyc" not in [e["name"] for e in walked.data["entries"]]
+
+    @pytest.mark.asyncio
+    async def test_list_directory_summary(self, tmp_path):
+        """Test per-directory size aggregation."""
+        plugin = FilesystemPlugin()
+        (tmp_path / "logs" / "old").mkdir(parents=True)
+        (tmp_path / "logs" / "app.log").write_bytes(b"x" * 100)
+        (tmp_path / "logs" / "old" / "app.1.log").write_bytes(b"x" * 300)
+        (tmp_path / "readme.txt").write_bytes(b"x" * 5)
+
+        result = await plugin.execute("list_directory", {"path": str(tmp_path), "recursive": True, "summary": True})
+
+        assert result.data["total_files"] == 3
+        assert result.data["total_size"] == 405
+        sizes = {Path(d["path"]).name: (d["files"], d["size"]) for d in result.data["directories"]}
+        assert sizes["logs"] == (2, 400)
+        assert sizes["old"] == (1, 300)
 
 
 class TestFileInfo:
@@ -945,3 +1038,258 @@ class TestExists:
         assert result.data["exists"] is False
         assert result.data["is_file"] is None
         assert result.data["is_directory"] is None
+
+
+class TestReadFileRange:
+    """Tests for partial reads of read_file."""
+
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_text("".join(f"line {i}\n" for i in range(1, 1001)))
+        return path
+
+    @pytest.mark.asyncio
+    async def test_head_and_tail(self, log_file):
+        """Test reading the first and last lines."""
+        plugin = FilesystemPlugin()
+
+        head = await plugin.execute("read_file", {"path": str(log_file), "head": 3})
+        tail = await plugin.execute("read_file", {"path": str(log_file), "tail": 2})
+
+        assert head.data["content"] == "line 1\nline 2\nline 3\n"
+        assert head.data["truncated"] is True
+        assert head.data["next_offset"] == head.data["end"]
+        assert tail.data["content"] == "line 999\nline 1000\n"
+        assert tail.data["end"] == log_file.stat().st_size
+
+    @pytest.mark.asyncio
+    async def test_offset_and_length(self, log_file):
+        """Test reading a byte range and continuing from next_offset."""
+        plugin = FilesystemPlugin()
+
+        first = await plugin.execute("read_file", {"path": str(log_file), "offset": 0, "length": 14})
+        second = await plugin.execute(
+            "read_file", {"path": str(log_file), "offset": first.data["next_offset"], "length": 7}
+        )
+
+        assert first.data["content"] == "line 1\nline 2\n"
+        assert second.data["content"] == "line 3\n"
+
+    @pytest.mark.asyncio
+    async def test_range_of_file_larger_than_max_size(self, log_file):
+        """Test that ranges work on files too large to read whole."""
+        plugin = FilesystemPlugin()
+
+        whole = await plugin.execute("read_file", {"path": str(log_file), "max_size": 100})
+        tail = await plugin.execute("read_file", {"path": str(log_file), "tail": 1, "max_size": 100})
+        capped = await plugin.execute("read_file", {"path": str(log_file), "offset": 0, "max_size": 10})
+
+        assert whole.error_code == "FILE_TOO_LARGE"
+        assert tail.data["content"] == "line 1000\n"
+        assert len(capped.data["content"]) == 10
+
+    @pytest.mark.asyncio
+    async def test_range_does_not_split_characters(self, tmp_path):
+        """Test that multi-byte characters cut by the range are dropped."""
+        plugin = FilesystemPlugin()
+        test_file = tmp_path / "utf8.txt"
+        test_file.write_text("aéb", encoding="utf-8")
+
+        result = await plugin.execute("read_file", {"path": str(test_file), "offset": 2, "length": 2})
+
+        assert result.data["content"] == "b"
+        assert result.data["start"] == 3
+
+    @pytest.mark.asyncio
+    async def test_conflicting_ranges_rejected(self, log_file):
+        """Test that head and tail cannot be combined."""
+        plugin = FilesystemPlugin()
+
+        result = await plugin.execute("read_file", {"path": str(log_file), "head": 1, "tail": 1})
+
+        assert result.error_code == "INVALID_RANGE"
+
+    @pytest.mark.asyncio
+    async def test_head_and_tail_across_scan_blocks(self, log_file):
+        """Test line scanning when lines straddle read blocks."""
+        plugin = FilesystemPlugin()
+
+        with patch("mother.plugins.builtin.filesystem._LINE_SCAN_CHUNK", 5):
+            head = await plugin.execute("read_file", {"path": str(log_file), "head": 12})
+            tail = await plugin.execute("read_file", {"path": str(log_file), "tail": 3})
+            everything = await plugin.execute("read_file", {"path": str(log_file), "tail": 5000})
+
+        assert head.data["content"] == "".join(f"line {i}\n" for i in range(1, 13))
+        assert tail.data["content"] == "line 998\nline 999\nline 1000\n"
+        assert everything.data["start"] == 0
+
+    @pytest.mark.asyncio
+    async def test_range_of_file_truncated_during_read(self, log_file):
+        """Test that a file truncated after it was sized reads short instead of faulting."""
+        plugin = FilesystemPlugin()
+        real_fstat = os.fstat
+
+        def fstat_then_truncate(fd):
+            result = real_fstat(fd)
+            os.truncate(log_file, 100)
+            return result
+
+        with patch("mother.plugins.builtin.filesystem.os.fstat", side_effect=fstat_then_truncate):
+            result = await plugin.execute("read_file", {"path": str(log_file), "offset": 50})
+
+        assert result.success is True
+        assert result.data["start"] == 50
+        assert result.data["end"] == 100
+        assert len(result.data["content"]) == 50
+
+    @pytest.mark.asyncio
+    async def test_range_of_empty_file(self, tmp_path):
+        """Test that empty files can be read by range."""
+        plugin = FilesystemPlugin()
+        test_file = tmp_path / "empty.txt"
+        test_file.touch()
+
+        result = await plugin.execute("read_file", {"path": str(test_file), "tail": 5})
+
+        assert result.success is True
+        assert result.data["content"] == ""
+
+
+class TestFastCopy:
+    """Tests for the copy fast paths."""
+
+    @pytest.mark.asyncio
+    async def test_copy_preserves_content_and_mtime(self, tmp_path):
+        """Test that kernel copies produce identical files."""
+        plugin = FilesystemPlugin()
+        source = tmp_path / "big.bin"
+        source.write_bytes(os.urandom(3 * 1024 * 1024))
+        os.utime(source, (1_600_000_000, 1_600_000_000))
+
+        result = await plugin.execute("copy_file", {"source": str(source), "destination": str(tmp_path / "copy.bin")})
+
+        assert result.success is True
+        assert result.data["method"] in ("copy_file_range", "sendfile", "read_write")
+        assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+        assert (tmp_path / "copy.bin").stat().st_mtime == 1_600_000_000
+
+    @pytest.mark.asyncio
+    async def test_copy_falls_back_when_kernel_copy_unsupported(self, tmp_path):
+        """Test the read/write fallback."""
+        plugin = FilesystemPlugin()
+        source = tmp_path / "source.txt"
+        source.write_text("fallback")
+
+        with (
+            patch("os.copy_file_range", side_effect=OSError(18, "Invalid cross-device link"), create=True),
+            patch("os.sendfile", side_effect=OSError(22, "Invalid argument")),
+        ):
+            result = await plugin.execute(
+                "copy_file", {"source": str(source), "destination": str(tmp_path / "dest.txt")}
+            )
+
+        assert result.data["method"] == "read_write"
+        assert (tmp_path / "dest.txt").read_text() == "fallback"
+
+    @pytest.mark.asyncio
+    async def test_copy_onto_itself_keeps_file(self, tmp_path):
+        """Test that overwriting a file with itself does not truncate it."""
+        plugin = FilesystemPlugin()
+        source = tmp_path / "same.txt"
+        source.write_text("keep me")
+
+        result = await plugin.execute(
+            "copy_file", {"source": str(source), "destination": str(source), "overwrite": True}
+        )
+
+        assert result.success is False
+        assert source.read_text() == "keep me"
+
+
+class TestGrep:
+    """Tests for grep capability."""
+
+    @pytest.mark.asyncio
+    async def test_grep_file(self, tmp_path):
+        """Test matching lines in a single file."""
+        plugin = FilesystemPlugin()
+        log = tmp_path / "app.log"
+        log.write_text("INFO start\nERROR disk full\nINFO retry\nerror again\n")
+
+        result = await plugin.execute("grep", {"path": str(log), "pattern": "error", "ignore_case": True})
+
+        assert result.success is True
+        assert [(m["line_number"], m["line"]) for m in result.data["matches"]] == [
+            (2, "ERROR disk full"),
+            (4, "error again"),
+        ]
+        assert result.data["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_grep_stops_at_max_matches(self, tmp_path):
+        """Test that the match cap ends the search."""
+        plugin = FilesystemPlugin()
+        log = tmp_path / "big.log"
+        log.write_text("match\n" * 10_000)
+
+        result = await plugin.execute("grep", {"path": str(log), "pattern": "match", "max_matches": 5})
+
+        assert result.data["count"] == 5
+        assert result.data["truncated"] is True
+        assert result.data["truncated_by"] == "max_matches"
+
+    @pytest.mark.asyncio
+    async def test_grep_stops_at_max_files(self, tmp_path):
+        """Test that the file budget ends a search with no matches."""
+        plugin = FilesystemPlugin()
+        for i in range(10):
+            (tmp_path / f"{i}.txt").write_text("nothing here\n")
+
+        result = await plugin.execute("grep", {"path": str(tmp_path), "pattern": "missing", "max_files": 3})
+
+        assert result.data["files_searched"] == 3
+        assert result.data["truncated_by"] == "max_files"
+
+    @pytest.mark.asyncio
+    async def test_grep_streams_a_line_without_newlines(self, tmp_path):
+        """Test a newline-free file is read in bounded pieces under the byte budget."""
+        plugin = FilesystemPlugin()
+        blob = tmp_path / "min.js"
+        blob.write_text("x" * 1_000_000 + "needle")
+
+        capped = await plugin.execute("grep", {"path": str(blob), "pattern": "needle", "max_bytes": 200_000})
+        found = await plugin.execute("grep", {"path": str(blob), "pattern": "needle"})
+
+        assert capped.data["count"] == 0
+        assert capped.data["truncated_by"] == "max_bytes"
+        assert found.data["count"] == 1
+        assert found.data["matches"][0]["line_number"] == 1
+        assert len(found.data["matches"][0]["line"]) <= 500
+        assert found.data["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_grep_directory(self, tmp_path):
+        """Test searching a tree, skipping hidden and binary files."""
+        plugin = FilesystemPlugin()
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.py").write_text("TODO: fix\n")
+        (tmp_path / "src" / "b.txt").write_text("TODO: not python\n")
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "c.py").write_text("TODO: hidden\n")
+        (tmp_path / "d.py").write_bytes(b"TODO\0binary")
+
+        result = await plugin.execute(
+            "grep", {"path": str(tmp_path), "pattern": "TODO", "fixed_string": True, "file_pattern": "*.py"}
+        )
+
+        assert [Path(m["path"]).name for m in result.data["matches"]] == ["a.py"]
+
+    @pytest.mark.asyncio
+    async def test_grep_invalid_pattern(self, tmp_path):
+        """Test invalid regular expressions."""
+        plugin = FilesystemPlugin()
+
+        result = await plugin.execute("grep", {"path": str(tmp_path), "pattern": "("})
+
+        assert result.error_code == "INVALID_PATTERN"
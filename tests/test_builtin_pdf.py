@@ -1,8 +1,14 @@
 """Tests for the built-in PDF plugin."""
 
+import asyncio
+import os
+import signal
+from concurrent.futures.process import BrokenProcessPool
+
 import pytest
-from pypdf import PdfWriter
+from pypdf import PdfReader, PdfWriter
 
+from mother.plugins.builtin import pdf
 from mother.plugins.builtin.pdf import PDFPlugin, parse_page_spec
 
 
@@ -108,7 +114,7 @@ class TestPDFPlugin:
     def test_capabilities(self, plugin):
         """Test plugin capabilities are defined."""
         caps = plugin.get_capabilities()
-        assert len(caps) == 7
+        assert len(caps) == 8
         cap_names = [c.name for c in caps]
         assert "merge" in cap_names
         assert "split" in cap_names
@@ -117,6 +123,7 @@ class TestPDFPlugin:
         assert "rotate" in cap_names
         assert "delete_pages" in cap_names
         assert "count_pages" in cap_names
+        assert "batch" in cap_names
 
     def test_delete_pages_requires_confirmation(self, plugin):
         """Test delete_pages requires confirmation."""
@@ -469,3 +476,138 @@ class TestPDFPluginCountPages:
         result = await plugin.execute("count_pages", {"input": "/nonexistent.pdf"})
         assert result.success is False
         assert result.error_code == "FILE_NOT_FOUND"
+
+
+def _write_pdf(path, pages):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+class TestPDFPluginMetadataCache:
+    """Tests for the (path, mtime, size) metadata cache."""
+
+    @pytest.mark.asyncio
+    async def test_info_and_count_share_one_read(self, tmp_path, monkeypatch):
+        """Test repeated info/count_pages calls only parse the file once."""
+        sample = _write_pdf(tmp_path / "sample.pdf", 4)
+        reads = []
+        original = pdf.read_metadata
+        monkeypatch.setattr(pdf, "read_metadata", lambda path: reads.append(path) or original(path))
+        plugin = PDFPlugin()
+
+        await plugin.execute("info", {"input": str(sample)})
+        result = await plugin.execute("count_pages", {"input": str(sample)})
+
+        assert result.data["pages"] == 4
+        assert len(reads) == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_file_is_read_again(self, tmp_path):
+        """Test a rewritten file is not served from the cache."""
+        sample = _write_pdf(tmp_path / "sample.pdf", 2)
+        plugin = PDFPlugin()
+        assert (await plugin.execute("count_pages", {"input": str(sample)})).data["pages"] == 2
+
+        _write_pdf(sample, 5)
+        os.utime(sample, ns=(0, 10**9))
+
+        assert (await plugin.execute("count_pages", {"input": str(sample)})).data["pages"] == 5
+
+
+class TestPDFPluginBatch:
+    """Tests for the PDF batch capability."""
+
+    @pytest.fixture
+    async def plugin(self):
+        plugin = PDFPlugin(config={"workers": 2})
+        yield plugin
+        await plugin.shutdown()
+
+    @pytest.fixture
+    def pdfs(self, tmp_path):
+        return [_write_pdf(tmp_path / f"doc_{i}.pdf", i + 2) for i in range(3)]
+
+    @pytest.mark.asyncio
+    async def test_batch_count_pages(self, plugin, pdfs):
+        """Test counting pages of several files."""
+        result = await plugin.execute("batch", {"operation": "count_pages", "files": [str(p) for p in pdfs]})
+
+        assert result.success is True
+        assert [r["data"]["pages"] for r in result.data["results"]] == [2, 3, 4]
+        assert result.data["succeeded"] == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_rotate(self, plugin, pdfs, tmp_path):
+        """Test rotating several files into one output directory."""
+        out = tmp_path / "out"
+        result = await plugin.execute(
+            "batch",
+            {"operation": "rotate", "files": [str(p) for p in pdfs], "output_dir": str(out), "angle": 180},
+        )
+
+        assert result.data["succeeded"] == 3
+        rotated = PdfReader(out / "doc_1_rotated.pdf")
+        assert len(rotated.pages) == 3
+        assert rotated.pages[0].rotation == 180
+
+    @pytest.mark.asyncio
+    async def test_batch_split(self, plugin, pdfs, tmp_path):
+        """Test splitting several files into a folder each."""
+        out = tmp_path / "out"
+        result = await plugin.execute("batch", {"operation": "split", "files": [str(pdfs[0])], "output_dir": str(out)})
+
+        assert result.data["succeeded"] == 1
+        assert sorted(f.name for f in (out / "doc_0").iterdir()) == ["page_001.pdf", "page_002.pdf"]
+
+    @pytest.mark.asyncio
+    async def test_batch_reports_per_file_errors(self, plugin, pdfs):
+        """Test one missing file does not fail the whole batch."""
+        result = await plugin.execute("batch", {"operation": "info", "files": [str(pdfs[0]), "/nonexistent.pdf"]})
+
+        assert result.success is True
+        assert result.data["failed"] == 1
+        assert result.data["results"][1]["error_code"] == "FILE_NOT_FOUND"
+
+    @pytest.mark.asyncio
+    async def test_batch_requires_output_dir(self, plugin, pdfs):
+        """Test writing operations need an output directory."""
+        result = await plugin.execute("batch", {"operation": "rotate", "files": [str(pdfs[0])]})
+
+        assert result.success is False
+        assert result.error_code == "INVALID_INPUT"
+
+    @pytest.mark.asyncio
+    async def test_pool_replaced_after_worker_dies(self, plugin, pdfs, tmp_path):
+        """Test a dead worker fails its own call but not later ones."""
+        with pytest.raises(BrokenProcessPool):
+            await plugin._run(os._exit, 1)
+
+        result = await plugin.execute("rotate", {"input": str(pdfs[0]), "output": str(tmp_path / "r.pdf"), "angle": 90})
+
+        assert result.success is True
+
+    @pytest.mark.asyncio
+    async def test_pool_killed_between_calls(self, plugin, pdfs, tmp_path):
+        """Test a call after a worker was killed runs on a new pool."""
+        await plugin.execute("rotate", {"input": str(pdfs[0]), "output": str(tmp_path / "a.pdf"), "angle": 90})
+        executor = plugin._executor
+        os.kill(next(iter(executor._processes)), signal.SIGKILL)
+        while not executor._broken:
+            await asyncio.sleep(0.01)
+
+        result = await plugin.execute("rotate", {"input": str(pdfs[0]), "output": str(tmp_path / "b.pdf"), "angle": 90})
+
+        assert result.success is True
+        assert plugin._executor is not executor
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_delete_pages(self, plugin, pdfs):
+        """Test delete_pages cannot skip its confirmation through batch."""
+        result = await plugin.execute("batch", {"operation": "delete_pages", "files": [str(pdfs[0])]})
+
+        assert result.success is False
+        assert result.error_code == "INVALID_INPUT"
@@ -240,6 +240,40 @@ class TestShellPluginRunCommand:
         assert result.data["exit_code"] == 1
         assert result.data["success"] is False
 
+    @pytest.mark.asyncio
+    async def test_run_command_reports_resource_usage(self):
+        """Test that rusage figures land in the result metadata."""
+        plugin = ShellPlugin()
+
+        result = await plugin.execute("run_command", {"command": "echo hello"})
+
+        usage = result.metadata["resource_usage"]
+        assert usage["cpu_seconds"] >= 0
+        assert usage["max_rss_bytes"] > 0
+
+    @pytest.mark.asyncio
+    async def test_run_command_resource_limits(self):
+        """Test that configured limits are enforced on the child."""
+        plugin = ShellPlugin(config={"resource_limits": {"max_cpu_seconds": 1}})
+
+        result = await plugin.execute("run_command", {"command": "while :; do :; done", "timeout": 30})
+
+        assert result.success is True
+        assert result.data["success"] is False
+        assert result.metadata["limit_signal"] == "SIGXCPU"
+
+    @pytest.mark.asyncio
+    async def test_run_command_output_bounded(self):
+        """Test that huge output is elided to the configured cap."""
+        plugin = ShellPlugin(config={"resource_limits": {"max_output_bytes": 2048}})
+
+        result = await plugin.execute("run_command", {"command": "yes | head -c 1000000"})
+
+        assert result.data["exit_code"] == 0
+        assert len(result.data["stdout"]) < 2048 + 64
+        assert "bytes elided" in result.data["stdout"]
+        assert result.metadata["stdout_bytes"] == 1000000
+
 
 class TestShellPluginRunScript:
     """Tests for run_script capability."""
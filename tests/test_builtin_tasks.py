@@ -1,5 +1,6 @@
 """Tests for the built-in tasks plugin."""
 
+import random
 from datetime import datetime, timedelta
 
 import pytest
@@ -270,6 +271,51 @@ class TestTaskStore:
         # Critical should be first
         assert top[0].priority == TaskPriority.CRITICAL
 
+    def test_get_top_tasks_sees_older_urgent_tasks(self, store):
+        """Test ranking covers every task, not just the most recent ones."""
+        old = datetime.now() - timedelta(days=30)
+        urgent = Task(
+            task_id="urgent",
+            title="Renew passport",
+            priority=TaskPriority.HIGH,
+            due_date=datetime.now() - timedelta(days=5),
+            created_at=old,
+            updated_at=old,
+        )
+        store.add_task(urgent)
+        for i in range(150):
+            store.add_task(Task(task_id=f"t{i}", title=f"Task {i}", priority=TaskPriority.LOW))
+
+        assert store.get_focus_task().task_id == "urgent"
+
+    def test_get_top_tasks_matches_scores(self, store):
+        """Test top tasks are exactly the best scored, ties broken by due date then newest."""
+        rng = random.Random(1)
+        now = datetime.now()
+        for i in range(300):
+            due = None if i % 4 == 0 else now + timedelta(hours=rng.randint(-24 * 10, 24 * 60))
+            created = now - timedelta(minutes=i)
+            store.add_task(
+                Task(
+                    task_id=f"t{i}",
+                    title=f"Task {i}",
+                    status=TaskStatus.COMPLETED if i % 7 == 0 else TaskStatus.TODO,
+                    priority=rng.choice(list(TaskPriority)),
+                    due_date=due,
+                    created_at=created,
+                    updated_at=created,
+                )
+            )
+
+        expected = store.list_tasks(limit=1000)
+        expected.sort(key=lambda t: -t.created_at.timestamp())
+        expected.sort(key=lambda t: t.due_date or datetime.max)
+        expected.sort(key=lambda t: t.total_score, reverse=True)
+
+        top = store.get_top_tasks(limit=25)
+        assert [t.task_id for t in top] == [t.task_id for t in expected[:25]]
+        assert all(t.status != TaskStatus.COMPLETED for t in top)
+
     def test_get_focus_task(self, store):
         """Test getting focus task."""
         task = Task(
@@ -313,6 +359,24 @@ class TestTaskStore:
         assert "by_status" in stats
         assert "by_priority" in stats
 
+    def test_get_stats_counts(self, store, sample_task):
+        """Test grouped statistics."""
+        now = datetime.now()
+        store.add_task(Task(task_id="late", title="Late", area="home", due_date=now - timedelta(days=2)))
+        store.add_task(Task(task_id="soon", title="Soon", area="home", due_date=now + timedelta(days=3)))
+        store.add_task(
+            Task(task_id="done", title="Done", status=TaskStatus.COMPLETED, due_date=now - timedelta(days=1))
+        )
+
+        stats = store.get_stats()
+
+        assert stats["total"] == 4
+        assert stats["by_status"] == {"todo": 1, "inbox": 2, "completed": 1}
+        assert stats["by_priority"] == {"high": 1, "normal": 2}
+        assert stats["by_area"] == {"work": 1, "home": 2}
+        assert stats["overdue"] == 1
+        assert stats["due_this_week"] == 1
+
     def test_get_areas(self, store, sample_task):
         """Test getting areas list."""
         areas = store.get_areas()
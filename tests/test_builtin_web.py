@@ -13,6 +13,23 @@ from mother.plugins.builtin.web import (
 )
 
 
+def _mock_client(plugin: WebPlugin, status_code: int = 200, error: Exception | None = None, **kwargs) -> list:
+    """Answer every request the plugin makes with a canned response.
+
+    Returns the list the sent requests are recorded in.
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if error is not None:
+            raise error
+        return httpx.Response(status_code, **kwargs)
+
+    plugin._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return requests
+
+
 class TestCreateManifest:
     """Tests for _create_manifest function."""
 
@@ -202,8 +219,7 @@ class TestExecute:
     async def test_execute_timeout_error(self):
         """Test execute handles timeout error."""
         plugin = WebPlugin()
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(side_effect=httpx.TimeoutException("timed out"))
+        _mock_client(plugin, error=httpx.TimeoutException("timed out"))
 
         result = await plugin.execute("fetch", {"url": "https://example.com"})
 
@@ -214,8 +230,7 @@ class TestExecute:
     async def test_execute_connection_error(self):
         """Test execute handles connection error."""
         plugin = WebPlugin()
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(side_effect=httpx.ConnectError("connection failed"))
+        _mock_client(plugin, error=httpx.ConnectError("connection failed"))
 
         result = await plugin.execute("fetch", {"url": "https://example.com"})
 
@@ -231,21 +246,71 @@ class TestFetch:
         """Test successful fetch."""
         plugin = WebPlugin()
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com"
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "text/html"}
-        mock_response.text = "<html>Hello</html>"
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, headers={"content-type": "text/html"}, text="<html>Hello</html>")
 
         result = await plugin.execute("fetch", {"url": "https://example.com"})
 
         assert result.success is True
         assert result.data["status_code"] == 200
+        assert result.data["format"] == "text"
+        assert result.data["content"] == "Hello"
+
+    @pytest.mark.asyncio
+    async def test_fetch_raw_format(self):
+        """Test fetch returns the HTML source with format=raw."""
+        plugin = WebPlugin()
+
+        _mock_client(plugin, headers={"content-type": "text/html"}, text="<html>Hello</html>")
+
+        result = await plugin.execute("fetch", {"url": "https://example.com", "format": "raw"})
+
         assert result.data["content"] == "<html>Hello</html>"
 
+    @pytest.mark.asyncio
+    async def test_fetch_markdown_format(self):
+        """Test fetch converts HTML to markdown."""
+        plugin = WebPlugin()
+
+        html = "<html><body><nav><a href='/'>Home</a></nav><h1>Title</h1><p>See <a href='/doc'>docs</a>.</p></body>"
+        _mock_client(plugin, headers={"content-type": "text/html"}, text=html)
+
+        result = await plugin.execute("fetch", {"url": "https://example.com/", "format": "markdown"})
+
+        assert result.data["content"] == "# Title\n\nSee [docs](https://example.com/doc)."
+
+    @pytest.mark.asyncio
+    async def test_fetch_non_html_is_not_converted(self):
+        """Test fetch leaves non-HTML content alone."""
+        plugin = WebPlugin()
+
+        _mock_client(plugin, json={"a": "<b>x</b>"})
+
+        result = await plugin.execute("fetch", {"url": "https://example.com"})
+
+        assert result.data["content"] == '{"a":"<b>x</b>"}'
+
+    @pytest.mark.asyncio
+    async def test_fetch_token_budget(self):
+        """Test fetch cuts extracted text to max_tokens."""
+        plugin = WebPlugin()
+
+        _mock_client(plugin, headers={"content-type": "text/html"}, text="<p>" + "word " * 1000 + "</p>")
+
+        result = await plugin.execute("fetch", {"url": "https://example.com", "max_tokens": 10})
+
+        assert result.data["truncated"] is True
+        assert result.data["content"] == "word " * 7 + "word\n... (truncated)"
+
+    @pytest.mark.asyncio
+    async def test_fetch_invalid_format(self):
+        """Test fetch rejects an unknown format."""
+        plugin = WebPlugin()
+
+        result = await plugin.execute("fetch", {"url": "https://example.com", "format": "pdf"})
+
+        assert result.success is False
+        assert result.error_code == "INVALID_INPUT"
+
     @pytest.mark.asyncio
     async def test_fetch_blocked_url(self):
         """Test fetch with blocked URL."""
@@ -258,36 +323,23 @@ class TestFetch:
 
     @pytest.mark.asyncio
     async def test_fetch_response_too_large_header(self):
-        """Test fetch rejects response too large (from header)."""
+        """Test fetch truncates a response whose content-length is over the limit."""
         plugin = WebPlugin(config={"max_response_size": 100})
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com"
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "text/html", "content-length": "1000"}
-        mock_response.text = "x" * 1000
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, headers={"content-type": "text/html", "content-length": "1000"}, text="x" * 1000)
 
         result = await plugin.execute("fetch", {"url": "https://example.com"})
 
-        assert result.success is False
-        assert result.error_code == "RESPONSE_TOO_LARGE"
+        assert result.success is True
+        assert result.data["truncated"] is True
+        assert result.data["content"] == "x" * 100 + "\n... (truncated)"
 
     @pytest.mark.asyncio
     async def test_fetch_content_truncated(self):
         """Test fetch truncates large content."""
         plugin = WebPlugin(config={"max_response_size": 50})
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com"
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "text/html"}  # No content-length
-        mock_response.text = "x" * 100
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, headers={"content-type": "text/html"}, text="x" * 100)
 
         result = await plugin.execute("fetch", {"url": "https://example.com"})
 
@@ -299,14 +351,7 @@ class TestFetch:
         """Test fetch with custom headers."""
         plugin = WebPlugin()
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com"
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "text/html"}
-        mock_response.text = "Hello"
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        requests = _mock_client(plugin, headers={"content-type": "text/html"}, text="Hello")
 
         result = await plugin.execute(
             "fetch",
@@ -314,7 +359,8 @@ class TestFetch:
         )
 
         assert result.success is True
-        plugin._client.get.assert_called_once()
+        assert len(requests) == 1
+        assert requests[0].headers["authorization"] == "Bearer token"
 
 
 class TestGet:
@@ -325,14 +371,7 @@ class TestGet:
         """Test successful GET request."""
         plugin = WebPlugin()
 
-        mock_response = MagicMock()
-        mock_response.url = "https://api.example.com"
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "application/json"}
-        mock_response.text = '{"data": "value"}'
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, headers={"content-type": "application/json"}, text='{"data": "value"}')
 
         result = await plugin.execute("get", {"url": "https://api.example.com"})
 
@@ -345,14 +384,7 @@ class TestGet:
         """Test GET request with query params."""
         plugin = WebPlugin()
 
-        mock_response = MagicMock()
-        mock_response.url = "https://api.example.com?q=test"
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "application/json"}
-        mock_response.text = '{"results": []}'
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, headers={"content-type": "application/json"}, text='{"results": []}')
 
         result = await plugin.execute(
             "get",
@@ -366,14 +398,7 @@ class TestGet:
         """Test GET truncates large content."""
         plugin = WebPlugin(config={"max_response_size": 50})
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com"
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "text/html"}
-        mock_response.text = "x" * 100
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, headers={"content-type": "text/html"}, text="x" * 100)
 
         result = await plugin.execute("get", {"url": "https://example.com"})
 
@@ -389,14 +414,7 @@ class TestPost:
         """Test POST with form data."""
         plugin = WebPlugin()
 
-        mock_response = MagicMock()
-        mock_response.url = "https://api.example.com"
-        mock_response.status_code = 201
-        mock_response.headers = {"content-type": "application/json"}
-        mock_response.text = '{"id": 1}'
-
-        plugin._client = AsyncMock()
-        plugin._client.post = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, status_code=201, headers={"content-type": "application/json"}, text='{"id": 1}')
 
         result = await plugin.execute(
             "post",
@@ -411,14 +429,7 @@ class TestPost:
         """Test POST with JSON data."""
         plugin = WebPlugin()
 
-        mock_response = MagicMock()
-        mock_response.url = "https://api.example.com"
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "application/json"}
-        mock_response.text = '{"success": true}'
-
-        plugin._client = AsyncMock()
-        plugin._client.post = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, headers={"content-type": "application/json"}, text='{"success": true}')
 
         result = await plugin.execute(
             "post",
@@ -445,14 +456,7 @@ class TestPost:
         """Test POST truncates large response."""
         plugin = WebPlugin(config={"max_response_size": 50})
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com"
-        mock_response.status_code = 200
-        mock_response.headers = {"content-type": "text/html"}
-        mock_response.text = "x" * 100
-
-        plugin._client = AsyncMock()
-        plugin._client.post = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, headers={"content-type": "text/html"}, text="x" * 100)
 
         result = await plugin.execute("post", {"url": "https://example.com"})
 
@@ -709,13 +713,7 @@ class TestGetJson:
         """Test successful JSON fetch."""
         plugin = WebPlugin()
 
-        mock_response = MagicMock()
-        mock_response.url = "https://api.example.com"
-        mock_response.status_code = 200
-        mock_response.json = MagicMock(return_value={"key": "value", "number": 42})
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, json={"key": "value", "number": 42})
 
         result = await plugin.execute("get_json", {"url": "https://api.example.com"})
 
@@ -728,13 +726,7 @@ class TestGetJson:
         """Test get_json with invalid JSON response."""
         plugin = WebPlugin()
 
-        mock_response = MagicMock()
-        mock_response.url = "https://api.example.com"
-        mock_response.status_code = 200
-        mock_response.json = MagicMock(side_effect=ValueError("Invalid JSON"))
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, text="not json")
 
         result = await plugin.execute("get_json", {"url": "https://api.example.com"})
 
@@ -768,12 +760,7 @@ class TestExtractLinks:
         </html>
         """
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com/"
-        mock_response.text = html
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, text=html)
 
         result = await plugin.execute("extract_links", {"url": "https://example.com/"})
 
@@ -790,12 +777,7 @@ class TestExtractLinks:
 
         html = '<html><a href="/page1">Link</a></html>'
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com/"
-        mock_response.text = html
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, text=html)
 
         result = await plugin.execute(
             "extract_links",
@@ -819,12 +801,7 @@ class TestExtractLinks:
         </html>
         """
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com/"
-        mock_response.text = html
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, text=html)
 
         result = await plugin.execute(
             "extract_links",
@@ -843,12 +820,7 @@ class TestExtractLinks:
 
         html = '<html><a href="page.html">Link</a></html>'
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com/"
-        mock_response.text = html
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, text=html)
 
         result = await plugin.execute(
             "extract_links",
@@ -871,12 +843,7 @@ class TestExtractLinks:
         </html>
         """
 
-        mock_response = MagicMock()
-        mock_response.url = "https://example.com/"
-        mock_response.text = html
-
-        plugin._client = AsyncMock()
-        plugin._client.get = AsyncMock(return_value=mock_response)
+        _mock_client(plugin, text=html)
 
         result = await plugin.execute("extract_links", {"url": "https://example.com/"})
 
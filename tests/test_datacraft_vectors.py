@@ -0,0 +1,185 @@
+"""Tests for datacraft embeddings, the vector index and hybrid search."""
+
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from mother.plugins.builtin.datacraft import DatacraftPlugin, vectors
+from mother.plugins.builtin.datacraft.storage import Document, DocumentStore
+from mother.plugins.builtin.datacraft.vectors import HashEmbedder, VectorIndex, to_blob
+
+TEXTS = {
+    "inv": "Invoice number 4411, total amount due within thirty days",
+    "rec": "Receipt from the hardware store for nails and a hammer",
+    "con": "The parties agree to the terms of this rental contract",
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(tmp_path / "test.db", embedder=HashEmbedder())
+    store.store_documents(
+        [
+            Document(doc_id=key, filename=f"{key}.txt", doc_type=key, content=text, chunks=[text], file_hash=key)
+            for key, text in TEXTS.items()
+        ]
+    )
+    store.embed_pending()
+    return store
+
+
+class TestHashEmbedder:
+    """Tests for the deterministic local embedder."""
+
+    def test_deterministic_and_normalised(self):
+        a, b = HashEmbedder()(["invoice total", "invoice total"])
+
+        assert np.array_equal(a, b)
+        assert np.linalg.norm(a) == pytest.approx(1.0)
+
+    def test_related_words_are_closer(self):
+        invoice, invoices, hammer = HashEmbedder()(["invoice", "invoices", "hammer"])
+
+        assert invoice @ invoices > invoice @ hammer
+
+    def test_empty_text(self):
+        assert HashEmbedder()([""]) == [None]
+
+
+class TestVectorIndex:
+    """Tests for the memory-mapped index."""
+
+    def _rows(self, matrix):
+        return [(i + 1, to_blob(v)) for i, v in enumerate(matrix)]
+
+    def test_exact_search(self, tmp_path):
+        matrix = np.eye(4, dtype=np.float32)
+        index = VectorIndex(tmp_path / "idx")
+        index.build(self._rows(matrix), 4, version=3)
+
+        hits = index.search([0.1, 0.9, 0.0, 0.0], 2)
+
+        assert index.version == 3
+        assert [chunk_id for chunk_id, _ in hits] == [2, 1]
+        assert hits[0][1] == pytest.approx(0.9 / np.linalg.norm([0.1, 0.9]), rel=1e-5)
+
+    def test_clustered_search_matches_exact(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(vectors, "IVF_MIN_VECTORS", 500)
+        rng = np.random.default_rng(0)
+        centres = rng.standard_normal((20, 32))
+        matrix = (centres[rng.integers(0, 20, 2000)] + 0.3 * rng.standard_normal((2000, 32))).astype(np.float32)
+        index = VectorIndex(tmp_path / "idx", nprobe=8)
+        index.build(self._rows(matrix), len(matrix), version=1)
+
+        normalised = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        recall = []
+        for q in matrix[:20]:
+            exact = set(np.argsort(-(normalised @ (q / np.linalg.norm(q))))[:10] + 1)
+            recall.append(len(exact & {chunk_id for chunk_id, _ in index.search(q, 10)}) / 10)
+
+        assert (tmp_path / "idx" / "centroids.npy").exists()
+        assert np.mean(recall) >= 0.9
+
+    def test_empty_index(self, tmp_path):
+        index = VectorIndex(tmp_path / "idx")
+        index.build([], 0, version=1)
+
+        assert index.search([1.0, 0.0], 5) == []
+
+
+class TestHybridSearch:
+    """Tests for semantic and hybrid DocumentStore search."""
+
+    def test_hybrid_finds_what_keyword_misses(self, store):
+        assert store.search("invoices") == []
+
+        semantic = store.search("invoices", mode="semantic")
+        hybrid = store.search("invoices", mode="hybrid")
+
+        assert semantic[0].doc_id == "inv"
+        assert hybrid[0].doc_id == "inv"
+
+    def test_keyword_hits_rank_first_in_hybrid(self, store):
+        results = store.search("contract", mode="hybrid")
+
+        assert results[0].doc_id == "con"
+        assert results[0].snippet == "The parties agree to the terms of this rental **contract**"
+        assert results[0].score == pytest.approx(1.0)
+
+    def test_doc_type_filter(self, store):
+        results = store.search("invoices", mode="semantic", doc_type="rec")
+
+        assert {r.doc_id for r in results} == {"rec"}
+
+    def test_needs_embedder(self, tmp_path):
+        with pytest.raises(ValueError, match="embeddings"):
+            DocumentStore(tmp_path / "plain.db").search("x", mode="hybrid")
+
+    def test_unknown_mode(self, store):
+        with pytest.raises(ValueError, match="Unknown search mode"):
+            store.search("x", mode="fuzzy")
+
+    def test_results_cached_until_store_changes(self, store):
+        first = store.search("hammer", mode="hybrid")
+        assert store.search("hammer", mode="hybrid") == first
+        assert len(store._cache) == 1
+
+        text = "Hammer drill and hammer bits"
+        store.store_document(Document(doc_id="new", filename="new.txt", doc_type="rec", content=text, chunks=[text]))
+        store.embed_pending()
+
+        assert "new" in [r.doc_id for r in store.search("hammer", mode="hybrid")]
+
+    def test_concurrent_searches_share_the_caches(self, store, monkeypatch):
+        monkeypatch.setattr("mother.plugins.builtin.datacraft.storage.SEARCH_CACHE_SIZE", 4)
+        queries = [f"hammer {i % 12}" for i in range(400)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda q: store.search(q, mode="hybrid"), queries))
+
+        assert all(r and r[0].doc_id == "rec" for r in results)
+        assert len(store._cache) <= 4
+        assert len(store._query_vectors) <= 4
+
+    def test_changed_chunks_are_re_embedded(self, store):
+        updated = Document(
+            doc_id="rec", filename="rec.txt", doc_type="rec", content="x", chunks=["Warranty card"], file_hash="rec2"
+        )
+        store.store_document(updated)
+
+        assert store.embed_pending() == 1
+        assert store.embed_pending() == 0
+        assert store.search("warranty", mode="semantic")[0].doc_id == "rec"
+
+    def test_deleted_documents_leave_the_index(self, store):
+        store.delete_document("inv")
+
+        assert "inv" not in [r.doc_id for r in store.search("invoices", mode="semantic")]
+
+
+class TestPluginSearchModes:
+    """Tests for search modes through the plugin."""
+
+    @pytest.mark.skipif(importlib.util.find_spec("datacraft") is None, reason="needs the DataCraft parsing engine")
+    @pytest.mark.asyncio
+    async def test_defaults_to_hybrid_with_embeddings(self, tmp_path):
+        plugin = DatacraftPlugin(config={"db_path": str(tmp_path / "test.db"), "embeddings": "hash"})
+        (tmp_path / "bill.txt").write_text(TEXTS["inv"])
+        await plugin.execute("process", {"path": str(tmp_path / "bill.txt")})
+
+        result = await plugin.execute("search", {"query": "invoices"})
+
+        assert result.success is True
+        assert result.data["mode"] == "hybrid"
+        assert result.data["results"][0]["filename"] == "bill.txt"
+
+    @pytest.mark.asyncio
+    async def test_semantic_without_embeddings(self, tmp_path):
+        plugin = DatacraftPlugin(config={"db_path": str(tmp_path / "test.db")})
+
+        result = await plugin.execute("search", {"query": "invoices", "mode": "semantic"})
+
+        assert result.success is False
+        assert result.error_code == "INVALID_INPUT"
@@ -0,0 +1,223 @@
+"""Tests for the email header cache and its incremental sync."""
+
+from unittest.mock import patch
+
+import pytest
+
+from mother.config.email_accounts import EmailAccount, ServerConfig
+from mother.plugins.builtin.email import EmailPlugin
+from mother.plugins.builtin.email.cache import SNIPPET_LENGTH, EmailHeaderCache
+from mother.plugins.builtin.email.imap_client import IMAPClient
+
+from .imap_stub import StubIMAPServer, make_message
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "condstore"])
+def server(request):
+    stub = StubIMAPServer()
+    if request.param:
+        stub.capabilities += ["ENABLE", "CONDSTORE"]
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def account(server):
+    return EmailAccount(
+        name="stub",
+        email="test@example.com",
+        imap=ServerConfig("127.0.0.1", server.port, use_ssl=False),
+    )
+
+
+@pytest.fixture(autouse=True)
+def password():
+    with patch("mother.plugins.builtin.email.imap_client.get_password", return_value="secret"):
+        yield
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmailHeaderCache(tmp_path / "cache.db")
+
+
+@pytest.fixture
+def client(account):
+    with IMAPClient(account) as client:
+        yield client
+
+
+def fill_inbox(server, count: int) -> list[int]:
+    return [server.add(make_message(f"Message {i}", sender=f"Sender {i} <s{i}@example.com>")) for i in range(count)]
+
+
+class TestSync:
+    """Tests for incremental folder synchronization."""
+
+    def test_initial_sync_is_full(self, server, client, cache) -> None:
+        fill_inbox(server, 12)
+
+        result = cache.sync(client, "stub", "INBOX")
+
+        assert result.full
+        assert result.added == 12
+        messages = cache.list_messages("stub", "INBOX", limit=5)
+        assert [m.subject for m in messages] == [f"Message {i}" for i in range(11, 6, -1)]
+        assert cache.unread_count("stub", "INBOX") == 12
+
+    def test_incremental_sync_fetches_only_new(self, server, client, cache) -> None:
+        fill_inbox(server, 10)
+        cache.sync(client, "stub", "INBOX")
+        server.commands.clear()
+
+        new_uid = server.add(make_message("Latest"))
+        result = cache.sync(client, "stub", "INBOX")
+
+        assert not result.full
+        assert result.added == 1
+        assert cache.list_messages("stub", "INBOX", limit=1)[0].subject == "Latest"
+        envelope_fetches = [c for c in server.commands_named("UID FETCH") if "ENVELOPE" in c]
+        assert envelope_fetches == [f"UID FETCH {new_uid}:* (UID FLAGS ENVELOPE BODYSTRUCTURE RFC822.SIZE)"]
+        assert not server.commands_named("UID SEARCH")
+
+    def test_flag_changes_and_expunges(self, server, client, cache) -> None:
+        uids = fill_inbox(server, 6)
+        cache.sync(client, "stub", "INBOX")
+
+        server.set_flags("INBOX", uids[0], {"\\Seen"})
+        server.remove("INBOX", uids[1])
+        result = cache.sync(client, "stub", "INBOX")
+
+        assert result.removed == 1
+        assert cache.unread_count("stub", "INBOX") == 4
+        assert {m.uid for m in cache.list_messages("stub", "INBOX", limit=10)} == {str(u) for u in uids[2:] + uids[:1]}
+
+    def test_condstore_fetches_only_changed_flags(self, server, client, cache) -> None:
+        if "CONDSTORE" not in server.capabilities:
+            pytest.skip("plain IMAP refreshes all flags")
+        uids = fill_inbox(server, 20)
+        cache.sync(client, "stub", "INBOX")
+        server.commands.clear()
+
+        server.set_flags("INBOX", uids[3], {"\\Seen", "\\Flagged"})
+        result = cache.sync(client, "stub", "INBOX")
+
+        assert result.updated == 1
+        assert any("CHANGEDSINCE" in c for c in server.commands_named("UID FETCH"))
+        # Nothing expunged, so no UID SEARCH to reconcile
+        assert not server.commands_named("UID SEARCH")
+        assert cache.unread_count("stub", "INBOX") == 19
+
+    def test_uidvalidity_change_resyncs(self, server, client, cache) -> None:
+        fill_inbox(server, 3)
+        cache.sync(client, "stub", "INBOX")
+
+        server.uidvalidity["INBOX"] = 2
+        server.remove("INBOX", 1)
+        result = cache.sync(client, "stub", "INBOX")
+
+        assert result.full
+        assert len(cache.list_messages("stub", "INBOX")) == 2
+
+    def test_sync_fills_snippets(self, server, client, cache) -> None:
+        server.add(make_message("Plain", body="The quarterly   report\nis attached"))
+        server.add(make_message("Accented", body="Caf\u00e9 au lait " * 40))
+        server.add(make_message("With file", body="See the contract", attachment=("c.pdf", b"%PDF")))
+
+        cache.sync(client, "stub", "INBOX")
+
+        with cache._connect() as conn:
+            snippets = dict(conn.execute("SELECT subject, snippet FROM messages").fetchall())
+        assert snippets["Plain"] == "The quarterly report is attached"
+        assert snippets["Accented"].startswith("Caf\u00e9 au lait Caf\u00e9")
+        assert len(snippets["Accented"]) == SNIPPET_LENGTH
+        assert snippets["With file"] == "See the contract"
+        assert [m.subject for m in cache.search("stub", "INBOX", "quarterly")] == ["Plain"]
+        # Single-part bodies and first parts share section 1: one FETCH for all
+        body_fetches = [c for c in server.commands_named("UID FETCH") if "BODY.PEEK" in c]
+        assert body_fetches == ["UID FETCH 1:3 (UID BODY.PEEK[1]<0.400>)"]
+
+
+class TestQueries:
+    """Tests for local search."""
+
+    @pytest.fixture
+    def synced(self, server, client, cache):
+        server.add(make_message("Invoice March", sender="Billing <billing@acme.com>"))
+        server.add(make_message("Lunch plans", sender="Carol <carol@example.com>"), flags={"\\Seen"})
+        server.add(make_message("Invoice April 100%", sender="Billing <billing@acme.com>"))
+        cache.sync(client, "stub", "INBOX")
+        return cache
+
+    def test_free_text_uses_fts(self, synced) -> None:
+        assert [m.subject for m in synced.search("stub", "INBOX", "invoice")] == ["Invoice April 100%", "Invoice March"]
+        assert [m.subject for m in synced.search("stub", "INBOX", "carol lun")] == ["Lunch plans"]
+
+    def test_imap_criteria_evaluated_locally(self, synced) -> None:
+        results = synced.search("stub", "INBOX", 'FROM "acme.com" SUBJECT march')
+        assert [m.subject for m in results] == ["Invoice March"]
+        assert [m.subject for m in synced.search("stub", "INBOX", "SEEN")] == ["Lunch plans"]
+        assert [m.subject for m in synced.search("stub", "INBOX", "SUBJECT 100%")] == ["Invoice April 100%"]
+
+    def test_unsupported_criteria_need_server(self, synced) -> None:
+        assert synced.search("stub", "INBOX", "BODY hello") is None
+        assert synced.search("stub", "INBOX", "SINCE 1-Jan-2024") is None
+
+    def test_snippet_searchable(self, synced) -> None:
+        uid = synced.list_messages("stub", "INBOX", limit=1)[0].uid
+        synced.set_snippet("stub", "INBOX", uid, "The quarterly   report\nis attached")
+        assert [m.uid for m in synced.search("stub", "INBOX", "quarterly")] == [uid]
+
+
+class TestEmailPluginCache:
+    """Tests for EmailPlugin answering from the cache."""
+
+    @pytest.fixture
+    def plugin(self, account, tmp_path):
+        plugin = EmailPlugin({"cache_db_path": str(tmp_path / "cache.db"), "cache_max_age": 300})
+        with patch.object(plugin, "_get_account", return_value=account):
+            yield plugin
+
+    async def test_repeat_calls_skip_server(self, plugin, server) -> None:
+        fill_inbox(server, 30)
+
+        first = await plugin.execute("list_messages", {"limit": 10})
+        commands = len(server.commands)
+        second = await plugin.execute("list_messages", {"limit": 10})
+        unread = await plugin.execute("unread_count", {})
+        search = await plugin.execute("search_messages", {"query": "FROM sender"})
+
+        assert first.data["cached"] and second.data["cached"]
+        assert first.data["messages"] == second.data["messages"]
+        assert unread.data["unread"] == 30
+        assert search.data["cached"] and search.data["count"] == 20
+        assert len(server.commands) == commands
+        await plugin.shutdown()
+
+    async def test_refresh_and_writes(self, plugin, server) -> None:
+        uids = fill_inbox(server, 3)
+        await plugin.execute("list_messages", {})
+
+        await plugin.execute("read_message", {"uid": str(uids[0])})
+        assert (await plugin.execute("unread_count", {})).data["unread"] == 2
+
+        await plugin.execute("delete_message", {"uid": str(uids[1])})
+        listed = await plugin.execute("list_messages", {})
+        assert [m["uid"] for m in listed.data["messages"]] == [str(uids[2]), str(uids[0])]
+
+        server.add(make_message("Fresh"))
+        stale = await plugin.execute("list_messages", {})
+        fresh = await plugin.execute("list_messages", {"refresh": True})
+        assert stale.data["count"] == 2
+        assert fresh.data["messages"][0]["subject"] == "Fresh"
+        await plugin.shutdown()
+
+    async def test_disabled_cache_goes_to_server(self, account, server) -> None:
+        fill_inbox(server, 2)
+        plugin = EmailPlugin({"header_cache": False})
+        with patch.object(plugin, "_get_account", return_value=account):
+            result = await plugin.execute("list_messages", {})
+        assert result.data["count"] == 2
+        assert not result.data["cached"]
+        await plugin.shutdown()
@@ -0,0 +1,319 @@
+"""Tests for the pooled, batched IMAP layer of the email plugin."""
+
+import asyncio
+import imaplib
+import time
+from unittest.mock import patch
+
+import pytest
+
+from mother.config.email_accounts import EmailAccount, ServerConfig
+from mother.plugins.builtin.email import EmailPlugin
+from mother.plugins.builtin.email.imap_client import (
+    IMAPClient,
+    bodystructure_attachments,
+    bodystructure_text_part,
+    compress_uid_set,
+    decode_partial_body,
+    parse_fetch_response,
+    parse_imap_data,
+)
+from mother.plugins.builtin.email.pool import IMAPPool
+
+from .imap_stub import StubIMAPServer, make_message
+
+
+@pytest.fixture
+def server():
+    stub = StubIMAPServer().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def account(server):
+    return EmailAccount(
+        name="stub",
+        email="test@example.com",
+        imap=ServerConfig("127.0.0.1", server.port, use_ssl=False),
+    )
+
+
+@pytest.fixture(autouse=True)
+def password():
+    with patch("mother.plugins.builtin.email.imap_client.get_password", return_value="secret"):
+        yield
+
+
+def fill_inbox(server, count: int) -> list[int]:
+    return [server.add(make_message(f"Message {i}", body=f"Body {i} " * 50)) for i in range(count)]
+
+
+class TestParsing:
+    """Tests for IMAP response parsing."""
+
+    def test_nested_lists_strings_and_nil(self) -> None:
+        parsed = parse_imap_data(b'(A "b c" NIL (1 2) "q\\"x")')
+        assert parsed == [[b"A", b"b c", None, [b"1", b"2"], b'q"x']]
+
+    def test_literal(self) -> None:
+        parsed = parse_imap_data(b'(SUBJECT {5}\r\nh(i)" NEXT)')
+        assert parsed == [[b"SUBJECT", b'h(i)"', b"NEXT"]]
+
+    def test_fetch_response_with_literal_tuples(self) -> None:
+        data = [
+            (b"1 (UID 7 FLAGS (\\Seen) ENVELOPE (NIL {4}", b"Caf\xc3"),
+            b" NIL NIL NIL NIL NIL NIL NIL NIL) RFC822.SIZE 42)",
+            b"2 (UID 9 FLAGS () RFC822.SIZE 10)",
+            b"3 (FLAGS (\\Deleted))",
+        ]
+        fetched = parse_fetch_response(data)
+        assert set(fetched) == {"7", "9"}
+        assert fetched["7"][b"FLAGS"] == [b"\\Seen"]
+        assert fetched["7"][b"ENVELOPE"][1] == b"Caf\xc3"
+        assert fetched["9"][b"RFC822.SIZE"] == b"10"
+
+    def test_compress_uid_set(self) -> None:
+        assert compress_uid_set(["5", "1", "2", "3", "9", "10"]) == "1:3,5,9:10"
+        assert compress_uid_set(["4"]) == "4"
+
+    def test_bodystructure_attachments(self) -> None:
+        structure = parse_imap_data(
+            b'(("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 12 1 NIL NIL NIL NIL)'
+            b'("APPLICATION" "PDF" ("NAME" "r.pdf") NIL NIL "BASE64" 400 NIL '
+            b'("ATTACHMENT" ("FILENAME" "report.pdf")) NIL NIL) "MIXED")'
+        )[0]
+        assert bodystructure_attachments(structure) == [
+            {"filename": "report.pdf", "content_type": "application/pdf", "size": 400}
+        ]
+
+    def test_bodystructure_text_part(self) -> None:
+        nested = parse_imap_data(
+            b'((("TEXT" "PLAIN" ("CHARSET" "iso-8859-1") NIL NIL "QUOTED-PRINTABLE" 12 1 NIL NIL NIL NIL)'
+            b'("TEXT" "HTML" ("CHARSET" "utf-8") NIL NIL "7BIT" 30 1 NIL NIL NIL NIL) "ALTERNATIVE")'
+            b'("TEXT" "PLAIN" NIL NIL NIL "BASE64" 400 5 NIL ("ATTACHMENT" ("FILENAME" "a.txt")) NIL NIL) "MIXED")'
+        )[0]
+        single = parse_imap_data(b'("TEXT" "PLAIN" NIL NIL NIL "BASE64" 40 1 NIL NIL NIL NIL)')[0]
+        html_only = parse_imap_data(b'("TEXT" "HTML" NIL NIL NIL "7BIT" 40 1 NIL NIL NIL NIL)')[0]
+
+        assert bodystructure_text_part(nested) == ("1.1", "quoted-printable", "iso-8859-1")
+        assert bodystructure_text_part(single) == ("1", "base64", "utf-8")
+        assert bodystructure_text_part(html_only) is None
+
+    def test_decode_partial_body(self) -> None:
+        # Fetches cut base64 mid-quantum and UTF-8 mid-character
+        assert decode_partial_body(b"SGVsbG8g\r\nd29ybGQ", "base64", "utf-8") == "Hello wor"
+        assert decode_partial_body("café".encode()[:-1], "7bit", "utf-8") == "caf"
+        assert decode_partial_body(b"caf=E9 =\r\nau lait", "quoted-printable", "iso-8859-1") == "café au lait"
+
+
+class TestBatchedFetch:
+    """Tests for IMAPClient summary fetching against the stub server."""
+
+    def test_summaries_use_one_fetch(self, server, account) -> None:
+        fill_inbox(server, 30)
+        server.add(make_message("Café ☕", attachment=("notes.txt", b"data")))
+
+        with IMAPClient(account) as client:
+            summaries = client.fetch_summaries("INBOX", "ALL", limit=20)
+
+        assert len(summaries) == 20
+        assert summaries[0].subject == "Café ☕"
+        assert summaries[0].attachments[0]["filename"] == "notes.txt"
+        assert summaries[1].subject == "Message 29"
+        assert summaries[1].sender == "Alice <alice@example.com>"
+        assert summaries[1].recipients == ["bob@example.com"]
+        assert summaries[1].date is not None
+        assert summaries[1].size > 0
+        assert summaries[1].body_text == ""
+
+        fetches = server.commands_named("UID FETCH")
+        assert len(fetches) == 1
+        assert "ENVELOPE" in fetches[0] and "RFC822.SIZE" in fetches[0]
+        assert "RFC822)" not in fetches[0]
+        assert len(server.commands_named("SELECT")) == 1
+
+    def test_flags_and_unseen(self, server, account) -> None:
+        uid = server.add(make_message("read one"), flags={"\\Seen"})
+        server.add(make_message("new one"))
+
+        with IMAPClient(account) as client:
+            unread = client.fetch_summaries("INBOX", "UNSEEN")
+            both = client.fetch_summaries_by_uid([str(uid)])
+
+        assert [m.subject for m in unread] == ["new one"]
+        assert both[0].flags == ["\\Seen"]
+
+    def test_fetch_messages_batched(self, server, account) -> None:
+        fill_inbox(server, 5)
+
+        with IMAPClient(account) as client:
+            messages = client.fetch_messages("INBOX", "ALL", limit=5)
+
+        assert [m.subject for m in messages] == [f"Message {i}" for i in range(4, -1, -1)]
+        assert "Body 4" in messages[0].body_text
+        assert len(server.commands_named("UID FETCH")) == 1
+
+
+class TestIMAPPool:
+    """Tests for connection pooling."""
+
+    async def test_connections_are_reused(self, server, account) -> None:
+        fill_inbox(server, 3)
+        pool = IMAPPool(keepalive_interval=0)
+
+        for _ in range(5):
+            summaries = await pool.run(account, lambda c: c.fetch_summaries("INBOX"))
+            assert len(summaries) == 3
+
+        assert server.logins == 1
+        assert pool.stats()["reuses"] == 4
+        assert len(server.commands_named("SELECT")) == 1
+        await pool.close()
+        assert server.commands_named("LOGOUT")
+
+    async def test_reconnects_after_drop(self, server, account) -> None:
+        fill_inbox(server, 2)
+        # A long interval skips the NOOP check so the dead socket is hit mid-operation
+        pool = IMAPPool(keepalive_interval=60)
+        await pool.run(account, lambda c: c.get_unread_count("INBOX"))
+
+        server.drop_connections()
+        count = await pool.run(account, lambda c: c.get_unread_count("INBOX"))
+
+        assert count == 2
+        assert server.logins == 2
+        assert pool.stats()["reconnects"] == 1
+        await pool.close()
+
+    async def test_command_error_after_reconnect_pools_client(self, server, account) -> None:
+        pool = IMAPPool(keepalive_interval=60)
+        await pool.run(account, lambda c: c.list_folders())
+
+        def failing(client: IMAPClient) -> None:
+            client.get_unread_count("INBOX")
+            raise imaplib.IMAP4.error("NO [NONEXISTENT] Unknown folder")
+
+        server.drop_connections()
+        with pytest.raises(imaplib.IMAP4.error):
+            await pool.run(account, failing)
+
+        assert pool.stats()["reconnects"] == 1
+        assert pool.stats()["idle"] == 1
+        await pool.close()
+        assert server.commands_named("LOGOUT")
+
+    async def test_stale_connection_checked_with_noop(self, server, account) -> None:
+        # A long interval keeps the background keepalive from racing the checkout
+        pool = IMAPPool(keepalive_interval=60)
+        await pool.run(account, lambda c: c.list_folders())
+        for slot in pool._slots.values():
+            slot.idle = [(client, last_used - 120) for client, last_used in slot.idle]
+        await pool.run(account, lambda c: c.list_folders())
+
+        assert server.commands_named("NOOP")
+        assert server.logins == 1
+        await pool.close()
+
+    async def test_keepalive_respects_connection_limit(self, server, account) -> None:
+        pool = IMAPPool(max_per_account=1, keepalive_interval=60)
+        await pool.run(account, lambda c: c.list_folders())
+
+        await asyncio.gather(pool.keepalive(), pool.run(account, lambda c: c.list_folders()))
+
+        assert server.commands_named("NOOP")
+        assert server.logins == 1
+        assert pool.stats()["idle"] == 1
+        await pool.close()
+
+    async def test_cancelled_run_closes_its_client(self, server, account) -> None:
+        pool = IMAPPool(keepalive_interval=0)
+        clients: list[IMAPClient] = []
+
+        def slow(client: IMAPClient) -> None:
+            clients.append(client)
+            time.sleep(0.3)
+
+        task = asyncio.create_task(pool.run(account, slow))
+        while not clients:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert not clients[0].connected
+        assert pool.stats()["idle"] == 0
+        await pool.close()
+
+    async def test_background_keepalive_drops_expired(self, server, account) -> None:
+        pool = IMAPPool(keepalive_interval=10, max_idle=0.01)
+        await pool.run(account, lambda c: c.list_folders())
+        await asyncio.sleep(0.05)
+
+        await pool.keepalive()
+
+        assert pool.stats()["idle"] == 0
+        assert server.commands_named("LOGOUT")
+        await pool.close()
+
+    async def test_event_loop_not_blocked(self, server, account) -> None:
+        """Blocking IMAP work runs in threads while the loop keeps ticking."""
+        pool = IMAPPool(keepalive_interval=0)
+
+        def slow(client: IMAPClient) -> int:
+            time.sleep(0.3)
+            return client.get_unread_count("INBOX")
+
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await pool.run(account, slow)
+        task.cancel()
+
+        assert ticks >= 10
+        await pool.close()
+
+    async def test_concurrency_per_account_is_bounded(self, server, account) -> None:
+        pool = IMAPPool(max_per_account=2, keepalive_interval=0)
+
+        await asyncio.gather(*(pool.run(account, lambda c: c.list_folders()) for _ in range(6)))
+
+        assert server.logins <= 2
+        await pool.close()
+
+
+class TestEmailPluginPooled:
+    """Tests for EmailPlugin on top of the pool."""
+
+    @pytest.fixture
+    def plugin(self, account, tmp_path):
+        plugin = EmailPlugin({"cache_db_path": str(tmp_path / "cache.db")})
+        with patch.object(plugin, "_get_account", return_value=account):
+            yield plugin
+
+    async def test_list_then_read(self, plugin, server) -> None:
+        fill_inbox(server, 50)
+
+        listed = await plugin.execute("list_messages", {"limit": 50})
+        assert listed.success
+        assert listed.data["count"] == 50
+        assert "body_text" not in listed.data["messages"][0]
+
+        uid = listed.data["messages"][0]["uid"]
+        read = await plugin.execute("read_message", {"uid": uid})
+        assert read.success
+        assert "Body 49" in read.data["message"]["body_text"]
+
+        unread = await plugin.execute("unread_count", {})
+        assert unread.data["unread"] == 49
+
+        # One login, one listing fetch plus its snippet fetch, one body fetch for the whole sequence
+        assert server.logins == 1
+        assert len(server.commands_named("UID FETCH")) == 3
+        await plugin.shutdown()
@@ -446,6 +446,21 @@ class TestCLIExecutor:
         assert result.success is True
         assert "hello" in result.raw_output
 
+    @pytest.mark.asyncio
+    async def test_execute_reports_resource_usage(self, cli_manifest):
+        """Test CLI runs are limited and metered."""
+        executor = CLIExecutor(
+            cli_manifest,
+            cli_manifest.execution.cli,
+            config={"resource_limits": {"max_open_files": 32}},
+        )
+        await executor.initialize()
+
+        result = await executor.execute("echo", {"message": "hello"})
+        assert result.success is True
+        assert result.metadata["resource_usage"]["cpu_seconds"] >= 0
+        assert "wall_time" in result.metadata
+
     @pytest.mark.asyncio
     async def test_execute_not_initialized(self, cli_manifest):
         """Test execute raises error when not initialized."""
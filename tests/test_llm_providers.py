@@ -223,6 +223,21 @@ class TestAnthropicProvider:
         result = provider.convert_tool_schema(schema)
         assert result == schema
 
+    def test_convert_tools_copies_read_only_schemas(self):
+        from types import MappingProxyType
+
+        from mother.llm.providers.anthropic import AnthropicProvider
+
+        provider = AnthropicProvider(api_key="test", model="claude-3")
+        schema = MappingProxyType(
+            {"name": "test", "input_schema": MappingProxyType({"type": "object", "required": ("path",)})}
+        )
+
+        (result,) = provider.convert_tools((schema,))
+
+        assert result == {"name": "test", "input_schema": {"type": "object", "required": ["path"]}}
+        assert type(result) is dict and type(result["input_schema"]) is dict
+
     def test_format_tool_result(self):
         from mother.llm.providers.anthropic import AnthropicProvider
 
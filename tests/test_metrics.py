@@ -0,0 +1,243 @@
+"""Tests for Prometheus-style metrics."""
+
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from mother import metrics
+from mother.agent.core import MotherAgent
+from mother.api.metrics import MetricsMiddleware
+from mother.api.ratelimit import RateLimitConfig, RateLimiter, RateLimitMiddleware
+from mother.llm.response import LLMResponse, ToolCall, Usage
+from mother.plugins import PluginResult
+from mother.plugins.manifest import (
+    CapabilitySpec,
+    ExecutionSpec,
+    ExecutionType,
+    PluginManifest,
+    PluginMetadata,
+    PythonExecutionSpec,
+)
+from mother.tools.registry import ToolRegistry
+
+
+@pytest.fixture
+def registry() -> metrics.MetricsRegistry:
+    return metrics.MetricsRegistry()
+
+
+class TestMetrics:
+    """Tests for counters, histograms, gauges and rendering."""
+
+    def test_counter(self, registry):
+        counter = metrics.Counter("jobs_total", "Jobs run", ("kind",), registry=registry)
+
+        counter.inc(kind="a")
+        counter.inc(2, kind="a")
+        counter.inc(kind="b")
+
+        assert counter.value(kind="a") == 3
+        assert registry.render() == (
+            '# HELP jobs_total Jobs run\n# TYPE jobs_total counter\njobs_total{kind="a"} 3\njobs_total{kind="b"} 1\n'
+        )
+
+    def test_labels_must_match(self, registry):
+        counter = metrics.Counter("jobs_total", "Jobs run", ("kind",), registry=registry)
+
+        with pytest.raises(ValueError, match="takes labels"):
+            counter.inc(other="x")
+
+    def test_duplicate_names_are_rejected(self, registry):
+        metrics.Counter("jobs_total", "Jobs run", registry=registry)
+
+        with pytest.raises(ValueError, match="already registered"):
+            metrics.Counter("jobs_total", "Jobs run", registry=registry)
+
+    def test_label_values_are_escaped(self, registry):
+        counter = metrics.Counter("jobs_total", "Jobs run", ("kind",), registry=registry)
+
+        counter.inc(kind='a "quoted"\\path\n')
+
+        assert 'jobs_total{kind="a \\"quoted\\"\\\\path\\n"} 1' in registry.render()
+
+    def test_histogram(self, registry):
+        histogram = metrics.Histogram("op_seconds", "Op latency", ("op",), buckets=(0.1, 1.0), registry=registry)
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, op="read")
+
+        assert histogram.count(op="read") == 4
+        assert registry.render().splitlines()[2:] == [
+            'op_seconds_bucket{op="read",le="0.1"} 2',
+            'op_seconds_bucket{op="read",le="1"} 3',
+            'op_seconds_bucket{op="read",le="+Inf"} 4',
+            'op_seconds_sum{op="read"} 3.65',
+            'op_seconds_count{op="read"} 4',
+        ]
+
+    async def test_histogram_timers(self, registry):
+        histogram = metrics.Histogram("op_seconds", "Op latency", ("op",), registry=registry)
+
+        @histogram.timed(op="sync")
+        def sync_op():
+            return 1
+
+        @histogram.timed(op="async")
+        async def async_op():
+            return 2
+
+        with histogram.time(op="block"):
+            pass
+
+        assert sync_op() == 1
+        assert await async_op() == 2
+        assert [histogram.count(op=op) for op in ("sync", "async", "block")] == [1, 1, 1]
+
+    def test_threads_record_into_their_own_shards(self, registry):
+        counter = metrics.Counter("jobs_total", "Jobs run", registry=registry)
+        histogram = metrics.Histogram("op_seconds", "Op latency", registry=registry)
+
+        def work():
+            for _ in range(1000):
+                counter.inc()
+                histogram.observe(0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value() == 8000
+        assert histogram.count() == 8000
+        assert len(counter._shards) == 8
+
+    def test_gauge(self, registry):
+        gauge = metrics.Gauge("queue_depth", "Queue depth", registry=registry)
+        assert "\nqueue_depth " not in registry.render()
+
+        gauge.set_function(lambda: 7)
+        assert "\nqueue_depth 7\n" in registry.render()
+
+        gauge.set_function(lambda: 1 / 0)
+        assert "\nqueue_depth " not in registry.render()
+
+
+class TestMiddleware:
+    """Tests for HTTP request metrics."""
+
+    def test_requests_are_labelled_by_route_template(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/things/{thing_id}")
+        async def get_thing(thing_id: str):
+            return {"id": thing_id}
+
+        client = TestClient(app)
+        before = metrics.HTTP_REQUEST_DURATION.count(method="GET", route="/things/{thing_id}", status=200)
+        unmatched = metrics.HTTP_REQUEST_DURATION.count(method="GET", route="unmatched", status=404)
+
+        client.get("/things/1")
+        client.get("/things/2")
+        client.get("/nowhere")
+
+        assert metrics.HTTP_REQUEST_DURATION.count(method="GET", route="/things/{thing_id}", status=200) == before + 2
+        assert metrics.HTTP_REQUEST_DURATION.count(method="GET", route="unmatched", status=404) == unmatched + 1
+
+    def test_rate_limit_rejections_are_counted(self):
+        app = FastAPI()
+        limiter = RateLimiter(RateLimitConfig(default_rpm=1, burst_multiplier=1.0))
+        app.add_middleware(RateLimitMiddleware, rate_limiter=limiter)
+
+        @app.get("/ping")
+        async def ping():
+            return {}
+
+        client = TestClient(app)
+        before = metrics.RATE_LIMIT_REJECTIONS.value(role="none")
+
+        responses = [client.get("/ping") for _ in range(3)]
+
+        rejected = sum(r.status_code == 429 for r in responses)
+        assert rejected > 0
+        assert metrics.RATE_LIMIT_REJECTIONS.value(role="none") == before + rejected
+
+
+class TestAgentMetrics:
+    """Tests for metrics recorded by the agent loop."""
+
+    async def test_llm_and_capability_metrics(self):
+        tools = ToolRegistry()
+        executor = MagicMock()
+        executor.execute = AsyncMock(return_value=PluginResult.error_result("nope", code="NOT_FOUND"))
+        manifest = PluginManifest(
+            schema_version="1.0",
+            plugin=PluginMetadata(name="metered", version="1.0.0", description="demo plugin", author="Test"),
+            capabilities=[CapabilitySpec(name="run", description="Run")],
+            execution=ExecutionSpec(
+                type=ExecutionType.PYTHON,
+                python=PythonExecutionSpec(module="test", **{"class": "Test"}),
+            ),
+        )
+        tools.plugin_manager.registry.register(manifest, executor)
+
+        provider = MagicMock()
+        provider.provider_type.value = "test"
+        provider.model = "metrics-model"
+        provider.create_message = AsyncMock(
+            side_effect=[
+                LLMResponse(
+                    tool_calls=[ToolCall(id="c1", name="metered_run", arguments={})],
+                    usage={"input_tokens": 100, "output_tokens": 20},
+                ),
+                LLMResponse(text="Done", stop_reason="end_turn", usage=Usage(input_tokens=150, output_tokens=5)),
+            ]
+        )
+        agent = MotherAgent(
+            tool_registry=tools,
+            provider=provider,
+            enable_memory=False,
+            enable_cognitive=False,
+            enable_session_persistence=False,
+        )
+
+        await agent.process_command("run it")
+
+        labels = {"provider": "test", "model": "metrics-model"}
+        assert metrics.LLM_REQUEST_DURATION.count(**labels) == 2
+        assert metrics.LLM_TOKENS.value(type="input", **labels) == 250
+        assert metrics.LLM_TOKENS.value(type="output", **labels) == 25
+        assert metrics.CAPABILITY_DURATION.count(capability="metered_run") == 1
+        assert metrics.CAPABILITY_ERRORS.value(capability="metered_run", code="NOT_FOUND") == 1
+
+    def test_endpoint(self):
+        from mother.api.auth import verify_api_key
+        from mother.api.routes import router
+
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[verify_api_key] = lambda: None
+
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == metrics.CONTENT_TYPE
+        assert "# TYPE mother_http_request_duration_seconds histogram" in response.text
+        assert "# TYPE mother_audit_queue_depth gauge" in response.text
+
+    def test_endpoint_requires_auth(self):
+        from mother.api.auth import verify_api_key
+        from mother.api.routes import router
+
+        def reject():
+            raise HTTPException(status_code=401, detail="API key required")
+
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[verify_api_key] = reject
+
+        assert TestClient(app).get("/metrics").status_code == 401
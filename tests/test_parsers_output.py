@@ -6,6 +6,7 @@ from mother.parsers.output import (
     ANSI_PATTERN,
     BOX_CHARS,
     OutputParser,
+    TableParser,
     TableParseResult,
     strip_ansi,
 )
@@ -246,6 +247,78 @@ My Data
             assert result is not None
             assert "Name" in result.headers
 
+        def test_rich_default_table(self, parser):
+            """Test heavy header, light body and no lines between rows."""
+            table = """
+             Users
+┏━━━━━━┳━━━━━━━━━━━━┳━━━━━━━┓
+┃ Name ┃ Email      ┃ Count ┃
+┡━━━━━━╇━━━━━━━━━━━━╇━━━━━━━┩
+│ ann  │ a@x.com    │ 1     │
+│ bob  │ bob@really │       │
+│      │ -long.com  │       │
+│ cy   │ c@x.com    │ 3     │
+└──────┴────────────┴───────┘
+"""
+            result = parser.parse_table(table)
+            assert result.title == "Users"
+            assert result.headers == ["Name", "Email", "Count"]
+            assert result.rows == [
+                {"Name": "ann", "Email": "a@x.com", "Count": "1"},
+                {"Name": "bob", "Email": "bob@really -long.com", "Count": ""},
+                {"Name": "cy", "Email": "c@x.com", "Count": "3"},
+            ]
+
+        def test_multi_line_cells_between_row_lines(self, parser):
+            """Test every line between two row lines belongs to one row."""
+            table = """
+┌──────┬────────┐
+│ Name │ Notes  │
+├──────┼────────┤
+│ long │ first  │
+│ name │ second │
+├──────┼────────┤
+│ b    │        │
+└──────┴────────┘
+"""
+            result = parser.parse_table(table)
+            assert result.rows == [{"Name": "long name", "Notes": "first second"}, {"Name": "b", "Notes": ""}]
+
+        def test_iterable_input(self, parser):
+            """Test parsing lines from an iterator."""
+            lines = iter(["│ A │ B │", "├───┼───┤", "│ 1 │ 2 │"])
+            result = parser.parse_table(lines)
+            assert result.rows == [{"A": "1", "B": "2"}]
+
+        def test_streamed_chunks_match_whole_output(self, parser):
+            """Test TableParser.feed with chunks that split lines and ANSI codes."""
+            table = "\x1b[1m│ A │ B │\x1b[0m\n├───┼───┤\n" + "".join(f"│ {i} │ x │\n" for i in range(50))
+            streaming = TableParser()
+            for start in range(0, len(table), 5):
+                streaming.feed(table[start : start + 5])
+            assert streaming.result() == parser.parse_table(table)
+            assert len(parser.parse_table(table).rows) == 50
+
+    class TestSharedTokens:
+        """Tests for reusing one tokenization across extractors."""
+
+        def test_same_output_is_tokenized_once(self):
+            parser = OutputParser()
+            output = "Name: x\n│ A │\n├───┤\n│ 1 │\nFound 3 results"
+
+            parser.parse_table(output)
+            tokens = parser._last
+            parser.extract_key_values(output)
+            parser.extract_summary(output)
+
+            assert parser._last is tokens
+
+        def test_new_output_is_tokenized(self):
+            parser = OutputParser()
+
+            assert parser.extract_summary("Found 1 result") == {"found": 1, "results": 1}
+            assert parser.extract_summary("Found 2 results") == {"found": 2, "results": 2}
+
     class TestParseEmailList:
         """Tests for parse_email_list method."""
 
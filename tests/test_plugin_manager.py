@@ -163,7 +163,7 @@ class TestPluginManager:
         """Test getting schemas when empty."""
         manager = PluginManager()
         schemas = manager.get_all_schemas()
-        assert schemas == []
+        assert schemas == ()
 
     def test_is_loaded_false(self) -> None:
         """Test is_loaded for non-loaded plugin."""
@@ -269,7 +269,7 @@ class TestPluginManagerIntegration:
         await manager.initialize()
 
         schemas = manager.get_all_schemas()
-        assert isinstance(schemas, list)
+        assert isinstance(schemas, tuple)
         assert len(schemas) > 0
 
         await manager.shutdown()
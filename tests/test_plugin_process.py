@@ -0,0 +1,268 @@
+"""Tests for resource-limited plugin subprocesses."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from mother.plugins.process import (
+    CgroupManager,
+    ProcessOutcome,
+    ResourceUsage,
+    StreamBuffer,
+    limits_from_config,
+    run_process,
+    stream_output,
+)
+from mother.plugins.sandbox import ResourceLimits
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX resource limits")
+
+
+class TestLimitsFromConfig:
+    """Tests for reading limits from plugin config."""
+
+    def test_defaults(self) -> None:
+        assert limits_from_config(None) == ResourceLimits()
+        assert limits_from_config({}) == ResourceLimits()
+
+    def test_overrides(self) -> None:
+        limits = limits_from_config({"resource_limits": {"max_cpu_seconds": 5, "max_open_files": 64}})
+        assert limits.max_cpu_seconds == 5
+        assert limits.max_open_files == 64
+
+    def test_instance_passthrough(self) -> None:
+        limits = ResourceLimits(max_processes=8)
+        assert limits_from_config({"resource_limits": limits}) is limits
+
+
+class TestRunProcess:
+    """Tests for run_process."""
+
+    async def test_captures_output_and_usage(self) -> None:
+        outcome = await run_process(["/bin/sh", "-c", "echo out; echo err >&2; exit 3"], timeout=10)
+
+        assert outcome.returncode == 3
+        assert outcome.stdout == b"out\n"
+        assert outcome.stderr == b"err\n"
+        assert not outcome.timed_out
+        assert outcome.usage is not None
+        assert outcome.usage.max_rss_bytes > 0
+
+        meta = outcome.metadata()
+        assert set(meta["resource_usage"]) >= {"cpu_seconds", "max_rss_bytes", "io_read_bytes", "io_write_bytes"}
+        assert "limit_signal" not in meta
+
+    async def test_limits_applied_in_child(self) -> None:
+        limits = ResourceLimits(max_open_files=50, max_cpu_seconds=7, nice_increment=3)
+        outcome = await run_process(["/bin/sh", "-c", "ulimit -n; ulimit -t"], timeout=10, limits=limits)
+
+        assert outcome.stdout.split() == [b"50", b"7"]
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="prlimit is Linux-only")
+    async def test_default_limits(self) -> None:
+        import resource
+
+        names = ["RLIMIT_CPU", "RLIMIT_NOFILE", "RLIMIT_AS", "RLIMIT_FSIZE"]
+        script = f"import resource; print([resource.getrlimit(getattr(resource, n))[0] for n in {names!r}])"
+        outcome = await run_process([sys.executable, "-c", script], timeout=30)
+
+        def capped(name: str, value: int) -> int:
+            soft = resource.getrlimit(getattr(resource, name))[0]
+            return value if soft == resource.RLIM_INFINITY else min(soft, value)
+
+        # CPU and open files are capped; address space and file size are opt-in
+        expected = [
+            capped("RLIMIT_CPU", 600),
+            capped("RLIMIT_NOFILE", 4096),
+            resource.getrlimit(resource.RLIMIT_AS)[0],
+            resource.getrlimit(resource.RLIMIT_FSIZE)[0],
+        ]
+        assert outcome.stdout.decode().strip() == str(expected)
+
+    async def test_missing_program_raises(self) -> None:
+        with pytest.raises(FileNotFoundError):
+            await run_process(["mother-no-such-program"], timeout=10)
+
+    async def test_waiting_does_not_hold_a_thread(self, monkeypatch) -> None:
+        def no_threads(*args, **kwargs):
+            raise AssertionError("run_process used a worker thread")
+
+        monkeypatch.setattr(asyncio, "to_thread", no_threads)
+        outcome = await run_process(["/bin/sh", "-c", "sleep 0.2; echo done"], timeout=10)
+
+        assert outcome.stdout == b"done\n"
+        assert outcome.usage is not None
+
+    async def test_reaps_without_pidfd(self, monkeypatch) -> None:
+        monkeypatch.delattr(os, "pidfd_open", raising=False)
+        outcome = await run_process(["/bin/sh", "-c", "sleep 0.1; exit 4"], timeout=10)
+
+        assert outcome.returncode == 4
+        assert outcome.usage is not None
+
+    async def test_cpu_limit_kills_busy_loop(self) -> None:
+        limits = ResourceLimits(max_cpu_seconds=1)
+        outcome = await run_process([sys.executable, "-c", "while True: pass"], timeout=30, limits=limits)
+
+        assert outcome.limit_signal == "SIGXCPU"
+        assert outcome.usage.cpu_seconds >= 0.5
+        assert outcome.metadata()["limit_signal"] == "SIGXCPU"
+
+    async def test_address_space_limit(self) -> None:
+        limits = ResourceLimits(max_address_space_mb=256)
+        outcome = await run_process(
+            [sys.executable, "-c", "bytearray(512 * 1024 * 1024)"],
+            timeout=30,
+            limits=limits,
+        )
+
+        assert outcome.returncode != 0
+        assert b"MemoryError" in outcome.stderr
+
+    async def test_timeout_kills_process_group(self) -> None:
+        start = time.monotonic()
+        outcome = await run_process(["/bin/sh", "-c", "sleep 30 & sleep 30"], timeout=0.5)
+
+        assert outcome.timed_out
+        assert time.monotonic() - start < 10
+        assert outcome.limit_signal is None
+
+    async def test_cwd_and_env(self, tmp_path) -> None:
+        outcome = await run_process(
+            ["/bin/sh", "-c", "pwd; echo $X"],
+            timeout=10,
+            cwd=str(tmp_path),
+            env={"X": "value", "PATH": "/usr/bin:/bin"},
+        )
+
+        assert outcome.stdout.decode().split() == [str(tmp_path), "value"]
+
+
+class TestStreamBuffer:
+    """Tests for bounded head/tail capture."""
+
+    def test_small_output_kept(self) -> None:
+        buffer = StreamBuffer(100)
+        buffer.write(b"hello ")
+        buffer.write(b"world")
+        assert buffer.getvalue() == b"hello world"
+        assert not buffer.truncated
+        assert buffer.total == 11
+
+    def test_head_and_tail_kept(self) -> None:
+        buffer = StreamBuffer(10)
+        for i in range(100):
+            buffer.write(str(i % 10).encode())
+        value = buffer.getvalue()
+        assert buffer.truncated
+        assert buffer.total == 100
+        assert value.startswith(b"01234")
+        assert value.endswith(b"56789")
+        assert b"[90 bytes elided]" in value
+
+    def test_large_single_chunk(self) -> None:
+        buffer = StreamBuffer(8)
+        buffer.write(b"a" * 4 + b"b" * 1000 + b"c" * 4)
+        assert buffer.getvalue().startswith(b"aaaa")
+        assert buffer.getvalue().endswith(b"cccc")
+
+    def test_exactly_full_is_not_truncated(self) -> None:
+        buffer = StreamBuffer(6)
+        buffer.write(b"abcdef")
+        assert buffer.getvalue() == b"abcdef"
+        assert not buffer.truncated
+
+
+class TestOutputStreaming:
+    """Tests for bounded capture and live output."""
+
+    async def test_large_output_is_bounded(self) -> None:
+        limits = ResourceLimits(max_output_bytes=4096)
+        outcome = await run_process(
+            [sys.executable, "-c", "import sys; sys.stdout.write('x' * 5_000_000 + 'END')"],
+            timeout=30,
+            limits=limits,
+        )
+
+        assert outcome.returncode == 0
+        assert outcome.stdout_bytes == 5_000_003
+        assert outcome.truncated
+        assert len(outcome.stdout) < 4096 + 64
+        assert outcome.stdout.endswith(b"END")
+        assert outcome.metadata()["output_truncated"] is True
+
+    async def test_kill_on_output_cap(self) -> None:
+        limits = ResourceLimits(max_output_bytes=1024, kill_on_output_cap=True)
+        start = time.monotonic()
+        outcome = await run_process(["/bin/sh", "-c", "yes"], timeout=30, limits=limits)
+
+        assert outcome.output_capped
+        assert not outcome.timed_out
+        assert time.monotonic() - start < 10
+        assert outcome.metadata()["output_capped"] is True
+        assert "limit_signal" not in outcome.metadata()
+
+    async def test_live_callback(self) -> None:
+        chunks: list[tuple[str, bytes]] = []
+
+        async def on_output(stream: str, chunk: bytes) -> None:
+            chunks.append((stream, chunk))
+
+        await run_process(["/bin/sh", "-c", "echo one; echo two >&2"], timeout=10, on_output=on_output)
+
+        assert b"".join(c for s, c in chunks if s == "stdout") == b"one\n"
+        assert b"".join(c for s, c in chunks if s == "stderr") == b"two\n"
+
+    async def test_stream_output_context(self) -> None:
+        seen: list[bytes] = []
+        with stream_output(lambda stream, chunk: seen.append(chunk)):
+            await run_process(["/bin/echo", "hi"], timeout=10)
+        await run_process(["/bin/echo", "after"], timeout=10)
+
+        assert b"".join(seen) == b"hi\n"
+
+    async def test_failing_callback_does_not_break_run(self) -> None:
+        def broken(stream: str, chunk: bytes) -> None:
+            raise RuntimeError("client went away")
+
+        outcome = await run_process(["/bin/echo", "hi"], timeout=10, on_output=broken)
+        assert outcome.stdout == b"hi\n"
+
+
+class TestResourceUsage:
+    """Tests for ResourceUsage and ProcessOutcome helpers."""
+
+    def test_cpu_seconds(self) -> None:
+        usage = ResourceUsage(cpu_user_seconds=1.25, cpu_system_seconds=0.5)
+        assert usage.cpu_seconds == 1.75
+        assert usage.to_dict()["cpu_seconds"] == 1.75
+
+    def test_signal_names(self) -> None:
+        assert ProcessOutcome(returncode=-9, stdout=b"", stderr=b"", wall_time=0).limit_signal == "SIGKILL"
+        assert ProcessOutcome(returncode=-15, stdout=b"", stderr=b"", wall_time=0).limit_signal is None
+        assert ProcessOutcome(returncode=1, stdout=b"", stderr=b"", wall_time=0).limit_signal is None
+
+
+class TestCgroupManager:
+    """Tests for cgroup placement."""
+
+    def test_disabled_without_root(self) -> None:
+        manager = CgroupManager(None)
+        assert manager.available is False
+        assert manager.prepare("shell", ResourceLimits()) is None
+
+    def test_unusable_root(self, tmp_path) -> None:
+        # A plain directory is not a cgroup
+        manager = CgroupManager(tmp_path)
+        assert manager.available is False
+        assert manager.prepare("shell", ResourceLimits()) is None
+        assert not (tmp_path / "mother-shell").exists()
+
+    async def test_run_without_cgroup_reports_none(self, tmp_path) -> None:
+        limits = ResourceLimits(cgroup_root=str(tmp_path))
+        outcome = await run_process(["/bin/true"], timeout=10, limits=limits, name="shell")
+        assert outcome.returncode == 0
+        assert outcome.cgroup is None
@@ -1,9 +1,11 @@
 """Tests for PluginRegistry and CapabilityEntry."""
 
+import json
 from unittest.mock import MagicMock
 
 import pytest
 
+from mother.llm.base import plain_schema
 from mother.plugins.exceptions import CapabilityNotFoundError
 from mother.plugins.manifest import (
     CapabilitySpec,
@@ -277,6 +279,58 @@ class TestPluginRegistry:
         assert "plugin_a" in names
         assert "plugin_b" in names
 
+    def test_anthropic_schemas_are_cached(self) -> None:
+        """Schemas are built once at register and shared until the set changes."""
+        registry = PluginRegistry()
+        registry.register(create_mock_manifest("plugin", [("a", "A"), ("b", "B")]), create_mock_executor())
+
+        entry = registry.get_capability("plugin_a")
+        assert entry._schema is not None
+        assert entry._schema_json is not None
+        assert entry.anthropic_schema is entry.anthropic_schema
+
+        first = registry.get_all_anthropic_schemas()
+        assert isinstance(first, tuple)
+        assert registry.get_all_anthropic_schemas() is first
+        assert first[0] is entry.anthropic_schema
+        assert json.loads(registry.get_all_anthropic_schemas_json()) == plain_schema(first)
+
+    def test_anthropic_schemas_are_read_only(self) -> None:
+        """The shared schemas cannot be changed by one caller for all others."""
+        registry = PluginRegistry()
+        manifest = create_mock_manifest("plugin", [("a", "A")])
+        manifest.capabilities[0].parameters = [
+            ParameterSpec(name="path", type=ParameterType.STRING, description="Path", required=True)
+        ]
+        registry.register(manifest, create_mock_executor())
+        schema = registry.get_capability("plugin_a").anthropic_schema
+
+        with pytest.raises(TypeError):
+            schema["description"] = "changed"
+        with pytest.raises(TypeError):
+            schema["input_schema"]["properties"]["path"]["type"] = "integer"
+        with pytest.raises(AttributeError):
+            schema["input_schema"]["required"].append("other")
+        assert plain_schema(schema)["input_schema"]["required"] == ["path"]
+
+    def test_anthropic_schemas_invalidated_on_reload(self) -> None:
+        """Registering or unregistering rebuilds the cached collections."""
+        registry = PluginRegistry()
+        registry.register(create_mock_manifest("plugin", [("a", "Old")]), create_mock_executor())
+        version = registry.version
+        first = registry.get_all_anthropic_schemas()
+        first_json = registry.get_all_anthropic_schemas_json()
+
+        registry.unregister("plugin")
+        registry.register(create_mock_manifest("plugin", [("a", "New"), ("b", "B")]), create_mock_executor())
+
+        assert registry.version > version
+        schemas = registry.get_all_anthropic_schemas()
+        assert schemas is not first
+        assert schemas[0]["description"] == "New"
+        assert registry.get_all_anthropic_schemas_json() != first_json
+        assert len(json.loads(registry.get_all_anthropic_schemas_json())) == 2
+
     def test_get_plugin_schemas(self) -> None:
         """Test getting schemas for specific plugin."""
         registry = PluginRegistry()
@@ -483,6 +537,43 @@ class TestPluginRegistry:
         result_plugins = [r.plugin_name for r in results]
         assert all(p == "demo-mail" for p in result_plugins)
 
+    def test_search_capabilities_after_unregister(self) -> None:
+        """Test that unregistered capabilities drop out of search results."""
+        registry = PluginRegistry()
+        registry.register(create_mock_manifest("mailer", [("send", "Send mail")]), create_mock_executor())
+        registry.register(create_mock_manifest("files", [("read", "Read file")]), create_mock_executor())
+
+        assert [r.full_name for r in registry.search_capabilities("send")] == ["mailer_send"]
+
+        registry.unregister("mailer")
+        assert registry.search_capabilities("send") == []
+        assert [r.full_name for r in registry.search_capabilities("read")] == ["files_read"]
+
+    def test_search_capabilities_prefix_and_stem(self) -> None:
+        """Test typeahead prefixes and stemmed description matches."""
+        registry = PluginRegistry()
+        manifest = create_mock_manifest(
+            "plugin",
+            [("merge", "Merge PDF documents"), ("read_file", "Read a file")],
+        )
+        registry.register(manifest, create_mock_executor())
+
+        assert registry.search_capabilities("mer")[0].capability_name == "merge"
+        assert registry.search_capabilities("document")[0].capability_name == "merge"
+
+    def test_search_capabilities_semantic(self) -> None:
+        """Test semantic re-ranking through a registry embedder."""
+        registry = PluginRegistry()
+        manifest = create_mock_manifest(
+            "plugin",
+            [("alpha", "file file file"), ("beta", "pdf file")],
+        )
+        registry.register(manifest, create_mock_executor())
+        registry.set_search_embedder(lambda text: [1.0, 0.0] if "pdf" in text else [0.0, 1.0])
+
+        results = registry.search_capabilities("pdf file", semantic=True)
+        assert results[0].capability_name == "beta"
+
     def test_list_capabilities_nonexistent_plugin(self) -> None:
         """Test listing capabilities for non-existent plugin returns empty list."""
         registry = PluginRegistry()
@@ -526,11 +526,14 @@ class TestResourceLimits:
     def test_default_limits(self) -> None:
         """Test default resource limits."""
         limits = ResourceLimits()
-        assert limits.max_cpu_seconds == 60
+        assert limits.max_cpu_seconds == 600
         assert limits.max_memory_mb == 512
         assert limits.max_execution_time == 300
-        assert limits.max_file_size_mb == 100
-        assert limits.max_open_files == 100
+        assert limits.max_open_files == 4096
+        # Opt-in caps (0 = inherit the server's limits)
+        assert limits.max_file_size_mb == 0
+        assert limits.max_address_space_mb == 0
+        assert limits.max_processes == 0
         assert limits.max_subprocess == 10
 
     def test_custom_limits(self) -> None:
@@ -752,6 +755,13 @@ class TestExecutionContext:
         assert result is not None
         assert "File write size exceeded" in result
 
+    def test_check_limits_without_file_size_cap(self) -> None:
+        """Test that writes are unlimited when max_file_size_mb is 0."""
+        context = ExecutionContext(plugin_name="test-plugin")
+        context.record_file_write("/tmp/big.bin", 200 * 1024 * 1024)
+
+        assert context.check_limits(ResourceLimits()) is None
+
     def test_check_limits_execution_time_exceeded(self) -> None:
         """Test limit check when execution time exceeded."""
         context = ExecutionContext(plugin_name="test-plugin")
@@ -0,0 +1,146 @@
+"""Tests for the capability search index."""
+
+import pytest
+
+from mother.plugins.search import SearchIndex, stem, tokenize
+
+
+def make_index() -> SearchIndex:
+    index = SearchIndex({"name": 3.0, "description": 1.0})
+    index.add("email_send_message", {"name": "send_message", "description": "Send an email message"})
+    index.add("email_list_messages", {"name": "list_messages", "description": "List emails in a folder"})
+    index.add("pdf_merge", {"name": "merge", "description": "Merge several PDF documents"})
+    index.add("filesystem_read_file", {"name": "read_file", "description": "Read a file from disk"})
+    return index
+
+
+class TestTokenize:
+    """Tests for tokenization and stemming."""
+
+    def test_splits_identifiers(self) -> None:
+        assert tokenize("send_message") == tokenize("send-message") == tokenize("sendMessage")
+
+    def test_plural_and_verb_forms_share_stem(self) -> None:
+        assert stem("emails") == stem("email")
+        assert stem("sending") == stem("send")
+        assert stem("deleted") == stem("delete")
+        assert stem("documents") == stem("document")
+
+    def test_short_tokens_untouched(self) -> None:
+        assert stem("ssh") == "ssh"
+        assert stem("ls") == "ls"
+
+    def test_empty(self) -> None:
+        assert tokenize("") == []
+        assert tokenize("--") == []
+
+
+class TestSearchIndex:
+    """Tests for SearchIndex."""
+
+    def test_requires_fields(self) -> None:
+        with pytest.raises(ValueError):
+            SearchIndex({})
+
+    def test_exact_term(self) -> None:
+        results = make_index().search("merge")
+        assert results[0][0] == "pdf_merge"
+
+    def test_stemmed_match(self) -> None:
+        ids = [doc for doc, _ in make_index().search("emails")]
+        assert "email_send_message" in ids
+        assert "email_list_messages" in ids
+
+    def test_prefix_typeahead(self) -> None:
+        ids = [doc for doc, _ in make_index().search("mer")]
+        assert ids == ["pdf_merge"]
+
+    def test_substring_via_trigrams(self) -> None:
+        ids = [doc for doc, _ in make_index().search("mail")]
+        assert "email_send_message" in ids
+
+    def test_name_outranks_description(self) -> None:
+        index = SearchIndex({"name": 3.0, "description": 1.0})
+        index.add("a", {"name": "other", "description": "read the docs"})
+        index.add("b", {"name": "read", "description": "something else"})
+        assert index.search("read")[0][0] == "b"
+
+    def test_exact_primary_bonus(self) -> None:
+        index = SearchIndex({"name": 1.0, "description": 1.0})
+        index.add("a", {"name": "email-sender", "description": "email"})
+        index.add("b", {"name": "email", "description": "email"})
+        assert index.search("email")[0][0] == "b"
+
+    def test_no_match(self) -> None:
+        assert make_index().search("zzzz") == []
+        assert make_index().search("") == []
+
+    def test_limit(self) -> None:
+        index = SearchIndex({"name": 1.0})
+        for i in range(20):
+            index.add(f"cap_{i}", {"name": f"cap_{i}"})
+        assert len(index.search("cap", limit=5)) == 5
+        assert len(index.search("cap", limit=None)) == 20
+
+    def test_ties_keep_insertion_order(self) -> None:
+        index = SearchIndex({"name": 1.0})
+        for name in ("first", "second", "third"):
+            index.add(name, {"name": "same words"})
+        assert [doc for doc, _ in index.search("same")] == ["first", "second", "third"]
+
+    def test_remove(self) -> None:
+        index = make_index()
+        index.remove("pdf_merge")
+        assert index.search("merge") == []
+        assert index.search("mer") == []
+        assert "pdf_merge" not in index
+        assert len(index) == 3
+
+    def test_replace(self) -> None:
+        index = make_index()
+        index.add("pdf_merge", {"name": "combine", "description": "Combine PDFs"})
+        assert index.search("merge") == []
+        assert index.search("combine")[0][0] == "pdf_merge"
+        assert len(index) == 4
+
+    def test_tags_iterable(self) -> None:
+        index = SearchIndex({"name": 1.0, "tags": 1.0})
+        index.add("t", {"name": "tool", "tags": ["ai", "ml"]})
+        assert index.search("ml")[0][0] == "t"
+
+    def test_clear(self) -> None:
+        index = make_index()
+        index.clear()
+        assert len(index) == 0
+        assert index.search("merge") == []
+
+
+class TestSemanticRerank:
+    """Tests for embedding-based re-ranking."""
+
+    @staticmethod
+    def embedder(text: str) -> list[float]:
+        # Two-dimensional toy space: "pdf" vs everything else
+        return [1.0, 0.0] if "pdf" in text.lower() else [0.0, 1.0]
+
+    def test_rerank_prefers_semantic_neighbor(self) -> None:
+        index = SearchIndex({"name": 1.0, "description": 1.0}, embedder=self.embedder)
+        index.add("a", {"name": "file", "description": "file file file"})
+        index.add("b", {"name": "combine", "description": "pdf file"})
+
+        lexical = index.search("pdf file")
+        semantic = index.search("pdf file", semantic=True)
+        assert {doc for doc, _ in lexical} == {doc for doc, _ in semantic}
+        assert semantic[0][0] == "b"
+
+    def test_semantic_without_embedder_is_lexical(self) -> None:
+        index = make_index()
+        assert index.search("merge", semantic=True) == index.search("merge")
+
+    def test_embedder_failure_falls_back(self) -> None:
+        def broken(text: str) -> list[float]:
+            raise RuntimeError("no network")
+
+        index = make_index()
+        index.set_embedder(broken)
+        assert index.search("merge", semantic=True)[0][0] == "pdf_merge"
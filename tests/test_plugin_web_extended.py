@@ -2,11 +2,23 @@
 
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from mother.plugins.builtin.web import WebPlugin
 
 
+def _mock_client(status_code: int = 200, error: Exception | None = None, **kwargs) -> httpx.AsyncClient:
+    """A real client whose transport answers every request with a canned response."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if error is not None:
+            raise error
+        return httpx.Response(status_code, **kwargs)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
 class TestWebPluginCapabilities:
     """Tests for WebPlugin capabilities."""
 
@@ -18,18 +30,9 @@ class TestWebPluginCapabilities:
     @pytest.mark.asyncio
     async def test_fetch_success(self, plugin):
         """Test successful fetch."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "Hello World"
-        mock_response.headers = {"content-type": "text/html"}
-
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-
+        with patch(
+            "httpx.AsyncClient", return_value=_mock_client(headers={"content-type": "text/html"}, text="Hello World")
+        ):
             result = await plugin.execute("fetch", {"url": "https://example.com"})
 
         assert result.success is True
@@ -38,18 +41,7 @@ class TestWebPluginCapabilities:
     @pytest.mark.asyncio
     async def test_fetch_with_headers(self, plugin):
         """Test fetch with custom headers."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "OK"
-        mock_response.headers = {}
-
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-
+        with patch("httpx.AsyncClient", return_value=_mock_client(text="OK")):
             result = await plugin.execute(
                 "fetch",
                 {"url": "https://example.com", "headers": {"Authorization": "Bearer token"}},
@@ -60,18 +52,7 @@ class TestWebPluginCapabilities:
     @pytest.mark.asyncio
     async def test_get_success(self, plugin):
         """Test GET request."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "Response"
-        mock_response.headers = {}
-
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-
+        with patch("httpx.AsyncClient", return_value=_mock_client(text="Response")):
             result = await plugin.execute("get", {"url": "https://api.example.com/data"})
 
         assert result.success is True
@@ -79,18 +60,10 @@ class TestWebPluginCapabilities:
     @pytest.mark.asyncio
     async def test_post_success(self, plugin):
         """Test POST request."""
-        mock_response = MagicMock()
-        mock_response.status_code = 201
-        mock_response.text = '{"id": 1}'
-        mock_response.headers = {"content-type": "application/json"}
-
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.post = AsyncMock(return_value=mock_response)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-
+        with patch(
+            "httpx.AsyncClient",
+            return_value=_mock_client(status_code=201, headers={"content-type": "application/json"}, text='{"id": 1}'),
+        ):
             result = await plugin.execute(
                 "post",
                 {
@@ -163,18 +136,10 @@ class TestWebPluginCapabilities:
     @pytest.mark.asyncio
     async def test_get_json(self, plugin):
         """Test JSON endpoint."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"key": "value"}
-        mock_response.headers = {"content-type": "application/json"}
-
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-
+        with patch(
+            "httpx.AsyncClient",
+            return_value=_mock_client(headers={"content-type": "application/json"}, json={"key": "value"}),
+        ):
             result = await plugin.execute("get_json", {"url": "https://api.example.com/json"})
 
         assert result.success is True
@@ -216,18 +181,7 @@ class TestWebPluginCapabilities:
         </body>
         </html>
         """
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = html
-        mock_response.headers = {"content-type": "text/html"}
-
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-
+        with patch("httpx.AsyncClient", return_value=_mock_client(headers={"content-type": "text/html"}, text=html)):
             result = await plugin.execute(
                 "extract_links",
                 {"url": "https://example.com"},
@@ -252,18 +206,7 @@ class TestWebPluginCapabilities:
     @pytest.mark.asyncio
     async def test_get_with_params(self, plugin):
         """Test GET request with query parameters."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "OK"
-        mock_response.headers = {}
-
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-
+        with patch("httpx.AsyncClient", return_value=_mock_client(text="OK")):
             result = await plugin.execute(
                 "get",
                 {
@@ -277,18 +220,12 @@ class TestWebPluginCapabilities:
     @pytest.mark.asyncio
     async def test_post_with_json(self, plugin):
         """Test POST request with JSON data."""
-        mock_response = MagicMock()
-        mock_response.status_code = 201
-        mock_response.text = '{"id": 123}'
-        mock_response.headers = {"content-type": "application/json"}
-
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.post = AsyncMock(return_value=mock_response)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-
+        with patch(
+            "httpx.AsyncClient",
+            return_value=_mock_client(
+                status_code=201, headers={"content-type": "application/json"}, text='{"id": 123}'
+            ),
+        ):
             result = await plugin.execute(
                 "post",
                 {
@@ -302,13 +239,7 @@ class TestWebPluginCapabilities:
     @pytest.mark.asyncio
     async def test_fetch_error(self, plugin):
         """Test fetch with network error."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.get = AsyncMock(side_effect=Exception("Network error"))
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-
+        with patch("httpx.AsyncClient", return_value=_mock_client(error=Exception("Network error"))):
             result = await plugin.execute("fetch", {"url": "https://example.com"})
 
         assert result.success is False
@@ -0,0 +1,179 @@
+"""Tests for async SSH execution, channel multiplexing and fan-out."""
+
+import asyncio
+import threading
+import time
+
+import paramiko
+import pytest
+import yaml
+
+from mother.plugins.builtin.ssh import SSHPlugin
+from mother.plugins.process import stream_output
+from mother.utils.ssh_client import SSHConnectionPool, VMRegistry
+
+from .ssh_stub import StubSSHServer
+
+VM_NAMES = ["alpha", "beta", "gamma"]
+
+
+@pytest.fixture
+def server():
+    stub = StubSSHServer().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def vms_config(server, tmp_path):
+    key_path = tmp_path / "id_rsa"
+    paramiko.RSAKey.generate(2048).write_private_key_file(str(key_path))
+    config_path = tmp_path / "vms.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "vms": {
+                    name: {"host": "127.0.0.1", "port": server.port, "user": "mother", "ssh_key": str(key_path)}
+                    for name in VM_NAMES
+                }
+            }
+        )
+    )
+    return config_path
+
+
+@pytest.fixture
+def pool(vms_config):
+    pool = SSHConnectionPool(VMRegistry.load_from_yaml(vms_config))
+    yield pool
+    pool.close_all()
+
+
+@pytest.fixture
+def plugin(vms_config):
+    plugin = SSHPlugin({"vms_config": str(vms_config)})
+    yield plugin
+    plugin.connection_pool.close_all()
+
+
+class TestSSHConnectionPool:
+    """Tests for pooled, multiplexed connections."""
+
+    async def test_channels_share_one_transport(self, pool, server) -> None:
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(pool.run("alpha", lambda conn: conn.run_command("sleep 0.3; echo ok")) for _ in range(5))
+        )
+
+        assert [r.stdout.strip() for r in results] == ["ok"] * 5
+        assert time.monotonic() - started < 1.2
+        assert server.connections == 1
+        assert server.max_concurrent == 5
+
+    async def test_reuse_does_not_run_probe_command(self, pool, server) -> None:
+        for _ in range(3):
+            await pool.run("alpha", lambda conn: conn.run_command("true"))
+
+        assert server.commands == ["true"] * 3
+        assert server.connections == 1
+
+    async def test_event_loop_not_blocked(self, pool) -> None:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await pool.run("alpha", lambda conn: conn.run_command("sleep 0.3; echo done"))
+        task.cancel()
+
+        assert result.stdout.strip() == "done"
+        assert ticks >= 10
+
+    async def test_close_all_stops_worker_threads(self, pool, server) -> None:
+        await pool.run("alpha", lambda conn: conn.run_command("true"))
+        workers = [t for t in threading.enumerate() if t.name.startswith("mother-ssh")]
+
+        pool.close_all()
+        for thread in workers:
+            thread.join(timeout=2)
+
+        assert workers and not any(thread.is_alive() for thread in workers)
+        # The pool stays usable after a close
+        result = await pool.run("alpha", lambda conn: conn.run_command("echo again"))
+        assert result.stdout.strip() == "again"
+
+    async def test_reconnects_after_drop(self, pool, server) -> None:
+        await pool.run("alpha", lambda conn: conn.run_command("true"))
+
+        server.drop_connections()
+        result = await pool.run("alpha", lambda conn: conn.run_command("echo back"))
+
+        assert result.stdout.strip() == "back"
+        assert server.connections == 2
+
+    async def test_large_stderr_does_not_stall(self, pool) -> None:
+        command = "head -c 3000000 /dev/zero >&2; echo finished"
+        result = await pool.run("alpha", lambda conn: conn.run_command(command, timeout=10))
+
+        assert result.stdout.strip() == "finished"
+        assert len(result.stderr) == 3000000
+
+    async def test_timeout(self, pool) -> None:
+        with pytest.raises(TimeoutError):
+            await pool.run("alpha", lambda conn: conn.run_command("sleep 5", timeout=0.3))
+
+
+class TestSSHPluginAsync:
+    """Tests for the plugin on top of the async pool."""
+
+    async def test_run_command(self, plugin) -> None:
+        result = await plugin.execute("run_command", {"vm_name": "alpha", "command": "echo hi; exit 3"})
+
+        assert result.success
+        assert result.data["stdout"] == "hi\n"
+        assert result.data["exit_code"] == 3
+
+    async def test_read_file_and_list_directory(self, plugin, tmp_path) -> None:
+        (tmp_path / "notes.txt").write_text("remote notes")
+
+        read = await plugin.execute("read_file", {"vm_name": "alpha", "remote_path": str(tmp_path / "notes.txt")})
+        listing = await plugin.execute("list_directory", {"vm_name": "alpha", "remote_path": str(tmp_path)})
+
+        assert read.data["content"] == "remote notes"
+        assert "notes.txt" in [f["name"] for f in listing.data["files"]]
+
+    async def test_run_on_many_fans_out(self, plugin, server) -> None:
+        started = time.monotonic()
+        result = await plugin.execute("run_on_many", {"command": "sleep 0.4; echo up"})
+
+        assert result.success
+        assert time.monotonic() - started < 1.5
+        assert sorted(r["vm_name"] for r in result.data["results"]) == VM_NAMES
+        assert all(r["stdout"] == "up\n" for r in result.data["results"])
+        assert result.data["succeeded"] == 3
+
+    async def test_run_on_many_streams_per_host(self, plugin) -> None:
+        chunks = []
+        with stream_output(lambda name, chunk: chunks.append((name, chunk))):
+            result = await plugin.execute(
+                "run_on_many", {"command": "echo out; echo err >&2", "vm_names": ["alpha", "beta"]}
+            )
+
+        assert result.data["count"] == 2
+        assert sorted(chunks) == [
+            ("alpha/stderr", b"err\n"),
+            ("alpha/stdout", b"out\n"),
+            ("beta/stderr", b"err\n"),
+            ("beta/stdout", b"out\n"),
+        ]
+
+    async def test_run_on_many_unknown_vm(self, plugin, server) -> None:
+        result = await plugin.execute("run_on_many", {"command": "true", "vm_names": ["alpha", "nope"]})
+
+        assert not result.success
+        assert result.error_code == "VM_NOT_FOUND"
+        assert not server.commands
@@ -41,6 +41,7 @@ EXPECTED_PLUGINS: dict[str, list[str]] = {
         "move_file",
         "create_directory",
         "exists",
+        "grep",
     ],
     "shell": [
         "run_command",
@@ -56,6 +57,7 @@ EXPECTED_PLUGINS: dict[str, list[str]] = {
     ],
     "web": [
         "fetch",
+        "fetch_many",
         "get",
         "post",
         "head",
@@ -63,6 +65,7 @@ EXPECTED_PLUGINS: dict[str, list[str]] = {
         "check_url",
         "get_json",
         "extract_links",
+        "cache_stats",
         "parse_url",
         "encode_url",
     ],
@@ -86,9 +89,12 @@ EXPECTED_PLUGINS: dict[str, list[str]] = {
         "rotate",
         "delete_pages",
         "count_pages",
+        "batch",
     ],
     "datacraft": [
         "process",
+        "job_status",
+        "cancel_job",
         "search",
         "tables",
         "get",
@@ -136,6 +142,7 @@ EXPECTED_PLUGINS: dict[str, list[str]] = {
     "ssh": [
         "connect",
         "run_command",
+        "run_on_many",
         "read_file",
         "list_directory",
         "download_file",
@@ -151,7 +158,7 @@ EXPECTED_PLUGINS: dict[str, list[str]] = {
 }
 
 # Sum of EXPECTED_PLUGINS above (12 builtin plugins).
-EXPECTED_TOTAL_CAPABILITIES = 99
+EXPECTED_TOTAL_CAPABILITIES = 106
 
 # Capabilities that MUST require confirmation (destructive / side-effect ops)
 DESTRUCTIVE_CAPABILITIES: list[tuple[str, str]] = [
@@ -180,6 +187,7 @@ DESTRUCTIVE_CAPABILITIES: list[tuple[str, str]] = [
     ("tor", "tor_stop"),
     # ssh
     ("ssh", "run_command"),
+    ("ssh", "run_on_many"),
     ("ssh", "download_file"),
     ("ssh", "upload_file"),
 ]
@@ -190,6 +198,7 @@ READ_ONLY_CAPABILITIES: list[tuple[str, str]] = [
     ("filesystem", "exists"),
     ("filesystem", "file_info"),
     ("filesystem", "list_directory"),
+    ("filesystem", "grep"),
     ("shell", "get_cwd"),
     ("shell", "whoami"),
     ("shell", "hostname"),
@@ -199,6 +208,7 @@ READ_ONLY_CAPABILITIES: list[tuple[str, str]] = [
     ("shell", "list_env"),
     ("shell", "system_info"),
     ("web", "fetch"),
+    ("web", "fetch_many"),
     ("web", "get"),
     ("web", "head"),
     ("web", "check_url"),
@@ -206,6 +216,7 @@ READ_ONLY_CAPABILITIES: list[tuple[str, str]] = [
     ("web", "extract_links"),
     ("web", "parse_url"),
     ("web", "encode_url"),
+    ("web", "cache_stats"),
     ("email", "list_accounts"),
     ("email", "list_folders"),
     ("email", "list_messages"),
@@ -222,6 +233,7 @@ READ_ONLY_CAPABILITIES: list[tuple[str, str]] = [
     ("datacraft", "stats"),
     ("datacraft", "search"),
     ("datacraft", "get"),
+    ("datacraft", "job_status"),
     ("google-docs", "list"),
     ("google-docs", "get"),
     ("google-docs", "status"),
@@ -152,7 +152,9 @@ class TestToolRegistrySchemas:
         registry = ToolRegistry(enable_plugins=False)
 
         schemas = registry.get_all_anthropic_schemas()
-        assert schemas == []
+        assert schemas == ()
+        assert registry.get_all_anthropic_schemas_json() == b"[]"
+        assert registry.version == 0
 
     def test_get_all_anthropic_schemas_with_plugins(self):
         """Test getting schemas from plugins."""
@@ -0,0 +1,222 @@
+"""Tests for request tracing."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mother import tracing
+from mother.agent.core import MotherAgent
+from mother.llm.response import LLMResponse, ToolCall
+from mother.plugins import PluginResult
+from mother.plugins.manifest import (
+    CapabilitySpec,
+    ExecutionSpec,
+    ExecutionType,
+    PluginManifest,
+    PluginMetadata,
+    PythonExecutionSpec,
+)
+from mother.tools.registry import ToolRegistry
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    # Only forced traces are recorded unless a test configures otherwise
+    tracing.configure(enabled=True, sample_rate=0.0)
+    tracing.reset_histograms()
+    yield
+    tracing.configure(enabled=False)
+    tracing.reset_histograms()
+
+
+class TestSpans:
+    """Tests for traces and spans."""
+
+    def test_spans_are_noops_without_a_trace(self):
+        with tracing.span("anything") as span:
+            assert span is None
+        assert tracing.current_trace() is None
+
+    def test_disabled_tracing_does_not_sample(self):
+        tracing.configure(enabled=False)
+
+        with tracing.start_trace("request") as trace:
+            assert trace is None
+
+    def test_forced_trace(self):
+        with tracing.start_trace("request", force=True) as trace:
+            with tracing.span("work"):
+                pass
+
+        assert [s.name for s in trace.spans] == ["request", "work"]
+
+    def test_force_is_ignored_while_disabled(self):
+        tracing.configure(enabled=False)
+
+        with tracing.start_trace("request", force=True) as trace:
+            assert trace is None
+
+    def test_sample_rate(self):
+        tracing.configure(enabled=True, sample_rate=0.0)
+
+        with tracing.start_trace("request") as trace:
+            assert trace is None
+
+    def test_nesting_and_timings(self):
+        tracing.configure(enabled=True)
+
+        with tracing.start_trace("request") as trace:
+            with tracing.span("outer", step=1):
+                with tracing.span("inner"):
+                    pass
+                with tracing.span("inner"):
+                    pass
+
+        root, outer, first, second = trace.spans
+        assert root.parent_id is None
+        assert outer.parent_id == root.span_id
+        assert first.parent_id == second.parent_id == outer.span_id
+        assert outer.attributes == {"step": 1}
+
+        timings = trace.timings()
+        assert timings["trace_id"] == trace.trace_id
+        assert timings["total_ms"] >= timings["spans"]["outer"]["total_ms"]
+        assert timings["spans"]["inner"]["count"] == 2
+        assert "request" not in timings["spans"]
+
+    async def test_spans_follow_asyncio_tasks(self):
+        with tracing.start_trace("request", force=True) as trace:
+            with tracing.span("fan_out"):
+
+                async def work(i):
+                    with tracing.span("task", index=i):
+                        await asyncio.sleep(0)
+
+                await asyncio.gather(*(work(i) for i in range(3)))
+
+        fan_out = trace.spans[1]
+        tasks = [s for s in trace.spans if s.name == "task"]
+        assert len(tasks) == 3
+        assert all(s.parent_id == fan_out.span_id for s in tasks)
+
+    def test_nested_start_trace_joins_the_outer_trace(self):
+        with tracing.start_trace("outer", force=True) as outer:
+            with tracing.start_trace("inner") as inner:
+                assert inner is outer
+
+        assert [s.name for s in outer.spans] == ["outer", "inner"]
+
+    def test_errors_are_recorded(self):
+        with pytest.raises(ValueError):
+            with tracing.start_trace("request", force=True) as trace:
+                with tracing.span("fails"):
+                    raise ValueError("boom")
+
+        assert trace.spans[1].error == "ValueError: boom"
+
+    async def test_traced_decorator(self):
+        @tracing.traced("sync_step")
+        def sync_step(x):
+            return x + 1
+
+        @tracing.traced("async_step")
+        async def async_step(x):
+            return x * 2
+
+        assert sync_step(1) == 2
+        with tracing.start_trace("request", force=True) as trace:
+            assert sync_step(1) == 2
+            assert await async_step(2) == 4
+
+        assert [s.name for s in trace.spans] == ["request", "sync_step", "async_step"]
+
+
+class TestExport:
+    """Tests for histograms and the OTLP export."""
+
+    def test_histograms(self):
+        for _ in range(3):
+            with tracing.start_trace("request", force=True):
+                with tracing.span("step"):
+                    pass
+
+        histograms = tracing.histograms()
+        assert histograms["step"]["count"] == 3
+        assert histograms["step"]["buckets"]["1"] == 3
+        assert histograms["request"]["count"] == 3
+
+    def test_otlp_file_export(self, tmp_path):
+        path = tmp_path / "traces" / "out.jsonl"
+        tracing.configure(enabled=True, export_path=path)
+
+        with tracing.start_trace("request", user="x") as trace:
+            with tracing.span("step", count=2, ratio=0.5, ok=True):
+                pass
+        tracing.flush()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 1
+        exported = json.loads(lines[0])["resourceSpans"][0]
+        assert exported["resource"]["attributes"][0]["value"] == {"stringValue": "mother"}
+        root, step = exported["scopeSpans"][0]["spans"]
+        assert root["traceId"] == step["traceId"] == trace.trace_id
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert step["parentSpanId"] == root["spanId"]
+        assert int(step["endTimeUnixNano"]) >= int(step["startTimeUnixNano"])
+        assert step["attributes"] == [
+            {"key": "count", "value": {"intValue": "2"}},
+            {"key": "ratio", "value": {"doubleValue": 0.5}},
+            {"key": "ok", "value": {"boolValue": True}},
+        ]
+
+
+class TestAgentTracing:
+    """Tests for tracing inside the agent loop."""
+
+    @pytest.fixture
+    def agent(self):
+        registry = ToolRegistry()
+        executor = MagicMock()
+        executor.execute = AsyncMock(return_value=PluginResult.success_result(data={"ok": True}))
+        manifest = PluginManifest(
+            schema_version="1.0",
+            plugin=PluginMetadata(name="demo", version="1.0.0", description="demo plugin", author="Test"),
+            capabilities=[CapabilitySpec(name="hello", description="Say hello")],
+            execution=ExecutionSpec(
+                type=ExecutionType.PYTHON,
+                python=PythonExecutionSpec(module="test", **{"class": "Test"}),
+            ),
+        )
+        registry.plugin_manager.registry.register(manifest, executor)
+
+        provider = MagicMock()
+        provider.create_message = AsyncMock(
+            side_effect=[
+                LLMResponse(text=None, tool_calls=[ToolCall(id="c1", name="demo_hello", arguments={})]),
+                LLMResponse(text="Hi", tool_calls=[], stop_reason="end_turn"),
+            ]
+        )
+        return MotherAgent(
+            tool_registry=registry,
+            provider=provider,
+            enable_memory=False,
+            enable_cognitive=False,
+            enable_session_persistence=False,
+        )
+
+    async def test_untraced_request_has_no_timings(self, agent):
+        response = await agent.process_command("say hello")
+
+        assert response.timings is None
+
+    async def test_traced_request_breakdown(self, agent):
+        response = await agent.process_command("say hello", trace=True)
+
+        spans = response.timings["spans"]
+        assert spans["llm.create_message"]["count"] == 2
+        assert spans["agent.tool"]["count"] == 1
+        assert spans["plugin.execute"]["count"] == 1
+        assert response.timings["total_ms"] >= spans["agent.tool"]["total_ms"]
+        assert tracing.histograms()["agent.process_command"]["count"] == 1
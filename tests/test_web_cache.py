@@ -0,0 +1,276 @@
+"""Tests for the web plugin's HTTP cache."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from mother.plugins.builtin.web import WebPlugin
+from mother.plugins.builtin.web.cache import CacheEntry, HTTPCache, parse_cache_control
+
+from .http_stub import Route, StubHTTPServer
+
+
+@pytest.fixture
+def server():
+    stub = StubHTTPServer().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+async def plugin(tmp_path):
+    plugin = WebPlugin(config={"cache_db_path": str(tmp_path / "cache.db")})
+    yield plugin
+    await plugin.shutdown()
+
+
+def _entry(headers, status=200, response_time=1000.0):
+    return CacheEntry(
+        url="http://example.com/",
+        status_code=status,
+        headers=headers,
+        content=b"x",
+        request_time=response_time,
+        response_time=response_time,
+    )
+
+
+class TestFreshness:
+    """Tests for freshness and age calculation."""
+
+    def test_parse_cache_control(self):
+        assert parse_cache_control('max-age=60, No-Cache, private="x"') == {
+            "max-age": "60",
+            "no-cache": None,
+            "private": "x",
+        }
+
+    def test_max_age(self):
+        entry = _entry([("cache-control", "max-age=60")])
+
+        assert entry.is_fresh(1059)
+        assert not entry.is_fresh(1061)
+
+    def test_age_header_counts(self):
+        entry = _entry([("cache-control", "max-age=60"), ("age", "50")])
+
+        assert not entry.is_fresh(1011)
+
+    def test_expires(self):
+        entry = _entry([("date", "Thu, 01 Jan 1970 00:16:40 GMT"), ("expires", "Thu, 01 Jan 1970 00:17:40 GMT")])
+
+        assert entry.freshness_lifetime() == 60
+
+    def test_invalid_expires_is_stale(self):
+        assert _entry([("expires", "0")]).freshness_lifetime() == 0
+
+    def test_heuristic_from_last_modified(self):
+        entry = _entry([("date", "Thu, 01 Jan 1970 00:16:40 GMT"), ("last-modified", "Thu, 01 Jan 1970 00:00:00 GMT")])
+
+        assert entry.freshness_lifetime() == pytest.approx(100)
+
+    def test_no_cache_response_is_never_fresh(self):
+        assert not _entry([("cache-control", "max-age=60, no-cache")]).is_fresh(1000)
+
+
+class TestHTTPCache:
+    """Tests for caching through the plugin against a local server."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_response_is_served_from_cache(self, plugin, server):
+        server.routes["/doc"] = Route(b"hello", headers={"Cache-Control": "max-age=300"})
+
+        first = await plugin.execute("fetch", {"url": server.url("/doc")})
+        second = await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        assert first.data["cache"] == "miss"
+        assert second.data["cache"] == "hit"
+        assert second.data["content"] == "hello"
+        assert len(server.hits("/doc")) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_response_is_revalidated(self, plugin, server):
+        server.routes["/doc"] = Route(b"hello", headers={"Cache-Control": "max-age=0"}, etag='"v1"')
+
+        await plugin.execute("get", {"url": server.url("/doc")})
+        result = await plugin.execute("get", {"url": server.url("/doc")})
+
+        assert result.data["cache"] == "revalidated"
+        assert result.data["status_code"] == 200
+        assert result.data["content"] == "hello"
+        assert server.hits("/doc")[1].headers["if-none-match"] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_changed_resource_replaces_entry(self, plugin, server):
+        server.routes["/doc"] = Route(b"old", headers={"Cache-Control": "no-cache"}, etag='"v1"')
+        await plugin.execute("fetch", {"url": server.url("/doc")})
+        server.routes["/doc"] = Route(b"new", headers={"Cache-Control": "no-cache"}, etag='"v2"')
+
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        assert result.data["cache"] == "miss"
+        assert result.data["content"] == "new"
+        assert (await plugin.execute("fetch", {"url": server.url("/doc")})).data["cache"] == "revalidated"
+
+    @pytest.mark.asyncio
+    async def test_no_store_is_not_cached(self, plugin, server):
+        server.routes["/doc"] = Route(b"secret", headers={"Cache-Control": "no-store"})
+
+        await plugin.execute("fetch", {"url": server.url("/doc")})
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        assert result.data["cache"] == "miss"
+        assert len(server.hits("/doc")) == 2
+
+    @pytest.mark.asyncio
+    async def test_private_is_not_cached(self, plugin, server):
+        server.routes["/doc"] = Route(b"mine", headers={"Cache-Control": "private, max-age=600"})
+
+        await plugin.execute("fetch", {"url": server.url("/doc")})
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        assert result.data["cache"] == "miss"
+        assert len(server.hits("/doc")) == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("credential", [{"Authorization": "Bearer alice"}, {"Cookie": "session=alice"}])
+    async def test_credentialed_responses_are_not_shared(self, plugin, server, credential):
+        server.routes["/me"] = Route(b"secret for alice", headers={"Cache-Control": "max-age=600"})
+
+        await plugin.execute("fetch", {"url": server.url("/me"), "headers": credential})
+        other = await plugin.execute("fetch", {"url": server.url("/me"), "headers": {"Authorization": "Bearer bob"}})
+        anonymous = await plugin.execute("fetch", {"url": server.url("/me")})
+
+        assert other.data["cache"] == "miss"
+        assert anonymous.data["cache"] == "miss"
+        assert len(server.hits("/me")) == 3
+
+    @pytest.mark.asyncio
+    async def test_public_credentialed_response_is_cached(self, plugin, server):
+        server.routes["/logo"] = Route(b"logo", headers={"Cache-Control": "public, max-age=600"})
+
+        await plugin.execute("fetch", {"url": server.url("/logo"), "headers": {"Authorization": "Bearer alice"}})
+        result = await plugin.execute("fetch", {"url": server.url("/logo")})
+
+        assert result.data["cache"] == "hit"
+
+    @pytest.mark.asyncio
+    async def test_vary_header_must_match(self, plugin, server):
+        server.routes["/doc"] = Route(b"hi", headers={"Cache-Control": "max-age=300", "Vary": "Accept-Language"})
+
+        await plugin.execute("fetch", {"url": server.url("/doc"), "headers": {"Accept-Language": "en"}})
+        other = await plugin.execute("fetch", {"url": server.url("/doc"), "headers": {"Accept-Language": "de"}})
+        same = await plugin.execute("fetch", {"url": server.url("/doc"), "headers": {"Accept-Language": "de"}})
+
+        assert other.data["cache"] == "miss"
+        assert same.data["cache"] == "hit"
+
+    @pytest.mark.asyncio
+    async def test_query_params_are_part_of_the_key(self, plugin, server):
+        server.routes["/api"] = Route(b'{"ok": true}', headers={"Cache-Control": "max-age=300"})
+
+        await plugin.execute("get_json", {"url": server.url("/api"), "params": {"q": "a"}})
+        other = await plugin.execute("get_json", {"url": server.url("/api"), "params": {"q": "b"}})
+        same = await plugin.execute("get_json", {"url": server.url("/api"), "params": {"q": "b"}})
+
+        assert other.data["cache"] == "miss"
+        assert same.data["cache"] == "hit"
+        assert same.data["json"] == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_bypass_and_only_modes(self, plugin, server):
+        server.routes["/doc"] = Route(b"hello", headers={"Cache-Control": "max-age=300"})
+
+        missing = await plugin.execute("fetch", {"url": server.url("/doc"), "cache": "only"})
+        await plugin.execute("fetch", {"url": server.url("/doc")})
+        bypassed = await plugin.execute("fetch", {"url": server.url("/doc"), "cache": "bypass"})
+        cached = await plugin.execute("fetch", {"url": server.url("/doc"), "cache": "only"})
+
+        assert missing.error_code == "NOT_CACHED"
+        assert bypassed.data["cache"] == "bypass"
+        assert cached.data["cache"] == "hit"
+        assert len(server.hits("/doc")) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_collapsed(self, plugin, server):
+        server.routes["/slow"] = Route(b"done", headers={"Cache-Control": "max-age=300"}, delay=0.2)
+
+        results = await asyncio.gather(*(plugin.execute("fetch", {"url": server.url("/slow")}) for _ in range(5)))
+
+        assert all(r.data["content"] == "done" for r in results)
+        assert len(server.hits("/slow")) == 1
+        assert plugin._cache.stats()["collapsed"] == 4
+
+    @pytest.mark.asyncio
+    async def test_entries_survive_restart(self, tmp_path, server):
+        server.routes["/doc"] = Route(b"hello", headers={"Cache-Control": "max-age=300"})
+        config = {"cache_db_path": str(tmp_path / "cache.db")}
+        first = WebPlugin(config=config)
+        await first.execute("fetch", {"url": server.url("/doc")})
+        await first.shutdown()
+
+        second = WebPlugin(config=config)
+        result = await second.execute("fetch", {"url": server.url("/doc")})
+        await second.shutdown()
+
+        assert result.data["cache"] == "hit"
+        assert second._cache.stats()["disk_reads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_post_invalidates(self, plugin, server):
+        server.routes["/item"] = Route(b"v1", headers={"Cache-Control": "max-age=300"})
+        await plugin.execute("fetch", {"url": server.url("/item")})
+
+        await plugin.execute("post", {"url": server.url("/item"), "json": {"x": 1}})
+        result = await plugin.execute("fetch", {"url": server.url("/item")})
+
+        assert result.data["cache"] == "miss"
+
+    @pytest.mark.asyncio
+    async def test_cache_stats(self, plugin, server):
+        server.routes["/doc"] = Route(b"hello", headers={"Cache-Control": "max-age=300"})
+        for _ in range(4):
+            await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        result = await plugin.execute("cache_stats", {})
+
+        assert result.data["hits"] == 3
+        assert result.data["misses"] == 1
+        assert result.data["hit_rate"] == 0.75
+        assert result.data["disk_entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, server):
+        server.routes["/doc"] = Route(b"hello", headers={"Cache-Control": "max-age=300"})
+        plugin = WebPlugin(config={"http_cache": False})
+
+        await plugin.execute("fetch", {"url": server.url("/doc")})
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+        await plugin.shutdown()
+
+        assert result.data["cache"] == "bypass"
+        assert len(server.hits("/doc")) == 2
+
+
+class TestDiskLimit:
+    """Tests for the size-bounded store."""
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entries_are_evicted(self, tmp_path, server):
+        for name in ("a", "b", "c"):
+            server.routes[f"/{name}"] = Route(name.encode() * 400, headers={"Cache-Control": "max-age=300"})
+        cache = HTTPCache(tmp_path / "cache.db", max_bytes=1000, memory_entries=0)
+
+        async def send_for(path):
+            async with httpx.AsyncClient() as client:
+                return await client.get(server.url(path))
+
+        for name in ("a", "b", "c"):
+            await cache.fetch(server.url(f"/{name}"), None, lambda _, n=name: send_for(f"/{n}"))
+
+        stats = cache.stats()
+        assert stats["evicted"] == 1
+        assert stats["disk_entries"] == 2
+        _, status = await cache.fetch(server.url("/a"), None, lambda _: send_for("/a"), mode="only")
+        assert status == "miss"
@@ -0,0 +1,179 @@
+"""Tests for HTML to text and Markdown extraction in the web plugin."""
+
+import pytest
+
+from mother.plugins.builtin.web.extract import CHARS_PER_TOKEN, extract_links, html_to_text, is_html, limit_text
+
+PAGE = """<!doctype html>
+<html>
+<head>
+  <title>Release notes</title>
+  <style>body { color: red }</style>
+  <script>window.track = true;</script>
+</head>
+<body class="page has-sidebar">
+  <header class="site-header"><a href="/">Home</a> <a href="/blog">Blog</a></header>
+  <nav><ul><li><a href="/a">Section A</a></li></ul></nav>
+  <div class="cookie-banner">We use cookies</div>
+  <main>
+    <article>
+      <header><h1>Release notes</h1></header>
+      <p>Version 2 is <strong>faster</strong> and has a <a href="/docs/upgrade">guide</a>.</p>
+      <h2>Changes</h2>
+      <ul><li><p>New cache</p></li><li>Fewer <em>allocations</em></li></ul>
+      <ol start="3"><li>three</li><li>four<ul><li>nested</li></ul></li></ol>
+      <pre><code>pip install -U mother
+  --pre</code></pre>
+      <table>
+        <tr><th>Metric</th><th>v1</th><th>v2</th></tr>
+        <tr><td>p50 | ms</td><td>12</td><td>4</td></tr>
+        <tr><td>p99<td>80<td>20
+      </table>
+      <blockquote><p>Ship it.</p></blockquote>
+      <div class="share-buttons"><a href="https://social.example/share">Share</a></div>
+    </article>
+  </main>
+  <aside>Related posts</aside>
+  <footer>Copyright 2026</footer>
+</body>
+</html>
+"""
+
+
+class TestHtmlToText:
+    """Tests for html_to_text."""
+
+    def test_markdown(self):
+        content, truncated = html_to_text(PAGE, "markdown", "https://example.com/blog/v2")
+
+        assert not truncated
+        assert content == (
+            "# Release notes\n\n"
+            "Version 2 is **faster** and has a [guide](https://example.com/docs/upgrade).\n\n"
+            "## Changes\n"
+            "- New cache\n"
+            "- Fewer *allocations*\n"
+            "3. three\n"
+            "4. four\n"
+            "  - nested\n\n"
+            "```\npip install -U mother\n  --pre\n```\n\n"
+            "| Metric | v1 | v2 |\n"
+            "| --- | --- | --- |\n"
+            "| p50 \\| ms | 12 | 4 |\n"
+            "| p99 | 80 | 20 |\n\n"
+            "> Ship it."
+        )
+
+    def test_text(self):
+        content, _ = html_to_text(PAGE, "text", "https://example.com/blog/v2")
+
+        assert content.startswith(
+            "Release notes\n\nVersion 2 is faster and has a guide (https://example.com/docs/upgrade)."
+        )
+        assert "Metric | v1 | v2\np50 | ms | 12 | 4" in content
+        assert "**" not in content
+
+    @pytest.mark.parametrize("chrome", ["Home", "Section A", "cookies", "Share", "Related posts", "Copyright", "track"])
+    def test_chrome_is_removed(self, chrome):
+        content, _ = html_to_text(PAGE, "markdown")
+
+        assert chrome not in content
+
+    def test_page_without_main_keeps_body_content(self):
+        html = "<body><nav>Menu</nav><div id='sidebar'>Links</div><h2>Intro</h2><p>Body text</p></body>"
+
+        assert html_to_text(html)[0] == "Intro\n\nBody text"
+
+    def test_article_header_is_kept(self):
+        html = "<article><header><p>By Jo</p></header><p>Text</p></article><footer>Site footer</footer>"
+
+        assert html_to_text(html)[0] == "By Jo\n\nText"
+
+    def test_hidden_elements_are_removed(self):
+        html = "<p>Shown</p><p hidden>Hidden</p><div aria-hidden='true'>Also hidden</div>"
+
+        assert html_to_text(html)[0] == "Shown"
+
+    def test_everything_chrome_falls_back_to_all_text(self):
+        html = "<div class='menu'>Only this</div>"
+
+        assert html_to_text(html)[0] == "Only this"
+
+    def test_whitespace_around_inline_elements_is_kept(self):
+        html = "<p>one <b>two </b>three<a href='#x'> four</a></p>"
+
+        assert html_to_text(html)[0] == "one two three four"
+
+    def test_entities_and_line_breaks(self):
+        assert html_to_text("<p>a &amp; b<br>c&nbsp;d</p>")[0] == "a & b\nc d"
+
+    def test_layout_table_is_flattened(self):
+        html = "<table><tr><td><p>First</p></td></tr><tr><td>Second</td></tr></table>"
+
+        assert html_to_text(html)[0] == "First\n\nSecond"
+
+    def test_unclosed_tags(self):
+        html = "<ul><li>one<li>two</ul><p>para<p>next"
+
+        assert html_to_text(html)[0] == "- one\n- two\n\npara\n\nnext"
+
+    def test_image_alt_text(self):
+        html = '<p><img src="/cat.png" alt="A cat"></p>'
+
+        assert html_to_text(html, "markdown", "https://example.com/")[0] == "![A cat](https://example.com/cat.png)"
+        assert html_to_text(html)[0] == "A cat"
+
+    def test_token_budget(self):
+        html = "".join(f"<p>Paragraph {i} {'word ' * 20}</p>" for i in range(100))
+
+        content, truncated = html_to_text(html, max_tokens=100)
+
+        assert truncated
+        assert len(content) <= 100 * CHARS_PER_TOKEN
+        assert content.startswith("Paragraph 0 word")
+
+    def test_no_budget(self):
+        html = "<p>" + "word " * 10000 + "</p>"
+
+        content, truncated = html_to_text(html, max_tokens=None)
+
+        assert not truncated
+        assert len(content) == len("word " * 10000) - 1
+
+    def test_large_main_content_stops_parsing_early(self):
+        html = "<main>" + "<p>text</p>" * 50000 + "</main><p>after</p>"
+
+        content, truncated = html_to_text(html, max_tokens=50)
+
+        assert truncated
+        assert "after" not in content
+
+
+class TestHelpers:
+    """Tests for the small helpers."""
+
+    def test_extract_links(self):
+        html = '<a href="/a">A</a> <a href="b?x=1&amp;y=2">B</a> <area href="#map"> <a>none</a> <a href=" ">blank</a>'
+
+        assert extract_links(html) == ["/a", "b?x=1&y=2", "#map"]
+        assert extract_links(html, "https://example.com/dir/page") == [
+            "https://example.com/a",
+            "https://example.com/dir/b?x=1&y=2",
+            "https://example.com/dir/page#map",
+        ]
+
+    def test_extract_links_honours_base_element(self):
+        html = '<head><base href="/static/"></head><a href="logo.png">logo</a>'
+
+        assert extract_links(html, "https://example.com/page") == ["https://example.com/static/logo.png"]
+
+    def test_is_html(self):
+        assert is_html("text/html; charset=utf-8", "")
+        assert is_html("application/xhtml+xml", "")
+        assert not is_html("application/json", "<html>")
+        assert is_html(None, "  <!DOCTYPE html><html>")
+        assert not is_html(None, "plain")
+
+    def test_limit_text(self):
+        assert limit_text("short", 10) == ("short", False)
+        assert limit_text("word " * 100, 5) == ("word word word word", True)
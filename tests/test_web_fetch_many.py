@@ -0,0 +1,188 @@
+"""Tests for the web plugin's fetch_many capability and robots.txt checks."""
+
+import socket
+
+import httpx
+import pytest
+
+from mother.plugins.builtin.web import HTTP2_AVAILABLE, MAX_FETCH_MANY_URLS, WebPlugin
+from mother.plugins.builtin.web.robots import ROBOTS_TTL, RobotsCache
+
+from .http_stub import Route, StubHTTPServer
+
+
+@pytest.fixture
+def server():
+    stub = StubHTTPServer().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+async def plugin(tmp_path):
+    plugin = WebPlugin(config={"cache_db_path": str(tmp_path / "cache.db")})
+    yield plugin
+    await plugin.shutdown()
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestFetchMany:
+    """Tests for fetch_many against a local server."""
+
+    @pytest.mark.asyncio
+    async def test_results_are_in_request_order(self, plugin, server):
+        server.routes["/slow"] = Route(b"<p>slow page</p>", headers={"Content-Type": "text/html"}, delay=0.2)
+        server.routes["/fast"] = Route(b"fast page")
+        urls = [server.url("/slow"), server.url("/fast"), server.url("/missing")]
+
+        result = await plugin.execute("fetch_many", {"urls": urls})
+
+        assert result.success is True
+        assert result.data["count"] == 3
+        assert result.data["succeeded"] == 3
+        assert [r["url"] for r in result.data["results"]] == urls
+        slow, fast, missing = result.data["results"]
+        assert slow["content"] == "slow page"
+        assert slow["elapsed_ms"] >= 200
+        assert fast["content"] == "fast page"
+        assert missing["status_code"] == 404
+
+    @pytest.mark.asyncio
+    async def test_requests_run_concurrently(self, plugin, server):
+        for i in range(4):
+            server.routes[f"/{i}"] = Route(b"ok", delay=0.3)
+
+        result = await plugin.execute("fetch_many", {"urls": [server.url(f"/{i}") for i in range(4)], "per_host": 4})
+
+        assert result.data["succeeded"] == 4
+        assert result.data["elapsed_ms"] < 1000
+        assert server.max_in_flight == 4
+
+    @pytest.mark.asyncio
+    async def test_global_limit(self, plugin, server):
+        for i in range(6):
+            server.routes[f"/{i}"] = Route(b"ok", delay=0.1)
+
+        urls = [server.url(f"/{i}") for i in range(6)]
+        await plugin.execute("fetch_many", {"urls": urls, "concurrency": 3, "per_host": 10})
+
+        assert server.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self, plugin, server):
+        for i in range(6):
+            server.routes[f"/{i}"] = Route(b"ok", delay=0.1)
+
+        urls = [server.url(f"/{i}") for i in range(6)]
+        await plugin.execute("fetch_many", {"urls": urls, "concurrency": 10})
+
+        assert server.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_url(self, tmp_path, server):
+        plugin = WebPlugin(config={"cache_db_path": str(tmp_path / "cache.db"), "blocked_domains": ["evil.com"]})
+        server.routes["/ok"] = Route(b"fine")
+        urls = [server.url("/ok"), "https://evil.com/", f"http://127.0.0.1:{_closed_port()}/", "ftp://example.com/"]
+
+        result = await plugin.execute("fetch_many", {"urls": urls})
+        await plugin.shutdown()
+
+        assert result.success is True
+        assert result.data["succeeded"] == 1
+        assert result.data["failed"] == 3
+        codes = [r.get("error_code") for r in result.data["results"]]
+        assert codes == [None, "URL_NOT_ALLOWED", "CONNECTION_ERROR", "URL_NOT_ALLOWED"]
+
+    @pytest.mark.asyncio
+    async def test_token_budget_is_split_across_urls(self, plugin, server):
+        server.routes["/big"] = Route(b"word " * 20000)
+
+        result = await plugin.execute("fetch_many", {"urls": [server.url("/big")] * 2})
+        capped = await plugin.execute("fetch_many", {"urls": [server.url("/big")], "max_tokens": 100})
+
+        assert all(r["truncated"] for r in result.data["results"])
+        assert len(result.data["results"][0]["content"]) < 4000 * 4 + 20
+        assert len(capped.data["results"][0]["content"]) < 100 * 4 + 20
+
+    @pytest.mark.asyncio
+    async def test_invalid_input(self, plugin):
+        empty = await plugin.execute("fetch_many", {"urls": []})
+        too_many = await plugin.execute("fetch_many", {"urls": ["https://example.com/"] * (MAX_FETCH_MANY_URLS + 1)})
+        bad_format = await plugin.execute("fetch_many", {"urls": ["https://example.com/"], "format": "pdf"})
+
+        assert empty.error_code == "INVALID_INPUT"
+        assert too_many.error_code == "INVALID_INPUT"
+        assert bad_format.error_code == "INVALID_INPUT"
+
+    def test_http2_follows_availability_and_config(self):
+        assert WebPlugin()._http2 is HTTP2_AVAILABLE
+        assert WebPlugin(config={"http2": False})._http2 is False
+
+
+class TestRobots:
+    """Tests for respect_robots."""
+
+    @pytest.mark.asyncio
+    async def test_disallowed_urls_are_skipped(self, plugin, server):
+        server.routes["/robots.txt"] = Route(b"User-agent: *\nDisallow: /private\n")
+        server.routes["/public"] = Route(b"public")
+        server.routes["/private/page"] = Route(b"secret")
+        urls = [server.url("/public"), server.url("/private/page"), server.url("/public")]
+
+        result = await plugin.execute("fetch_many", {"urls": urls, "respect_robots": True})
+
+        public, private, _ = result.data["results"]
+        assert public["content"] == "public"
+        assert private["error_code"] == "ROBOTS_DISALLOWED"
+        assert server.hits("/private/page") == []
+        assert len(server.hits("/robots.txt")) == 1
+
+    @pytest.mark.asyncio
+    async def test_robots_ignored_by_default(self, plugin, server):
+        server.routes["/robots.txt"] = Route(b"User-agent: *\nDisallow: /\n")
+        server.routes["/page"] = Route(b"page")
+
+        result = await plugin.execute("fetch_many", {"urls": [server.url("/page")]})
+
+        assert result.data["succeeded"] == 1
+        assert server.hits("/robots.txt") == []
+
+    @pytest.mark.asyncio
+    async def test_missing_robots_allows_everything(self, plugin, server):
+        server.routes["/page"] = Route(b"page")
+
+        result = await plugin.execute("fetch_many", {"urls": [server.url("/page")], "respect_robots": True})
+
+        assert result.data["succeeded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_server_error_disallows_everything(self, plugin, server):
+        server.routes["/robots.txt"] = Route(b"oops", status=503)
+        server.routes["/page"] = Route(b"page")
+
+        result = await plugin.execute("fetch_many", {"urls": [server.url("/page")], "respect_robots": True})
+
+        assert result.data["results"][0]["error_code"] == "ROBOTS_DISALLOWED"
+
+    @pytest.mark.asyncio
+    async def test_rules_expire(self):
+        now = [0.0]
+        fetched = []
+
+        async def fetch(url):
+            fetched.append(url)
+            return httpx.Response(200, text="User-agent: *\nDisallow: /x\n")
+
+        robots = RobotsCache("Mother-AI/1.0", fetch, clock=lambda: now[0])
+
+        assert await robots.allowed("https://example.com/page")
+        assert not await robots.allowed("https://example.com/x/1")
+        now[0] = ROBOTS_TTL + 1
+        await robots.allowed("https://example.com/page")
+
+        assert fetched == ["https://example.com/robots.txt"] * 2
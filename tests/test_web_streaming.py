@@ -0,0 +1,155 @@
+"""Tests for the web plugin's streamed, size-capped response bodies."""
+
+import gzip
+import zlib
+
+import pytest
+
+from mother.plugins.builtin.web import WebPlugin
+
+from .http_stub import Route, StubHTTPServer
+
+
+@pytest.fixture
+def server():
+    stub = StubHTTPServer().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+async def plugin(tmp_path):
+    plugin = WebPlugin(config={"cache_db_path": str(tmp_path / "cache.db"), "max_response_size": 1000})
+    yield plugin
+    await plugin.shutdown()
+
+
+class TestSizeCap:
+    """Tests for cutting bodies at max_response_size."""
+
+    @pytest.mark.asyncio
+    async def test_small_body_is_complete(self, plugin, server):
+        server.routes["/doc"] = Route(b"hello")
+
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        assert result.data["content"] == "hello"
+        assert result.data["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_body_at_the_cap_is_not_truncated(self, plugin, server):
+        server.routes["/doc"] = Route(b"x" * 1000)
+
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        assert result.data["content"] == "x" * 1000
+        assert result.data["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_chunked_body_is_cut_at_the_cap(self, plugin, server):
+        server.routes["/big"] = Route(b"x" * 200_000, chunked=True)
+
+        result = await plugin.execute("get", {"url": server.url("/big")})
+
+        assert result.success is True
+        assert result.data["truncated"] is True
+        assert result.data["content"] == "x" * 1000 + "\n... (truncated)"
+
+    @pytest.mark.asyncio
+    async def test_gzip_bomb_is_bounded(self, plugin, server):
+        bomb = gzip.compress(b"\0" * 20_000_000)
+        server.routes["/bomb"] = Route(bomb, headers={"Content-Encoding": "gzip"}, chunked=True)
+
+        result = await plugin.execute("fetch", {"url": server.url("/bomb")})
+
+        assert result.data["truncated"] is True
+        assert len(result.data["content"]) == 1000 + len("\n... (truncated)")
+
+    @pytest.mark.asyncio
+    async def test_gzip_body_is_decoded(self, plugin, server):
+        server.routes["/doc"] = Route(gzip.compress(b"hello"), headers={"Content-Encoding": "gzip"})
+
+        result = await plugin.execute("get", {"url": server.url("/doc")})
+
+        assert result.data["content"] == "hello"
+        assert "content-encoding" not in result.data["headers"]
+
+    @pytest.mark.asyncio
+    async def test_raw_deflate_body_is_decoded(self, plugin, server):
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        body = compressor.compress(b"hello") + compressor.flush()
+        server.routes["/doc"] = Route(body, headers={"Content-Encoding": "deflate"})
+
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        assert result.data["content"] == "hello"
+
+    @pytest.mark.asyncio
+    async def test_post_response_is_capped(self, plugin, server):
+        server.routes["/submit"] = Route(b"y" * 5000, chunked=True)
+
+        result = await plugin.execute("post", {"url": server.url("/submit"), "json": {"a": 1}})
+
+        assert result.data["truncated"] is True
+        assert result.data["content"].startswith("y" * 1000)
+        assert server.hits("/submit")[0].body == b'{"a":1}'
+
+    @pytest.mark.asyncio
+    async def test_truncated_json_is_an_error(self, plugin, server):
+        server.routes["/api"] = Route(b'{"items": [' + b'"x", ' * 1000 + b'"x"]}')
+
+        result = await plugin.execute("get_json", {"url": server.url("/api")})
+
+        assert result.success is False
+        assert result.error_code == "RESPONSE_TOO_LARGE"
+
+    @pytest.mark.asyncio
+    async def test_truncated_response_is_not_cached(self, plugin, server):
+        server.routes["/big"] = Route(b"x" * 5000, headers={"Cache-Control": "max-age=300"})
+
+        await plugin.execute("fetch", {"url": server.url("/big")})
+        result = await plugin.execute("fetch", {"url": server.url("/big")})
+
+        assert result.data["cache"] == "miss"
+        assert len(server.hits("/big")) == 2
+
+
+class TestDecoding:
+    """Tests for charset-aware text decoding."""
+
+    @pytest.mark.asyncio
+    async def test_charset_from_content_type(self, plugin, server):
+        server.routes["/doc"] = Route(
+            "café".encode("latin-1"), headers={"Content-Type": "text/plain; charset=iso-8859-1"}
+        )
+
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        assert result.data["content"] == "café"
+
+    @pytest.mark.asyncio
+    async def test_charset_from_meta_tag(self, plugin, server):
+        body = '<html><head><meta charset="windows-1252"></head>café</html>'.encode("cp1252")
+        server.routes["/doc"] = Route(body, headers={"Content-Type": "text/html"})
+
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        assert "café" in result.data["content"]
+
+    @pytest.mark.asyncio
+    async def test_byte_order_mark(self, plugin, server):
+        server.routes["/doc"] = Route("café".encode("utf-16"), headers={"Content-Type": "text/plain"})
+
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+
+        assert result.data["content"] == "café"
+
+    @pytest.mark.asyncio
+    async def test_character_split_at_the_cap_is_dropped(self, tmp_path, server):
+        plugin = WebPlugin(config={"cache_db_path": str(tmp_path / "cache.db"), "max_response_size": 5})
+        server.routes["/doc"] = Route("é".encode() * 10, headers={"Content-Type": "text/plain; charset=utf-8"})
+
+        result = await plugin.execute("fetch", {"url": server.url("/doc")})
+        await plugin.shutdown()
+
+        assert result.data["content"] == "éé\n... (truncated)"